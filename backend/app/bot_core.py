@@ -1,16 +1,23 @@
 # app/bot_core.py (সম্পূর্ণ আপডেট করা সংস্করণ)
 
+import datetime
 import time
-import pandas as pd
-import traceback
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, Callable, Optional
 
 # আমাদের সার্ভিস এবং কনফিগারেশন মডিউল
-from .services.exchange_manager import get_exchange_client
+from .services.exchange_manager import get_exchange_client, get_public_client
+from .services import paper_exchange, request_scheduler
+from .services.order_router import order_router
 from .services.strategy_manager import load_strategy_dynamically
 from . import config
-from .database.database import SessionLocal
-from .database import crud
+from .lazy_imports import lazy_import
+from .database.trade_writer import trade_writer
+from .services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+pd = lazy_import("pandas")
 
 # --- ডিফল্ট ট্রেডিং প্যারামিটার ---
 # এই প্যারামিটারগুলো এখন শুধুমাত্র একটি ফলব্যাক হিসেবে কাজ করবে,
@@ -21,14 +28,34 @@ DEFAULT_SYMBOL = 'BTC/USDT'
 DEFAULT_TIMEFRAME = '1m'
 DEFAULT_TRADE_AMOUNT = 0.001
 DEFAULT_STRATEGY_PARAMS = {'length': 14, 'oversold': 30, 'overbought': 70}
+# প্রতিটি চক্রের পর কত সেকেন্ড অপেক্ষা করা হবে
+DEFAULT_POLL_INTERVAL = 60
+# প্রতিটি চক্রে সর্বনিম্ন কতগুলো ক্যান্ডেল আনা হবে (স্ট্র্যাটেজির warmup_bars() বেশি হলে সেটি)
+MIN_HISTORY_CANDLES = 100
+
+
+class WallClock:
+    """লাইভ বটের ঘড়ি। রিপ্লে হারনেস এর বদলে একটি ভার্চুয়াল ঘড়ি দেয়, যাতে sleep সাথে সাথে ফেরে।"""
+
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.utcnow()
 
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
 
-def run_bot_cycle(bot_status_ref: dict, strategy_options: Dict[str, Any] = None):
+
+def run_bot_cycle(bot_status_ref: dict, strategy_options: Dict[str, Any] = None, exchange=None, clock=None,
+                  trade_sink=None, on_signal: Optional[Callable[[Any, str], None]] = None):
     """
     ট্রেডিং বটের মূল চক্র। 
     এটি এখন UI থেকে পাঠানো কাস্টম অপশন গ্রহণ করতে পারে।
+    exchange, clock এবং trade_sink না দিলে আসল ccxt ক্লায়েন্ট, আসল সময় এবং trade_writer ব্যবহার হয়;
+    রিপ্লে হারনেস এগুলোর বদলে সিমুলেটেড এক্সচেঞ্জ ও ভার্চুয়াল ঘড়ি দেয়। on_signal(df, signal) প্রতিটি
+    সিগন্যালের পর ডাকা হয়।
+    নিজের তৈরি করা এক্সচেঞ্জে অর্ডারগুলো order_router দিয়ে যায়, যাতে লুপ ack-এর জন্য আটকে না থাকে;
+    ইনজেক্ট করা এক্সচেঞ্জে (রিপ্লে) অর্ডার সরাসরি দেওয়া হয়, যাতে ভার্চুয়াল ঘড়িতে ফলাফল নির্ধারিত থাকে।
     """
-    print("🤖 Zenith Bot engine is attempting to start...")
+    logger.info("🤖 Zenith Bot engine is attempting to start...")
 
     # strategy_options না থাকলে ডিফল্ট ভ্যালু ব্যবহার করা
     if strategy_options is None:
@@ -40,71 +67,126 @@ def run_bot_cycle(bot_status_ref: dict, strategy_options: Dict[str, Any] = None)
     timeframe = strategy_options.get('timeframe', DEFAULT_TIMEFRAME)
     trade_amount = strategy_options.get('trade_amount', DEFAULT_TRADE_AMOUNT)
     strategy_params = strategy_options.get('params', DEFAULT_STRATEGY_PARAMS)
-    
-    db = None
+    poll_interval = strategy_options.get('poll_interval', DEFAULT_POLL_INTERVAL)
+    # পেপার মোডে অর্ডার লোকাল ম্যাচিং ইঞ্জিনে যায় এবং ট্রেড আসল ফিলের দাম ও পরিমাণে রেকর্ড হয়
+    paper_trading = strategy_options.get('paper_trading', config.PAPER_TRADING)
+    # false হলে (আসল এক্সচেঞ্জে) বট আগের মতো শুধু টিকারের দামে ট্রেড রেকর্ড করে
+    live_trading = strategy_options.get('live_trading', config.LIVE_TRADING)
+    route_orders = exchange is None
+    clock = clock or WallClock()
+    trade_sink = trade_sink or trade_writer
+
+    def record_fill(order: Dict[str, Any]):
+        # রাউটারের থ্রেডে ডাকা হয়; trade_writer থ্রেড-সেফ
+        if order['filled']:
+            trade_sink.submit(order['symbol'], order['side'].upper(), order['filled'], order['average'],
+                              strategy=strategy_name)
 
     try:
         # --- ধাপ ১: প্রাথমিক সেটআপ ---
         bot_status_ref["is_running"] = True
         
-        db = SessionLocal()
-        print("🔗 Database session opened.")
-        
-        exchange = get_exchange_client(exchange_name, config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
-        print(f"✅ Successfully connected to {exchange.name}.")
+        if exchange is None and paper_trading:
+            # লাইভ বটের রিকোয়েস্ট শিডিউলারে সবার আগে যায়, যাতে ব্যাকফিল বা ব্যাকটেস্ট তাকে দেরি না করায়
+            market_data = get_public_client(exchange_name, priority=request_scheduler.LIVE)
+            exchange = paper_exchange.get_paper_exchange(exchange_name, market_data=market_data)
+        elif exchange is None:
+            exchange = get_exchange_client(exchange_name, config.BINANCE_API_KEY, config.BINANCE_API_SECRET,
+                                           priority=request_scheduler.LIVE)
+        logger.info("✅ Successfully connected to %s.", exchange.name)
+        router_key = exchange.id if paper_trading else exchange_name
+        if route_orders and (paper_trading or live_trading):
+            order_router.register(router_key, exchange)
         
         # --- ডাইনামিক স্ট্র্যাটেজি লোডিং ---
         strategy = load_strategy_dynamically(strategy_name, strategy_params)
-        print(f"📈 Strategy loaded: '{strategy_name}' with params {strategy_params}")
+        logger.info("📈 Strategy loaded: '%s' with params %s", strategy_name, strategy_params)
+        # লুকব্যাক ছোট হলে দীর্ঘ পিরিয়ডের ইন্ডিকেটর ব্যাকটেস্টের চেয়ে ভিন্ন সিগন্যাল দেয়
+        history_limit = max(MIN_HISTORY_CANDLES, strategy.warmup_bars())
+        short_history_warned = False
 
         # বট স্ট্যাটাস আপডেট করা
         bot_status_ref["strategy_name"] = strategy_name
         bot_status_ref["symbol"] = symbol
         
         # --- ধাপ ২: মূল ট্রেডিং লুপ ---
-        print(f"\n🚀 Starting main trading loop for {symbol} on {timeframe}...")
+        logger.info("🚀 Starting main trading loop for %s on %s...", symbol, timeframe)
         while bot_status_ref.get("is_running", False):
             try:
-                print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Checking for new signal...")
+                logger.debug("Checking for new signal...")
 
-                ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=100)
+                metrics.inc("exchange_requests_total", exchange=exchange_name, method="fetch_ohlcv")
+                ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=history_limit)
                 if not ohlcv:
-                    print(f"⚠️ Could not fetch OHLCV data for {symbol}. Skipping cycle.")
-                    time.sleep(60)
+                    logger.warning("⚠️ Could not fetch OHLCV data for %s. Skipping cycle.", symbol)
+                    clock.sleep(poll_interval)
                     continue
 
+                if len(ohlcv) < history_limit and not short_history_warned:
+                    # এক্সচেঞ্জ প্রতি রিকোয়েস্টে কম ক্যান্ডেল দিলে রিকার্সিভ ইন্ডিকেটর settle হয় না
+                    logger.warning("⚠️ Got %d candles for %s but the strategy needs %d to settle; signals may differ "
+                                   "from the backtest.", len(ohlcv), symbol, history_limit)
+                    short_history_warned = True
+
                 df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
                 
-                signal = strategy.generate_signals(df)
-                print(f"💡 Signal generated: {signal}")
-
-                if signal in ['BUY', 'SELL']:
+                with metrics.timer("strategy_signal_seconds", mode="live"):
+                    signal = strategy.generate_signals(df)
+                signal_at = time.monotonic()
+                logger.info("💡 Signal generated: %s", signal)
+                if on_signal is not None:
+                    on_signal(df, signal)
+
+                if signal in ['BUY', 'SELL'] and route_orders and (paper_trading or live_trading):
+                    # ack বা ফিলের জন্য অপেক্ষা নেই; ফিল হলে record_fill ট্রেডটি রেকর্ড করে
+                    # (রিজেক্ট হলে, যেমন পেপার অ্যাকাউন্টে যথেষ্ট ব্যালেন্স না থাকলে, রাউটার নিজেই লগ করে)
+                    order_router.submit(router_key, symbol, 'market', signal.lower(), trade_amount,
+                                        bot_id=strategy_name, reference_price=float(df['close'].iloc[-1]),
+                                        signal_at=signal_at, on_fill=record_fill)
+                    logger.info("ACTION: %s order for %s %s sent to the order router (%s).", signal, trade_amount,
+                                symbol, router_key)
+                elif signal in ['BUY', 'SELL'] and paper_trading:
+                    try:
+                        order = exchange.create_order(symbol, 'market', signal.lower(), trade_amount)
+                    except paper_exchange.PaperExchangeError as e:
+                        # যেমন কেনার মতো USDT বা বেচার মতো BTC নেই; এটি ত্রুটি নয়, সিগন্যালটি বাদ যায়
+                        logger.info("⏭️ Paper %s order skipped: %s", signal, e)
+                    else:
+                        logger.info("ACTION: Paper %s order %s filled %s %s at %s", signal, order['id'],
+                                    order['filled'], symbol, order['average'])
+                        if order['filled']:
+                            trade_sink.submit(symbol, signal, order['filled'], order['average'], timestamp=clock.now(),
+                                              strategy=strategy_name)
+                elif signal in ['BUY', 'SELL']:
+                    metrics.inc("exchange_requests_total", exchange=exchange_name, method="fetch_ticker")
                     current_price = exchange.fetch_ticker(symbol)['last']
-                    print(f"ACTION: Placing a {signal} order for {trade_amount} {symbol} at {current_price}")
+                    logger.info("ACTION: Placing a %s order for %s %s at %s", signal, trade_amount, symbol, current_price)
                     
-                    crud.create_trade(db, symbol, signal, trade_amount, current_price)
-                    print("✅ Trade successfully saved to database.")
+                    # ট্রেডটি সরাসরি কমিট না করে রাইটারের বাফারে দেওয়া হচ্ছে, যা ব্যাচ করে সেভ করবে
+                    trade_sink.submit(symbol, signal, trade_amount, current_price, timestamp=clock.now(),
+                                      strategy=strategy_name)
+                    logger.debug("✅ Trade queued for saving to database.")
 
-                time.sleep(60)
+                clock.sleep(poll_interval)
 
             except Exception as e:
-                print(f"🔥 An error occurred inside the trading loop: {e}")
-                print("Bot will rest for 30 seconds and then continue.")
-                time.sleep(30)
+                metrics.inc("errors_total", component="bot_loop")
+                logger.error("🔥 An error occurred inside the trading loop: %s. Bot will rest for 30 seconds and then continue.", e)
+                clock.sleep(30)
 
     except Exception as e:
-        print("\n🔥🔥🔥 A FATAL ERROR occurred that stopped the bot engine! 🔥🔥🔥")
-        print(f"Error Type: {type(e).__name__}")
-        print(f"Error Details: {e}")
-        traceback.print_exc()
+        metrics.inc("errors_total", component="bot_engine")
+        logger.exception("🔥🔥🔥 A FATAL ERROR occurred that stopped the bot engine! %s: %s", type(e).__name__, e)
 
     finally:
-        print("\nInitiating bot shutdown sequence...")
-        if db:
-            db.close()
-            print("🔗 Database session closed.")
+        logger.info("Initiating bot shutdown sequence...")
+        try:
+            trade_sink.flush()
+            logger.info("💾 Pending trades flushed to database.")
+        except Exception as e:
+            logger.warning("⚠️ Could not flush pending trades: %s", e)
         
         bot_status_ref["is_running"] = False
         bot_status_ref["strategy_name"] = None
         bot_status_ref["symbol"] = None
-        print("🛑 Zenith Bot engine has been stopped.")
\ No newline at end of file
+        logger.info("🛑 Zenith Bot engine has been stopped.")
\ No newline at end of file
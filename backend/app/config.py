@@ -1,6 +1,7 @@
 # app/config.py
 
 import os
+import logging
 from dotenv import load_dotenv
 
 # .env ফাইল থেকে পরিবেশের ভেরিয়েবল লোড করে
@@ -8,4 +9,137 @@ load_dotenv()
 
 # এখন আমরা os.getenv() ব্যবহার করে key গুলো পেতে পারি
 BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
-BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
\ No newline at end of file
+BINANCE_API_SECRET = os.getenv("BINANCE_API_SECRET")
+
+# --- ট্রেড রাইটার (ব্যাচ করে ডাটাবেসে ট্রেড লেখা) ---
+# কতগুলো ট্রেড জমা হলে একসাথে ফ্লাশ হবে, এবং সর্বোচ্চ কত সেকেন্ড পর পর ফ্লাশ হবে
+TRADE_WRITER_BATCH_SIZE = int(os.getenv("TRADE_WRITER_BATCH_SIZE", "50"))
+TRADE_WRITER_FLUSH_INTERVAL = float(os.getenv("TRADE_WRITER_FLUSH_INTERVAL", "1.0"))
+
+# --- ব্যবহারকারীর আপলোড করা স্ট্র্যাটেজির স্যান্ডবক্স সীমা ---
+# আপলোডের সময় যাচাই (ইম্পোর্ট + স্মোক টেস্ট) কত সেকেন্ডের মধ্যে শেষ হতে হবে
+USER_STRATEGY_VALIDATION_TIMEOUT = float(os.getenv("USER_STRATEGY_VALIDATION_TIMEOUT", "20"))
+# একটি ব্যাকটেস্টের জন্য ওয়ার্কার প্রসেসের সর্বোচ্চ সময়, CPU সেকেন্ড এবং মেমরি (MB)
+USER_STRATEGY_BACKTEST_TIMEOUT = float(os.getenv("USER_STRATEGY_BACKTEST_TIMEOUT", "600"))
+USER_STRATEGY_CPU_SECONDS = int(os.getenv("USER_STRATEGY_CPU_SECONDS", "300"))
+USER_STRATEGY_MEMORY_MB = int(os.getenv("USER_STRATEGY_MEMORY_MB", "1024"))
+
+# --- ব্যাকটেস্ট ওয়ার্কার পুল এবং অ্যাডমিশন কিউ ---
+# একসাথে কতগুলো ব্যাকটেস্ট চলবে (ওয়ার্কার প্রসেস), কতগুলো অপেক্ষা করতে পারবে, এবং একজন ক্লায়েন্ট একসাথে কতগুলো
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+BACKTEST_MAX_PENDING = int(os.getenv("BACKTEST_MAX_PENDING", str(BACKTEST_WORKERS * 4)))
+BACKTEST_PER_CLIENT_LIMIT = int(os.getenv("BACKTEST_PER_CLIENT_LIMIT", "2"))
+
+# --- ক্যাশ ফোল্ডার এবং ব্যাকটেস্ট ফলাফল ক্যাশ ---
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+# মেমরিতে এবং ডিস্কে সর্বোচ্চ কতগুলো ব্যাকটেস্ট ফলাফল রাখা হবে (LRU)
+RESULT_CACHE_MEMORY_ENTRIES = int(os.getenv("RESULT_CACHE_MEMORY_ENTRIES", "64"))
+RESULT_CACHE_DISK_ENTRIES = int(os.getenv("RESULT_CACHE_DISK_ENTRIES", "1024"))
+# কোডের বাইরে কিছু বদলালে (যেমন TA-Lib বা numpy আপগ্রেড) সংখ্যাটি বাড়িয়ে দিলে আগের সব ফলাফল অবৈধ হয়
+RESULT_CACHE_VERSION = os.getenv("RESULT_CACHE_VERSION", "1")
+
+# --- স্ট্রিমিং ব্যাকটেস্ট ---
+# একবারে কতগুলো ক্যান্ডেল মেমরিতে আনা হবে, চার্ট প্রিভিউতে সর্বোচ্চ কতগুলো পয়েন্ট থাকবে,
+# এবং ডিস্কে সর্বশেষ কতগুলো রানের ইকুইটি ফাইল রাখা হবে
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "50000"))
+STREAM_PREVIEW_POINTS = int(os.getenv("STREAM_PREVIEW_POINTS", "1000"))
+STREAM_KEEP_RUNS = int(os.getenv("STREAM_KEEP_RUNS", "20"))
+
+# --- স্ট্র্যাটেজি তুলনা ---
+# একটি তুলনা রিকোয়েস্টে সর্বোচ্চ কতগুলো (strategy, params) জোড়া থাকতে পারে
+COMPARE_MAX_STRATEGIES = int(os.getenv("COMPARE_MAX_STRATEGIES", "12"))
+# একটি তুলনা কিউতে একটি জব হিসেবে ভর্তি হয়; তার স্ট্র্যাটেজিগুলো একসাথে সর্বোচ্চ কতগুলো ওয়ার্কারে চলবে
+# (ডিফল্ট: একজন ক্লায়েন্টের একসাথে চলা ব্যাকটেস্টের সীমা, যাতে একটি রিকোয়েস্ট পুরো পুল দখল না করে)
+COMPARE_MAX_PARALLEL = int(os.getenv("COMPARE_MAX_PARALLEL", str(BACKTEST_PER_CLIENT_LIMIT)))
+
+# --- ক্যাশ ওয়ার্মার ---
+# যে সিরিজগুলো সবসময় হালনাগাদ রাখা হবে, কমা দিয়ে আলাদা: "binance:BTC/USDT:1h,binance:ETH/USDT:4h" (খালি হলে বন্ধ)
+CACHE_WARMER_WATCHLIST = os.getenv("CACHE_WARMER_WATCHLIST", "")
+# কত দিনের পুরনো ইতিহাস ব্যাকফিল করা হবে, একবারে কত দিন করে, এবং বাউন্ডারির পর কত সেকেন্ড পরে top-up হবে
+CACHE_WARMER_HISTORY_DAYS = int(os.getenv("CACHE_WARMER_HISTORY_DAYS", "365"))
+CACHE_WARMER_BACKFILL_STEP_DAYS = int(os.getenv("CACHE_WARMER_BACKFILL_STEP_DAYS", "30"))
+CACHE_WARMER_TOPUP_DELAY = float(os.getenv("CACHE_WARMER_TOPUP_DELAY", "5"))
+
+# --- পেপার ট্রেডিং ---
+# true হলে বট আসল অর্ডারের বদলে লোকাল পেপার এক্সচেঞ্জে অর্ডার দেয় (মার্কেট ডেটা আসল এক্সচেঞ্জ থেকে)
+PAPER_TRADING = os.getenv("PAPER_TRADING", "false").lower() in ("1", "true", "yes")
+# শুরুর ব্যালেন্স ("USDT:10000,BTC:0.5"), ফি (শতাংশে), এবং একটি ক্যান্ডেলের volume-এর কত অংশ ফিল হতে পারে
+PAPER_STARTING_BALANCES = os.getenv("PAPER_STARTING_BALANCES", "USDT:10000")
+PAPER_TAKER_FEE_PERCENTAGE = float(os.getenv("PAPER_TAKER_FEE_PERCENTAGE", "0.1"))
+PAPER_MAKER_FEE_PERCENTAGE = float(os.getenv("PAPER_MAKER_FEE_PERCENTAGE", "0.1"))
+PAPER_LIQUIDITY_PARTICIPATION = float(os.getenv("PAPER_LIQUIDITY_PARTICIPATION", "0.1"))
+
+# --- এক্সচেঞ্জ রিকোয়েস্ট শিডিউলার ---
+# বাকেটে কত সেকেন্ডের রেট জমতে পারে (burst), এবং ইন্টারেক্টিভ ও ব্যাকফিল রিকোয়েস্ট বাকেটের কত অংশ
+# লাইভ বটের জন্য খালি রেখে যাবে
+REQUEST_SCHEDULER_BURST_SECONDS = float(os.getenv("REQUEST_SCHEDULER_BURST_SECONDS", "1"))
+REQUEST_SCHEDULER_INTERACTIVE_RESERVE = float(os.getenv("REQUEST_SCHEDULER_INTERACTIVE_RESERVE", "0.25"))
+REQUEST_SCHEDULER_BACKFILL_RESERVE = float(os.getenv("REQUEST_SCHEDULER_BACKFILL_RESERVE", "0.5"))
+# ccxt rateLimit না জানালে প্রতি সেকেন্ডে কত weight
+REQUEST_SCHEDULER_DEFAULT_RATE = float(os.getenv("REQUEST_SCHEDULER_DEFAULT_RATE", "10"))
+
+# --- অর্ডার রাউটার ---
+# true হলে (পেপার মোড ছাড়া) বট শুধু ট্রেড রেকর্ড না করে আসল এক্সচেঞ্জে মার্কেট অর্ডার পাঠায়
+LIVE_TRADING = os.getenv("LIVE_TRADING", "false").lower() in ("1", "true", "yes")
+# প্রতিটি এক্সচেঞ্জে প্রতি সেকেন্ডে সর্বোচ্চ অর্ডার-রিকোয়েস্ট, burst, একসাথে চলা কল এবং একটি ব্যাচে সর্বোচ্চ অর্ডার
+ORDER_ROUTER_RATE = float(os.getenv("ORDER_ROUTER_RATE", "10"))
+ORDER_ROUTER_BURST = float(os.getenv("ORDER_ROUTER_BURST", "20"))
+ORDER_ROUTER_CONCURRENCY = int(os.getenv("ORDER_ROUTER_CONCURRENCY", "4"))
+ORDER_ROUTER_BATCH_SIZE = int(os.getenv("ORDER_ROUTER_BATCH_SIZE", "5"))
+# খোলা অর্ডারের ফিল কত সেকেন্ড পরপর fetch_order দিয়ে দেখা হবে
+ORDER_ROUTER_POLL_INTERVAL = float(os.getenv("ORDER_ROUTER_POLL_INTERVAL", "1"))
+
+# --- অফলাইন ক্যান্ডেল ইম্পোর্ট ---
+# API দিয়ে শুধুমাত্র এই ফোল্ডারের ভেতরের ডাম্প ফাইল ইম্পোর্ট করা যায় (CLI-তে যেকোনো পাথ চলে)
+CANDLE_IMPORT_ROOT = os.getenv("CANDLE_IMPORT_ROOT", os.path.join(CACHE_DIR, "imports"))
+# API ইম্পোর্ট একসাথে ব্যাকটেস্টের ওয়ার্কার পুলের সর্বোচ্চ কতগুলো প্রসেস ব্যবহার করবে
+CANDLE_IMPORT_CONCURRENCY = int(os.getenv("CANDLE_IMPORT_CONCURRENCY", str(max(1, BACKTEST_WORKERS // 2))))
+
+# --- ডিস্ট্রিবিউটেড অপটিমাইজার (ব্রোকার, ব্যাচ এবং লিজ) ---
+# ব্রোকারের SQLite ফাইল (WAL মোড); লোকাল ডিস্কে রাখতে হবে, নেটওয়ার্ক ফোল্ডারে নয়
+OPTIMIZER_BROKER_PATH = os.getenv("OPTIMIZER_BROKER_PATH", os.path.join(CACHE_DIR, "optimizer_broker.db"))
+# একটি ব্যাচে কতগুলো প্যারামিটার কম্বিনেশন থাকবে, এবং একটি লিজ কত সেকেন্ড বৈধ থাকবে (হার্টবিট না এলে)
+OPTIMIZER_BATCH_SIZE = int(os.getenv("OPTIMIZER_BATCH_SIZE", "8"))
+OPTIMIZER_LEASE_SECONDS = float(os.getenv("OPTIMIZER_LEASE_SECONDS", "120"))
+# একটি ব্যাচ সর্বোচ্চ কতবার লিজ দেওয়া হবে (বারবার ওয়ার্কার মারা গেলে ব্যাচটি ব্যর্থ হিসেবে চিহ্নিত হয়)
+OPTIMIZER_MAX_ATTEMPTS = int(os.getenv("OPTIMIZER_MAX_ATTEMPTS", "3"))
+# API সার্ভার নিজে কতগুলো লোকাল ওয়ার্কার চালাবে (0 হলে শুধুমাত্র বাইরের ওয়ার্কাররা কাজ করবে)
+OPTIMIZER_LOCAL_WORKERS = int(os.getenv("OPTIMIZER_LOCAL_WORKERS", str(max(1, BACKTEST_WORKERS // 2))))
+# লোকাল ওয়ার্কাররা ব্যাকটেস্ট পুল থেকে আলাদা পুলে চলে; এই nice মান দিয়ে তাদের CPU অগ্রাধিকার কমানো হয় (0 = বদলায় না)
+OPTIMIZER_WORKER_NICE = int(os.getenv("OPTIMIZER_WORKER_NICE", "10"))
+# সেরা কতগুলো ফলাফলের জন্য মন্টে কার্লো রোবাস্টনেস বিশ্লেষণ চালানো হবে (0 হলে বন্ধ), এবং কতগুলো পাথে
+OPTIMIZER_MONTE_CARLO_TOP_K = int(os.getenv("OPTIMIZER_MONTE_CARLO_TOP_K", "10"))
+OPTIMIZER_MONTE_CARLO_PATHS = int(os.getenv("OPTIMIZER_MONTE_CARLO_PATHS", "10000"))
+# আগের জবগুলোতে চালানো কম্বিনেশনের মেমো (স্ট্র্যাটেজি বা ডেটা বদলালে সংশ্লিষ্ট এন্ট্রি মুছে যায়)
+OPTIMIZER_MEMO_PATH = os.getenv("OPTIMIZER_MEMO_PATH", os.path.join(CACHE_DIR, "optimizer_memo.db"))
+# ব্যাচ চলার সময় শেষ হওয়া কম্বিনেশনগুলো কত সেকেন্ড পরপর ব্রোকারে চেকপয়েন্ট করা হবে
+OPTIMIZER_CHECKPOINT_SECONDS = float(os.getenv("OPTIMIZER_CHECKPOINT_SECONDS", "5"))
+# সার্ভার চালু হলে আগের প্রসেসের অসম্পূর্ণ জবগুলো স্বয়ংক্রিয়ভাবে আবার শুরু হবে কিনা
+# (একই ব্রোকার শেয়ার করা একাধিক API সার্ভার থাকলে শুধু একটিতে true রাখুন)
+OPTIMIZER_RESUME_ON_STARTUP = os.getenv("OPTIMIZER_RESUME_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# --- ইন্ডিকেটর ব্যাকএন্ড ---
+# "auto" হলে প্রতিটি ইন্ডিকেটরের জন্য ইনস্টল করা দ্রুততম ব্যাকএন্ড; নাহলে talib, numpy বা pandas_ta জোর করে
+# (যে ইন্ডিকেটরের সেই ব্যাকএন্ড নেই বা লাইব্রেরি ইনস্টল নেই, সেখানে আবার দ্রুততমটিই ব্যবহার হয়)
+INDICATOR_BACKEND = os.getenv("INDICATOR_BACKEND", "auto").lower()
+# লাইভ বট শুধু শেষ warmup_bars() ক্যান্ডেল আনে। রিকার্সিভ ইন্ডিকেটরের (EMA, RSI, ATR, MACD) উইন্ডো এমন
+# দৈর্ঘ্যের রাখা হয় যাতে উইন্ডোর শুরুর সিডের ওজন এর নিচে নামে: 0.001 মানে শেষ মানটি পুরো হিস্টোরির মান
+# থেকে সর্বোচ্চ সিড আর আসল মানের ব্যবধানের 0.1% দূরে (ছোট করলে বেশি ক্যান্ডেল আনতে হয়)
+INDICATOR_SETTLE_TOLERANCE = float(os.getenv("INDICATOR_SETTLE_TOLERANCE", "0.001"))
+
+# --- রেসপন্স এনকোডিং ---
+# এর চেয়ে ছোট রেসপন্স কম্প্রেস করা হয় না; gzip লেভেল (1-9) এবং brotli কোয়ালিটি (0-11)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "1"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "2"))
+
+# --- লগিং ---
+# DEBUG, INFO, WARNING, ERROR; প্রোডাকশনে INFO বা WARNING, হট-পাথের বিস্তারিত দেখতে DEBUG
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+def configure_logging():
+    """LOG_LEVEL অনুযায়ী রুট লগার সেট করে (API সার্ভার এবং ওয়ার্কার CLI শুরুতে একবার ডাকে)।"""
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL, logging.INFO),
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+    )
@@ -1,24 +1,244 @@
 # app/database/crud.py
 
+import base64
+import datetime
+from collections import defaultdict
+from sqlalchemy import func, and_, or_, case, literal
 from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Tuple
 from . import models
+from ..services import position_ledger
 
-def create_trade(db: Session, symbol: str, order_type: str, amount: float, price: float):
+def create_trade(db: Session, symbol: str, order_type: str, amount: float, price: float,
+                 strategy: Optional[str] = None, market_type: str = "spot"):
     # একটি নতুন ট্রেড অবজেক্ট তৈরি করা
     db_trade = models.Trade(
         symbol=symbol,
         order_type=order_type,
         amount=amount,
-        price=price
+        price=price,
+        strategy=strategy,
+        market_type=market_type
     )
     db.add(db_trade) # সেশনে যোগ করা
+    db.flush()       # id এবং timestamp পাওয়ার জন্য
+    position_ledger.apply_trades_to_ledger(db, [db_trade]) # FIFO অনুযায়ী pnl সেট করা
+    apply_performance_deltas(db, [db_trade])
     db.commit()      # ডাটাবেসে সেভ করা
-    db.refresh(db_trade) # ডাটাবেস থেকে নতুন ডেটা দিয়ে অবজেক্ট রিফ্রেশ করা
+    db.refresh(db_trade) # ডাটাবেস থেকে নতুন ডেটা দিয়ে অবজেক্ট রিফ্রেশ করা
     return db_trade
 
-# <-- নতুন ফাংশন যোগ করা হলো -->
-def get_trades(db: Session, skip: int = 0, limit: int = 100):
+def create_trades_bulk(db: Session, trades: List[Dict[str, Any]], commit: bool = True) -> int:
+    """
+    একাধিক ট্রেড একটিমাত্র ট্রানজ্যাকশনে সেভ করে।
+    প্রতিটি ট্রেডের জন্য আলাদা commit/refresh না করায় SQLite লক অনেক কম সময় ধরে রাখা হয়।
+    একই ট্রানজ্যাকশনে FIFO লেজার এবং পারফরম্যান্স অ্যাগ্রিগেটগুলোও আপডেট করা হয়।
+    """
+    if not trades:
+        return 0
+    db_trades = [models.Trade(**trade) for trade in trades]
+    db.add_all(db_trades)
+    db.flush()
+    position_ledger.apply_trades_to_ledger(db, db_trades)
+    apply_performance_deltas(db, db_trades)
+    if commit:
+        db.commit()
+    return len(trades)
+
+# ==============================================================================
+#  পারফরম্যান্স অ্যাগ্রিগেট (ইনক্রিমেন্টাল আপডেট)
+# ==============================================================================
+
+AGGREGATE_FIELDS = ("trade_count", "closed_trades", "wins", "losses", "realized_pnl", "volume")
+
+def _aggregate_keys(trade: models.Trade) -> List[Tuple[str, str]]:
+    """একটি ট্রেড কোন কোন (scope, key) অ্যাগ্রিগেটে যোগ হবে তা নির্ধারণ করে।"""
+    return [
+        ("total", "all"),
+        ("symbol", trade.symbol or "unknown"),
+        ("strategy", trade.strategy or "unknown"),
+        ("market", trade.market_type or "spot"),
+    ]
+
+def _is_closing_trade(trade: models.Trade) -> bool:
+    # যে ট্রেড FIFO লেজারে অন্তত একটি খোলা লট বন্ধ করেছে, সেটিই একটি সম্পন্ন ট্রেড
+    return (trade.closed_amount or 0.0) > 0
+
+def apply_performance_deltas(db: Session, trades: List[models.Trade]):
+    """
+    নতুন ট্রেডগুলোর প্রভাব প্রথমে মেমরিতে যোগ করে, তারপর প্রতিটি (scope, key)-এর জন্য
+    একটিমাত্র UPSERT দিয়ে অ্যাগ্রিগেট টেবিলে যোগ করে। কমিট কলারের দায়িত্ব।
+    """
+    deltas: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(AGGREGATE_FIELDS, 0))
+    for trade in trades:
+        pnl = trade.pnl or 0.0
+        closing = _is_closing_trade(trade)
+        for agg_key in _aggregate_keys(trade):
+            delta = deltas[agg_key]
+            delta["trade_count"] += 1
+            delta["volume"] += (trade.amount or 0.0) * (trade.price or 0.0)
+            delta["realized_pnl"] += pnl
+            if closing:
+                delta["closed_trades"] += 1
+                if pnl > 0:
+                    delta["wins"] += 1
+                else:
+                    delta["losses"] += 1
+
+    if not deltas:
+        return
+    rows = [{"scope": scope, "key": key, "updated_at": datetime.datetime.utcnow(), **delta}
+            for (scope, key), delta in deltas.items()]
+    _upsert_aggregates(db, rows, increment=True)
+
+def _upsert_aggregates(db: Session, rows: List[Dict[str, Any]], increment: bool):
+    """increment=True হলে বিদ্যমান মানের সাথে যোগ করে, নাহলে প্রতিস্থাপন করে।"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = models.PerformanceAggregate.__table__
+    stmt = insert(table)
+    update_values = {
+        field: (table.c[field] + stmt.excluded[field]) if increment else stmt.excluded[field]
+        for field in AGGREGATE_FIELDS
+    }
+    update_values["updated_at"] = stmt.excluded.updated_at
+    stmt = stmt.on_conflict_do_update(index_elements=["scope", "key"], set_=update_values)
+    db.execute(stmt, rows)
+
+def get_performance_aggregates(db: Session, scope: Optional[str] = None) -> List[models.PerformanceAggregate]:
+    query = db.query(models.PerformanceAggregate)
+    if scope:
+        query = query.filter(models.PerformanceAggregate.scope == scope)
+    return query.all()
+
+def rebuild_performance_aggregates(db: Session) -> int:
+    """
+    সম্পূর্ণ trades টেবিল থেকে SQL GROUP BY ব্যবহার করে সব অ্যাগ্রিগেট নতুন করে তৈরি করে।
+    পুরনো ডেটা ব্যাকফিল করার জন্য বা কোনো অসঙ্গতি হলে ব্যবহার করা হয়।
+    """
+    trade = models.Trade
+    is_close = func.coalesce(trade.closed_amount, 0.0) > 0
+    scope_columns = {
+        "total": literal("all"),
+        "symbol": func.coalesce(trade.symbol, "unknown"),
+        "strategy": func.coalesce(trade.strategy, "unknown"),
+        "market": func.coalesce(trade.market_type, "spot"),
+    }
+    now = datetime.datetime.utcnow()
+    rows = []
+    for scope, key_col in scope_columns.items():
+        key_col = key_col.label("key")
+        query = db.query(
+            key_col,
+            func.count(trade.id).label("trade_count"),
+            func.sum(case((is_close, 1), else_=0)).label("closed_trades"),
+            func.sum(case((and_(is_close, trade.pnl > 0), 1), else_=0)).label("wins"),
+            func.sum(case((and_(is_close, func.coalesce(trade.pnl, 0.0) <= 0), 1), else_=0)).label("losses"),
+            func.coalesce(func.sum(trade.pnl), 0.0).label("realized_pnl"),
+            func.coalesce(func.sum(trade.amount * trade.price), 0.0).label("volume"),
+        ).group_by(key_col)
+        for row in query.all():
+            rows.append({"scope": scope, "key": row.key, "updated_at": now,
+                         **{field: getattr(row, field) or 0 for field in AGGREGATE_FIELDS}})
+
+    db.query(models.PerformanceAggregate).delete()
+    if rows:
+        _upsert_aggregates(db, rows, increment=False)
+    db.commit()
+    return len(rows)
+
+# ==============================================================================
+#  ট্রেড হিস্ট্রি: keyset (cursor) পেজিনেশন এবং ফিল্টার
+# ==============================================================================
+
+def encode_trade_cursor(trade: models.Trade) -> str:
+    """একটি ট্রেডের (timestamp, id) থেকে একটি অস্বচ্ছ cursor স্ট্রিং তৈরি করে।"""
+    raw = f"{trade.timestamp.isoformat()}|{trade.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_trade_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    """cursor স্ট্রিং থেকে (timestamp, id) বের করে। ভুল cursor হলে ValueError দেয়।"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp_str, trade_id = raw.rsplit("|", 1)
+        return datetime.datetime.fromisoformat(timestamp_str), int(trade_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor.")
+
+def _apply_trade_filters(query, symbol: Optional[str] = None, order_type: Optional[str] = None,
+                         start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None):
+    if symbol:
+        query = query.filter(models.Trade.symbol == symbol)
+    if order_type:
+        query = query.filter(models.Trade.order_type == order_type.upper())
+    if start:
+        query = query.filter(models.Trade.timestamp >= start)
+    if end:
+        query = query.filter(models.Trade.timestamp < end)
+    return query
+
+def get_trades(db: Session, limit: int = 100, cursor: Optional[str] = None, symbol: Optional[str] = None,
+               order_type: Optional[str] = None, start: Optional[datetime.datetime] = None,
+               end: Optional[datetime.datetime] = None) -> List[models.Trade]:
     """
     ডাটাবেস থেকে ট্রেডের তালিকা নিয়ে আসে (সবচেয়ে নতুনগুলো আগে)।
+    offset-এর বদলে (timestamp, id) keyset ব্যবহার করা হয়, তাই গভীর পেজেও
+    আগের সারিগুলো স্ক্যান করে ফেলে দিতে হয় না। cursor হলো আগের পেজের শেষ ট্রেডের cursor।
     """
-    return db.query(models.Trade).order_by(models.Trade.id.desc()).offset(skip).limit(limit).all()
\ No newline at end of file
+    query = _apply_trade_filters(db.query(models.Trade), symbol, order_type, start, end)
+    if cursor:
+        cursor_ts, cursor_id = decode_trade_cursor(cursor)
+        query = query.filter(or_(
+            models.Trade.timestamp < cursor_ts,
+            and_(models.Trade.timestamp == cursor_ts, models.Trade.id < cursor_id)
+        ))
+    return query.order_by(models.Trade.timestamp.desc(), models.Trade.id.desc()).limit(limit).all()
+
+# ==============================================================================
+#  ট্রেড অ্যাগ্রিগেশন (SQL-এ গণনা করা ঘণ্টা/দিন ভিত্তিক বাকেট)
+# ==============================================================================
+
+TRADE_BUCKET_FORMATS = {
+    # bucket: (SQLite strftime ফরম্যাট, PostgreSQL to_char ফরম্যাট)
+    "hour": ("%Y-%m-%d %H:00", "YYYY-MM-DD HH24:00"),
+    "day": ("%Y-%m-%d", "YYYY-MM-DD"),
+}
+
+def _bucket_expression(db: Session, bucket: str):
+    if bucket not in TRADE_BUCKET_FORMATS:
+        raise ValueError(f"Unsupported bucket '{bucket}'. Use one of: {list(TRADE_BUCKET_FORMATS)}")
+    sqlite_format, postgres_format = TRADE_BUCKET_FORMATS[bucket]
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(models.Trade.timestamp, postgres_format)
+    return func.strftime(sqlite_format, models.Trade.timestamp)
+
+def get_trade_aggregates(db: Session, bucket: str = "day", symbol: Optional[str] = None,
+                         order_type: Optional[str] = None, start: Optional[datetime.datetime] = None,
+                         end: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
+    """
+    ঘণ্টা বা দিন অনুযায়ী ট্রেডের ভলিউম এবং PnL যোগফল ডাটাবেসেই GROUP BY করে গণনা করে।
+    পাইথনে কোনো ট্রেড অবজেক্ট লোড করা হয় না।
+    """
+    bucket_col = _bucket_expression(db, bucket).label("bucket")
+    query = db.query(
+        bucket_col,
+        func.count(models.Trade.id).label("trade_count"),
+        func.coalesce(func.sum(models.Trade.amount), 0.0).label("volume"),
+        func.coalesce(func.sum(models.Trade.amount * models.Trade.price), 0.0).label("notional"),
+        func.coalesce(func.sum(models.Trade.pnl), 0.0).label("pnl"),
+    )
+    query = _apply_trade_filters(query, symbol, order_type, start, end)
+    rows = query.group_by(bucket_col).order_by(bucket_col).all()
+    return [
+        {
+            "bucket": row.bucket,
+            "trade_count": row.trade_count,
+            "volume": row.volume,
+            "notional": row.notional,
+            "pnl": row.pnl,
+        }
+        for row in rows
+    ]
@@ -1,11 +1,35 @@
 # app/database/database.py
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # ডাটাবেসের URL (SQLite ফাইলের নাম)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./zenith_bot.db"
+# aiosqlite ড্রাইভার ইনস্টল থাকলে একই ফাইলের জন্য async URL
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./zenith_bot.db"
+
+# SQLite কানেকশনের জন্য পারফরম্যান্স PRAGMA গুলো
+# WAL মোডে রিডাররা রাইটারকে আটকায় না, এবং busy_timeout লক পেলে সাথে সাথে এরর না দিয়ে অপেক্ষা করে।
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",   # WAL-এর সাথে নিরাপদ, প্রতিটি কমিটে fsync লাগে না
+    "busy_timeout": "5000",    # মিলিসেকেন্ড
+    "temp_store": "MEMORY",
+    "cache_size": "-20000",    # প্রায় ২০ MB পেজ ক্যাশ
+}
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """প্রতিটি নতুন SQLite কানেকশনে PRAGMA গুলো প্রয়োগ করে।"""
+    cursor = dbapi_connection.cursor()
+    for key, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {key}={value}")
+    cursor.close()
+
+def _apply_sqlite_pragmas(target_engine: Engine):
+    if target_engine.dialect.name == "sqlite":
+        event.listen(target_engine, "connect", _set_sqlite_pragmas)
 
 # SQLAlchemy ইঞ্জিন তৈরি
 engine = create_engine(
@@ -13,9 +37,32 @@ engine = create_engine(
     # এই আর্গুমেন্টটি শুধু SQLite-এর জন্য প্রয়োজন
     connect_args={"check_same_thread": False}
 )
+_apply_sqlite_pragmas(engine)
 
 # প্রতিটি ডাটাবেস সেশনের জন্য একটি SessionLocal ক্লাস তৈরি
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # আমাদের ডাটাবেস মডেলগুলো এই Base ক্লাস থেকে উত্তরাধিকারী হবে
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# --- ঐচ্ছিক async ইঞ্জিন (aiosqlite থাকলে) ---
+_async_session_factory = None
+
+def get_async_session_factory():
+    """
+    aiosqlite ইনস্টল থাকলে একটি async sessionmaker ফেরত দেয়, না থাকলে None।
+    ইঞ্জিনটি প্রথমবার প্রয়োজনের সময় তৈরি হয়।
+    """
+    global _async_session_factory
+    if _async_session_factory is not None:
+        return _async_session_factory
+    try:
+        import aiosqlite  # noqa: F401
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    except ImportError:
+        return None
+
+    async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+    _apply_sqlite_pragmas(async_engine.sync_engine)
+    _async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session_factory
@@ -1,6 +1,6 @@
 # app/database/models.py
 
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, inspect, text
 import datetime
 from .database import Base
 
@@ -12,5 +12,72 @@ class Trade(Base):
     order_type = Column(String) # 'BUY' or 'SELL'
     amount = Column(Float)
     price = Column(Float)
-    timestamp = Column(DateTime, default=datetime.datetime.utcnow)
-    pnl = Column(Float, default=0.0) # Profit and Loss
\ No newline at end of file
+    timestamp = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+    pnl = Column(Float, default=0.0) # Profit and Loss (FIFO লেজার দ্বারা পূরণ করা হয়)
+    closed_amount = Column(Float, default=0.0) # এই ট্রেডটি আগের খোলা লট থেকে কতটুকু বন্ধ করেছে
+    strategy = Column(String, nullable=True) # কোন স্ট্র্যাটেজি ট্রেডটি তৈরি করেছে
+    market_type = Column(String, default="spot") # 'spot' or 'futures'
+
+    # সিম্বল এবং সময় দিয়ে ফিল্টার করা কিউরি এবং keyset পেজিনেশনের জন্য কম্পোজিট ইনডেক্স
+    # (SQLite-এ প্রতিটি ইনডেক্সে rowid অর্থাৎ id স্বয়ংক্রিয়ভাবে থাকে)
+    __table_args__ = (
+        Index("ix_trades_symbol_timestamp", "symbol", "timestamp"),
+    )
+
+
+class PositionLot(Base):
+    """
+    FIFO লেজারের একটি খোলা লট: একটি BUY ট্রেডের যে অংশ এখনো বিক্রি হয়নি।
+    প্রতিটি সিম্বলের লটগুলো opened_at এবং id অনুযায়ী সাজালে FIFO ক্রম পাওয়া যায়।
+    """
+    __tablename__ = "position_lots"
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, index=True, nullable=False)
+    trade_id = Column(Integer, nullable=False) # যে BUY ট্রেড থেকে লটটি খোলা হয়েছে
+    amount = Column(Float, nullable=False)     # অবশিষ্ট পরিমাণ
+    price = Column(Float, nullable=False)      # এন্ট্রি প্রাইস
+    opened_at = Column(DateTime, nullable=False)
+
+
+class PerformanceAggregate(Base):
+    """
+    ট্রেড লেখার সময় ইনক্রিমেন্টালি আপডেট হওয়া পারফরম্যান্সের চলমান যোগফল।
+    scope হলো 'total', 'symbol', 'strategy' বা 'market', এবং key হলো সেই scope-এর মান
+    (যেমন scope='symbol', key='BTC/USDT')।
+    """
+    __tablename__ = "performance_aggregates"
+
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    trade_count = Column(Integer, default=0, nullable=False)
+    closed_trades = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    realized_pnl = Column(Float, default=0.0, nullable=False)
+    volume = Column(Float, default=0.0, nullable=False) # amount * price-এর যোগফল
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
+def ensure_schema(bind):
+    """
+    create_all শুধু নতুন টেবিল তৈরি করে, বিদ্যমান টেবিলে নতুন কলাম বা ইনডেক্স যোগ করে না।
+    এই ফাংশনটি পুরনো ডাটাবেস ফাইলে অনুপস্থিত কলাম এবং ইনডেক্সগুলো তৈরি করে দেয়।
+    """
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    ddl += f" DEFAULT {default!r}"
+                conn.execute(text(ddl))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
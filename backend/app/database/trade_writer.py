@@ -0,0 +1,181 @@
+# app/database/trade_writer.py
+
+import contextlib
+import datetime
+import logging
+import threading
+import asyncio
+from typing import List, Dict, Any, Optional
+
+from .. import config
+from . import crud
+from .database import SessionLocal, get_async_session_factory
+from ..services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TradeWriter:
+    """
+    ট্রেডগুলোকে মেমরিতে বাফার করে এবং ব্যাচ আকারে একটিমাত্র ট্রানজ্যাকশনে ডাটাবেসে লেখে।
+    submit() কখনো ডিস্কে লেখার জন্য অপেক্ষা করে না; একটি ব্যাকগ্রাউন্ড থ্রেড
+    নির্দিষ্ট সময় পর পর অথবা ব্যাচ পূর্ণ হলে ফ্লাশ করে।
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = None, flush_interval: float = None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or config.TRADE_WRITER_BATCH_SIZE
+        self.flush_interval = flush_interval or config.TRADE_WRITER_FLUSH_INTERVAL
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # একসাথে দুটি ফ্লাশ যেন একই লকের জন্য প্রতিযোগিতা না করে
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- বাফারে ট্রেড যোগ করা ---
+    def submit(self, symbol: str, order_type: str, amount: float, price: float, timestamp: datetime.datetime = None,
+               strategy: Optional[str] = None, market_type: str = "spot"):
+        """একটি ট্রেড বাফারে যোগ করে। টাইমস্ট্যাম্প ফ্লাশের সময় নয়, জমা দেওয়ার সময় ধরা হয়।"""
+        trade = {
+            "symbol": symbol,
+            "order_type": order_type,
+            "amount": amount,
+            "price": price,
+            "timestamp": timestamp or datetime.datetime.utcnow(),
+            "strategy": strategy,
+            "market_type": market_type,
+        }
+        with self._lock:
+            self._buffer.append(trade)
+            buffered = len(self._buffer)
+
+        if buffered >= self.batch_size:
+            if self.is_running:
+                self._wakeup.set()
+            else:
+                # ব্যাকগ্রাউন্ড থ্রেড না থাকলে (যেমন স্ক্রিপ্ট থেকে চালালে) এখানেই ফ্লাশ করা
+                self.flush()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        return batch
+
+    def _requeue(self, batch: List[Dict[str, Any]]):
+        # ব্যর্থ ব্যাচটি বাফারের শুরুতে ফেরত রাখা, যাতে ক্রম ঠিক থাকে
+        with self._lock:
+            self._buffer = batch + self._buffer
+
+    # --- সিঙ্ক্রোনাস ফ্লাশ ---
+    def flush(self) -> int:
+        """বাফারের সব ট্রেড একটি ট্রানজ্যাকশনে লেখে এবং লেখা ট্রেডের সংখ্যা ফেরত দেয়।"""
+        with self._flush_lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        # কলারকে _flush_lock ধরে রাখতে হবে
+        batch = self._drain()
+        if not batch:
+            return 0
+        db = self.session_factory()
+        try:
+            with metrics.timer("trade_writer_flush_seconds", mode="sync"):
+                written = crud.create_trades_bulk(db, batch)
+            metrics.inc("trade_writer_trades_total", len(batch))
+            return written
+        except Exception:
+            db.rollback()
+            self._requeue(batch)
+            raise
+        finally:
+            db.close()
+
+    @contextlib.contextmanager
+    def paused(self):
+        """
+        বাফার ফ্লাশ করে এবং ব্লক শেষ না হওয়া পর্যন্ত রাইটারকে আর কিছু লিখতে দেয় না; এর মধ্যে আসা
+        ট্রেডগুলো বাফারে জমে থাকে। সম্পূর্ণ হিস্ট্রি থেকে অ্যাগ্রিগেট বা লেজার পুনর্গণনার সময় ব্যবহার করা হয়,
+        যাতে কোনো ট্রেড একই সাথে ইনক্রিমেন্টালি প্রয়োগ হয়ে দুবার গোনা বা হারিয়ে না যায়।
+        """
+        with self._flush_lock:
+            self._flush_locked()
+            yield
+
+    # --- অ্যাসিঙ্ক্রোনাস ফ্লাশ ---
+    async def flush_async(self) -> int:
+        """
+        ইভেন্ট লুপ ব্লক না করে ফ্লাশ করে। aiosqlite থাকলে async ড্রাইভার ব্যবহার করে,
+        না থাকলে সিঙ্ক্রোনাস ফ্লাশটি একটি থ্রেডে চালায়।
+        """
+        async_session_factory = get_async_session_factory()
+        if async_session_factory is None:
+            return await asyncio.to_thread(self.flush)
+
+        # অন্য ফ্লাশ বা paused() চলাকালীন লুপে অপেক্ষা না করে থ্রেডে সিঙ্ক্রোনাস ফ্লাশের জন্য অপেক্ষা করা
+        if not self._flush_lock.acquire(blocking=False):
+            return await asyncio.to_thread(self.flush)
+        try:
+            batch = self._drain()
+            if not batch:
+                return 0
+            try:
+                with metrics.timer("trade_writer_flush_seconds", mode="async"):
+                    async with async_session_factory() as session:
+                        # ট্রেড এবং অ্যাগ্রিগেট একই ট্রানজ্যাকশনে লেখা হয়
+                        await session.run_sync(crud.create_trades_bulk, batch, False)
+                        await session.commit()
+                metrics.inc("trade_writer_trades_total", len(batch))
+            except Exception:
+                self._requeue(batch)
+                raise
+            return len(batch)
+        finally:
+            self._flush_lock.release()
+
+    # --- ব্যাকগ্রাউন্ড থ্রেড ---
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                metrics.inc("errors_total", component="trade_writer")
+                logger.warning("⚠️ Trade writer flush failed, will retry: %s", e)
+        # বন্ধ হওয়ার আগে বাকি ট্রেডগুলো লিখে ফেলা
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("🔥 Trade writer could not flush remaining trades on shutdown: %s", e)
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="trade-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        if not self.is_running:
+            self.flush()
+            return
+        self._stop_event.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+
+# অ্যাপ জুড়ে একটিমাত্র শেয়ার করা রাইটার
+trade_writer = TradeWriter()
+metrics.register_gauge(lambda: {"trade_writer_pending": trade_writer.pending})
@@ -0,0 +1,50 @@
+# app/import_candles.py
+#
+# অফলাইন ক্যান্ডেল ইম্পোর্ট: ডাউনলোড করা ঐতিহাসিক ডাম্প (Binance kline zip, CSV, parquet) সরাসরি
+# ক্যান্ডেল স্টোরে লেখে, যাতে লম্বা ব্যাকটেস্টের জন্য এক্সচেঞ্জ থেকে পেজ ধরে ডাউনলোড করতে না হয়:
+#
+#   python -m app.import_candles --exchange binance --symbol BTC/USDT --timeframe 1h ./dumps/BTCUSDT-1h --processes 8
+#
+# ফাইলগুলো একাধিক প্রসেসে পার্স হয়; একই রেঞ্জ আবার ইম্পোর্ট করলে ডুপ্লিকেট তৈরি হয় না।
+
+import argparse
+import datetime
+import logging
+import sys
+
+from . import config
+from .services import candle_import
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import historical candle dumps into the candle store")
+    parser.add_argument("paths", nargs="+", help="CSV, zip or parquet files, or folders containing them")
+    parser.add_argument("--exchange", required=True, help="Exchange the candles belong to, e.g. binance")
+    parser.add_argument("--symbol", required=True, help="Trading symbol, e.g. BTC/USDT")
+    parser.add_argument("--timeframe", required=True, help="Timeframe of the candles in the files, e.g. 1h")
+    parser.add_argument("--processes", type=int, default=None, help="Parser processes (default: CPU count)")
+    args = parser.parse_args()
+
+    config.configure_logging()
+    try:
+        report = candle_import.import_candle_files(args.paths, args.exchange, args.symbol, args.timeframe,
+                                                   processes=args.processes)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"--- Candle Import ({args.exchange} {args.symbol} {args.timeframe}) ---")
+    print(f"files: {report['imported_files']}/{report['files']}, candles: {report['rows']:,}, "
+          f"time: {report['seconds']:.2f} s")
+    for error in report["errors"]:
+        print(f"⚠️ {error['file']}: {error['error']}")
+    for start_ms, end_ms in report["covered"]:
+        start, end = (datetime.datetime.fromtimestamp(ms / 1000, datetime.timezone.utc) for ms in (start_ms, end_ms))
+        print(f"covered: {start:%Y-%m-%d %H:%M} -> {end:%Y-%m-%d %H:%M} UTC")
+    return 1 if report["errors"] and not report["imported_files"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
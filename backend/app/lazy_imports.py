@@ -0,0 +1,55 @@
+# app/lazy_imports.py
+
+import importlib
+import sys
+import types
+
+# ==============================================================================
+#  অলস ইম্পোর্ট (Lazy imports)
+#
+#  ccxt, pandas, numpy এবং pyarrow ইম্পোর্ট করতে কয়েক সেকেন্ড লাগে, অথচ API চালু হওয়ার সময়
+#  এগুলোর দরকার হয় না। মডিউলের শুরুতে
+#
+#      pd = lazy_import("pandas")
+#
+#  লিখলে আসল ইম্পোর্টটি প্রথমবার pd.<কিছু> ব্যবহারের সময় হয়। টাইপ অ্যানোটেশনে pd.DataFrame
+#  ব্যবহার করতে হলে সেই মডিউলে `from __future__ import annotations` থাকতে হবে।
+# ==============================================================================
+
+
+class _LazyModule(types.ModuleType):
+    """প্রথম অ্যাট্রিবিউট অ্যাক্সেসে আসল মডিউল ইম্পোর্ট করে এমন একটি প্রক্সি।"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+            # পরের অ্যাক্সেসগুলো সাধারণ dict lookup হয়, __getattr__ পর্যন্ত আসে না
+            self.__dict__.update(
+                {k: v for k, v in module.__dict__.items() if k not in ("__name__", "__dict__")}
+            )
+        return module
+
+    def __getattr__(self, attr: str):
+        # শুধুমাত্র যে অ্যাট্রিবিউট __dict__-এ নেই তার জন্য ডাকা হয় (যেমন পরে লোড হওয়া সাবমডিউল)
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """`import name`-এর অলস সংস্করণ; মডিউলটি আগেই ইম্পোর্ট হয়ে থাকলে সেটিই ফেরত দেয়।"""
+    module = sys.modules.get(name)
+    if module is not None and not isinstance(module, _LazyModule):
+        return module
+    return _LazyModule(name)
@@ -1,16 +1,21 @@
 # app/main.py (আপনার দেওয়া কোড + CORS ফিক্স)
 
 # --- FastAPI এবং Python-এর স্ট্যান্ডার্ড লাইব্রেরি ইম্পোর্ট ---
-from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, UploadFile, File
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, UploadFile, File, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
-import traceback
+import asyncio
+import datetime
+import logging
+import time
 
 # --- লোকাল ইম্পোর্টস ---
 from .database import models, crud
-from . import schemas
+from . import schemas, config
 from .database.database import SessionLocal, engine
+from .database.trade_writer import trade_writer
 
 from . import bot_core
 from .services import (
@@ -18,12 +23,25 @@ from .services import (
     exchange_manager,
     backtesting_engine,
     strategy_manager,
-    optimizer_engine
+    optimizer_engine,
+    position_ledger,
+    monte_carlo,
+    candle_import,
+    replay,
+    paper_exchange,
+    request_scheduler
 )
+from .services.backtest_queue import backtest_queue, QueueSaturated, shutdown_worker_pool
+from .services.result_cache import result_cache
+from .services.cache_warmer import cache_warmer
+from .services.order_router import order_router
+from .services.metrics import metrics
+from .services import response_encoding
 
 # --- অ্যাপ ইনিশিয়ালাইজেশন এবং কনফিগারেশন ---
 
-models.Base.metadata.create_all(bind=engine)
+config.configure_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Zenith Bot API",
@@ -54,11 +72,55 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # ব্রাউজার থেকে পরের পেজের cursor পড়ার জন্য হেডারটি এক্সপোজ করা
+    expose_headers=["X-Next-Cursor", "X-Queue-Wait-Ms", "Retry-After"],
 )
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # রাউটের টেমপ্লেট (যেমন /api/optimizer/status/{job_id}) লেবেল হিসেবে, যাতে প্রতিটি আইডির জন্য আলাদা সিরিজ না হয়
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.observe("http_request_duration_seconds", time.perf_counter() - started,
+                    method=request.method, route=getattr(route, "path", "unmatched"), status=response.status_code)
+    return response
 # ==========================================================
 
 bot_status = {"is_running": False, "strategy_name": None, "symbol": None}
 
+# --- অ্যাপ চালু এবং বন্ধের সময়কার কাজ ---
+@app.on_event("startup")
+def on_startup():
+    # টেবিল তৈরি এবং মাইগ্রেশন ইম্পোর্টের সময় নয়, সার্ভার চালু হওয়ার সময় একবার করা হয়
+    models.ensure_schema(engine)
+    # ট্রেডগুলো ব্যাচ করে লেখার জন্য ব্যাকগ্রাউন্ড রাইটার চালু করা
+    trade_writer.start()
+    # ওয়াচলিস্টের সিরিজগুলো ক্যান্ডেল স্টোরে হালনাগাদ রাখা
+    if cache_warmer.watchlist():
+        cache_warmer.start()
+    # আগের প্রসেস বন্ধ হওয়ার সময় অসম্পূর্ণ থাকা অপটিমাইজার জবগুলো শেষ চেকপয়েন্ট থেকে আবার চালানো
+    if config.OPTIMIZER_RESUME_ON_STARTUP:
+        asyncio.ensure_future(optimizer_engine.resume_unfinished_jobs())
+    # পুরনো ডাটাবেসের জন্য পারফরম্যান্স অ্যাগ্রিগেট একবার ব্যাকফিল করা
+    db = SessionLocal()
+    try:
+        with trade_writer.paused():
+            backfilled = performance_analyzer.ensure_performance_aggregates(db)
+        if backfilled:
+            logger.info("📊 Performance aggregates were backfilled from existing trades.")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # আগে রাউটার, যাতে চলমান অর্ডারগুলোর ফিল on_fill দিয়ে trade_writer-এর বাফারে পৌঁছায়;
+    # তারপর বাফারে থাকা সব ট্রেড ডাটাবেসে লিখে ফেলা
+    order_router.stop()
+    trade_writer.stop()
+    cache_warmer.stop()
+    shutdown_worker_pool()
+
 def get_db():
     db = SessionLocal()
     try:
@@ -93,6 +155,29 @@ def stop_bot():
     bot_status["is_running"] = False
     return {"message": "Stopping signal sent. The bot will stop after its current cycle."}
 
+@app.get("/api/paper/accounts", response_model=List[schemas.PaperAccount], tags=["Bot Control"])
+def get_paper_accounts(recent_trades: int = Query(50, ge=0, le=1000)):
+    """পেপার ট্রেডিং মোডে চলা বটগুলোর অ্যাকাউন্ট (এক্সচেঞ্জপ্রতি একটি)।"""
+    accounts = []
+    for name, account in paper_exchange.paper_accounts().items():
+        balance = account.fetch_balance()
+        accounts.append({
+            "exchange": name, "free": balance["free"], "used": balance["used"], "total": balance["total"],
+            "open_orders": account.fetch_open_orders(),
+            "recent_trades": account.fetch_my_trades(limit=recent_trades) if recent_trades else [],
+        })
+    return accounts
+
+@app.get("/api/orders/router", response_model=List[schemas.OrderRouterLane], tags=["Bot Control"])
+def get_order_router_stats():
+    """অর্ডার রাউটারের প্রতিটি এক্সচেঞ্জ লেনের অবস্থা।"""
+    return order_router.stats()
+
+@app.get("/api/orders/recent", response_model=List[schemas.RoutedOrder], tags=["Bot Control"])
+def get_recent_orders(limit: int = Query(100, ge=1, le=1000)):
+    """রাউটারের সাম্প্রতিক অর্ডার (নতুনগুলো আগে), সিগন্যাল-থেকে-ack latency এবং slippage সহ।"""
+    return order_router.recent(limit)
+
 # --- Informational Endpoints ---
 @app.get("/api/exchanges/supported", response_model=List[str], tags=["Info"])
 def get_supported_exchanges():
@@ -106,6 +191,11 @@ async def get_available_markets(exchange_name: str):
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+@app.get("/api/exchanges/scheduler", response_model=List[schemas.ExchangeSchedulerStatus], tags=["Info"])
+def get_exchange_scheduler_status():
+    """প্রতিটি এক্সচেঞ্জের রিকোয়েস্ট শিডিউলারের টোকেন এবং অগ্রাধিকার অনুযায়ী কিউর দৈর্ঘ্য।"""
+    return request_scheduler.scheduler_stats()
+
 @app.get("/api/timeframes/supported", response_model=List[str], tags=["Info"])
 def get_supported_timeframes():
     return SUPPORTED_TIMEFRAMES
@@ -128,9 +218,13 @@ def get_params_for_strategy(strategy_name: str):
         raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
 
 @app.post("/api/strategies/upload", response_model=schemas.ResponseMessage, tags=["Strategies"])
-async def upload_strategy(file: UploadFile = File(...)):
+def upload_strategy(file: UploadFile = File(...)):
+    # স্যান্ডবক্স যাচাইয়ে কয়েক সেকেন্ড লাগতে পারে, তাই sync হ্যান্ডলার: FastAPI এটি থ্রেডপুলে চালায়,
+    # ইভেন্ট লুপ (লাইভ ট্রেডিং, অপটিমাইজার কোঅর্ডিনেটর) আটকে থাকে না
     try:
         message = strategy_manager.save_strategy_file(file)
+        # আবার আপলোড করা স্ট্র্যাটেজির পুরনো ব্যাকটেস্ট ফলাফল ক্যাশ থেকে মুছে ফেলা
+        result_cache.invalidate_strategy(strategy_manager.get_strategy_display_name(file.filename))
         return {"message": message}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
@@ -139,31 +233,279 @@ async def upload_strategy(file: UploadFile = File(...)):
 
 # --- Data and Backtesting Endpoints ---
 @app.get("/api/trades", response_model=List[schemas.Trade], tags=["Data"])
-def read_trades(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_trades(db, skip=skip, limit=limit)
+def read_trades(
+    http_request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    symbol: Optional[str] = None,
+    order_type: Optional[str] = None,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    db: Session = Depends(get_db)
+):
+    # পরের পেজের জন্য X-Next-Cursor হেডারের মানটি cursor হিসেবে পাঠাতে হবে
+    try:
+        trades = crud.get_trades(db, limit=limit, cursor=cursor, symbol=symbol,
+                                 order_type=order_type, start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {}
+    if len(trades) == limit:
+        headers["X-Next-Cursor"] = crud.encode_trade_cursor(trades[-1])
+    # ORM অবজেক্ট থেকে সরাসরি ডিকশনারি; প্রতিটি সারির জন্য pydantic ভ্যালিডেশন লাগে না
+    rows = [{"id": t.id, "symbol": t.symbol, "order_type": t.order_type, "amount": t.amount,
+             "price": t.price, "timestamp": t.timestamp, "pnl": t.pnl} for t in trades]
+    return response_encoding.encoded_response(
+        http_request, rows, endpoint="trades",
+        columnar=lambda: response_encoding.trades_columns(rows), headers=headers,
+    )
+
+@app.get("/api/trades/aggregate", response_model=List[schemas.TradeAggregateBucket], tags=["Data"])
+def read_trade_aggregates(
+    bucket: str = "day",
+    symbol: Optional[str] = None,
+    order_type: Optional[str] = None,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    db: Session = Depends(get_db)
+):
+    try:
+        return crud.get_trade_aggregates(db, bucket=bucket, symbol=symbol,
+                                         order_type=order_type, start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/api/performance-stats", response_model=schemas.PerformanceStats, tags=["Data"])
 def get_performance_stats(db: Session = Depends(get_db)):
-    # This is a placeholder, you might want to implement a real calculation
-    return schemas.PerformanceStats(total_pnl=0.0, spot_pnl=0.0, futures_pnl=0.0, win_rate=0.0)
+    # অ্যাগ্রিগেট টেবিল থেকে পড়া হয়, তাই ট্রেড হিস্ট্রির আকারের উপর নির্ভর করে না
+    return performance_analyzer.calculate_performance_stats(db)
+
+@app.post("/api/performance-stats/rebuild", response_model=schemas.ResponseMessage, tags=["Data"])
+def rebuild_performance_stats(db: Session = Depends(get_db)):
+    # বাফারের ট্রেডগুলো আগে লিখে ফেলা এবং পুনর্গঠন শেষ না হওয়া পর্যন্ত রাইটারকে থামিয়ে রাখা,
+    # যাতে মাঝখানে কোনো ট্রেড ইনক্রিমেন্টালি প্রয়োগ হয়ে দুবার গোনা বা হারিয়ে না যায়
+    with trade_writer.paused():
+        rows = performance_analyzer.rebuild_performance_stats(db)
+    return {"message": f"Rebuilt {rows} performance aggregate rows from trade history."}
+
+@app.get("/api/positions", response_model=List[schemas.OpenPosition], tags=["Data"])
+def read_open_positions(db: Session = Depends(get_db)):
+    return position_ledger.get_open_positions(db)
+
+@app.post("/api/positions/recompute", response_model=schemas.ResponseMessage, tags=["Data"])
+def recompute_positions(db: Session = Depends(get_db)):
+    # সম্পূর্ণ ট্রেড হিস্ট্রি থেকে FIFO লেজার, ট্রেডের pnl এবং অ্যাগ্রিগেট নতুন করে গণনা করা;
+    # কমিট না হওয়া পর্যন্ত রাইটার থামানো থাকে, নইলে মাঝখানে লেখা ট্রেড লেজারকে এলোমেলো করে দেয়
+    with trade_writer.paused():
+        count = position_ledger.recompute_ledger(db)
+        db.commit()
+    return {"message": f"Recomputed FIFO ledger over {count} trades."}
+
+def _client_id(http_request: Request) -> str:
+    # X-Client-Id হেডার থাকলে সেটি, না থাকলে ক্লায়েন্টের IP দিয়ে প্রতি-ক্লায়েন্ট সীমা গণনা করা
+    return http_request.headers.get("X-Client-Id") or (http_request.client.host if http_request.client else "anonymous")
 
 @app.post("/api/backtest/run", response_model=schemas.BacktestResult, tags=["Backtesting"])
-async def run_backtest(request: schemas.BacktestRequest):
-    try:
-        result_data = await backtesting_engine.run_simulation(
-            exchange_name=request.exchange_name,
-            strategy_name=request.strategy_name,
-            symbol=request.symbol,
-            timeframe=request.timeframe,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            strategy_params=request.strategy_params
+async def run_backtest(request: schemas.BacktestRequest, http_request: Request):
+    try:
+        result_data, waited = await backtest_queue.run(
+            _client_id(http_request),
+            lambda: backtesting_engine.run_simulation(
+                exchange_name=request.exchange_name,
+                strategy_name=request.strategy_name,
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                strategy_params=request.strategy_params
+            )
         )
-        return result_data
+        metrics.inc("backtest_runs_total", outcome="ok")
+        # বড় price_history-র জন্য Accept অনুযায়ী Arrow/MessagePack এবং gzip/br কম্প্রেশন
+        return response_encoding.encoded_response(
+            http_request, result_data, endpoint="backtest_run",
+            columnar=lambda: response_encoding.backtest_columns(result_data),
+            headers={"X-Queue-Wait-Ms": str(round(waited * 1000))},
+        )
+    except QueueSaturated as qs:
+        metrics.inc("backtest_runs_total", outcome="rejected")
+        raise HTTPException(status_code=429, detail=str(qs), headers={"Retry-After": str(qs.retry_after)})
     except Exception as e:
-        traceback.print_exc()
+        metrics.inc("backtest_runs_total", outcome="error")
+        metrics.inc("errors_total", component="backtest")
+        logger.exception("Backtest failed")
         raise HTTPException(status_code=500, detail=f"An internal server error occurred during backtest: {e}")
 
+@app.post("/api/backtest/compare", response_model=schemas.ComparisonResult, tags=["Backtesting"])
+async def compare_strategies(request: schemas.ComparisonRequest, http_request: Request):
+    # একই ডেটায় একাধিক স্ট্র্যাটেজি: ডেটা একবার আনা হয়, প্রাইস হিস্টোরি রেসপন্সে একবারই যায়
+    if len(request.strategies) > config.COMPARE_MAX_STRATEGIES:
+        raise HTTPException(status_code=400,
+                            detail=f"At most {config.COMPARE_MAX_STRATEGIES} strategies can be compared at once.")
+    try:
+        result, waited = await backtest_queue.run(
+            _client_id(http_request),
+            lambda: backtesting_engine.run_comparison(
+                exchange_name=request.exchange_name,
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                entries=[entry.model_dump() for entry in request.strategies],
+            )
+        )
+        metrics.inc("backtest_runs_total", outcome="ok")
+        return response_encoding.encoded_response(
+            http_request, result, endpoint="backtest_compare",
+            columnar=lambda: response_encoding.comparison_columns(result),
+            headers={"X-Queue-Wait-Ms": str(round(waited * 1000))},
+        )
+    except QueueSaturated as qs:
+        metrics.inc("backtest_runs_total", outcome="rejected")
+        raise HTTPException(status_code=429, detail=str(qs), headers={"Retry-After": str(qs.retry_after)})
+    except ValueError as e:
+        metrics.inc("backtest_runs_total", outcome="error")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        metrics.inc("backtest_runs_total", outcome="error")
+        metrics.inc("errors_total", component="backtest")
+        logger.exception("Strategy comparison failed")
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred during comparison: {e}")
+
+@app.post("/api/backtest/stream", response_model=schemas.StreamingBacktestResult, tags=["Backtesting"])
+async def run_streaming_backtest(request: schemas.BacktestRequest, http_request: Request):
+    # খুব বড় রেঞ্জের (যেমন কয়েক বছরের 1m) জন্য: মেমরি সীমিত থাকে, ইকুইটি কার্ভ ডিস্কে লেখা হয়
+    try:
+        result, _ = await backtest_queue.run(
+            _client_id(http_request),
+            lambda: backtesting_engine.run_simulation_streaming(
+                exchange_name=request.exchange_name,
+                strategy_name=request.strategy_name,
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                strategy_params=request.strategy_params
+            )
+        )
+        metrics.inc("backtest_runs_total", outcome="ok")
+        return result
+    except QueueSaturated as qs:
+        metrics.inc("backtest_runs_total", outcome="rejected")
+        raise HTTPException(status_code=429, detail=str(qs), headers={"Retry-After": str(qs.retry_after)})
+    except ValueError as ve:
+        metrics.inc("backtest_runs_total", outcome="error")
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        metrics.inc("backtest_runs_total", outcome="error")
+        metrics.inc("errors_total", component="backtest")
+        logger.exception("Streaming backtest failed")
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred during backtest: {e}")
+
+@app.get("/api/backtest/stream/{run_id}/{part}", tags=["Backtesting"])
+def get_streaming_backtest_file(run_id: str, part: str):
+    files = {"equity": backtesting_engine.EQUITY_FILE, "trades": backtesting_engine.TRADES_FILE}
+    if part not in files:
+        raise HTTPException(status_code=404, detail="Unknown part. Use 'equity' or 'trades'.")
+    try:
+        path = backtesting_engine.streaming_run_file(run_id, files[part])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Run not found")
+    return FileResponse(path, media_type=response_encoding.ARROW_TYPE, filename=f"{run_id}_{files[part]}")
+
+@app.post("/api/bot/replay", response_model=schemas.ReplayReport, tags=["Backtesting"])
+async def run_bot_replay(request: schemas.ReplayRequest, http_request: Request):
+    # লাইভ বটের লুপ ভার্চুয়াল ঘড়িতে চালিয়ে প্রতিটি ক্যান্ডেলে ব্যাকটেস্টারের সিগন্যালের সাথে মেলানো
+    try:
+        report, _ = await backtest_queue.run(
+            _client_id(http_request),
+            lambda: replay.run_replay(
+                exchange_name=request.exchange_name,
+                strategy_name=request.strategy_name,
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                strategy_params=request.strategy_params,
+                trade_amount=request.trade_amount,
+                paper_trading=request.paper_trading
+            )
+        )
+        return report
+    except QueueSaturated as qs:
+        raise HTTPException(status_code=429, detail=str(qs), headers={"Retry-After": str(qs.retry_after)})
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        metrics.inc("errors_total", component="replay")
+        logger.exception("Bot replay failed")
+        raise HTTPException(status_code=500, detail=f"An internal server error occurred during replay: {e}")
+
+@app.post("/api/backtest/monte-carlo", response_model=schemas.MonteCarloResult, tags=["Backtesting"])
+async def run_monte_carlo(request: schemas.MonteCarloRequest):
+    trade_returns = request.trade_returns
+    if trade_returns is None:
+        # ফ্রন্টএন্ডের কাছে থাকা BacktestResult-এর trade_logs থেকে রিটার্ন বের করা
+        trade_returns = monte_carlo.trade_returns_from_logs(request.trade_logs or [],
+                                                            backtesting_engine.TRADE_FEE_PERCENTAGE)
+    try:
+        # NumPy-তে গণনা কয়েকশো মিলিসেকেন্ড নিতে পারে, তাই ইভেন্ট লুপের বাইরে চালানো হয়
+        return await asyncio.to_thread(monte_carlo.run_monte_carlo, trade_returns,
+                                       request.paths, request.method, request.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/backtest/queue", response_model=schemas.BacktestQueueStatus, tags=["Backtesting"])
+def get_backtest_queue_status():
+    return backtest_queue.stats()
+
+@app.get("/api/backtest/cache", response_model=Dict[str, Any], tags=["Backtesting"])
+def get_backtest_cache_status():
+    return result_cache.stats()
+
+# --- Candle Import Endpoints ---
+@app.post("/api/candles/import", response_model=Dict[str, str], tags=["Data"])
+def start_candle_import(request: schemas.CandleImportRequest, background_tasks: BackgroundTasks):
+    try:
+        job_id = candle_import.start_import_job(background_tasks, request.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id}
+
+@app.get("/api/candles/import/{job_id}", response_model=schemas.CandleImportStatus, tags=["Data"])
+def get_candle_import_status(job_id: str):
+    job = candle_import.get_import_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job_id, **job}
+
+@app.get("/api/candles/freshness", response_model=List[schemas.SeriesFreshness], tags=["Data"])
+def get_candle_freshness():
+    """ক্যাশ ওয়ার্মারের ওয়াচলিস্টের প্রতিটি সিরিজ কতটা হালনাগাদ।"""
+    return cache_warmer.freshness()
+
+@app.post("/api/candles/watchlist", response_model=schemas.ResponseMessage, tags=["Data"])
+def add_watchlist_series(series: schemas.WatchlistSeries):
+    if series.exchange.lower() not in SUPPORTED_EXCHANGES:
+        raise HTTPException(status_code=400, detail=f"The exchange '{series.exchange}' is not supported.")
+    cache_warmer.add(series.exchange, series.symbol, series.timeframe)
+    cache_warmer.start()
+    return {"message": f"{series.symbol} {series.timeframe} on {series.exchange} is now kept warm."}
+
+@app.delete("/api/candles/watchlist", response_model=schemas.ResponseMessage, tags=["Data"])
+def remove_watchlist_series(exchange: str, symbol: str, timeframe: str):
+    if not cache_warmer.remove(exchange, symbol, timeframe):
+        raise HTTPException(status_code=404, detail="Series is not on the watchlist")
+    return {"message": f"{symbol} {timeframe} on {exchange} was removed from the watchlist."}
+
+# --- Observability ---
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Observability"], include_in_schema=False)
+def get_metrics():
+    """Prometheus টেক্সট ফরম্যাটে কাউন্টার, টাইমার এবং গেজগুলো।"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 # --- Optimization Endpoints ---
 @app.post("/api/optimizer/start", response_model=Dict[str, str], tags=["Optimizer"])
 def start_optimization(request: schemas.OptimizerRequest, background_tasks: BackgroundTasks):
@@ -171,15 +513,39 @@ def start_optimization(request: schemas.OptimizerRequest, background_tasks: Back
         job_id = optimizer_engine.start_optimization_job(background_tasks, request.dict())
         return {"job_id": job_id}
     except Exception as e:
-        traceback.print_exc()
+        metrics.inc("errors_total", component="optimizer")
+        logger.exception("Failed to start optimization job")
         raise HTTPException(status_code=500, detail=f"Failed to start optimization job: {e}")
 
+@app.post("/api/optimizer/resume/{job_id}", response_model=schemas.JobStatus, tags=["Optimizer"])
+async def resume_optimization(job_id: str):
+    """অসম্পূর্ণ বা ব্যর্থ জব শেষ চেকপয়েন্ট থেকে আবার চালায়; শেষ হওয়া কম্বিনেশন আর চলে না।"""
+    try:
+        job = await optimizer_engine.resume_optimization_job(job_id)
+    except optimizer_engine.JobNotResumable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 @app.get("/api/optimizer/status/{job_id}", response_model=schemas.JobStatus, tags=["Optimizer"])
 def get_optimization_status(job_id: str):
-    job = optimizer_engine.JOBS_DB.get(job_id)
+    job = optimizer_engine.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     # job is a dict, so we must add job_id to it for it to match the schema
     response_data = job.copy()
     response_data['job_id'] = job_id
-    return response_data
\ No newline at end of file
+    return response_data
+
+@app.get("/api/optimizer/results/{job_id}", response_model=schemas.OptimizationResult, tags=["Optimizer"])
+def get_optimization_results(job_id: str, http_request: Request):
+    job = optimizer_engine.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    payload = {"job_id": job_id, **{key: job.get(key) for key in
+               ("status", "progress", "total_runs", "active_workers", "error", "results")}}
+    return response_encoding.encoded_response(
+        http_request, payload, endpoint="optimizer_results",
+        columnar=lambda: response_encoding.optimizer_columns(payload),
+    )
\ No newline at end of file
@@ -0,0 +1,227 @@
+# app/optimizer_worker.py
+#
+# অপটিমাইজার ওয়ার্কার: ব্রোকার থেকে প্যারামিটার কম্বিনেশনের ব্যাচ নিয়ে ব্যাকটেস্ট চালায় এবং ফলাফল ফেরত দেয়।
+# API সার্ভারের লোকাল ওয়ার্কারদের পাশাপাশি একই মেশিনে আলাদা প্রসেস হিসেবে চালানো যায়:
+#
+#   python -m app.optimizer_worker --broker cache/optimizer_broker.db --processes 8
+#
+# SqliteBroker WAL মোডে চলে, যা শুধু একটি হোস্টের শেয়ার্ড মেমরিতে কাজ করে; NFS/SMB-এর মতো নেটওয়ার্ক
+# ফোল্ডারে ব্রোকার ফাইল রাখা নিরাপদ নয়। অন্য মেশিনের ওয়ার্কারদের জন্য OptimizerBroker-এর একটি
+# নেটওয়ার্ক ইমপ্লিমেন্টেশন (যেমন Redis) লাগবে।
+#
+# ওয়ার্কার মারা গেলে তার হার্টবিট বন্ধ হয়, লিজের মেয়াদ শেষ হয় এবং ব্যাচটি অন্য ওয়ার্কার পায়।
+# শেষ হওয়া কম্বিনেশনগুলো নিয়মিত চেকপয়েন্ট করা হয়, তাই অন্য ওয়ার্কার শুধু বাকিগুলো চালায়।
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from . import config
+from .services import candle_store, monte_carlo, strategy_sandbox
+from .services.optimizer_broker import BatchLease, OptimizerBroker, SqliteBroker, new_worker_id
+from .services.strategy_manager import is_user_strategy
+from .services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# এই প্রসেসে শেষবার লোড করা ডেটাসেট (একই জবের পরের ব্যাচগুলো আবার পড়ে না)
+_dataset_cache: Dict[str, Any] = {"key": None, "spec": None, "df": None}
+
+# ==============================================================================
+#  ডেটাসেট লোড করা (Loading the job's dataset)
+# ==============================================================================
+
+def _candle_spec(job_spec: Dict[str, Any]) -> candle_store.CandleSpec:
+    start_ms, end_ms = candle_store.date_range_to_ms(
+        datetime.date.fromisoformat(str(job_spec["start_date"])),
+        datetime.date.fromisoformat(str(job_spec["end_date"])),
+    )
+    return candle_store.CandleSpec(job_spec["exchange_name"], job_spec["symbol"], job_spec["timeframe"], start_ms, end_ms)
+
+async def _ensure_local_candles(job_spec: Dict[str, Any]):
+    """এই মেশিনের ক্যান্ডেল স্টোরে ডেটা না থাকলে এক্সচেঞ্জ থেকে নিয়ে আসে।"""
+    import ccxt.async_support as ccxt_async
+    from .services.backtesting_engine import ensure_candles
+    from .services import request_scheduler
+
+    exchange = request_scheduler.attach(getattr(ccxt_async, job_spec["exchange_name"])({'aiohttp_kwargs': {'timeout': 30}}),
+                                        request_scheduler.BACKFILL)
+    try:
+        await ensure_candles(exchange, job_spec["symbol"], job_spec["timeframe"],
+                             datetime.date.fromisoformat(str(job_spec["start_date"])),
+                             datetime.date.fromisoformat(str(job_spec["end_date"])), source="optimizer")
+    finally:
+        await exchange.close()
+
+def _load_dataset(job_spec: Dict[str, Any]):
+    spec = _candle_spec(job_spec)
+    key = repr(spec)
+    if _dataset_cache["key"] != key:
+        if candle_store.missing_ranges(spec.exchange, spec.symbol, spec.timeframe, spec.start_ms, spec.end_ms):
+            asyncio.run(_ensure_local_candles(job_spec))
+        _dataset_cache.update(key=key, spec=spec, df=candle_store.read_candles(spec))
+    return _dataset_cache["spec"], _dataset_cache["df"]
+
+# ==============================================================================
+#  ব্যাচ চালানো (Evaluating a batch)
+# ==============================================================================
+
+def evaluate_batch(lease: BatchLease, checkpoint: Callable[[List[Dict[str, Any]]], bool] = None,
+                   checkpoint_seconds: float = None) -> List[Dict[str, Any]]:
+    """
+    ব্যাচের প্রতিটি কম্বিনেশনের জন্য ব্যাকটেস্ট চালিয়ে মূল মেট্রিক্সগুলো ফেরত দেয়। checkpoint দিলে
+    প্রতি checkpoint_seconds পরপর শেষ হওয়া ফলাফলগুলো তাকে দেওয়া হয় এবং শুধু বাকিগুলো ফেরত আসে;
+    checkpoint False দিলে (লিজ হারিয়ে গেছে) ব্যাচটি সেখানেই থামে।
+    """
+    from .services.backtesting_engine import TRADE_FEE_PERCENTAGE, simulate_backtest, simulate_backtest_from_store
+
+    strategy_name = lease.spec["strategy_name"]
+    spec, df = _load_dataset(lease.spec)
+    sandboxed = is_user_strategy(strategy_name)
+
+    checkpoint_seconds = config.OPTIMIZER_CHECKPOINT_SECONDS if checkpoint_seconds is None else checkpoint_seconds
+    last_checkpoint = time.monotonic()
+    results = []
+    for params in lease.combinations:
+        try:
+            if sandboxed:
+                # ব্যবহারকারীর স্ট্র্যাটেজি সবসময় সীমাবদ্ধ আলাদা প্রসেসে চলে
+                result = strategy_sandbox.run_isolated(simulate_backtest_from_store, (spec, strategy_name, params))
+            else:
+                result = simulate_backtest(df, strategy_name, params)
+            results.append({"params": params, "metrics": {
+                "total_return": result.total_return,
+                "win_rate": result.win_rate,
+                "max_drawdown": result.max_drawdown,
+                # কোঅর্ডিনেটর সেরা ফলাফলগুলোর মন্টে কার্লো বিশ্লেষণে এগুলো ব্যবহার করে
+                "trade_returns": [round(r, 6) for r in
+                                  monte_carlo.trade_returns_from_logs(result.trade_logs, TRADE_FEE_PERCENTAGE)],
+            }})
+        except Exception as e:
+            # একটি রান ব্যর্থ হলে ব্যাচের বাকি রানগুলো চলবে
+            results.append({"params": params, "error": str(e)})
+        if checkpoint is not None and time.monotonic() - last_checkpoint >= checkpoint_seconds:
+            if not checkpoint(results):
+                break
+            results = []
+            last_checkpoint = time.monotonic()
+    return results
+
+
+class _Heartbeat(threading.Thread):
+    """ব্যাচ চলার সময় নিয়মিত লিজের মেয়াদ বাড়ায়।"""
+
+    def __init__(self, broker: OptimizerBroker, lease: BatchLease, lease_seconds: float):
+        super().__init__(daemon=True)
+        self.broker = broker
+        self.lease = lease
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stopped.wait(self.lease_seconds / 3):
+            if not self.broker.heartbeat(self.lease.batch_id, self.lease.worker_id, self.lease_seconds):
+                self.lost = True
+                return
+
+
+def run_worker(broker: OptimizerBroker, worker_id: str = None, job_id: str = None,
+               exit_when_idle: bool = False, poll_interval: float = 2.0, lease_seconds: float = None) -> int:
+    """
+    ব্রোকার থেকে ব্যাচ নিয়ে চালানোর মূল লুপ। job_id দিলে শুধু সেই জবের ব্যাচ নেয়।
+    exit_when_idle হলে কাজ শেষ হলেই ফেরত আসে। সম্পন্ন ব্যাচের সংখ্যা ফেরত দেয়।
+    """
+    worker_id = worker_id or new_worker_id()
+    lease_seconds = lease_seconds or config.OPTIMIZER_LEASE_SECONDS
+    completed = 0
+    logger.info("🛠️ Optimizer worker %s started.", worker_id)
+
+    while True:
+        lease = broker.lease_batch(worker_id, lease_seconds, job_id=job_id)
+        if lease is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        heartbeat = _Heartbeat(broker, lease, lease_seconds)
+        heartbeat.start()
+        # ব্রোকারে ইতিমধ্যে জমা দেওয়া (চেকপয়েন্ট করা) কম্বিনেশনগুলো
+        submitted = set()
+
+        def checkpoint(partial: List[Dict[str, Any]]) -> bool:
+            accepted = broker.checkpoint_batch(lease.batch_id, worker_id, partial)
+            if accepted:
+                submitted.update(json.dumps(item["params"], sort_keys=True) for item in partial)
+            return accepted
+
+        try:
+            results = evaluate_batch(lease, checkpoint)
+        except Exception as e:
+            # ডেটাসেট লোড বা চেকপয়েন্ট করা না গেলে বাকি কম্বিনেশনগুলোর জন্য এরর রিপোর্ট করা হয়;
+            # আগে জমা দেওয়াগুলোর আবার সারি যোগ হলে ফলাফল দুবার গোনা হত
+            metrics.inc("errors_total", component="optimizer_worker")
+            logger.exception("Could not evaluate batch %s", lease.batch_id)
+            results = [{"params": params, "error": str(e)} for params in lease.combinations
+                       if json.dumps(params, sort_keys=True) not in submitted]
+        finally:
+            heartbeat.stopped.set()
+            heartbeat.join()
+
+        if broker.complete_batch(lease.batch_id, worker_id, results):
+            completed += 1
+        else:
+            logger.warning("⚠️ Lease for batch %s was lost; results discarded.", lease.batch_id)
+
+    logger.info("🛠️ Optimizer worker %s finished %s batches.", worker_id, completed)
+    return completed
+
+
+def drain_job(broker_path: str, job_id: str) -> int:
+    """API সার্ভারের প্রসেস পুলে চলে: একটি জবের ব্যাচ শেষ না হওয়া পর্যন্ত কাজ করে।"""
+    return run_worker(SqliteBroker(broker_path), job_id=job_id, exit_when_idle=True)
+
+
+def _worker_process(broker_path: str, exit_when_idle: bool, poll_interval: float, lease_seconds: Optional[float]):
+    config.configure_logging()
+    run_worker(SqliteBroker(broker_path), exit_when_idle=exit_when_idle,
+               poll_interval=poll_interval, lease_seconds=lease_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zenith optimizer worker")
+    parser.add_argument("--broker", default=config.OPTIMIZER_BROKER_PATH, help="Path to the broker SQLite file")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes to run")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when there is no work")
+    parser.add_argument("--lease-seconds", type=float, default=None, help="Lease length (default from config)")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Exit once the broker has no pending batches")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _worker_process(args.broker, args.exit_when_idle, args.poll_interval, args.lease_seconds)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_worker_process, args=(args.broker, args.exit_when_idle, args.poll_interval, args.lease_seconds))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
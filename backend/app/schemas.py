@@ -16,17 +16,54 @@ class Trade(BaseModel):
     amount: float
     price: float
     timestamp: datetime.datetime
+    pnl: Optional[float] = 0.0
 
     class Config:
         from_attributes = True
 
 
+class OpenPosition(BaseModel):
+    """ FIFO লেজার থেকে একটি সিম্বলের খোলা পজিশন এবং আনরিয়ালাইজড PnL """
+    symbol: str
+    amount: float
+    avg_entry_price: float
+    cost_basis: float
+    mark_price: float
+    unrealized_pnl: float
+    lots: int = Field(..., description="Number of open FIFO lots")
+
+
+class TradeAggregateBucket(BaseModel):
+    """ ঘণ্টা বা দিন ভিত্তিক ট্রেড ভলিউম এবং PnL-এর একটি বাকেট (SQL-এ গণনা করা) """
+    bucket: str = Field(..., description="Bucket label, e.g. '2024-01-31' or '2024-01-31 14:00'")
+    trade_count: int
+    volume: float = Field(..., description="Sum of traded amounts in the bucket")
+    notional: float = Field(..., description="Sum of amount * price in the bucket")
+    pnl: float = Field(..., description="Sum of realized PnL in the bucket")
+
+
+class PerformanceBreakdown(BaseModel):
+    """ একটি সিম্বল বা স্ট্র্যাটেজির জন্য আলাদা পারফরম্যান্স হিসাব """
+    key: str
+    realized_pnl: float
+    trade_count: int
+    wins: int
+    losses: int
+    win_rate: float
+    volume: float
+
+
 class PerformanceStats(BaseModel):
     """ ড্যাশবোর্ডের পারফরম্যান্স মেট্রিক্স প্রদর্শনের জন্য """
     total_pnl: float
     spot_pnl: float
     futures_pnl: float
     win_rate: float
+    total_trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    by_symbol: List[PerformanceBreakdown] = []
+    by_strategy: List[PerformanceBreakdown] = []
 
 
 class ApiKeyTestRequest(BaseModel):
@@ -94,6 +131,252 @@ class BacktestResult(BaseModel):
     trade_logs: List[TradeLog] = Field(..., description="A log of all simulated BUY/SELL trades for marking the chart")
 
 
+class ComparisonEntry(BaseModel):
+    """ তুলনায় একটি স্ট্র্যাটেজি এবং তার প্যারামিটার। """
+    strategy_name: str
+    strategy_params: Dict[str, Any] = Field(default_factory=dict)
+    label: Optional[str] = Field(None, description="Column label; defaults to the strategy name and parameters")
+
+
+class ComparisonRequest(BaseModel):
+    """ একটি ডেটাসেট এবং তার উপর পাশাপাশি চালানোর জন্য স্ট্র্যাটেজির তালিকা। """
+    exchange_name: str
+    symbol: str
+    timeframe: str
+    start_date: datetime.date
+    end_date: datetime.date
+    strategies: List[ComparisonEntry] = Field(..., min_length=1)
+
+
+class ComparisonRow(BaseModel):
+    """ তুলনা টেবিলের একটি সারি; equity[i] হলো price_history[i]-এর ক্যান্ডেলে পোর্টফোলিও ভ্যালু। """
+    label: str
+    strategy_name: str
+    strategy_params: Dict[str, Any]
+    total_return: Optional[float] = None
+    win_rate: Optional[float] = None
+    max_drawdown: Optional[float] = None
+    sharpe_ratio: Optional[float] = None
+    total_trades: Optional[int] = None
+    final_value: Optional[float] = None
+    equity: List[float] = Field(default_factory=list)
+    trade_logs: List[TradeLog] = Field(default_factory=list)
+    error: Optional[str] = Field(None, description="Why this strategy could not be run; the other rows are unaffected")
+
+
+class ComparisonResult(BaseModel):
+    """ একাধিক স্ট্র্যাটেজির ফলাফল; প্রাইস হিস্টোরি একবারই থাকে এবং সব ইকুইটি কার্ভের টাইম ইনডেক্স। """
+    price_history: List[CandleData]
+    strategies: List[ComparisonRow]
+
+
+class StreamingBacktestResult(BaseModel):
+    """
+    স্ট্রিমিং ব্যাকটেস্টের সারাংশ। পূর্ণ ইকুইটি কার্ভ এবং ট্রেডগুলো ডিস্কে থাকে এবং run_id দিয়ে
+    /api/backtest/stream/{run_id}/equity ও /trades থেকে Arrow IPC স্ট্রিম হিসেবে পাওয়া যায়।
+    """
+    run_id: str
+    total_return: float
+    win_rate: float
+    max_drawdown: float
+    sharpe_ratio: float
+    total_trades: int
+    bars: int = Field(..., description="Number of candles simulated")
+    warmup_bars: int = Field(..., description="Lookback window passed to the strategy for each signal")
+    incremental: bool = Field(False, description="Strategy carried its indicator state across candles (exact match with the full backtest)")
+    equity_preview: List[BacktestResultHistory] = Field(..., description="Down-sampled equity curve for charting")
+
+
+# ------------------------------------------------------------------------------
+#  লাইভ বট রিপ্লে স্কিমা (Schemas for Replaying the Live Bot)
+# ------------------------------------------------------------------------------
+
+class ReplayRequest(BacktestRequest):
+    """ ক্যাশ করা ক্যান্ডেলের উপর লাইভ বটের কোড পাথ চালিয়ে ব্যাকটেস্টারের সাথে মেলানোর অনুরোধ। """
+    trade_amount: float = Field(0.001, gt=0, description="Order size the live bot would use")
+    paper_trading: bool = Field(False, description="Place the bot's orders on a fresh paper exchange account")
+
+
+class ReplayMismatch(BaseModel):
+    timestamp: datetime.datetime = Field(..., description="Candle on which the signals differ")
+    live: Optional[str] = Field(None, description="Signal from the live bot loop (null if it produced none)")
+    backtest: str = Field(..., description="Signal from the backtester")
+
+
+class ReplayReport(BaseModel):
+    """ লাইভ/ব্যাকটেস্ট সিগন্যাল প্যারিটি এবং লাইভ লুপের থ্রুপুট। """
+    candles: int
+    live_cycles: int = Field(..., description="Live loop iterations that produced a signal")
+    live_seconds: float
+    cycles_per_second: float
+    backtest_seconds: float
+    compared: int
+    matching: int
+    match_rate: float = Field(..., description="Percentage of candles where both produced the same signal")
+    parity: bool
+    mismatches: List[ReplayMismatch] = Field(..., description="The first differing candles")
+    live_orders: int = Field(..., description="Trades the live loop recorded (filled orders in paper mode)")
+    backtest_trades: int = Field(..., description="Round trips the backtester executed")
+    paper_balance: Optional[Dict[str, float]] = Field(None, description="Final paper account balances in paper mode")
+
+
+class PaperAccount(BaseModel):
+    """ একটি পেপার ট্রেডিং অ্যাকাউন্টের ব্যালেন্স, খোলা অর্ডার এবং সাম্প্রতিক ফিল। """
+    exchange: str
+    free: Dict[str, float]
+    used: Dict[str, float]
+    total: Dict[str, float]
+    open_orders: List[Dict[str, Any]]
+    recent_trades: List[Dict[str, Any]]
+
+
+class ExchangeSchedulerStatus(BaseModel):
+    """ একটি এক্সচেঞ্জের রিকোয়েস্ট শিডিউলার: token bucket এবং অগ্রাধিকার অনুযায়ী কিউ ও খরচ হওয়া weight। """
+    exchange: str
+    rate_per_second: float = Field(..., description="Rate-limit weight refilled per second")
+    capacity: float
+    tokens: float
+    queued: Dict[str, int] = Field(..., description="Requests waiting, by priority (live, interactive, backfill)")
+    granted: Dict[str, int]
+    weight: Dict[str, float]
+
+
+class OrderRouterLane(BaseModel):
+    """ অর্ডার রাউটারে একটি এক্সচেঞ্জের কিউ, কাউন্টার এবং সিগন্যাল থেকে ack পর্যন্ত latency। """
+    exchange: str
+    queued: int
+    in_flight: int
+    tracking: int = Field(..., description="Acknowledged orders still being polled for fills")
+    batch_size: int = Field(..., description="Orders per request (1 when the exchange has no batch endpoint)")
+    rate_per_second: float
+    submitted: int
+    acked: int
+    filled: int
+    rejected: int
+    canceled: int
+    batches: int
+    signal_to_ack_p50_ms: Optional[float]
+    signal_to_ack_p95_ms: Optional[float]
+
+
+class RoutedOrder(BaseModel):
+    """ রাউটারের মধ্য দিয়ে যাওয়া একটি অর্ডার, তার ফিল এবং আমাদের পাইপলাইনের কারণে হওয়া দেরি ও slippage। """
+    id: str
+    exchange: str
+    symbol: str
+    type: str
+    side: str
+    amount: float
+    price: Optional[float]
+    bot_id: Optional[str]
+    status: str = Field(..., description="queued, submitted, acked, filled, partially_filled, canceled or rejected")
+    exchange_order_id: Optional[str]
+    filled: float
+    average: Optional[float]
+    reference_price: Optional[float] = Field(None, description="Close of the candle the signal was generated on")
+    slippage_bps: Optional[float] = Field(None, description="Fill price versus reference price; positive is worse for us")
+    error: Optional[str]
+    batched: bool
+    created_at: float
+    queue_ms: Optional[float] = Field(None, description="Time spent waiting for a rate-budget token and a free slot")
+    signal_to_ack_ms: Optional[float]
+    signal_to_fill_ms: Optional[float]
+
+
+# ==============================================================================
+#  মন্টে কার্লো স্কিমা (Schemas for Monte Carlo Robustness Analysis)
+# ==============================================================================
+
+class MonteCarloRequest(BaseModel):
+    """
+    একটি সম্পন্ন ব্যাকটেস্টের ট্রেড রিটার্ন, অথবা তার trade_logs (যেখান থেকে রিটার্ন বের করা হবে)।
+    """
+    trade_returns: Optional[List[float]] = Field(None, description="Per-trade fractional returns, e.g. 0.05 for +5%")
+    trade_logs: Optional[List[TradeLog]] = Field(None, description="BUY/SELL logs from a BacktestResult; used when trade_returns is omitted")
+    paths: int = Field(10000, ge=1, le=100000, description="Number of simulated trade sequences")
+    method: str = Field("bootstrap", description="'bootstrap' (resample with replacement) or 'shuffle' (reorder)")
+    seed: Optional[int] = Field(None, description="Random seed for reproducible results")
+
+
+class MonteCarloHistogram(BaseModel):
+    """ একটি ডিস্ট্রিবিউশনের হিস্টোগ্রাম (len(bin_edges) == len(counts) + 1)। """
+    bin_edges: List[float]
+    counts: List[int]
+
+
+class MonteCarloSummary(BaseModel):
+    """ সিমুলেটেড পাথগুলোর মোট রিটার্ন এবং সর্বোচ্চ ড্র-ডাউনের পার্সেন্টাইল (শতাংশে)। """
+    method: str
+    paths: int
+    trades: int = Field(..., description="Number of closed trades that were resampled")
+    mean_return: float
+    probability_of_loss: float = Field(..., description="Fraction of paths that ended with a negative return")
+    return_percentiles: Dict[str, float] = Field(..., description="Total return percentiles, e.g. {'p5': -3.1, 'p50': 12.4}")
+    max_drawdown_percentiles: Dict[str, float] = Field(..., description="Max drawdown percentiles; p5 is the worst 5% boundary")
+
+
+class MonteCarloResult(MonteCarloSummary):
+    """ API থেকে পাঠানো সম্পূর্ণ ফলাফল, ডিস্ট্রিবিউশনের হিস্টোগ্রামসহ। """
+    return_distribution: MonteCarloHistogram
+    max_drawdown_distribution: MonteCarloHistogram
+
+
+# ==============================================================================
+#  ক্যান্ডেল ইম্পোর্ট স্কিমা (Schemas for Offline Candle Import)
+# ==============================================================================
+
+class CandleImportRequest(BaseModel):
+    """ CANDLE_IMPORT_ROOT ফোল্ডারের ভেতরের CSV/zip/parquet ফাইল বা ফোল্ডার ক্যান্ডেল স্টোরে ইম্পোর্ট করার অনুরোধ। """
+    exchange: str = Field(..., description="The exchange the candles belong to, e.g., 'binance'")
+    symbol: str = Field(..., description="The trading symbol, e.g., 'BTC/USDT'")
+    timeframe: str = Field(..., description="The timeframe of the candles in the files, e.g., '1h'")
+    paths: List[str] = Field(..., min_length=1, description="Files or folders relative to the import folder, e.g. 'binance/BTCUSDT-1h'")
+
+
+class CandleImportFileError(BaseModel):
+    file: str
+    error: str
+
+
+class CandleImportStatus(BaseModel):
+    """ একটি ইম্পোর্ট জবের অবস্থা এবং (শেষ হলে) সারাংশ। """
+    job_id: str
+    status: str = Field(..., description="Current status: pending, running, completed, or failed")
+    exchange: str
+    symbol: str
+    timeframe: str
+    files: int = Field(..., description="Number of dump files found")
+    imported_files: int
+    rows: int = Field(..., description="Candles read from the files after de-duplication")
+    errors: List[CandleImportFileError] = Field(..., description="Files that could not be parsed")
+    covered: List[List[int]] = Field(..., description="Cached [start_ms, end_ms) ranges for the series after the import")
+    seconds: Optional[float] = None
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+
+
+# ------------------------------------------------------------------------------
+#  ক্যাশ ওয়ার্মার স্কিমা (Schemas for the Cache Warmer Watchlist)
+# ------------------------------------------------------------------------------
+
+class WatchlistSeries(BaseModel):
+    """ ক্যাশ ওয়ার্মারের ওয়াচলিস্টে থাকা একটি সিরিজ। """
+    exchange: str = Field(..., description="The exchange, e.g., 'binance'")
+    symbol: str = Field(..., description="The trading symbol, e.g., 'BTC/USDT'")
+    timeframe: str = Field(..., description="The timeframe, e.g., '1h'")
+
+
+class SeriesFreshness(WatchlistSeries):
+    """ একটি ওয়াচলিস্ট সিরিজ ক্যান্ডেল স্টোরে কতটা হালনাগাদ। """
+    fresh: bool = Field(..., description="True when every closed candle up to now is in the candle store")
+    covered_until_ms: Optional[int] = Field(None, description="End of the newest cached range (exclusive)")
+    lag_seconds: Optional[float] = Field(None, description="Seconds between now and covered_until_ms")
+    history_start_ms: Optional[int] = Field(None, description="Start of the contiguous cached range ending at covered_until_ms")
+    backfill_complete: bool
+    last_topup_at: Optional[float] = Field(None, description="Unix time of the last successful top-up")
+    next_topup_ms: Optional[int] = None
+    last_error: Optional[str] = None
+
+
 # ==============================================================================
 #  ধাপ ১৩.খ (নতুন): অপটিমাইজেশন স্কিমা (Schemas for Optimization Engine)
 # ==============================================================================
@@ -119,6 +402,7 @@ class OptimizerRequest(BaseModel):
     start_date: datetime.date
     end_date: datetime.date
     strategy_params_range: Dict[str, ParamRange]
+    reuse_cached: bool = Field(True, description="Reuse results of combinations already evaluated by earlier jobs on the same strategy code and data")
 
 
 # ------------------------------------------------------------------------------
@@ -131,6 +415,7 @@ class OptimizationResultItem(BaseModel):
     total_return: float
     win_rate: float
     max_drawdown: float
+    robustness: Optional[MonteCarloSummary] = Field(None, description="Monte Carlo analysis, computed for the top-ranked results only")
 
 
 class JobStatus(BaseModel):
@@ -139,6 +424,8 @@ class JobStatus(BaseModel):
     status: str = Field(..., description="Current status: pending, running, completed, or failed")
     progress: int = Field(..., description="Number of backtests completed")
     total_runs: int = Field(..., description="Total number of backtests to run")
+    active_workers: Optional[int] = Field(None, description="Workers currently holding a lease on this job")
+    reused_runs: Optional[int] = Field(None, description="Combinations answered from earlier jobs instead of being run again")
     error: Optional[str] = Field(None, description="Error message if the job failed")
 
 
@@ -151,6 +438,22 @@ class OptimizationResult(JobStatus):
 #  সাধারণ এবং স্ট্যাটাস স্কিমা (General & Status Schemas)
 # ==============================================================================
 
+class BacktestQueueStatus(BaseModel):
+    """ ব্যাকটেস্ট ওয়ার্কার পুল এবং অ্যাডমিশন কিউয়ের বর্তমান অবস্থা। """
+    workers: int
+    running: int
+    queued: int = Field(..., description="Backtests admitted and waiting for a worker slot")
+    max_pending: int
+    per_client_limit: int
+    active_clients: int
+    completed: int
+    failed: int
+    rejected: int = Field(..., description="Requests refused with 429 because the queue was saturated")
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_run_ms: float
+
+
 class BotStatus(BaseModel):
     """ বটের বর্তমান অবস্থা জানানোর জন্য একটি স্ট্যান্ডার্ড মডেল। """
     is_running: bool
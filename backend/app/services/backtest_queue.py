@@ -0,0 +1,194 @@
+# app/services/backtest_queue.py
+
+import asyncio
+import os
+import time
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .. import config
+from .metrics import metrics, call_with_metrics
+
+# ==============================================================================
+#  CPU-নির্ভর কাজের জন্য শেয়ার করা ওয়ার্কার প্রসেস পুল
+# ==============================================================================
+
+_worker_pool: Optional[ProcessPoolExecutor] = None
+_optimizer_pool: Optional[ProcessPoolExecutor] = None
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """প্রথমবার প্রয়োজনের সময় ব্যাকটেস্টের জন্য একটি spawn-ভিত্তিক প্রসেস পুল তৈরি করে।"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = ProcessPoolExecutor(
+            max_workers=config.BACKTEST_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _worker_pool
+
+def _lower_priority():
+    # অপটিমাইজার প্রসেসগুলো কম অগ্রাধিকারে চলে, যাতে CPU-তে ইন্টারঅ্যাকটিভ ব্যাকটেস্ট আগে সুযোগ পায়
+    if config.OPTIMIZER_WORKER_NICE and hasattr(os, "nice"):
+        os.nice(config.OPTIMIZER_WORKER_NICE)
+
+def get_optimizer_pool() -> ProcessPoolExecutor:
+    """
+    লোকাল অপটিমাইজার ওয়ার্কারদের আলাদা পুল। একটি drain_job পুরো জব শেষ না হওয়া পর্যন্ত (কয়েক ঘণ্টাও
+    হতে পারে) একটি প্রসেস দখল করে রাখে; ব্যাকটেস্ট পুলে চললে ব্যাকটেস্ট আর তুলনা ততক্ষণ আটকে থাকত।
+    """
+    global _optimizer_pool
+    if _optimizer_pool is None:
+        _optimizer_pool = ProcessPoolExecutor(
+            max_workers=max(1, config.OPTIMIZER_LOCAL_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_lower_priority,
+        )
+    return _optimizer_pool
+
+async def _run_in_pool(pool: ProcessPoolExecutor, func: Callable, *args) -> Any:
+    loop = asyncio.get_running_loop()
+    result, snapshot = await loop.run_in_executor(pool, call_with_metrics, func, *args)
+    # ওয়ার্কারে রেকর্ড হওয়া টাইমার/কাউন্টারগুলো এই প্রসেসের রেজিস্ট্রিতে যোগ করা
+    metrics.merge(snapshot)
+    return result
+
+async def run_in_worker(func: Callable, *args) -> Any:
+    """একটি সিঙ্ক্রোনাস, pickle-যোগ্য ফাংশন ওয়ার্কার পুলে চালায়; ইভেন্ট লুপ মুক্ত থাকে।"""
+    return await _run_in_pool(get_worker_pool(), func, *args)
+
+async def run_in_optimizer_worker(func: Callable, *args) -> Any:
+    """run_in_worker-এর মতো, কিন্তু অপটিমাইজারের নিজস্ব পুলে।"""
+    return await _run_in_pool(get_optimizer_pool(), func, *args)
+
+def shutdown_worker_pool():
+    global _worker_pool, _optimizer_pool
+    for pool in (_worker_pool, _optimizer_pool):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    _worker_pool = _optimizer_pool = None
+
+# ==============================================================================
+#  অ্যাডমিশন কিউ (Bounded admission queue)
+# ==============================================================================
+
+class QueueSaturated(Exception):
+    """কিউ পূর্ণ বা ক্লায়েন্ট তার সীমায় পৌঁছেছে; API এটিকে 429 হিসেবে ফেরত দেয়।"""
+
+    def __init__(self, message: str, retry_after: int = 5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BacktestJobQueue:
+    """
+    ব্যাকটেস্ট অনুরোধগুলোর জন্য একটি সীমিত অ্যাডমিশন কিউ।
+    সর্বোচ্চ `max_workers`টি জব একসাথে চলে, বাকিরা সর্বোচ্চ `max_pending` পর্যন্ত অপেক্ষা করে,
+    এবং একজন ক্লায়েন্টের একসাথে `per_client_limit`-এর বেশি জব থাকতে পারে না।
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, per_client_limit: int = None):
+        self.max_workers = max_workers or config.BACKTEST_WORKERS
+        self.max_pending = max_pending or config.BACKTEST_MAX_PENDING
+        self.per_client_limit = per_client_limit or config.BACKTEST_PER_CLIENT_LIMIT
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._per_client: Dict[str, int] = defaultdict(int)
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphore চলমান ইভেন্ট লুপের সাথে তৈরি হওয়া উচিত, তাই অলসভাবে তৈরি করা
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    def _estimated_wait_seconds(self) -> int:
+        finished = self.completed + self.failed
+        avg_run = self._total_run / finished if finished else 5.0
+        return max(1, int(avg_run * (self.queued + 1) / self.max_workers))
+
+    async def run(self, client_id: str, job: Callable[[], Awaitable[Any]]):
+        """
+        জবটি কিউতে ভর্তি করে, একটি ওয়ার্কার স্লট পাওয়া পর্যন্ত অপেক্ষা করে এবং চালায়।
+        (ফলাফল, কিউতে অপেক্ষার সেকেন্ড) ফেরত দেয়। সম্পৃক্ত হলে QueueSaturated দেয়।
+        """
+        if self.queued + self.running >= self.max_workers + self.max_pending:
+            self.rejected += 1
+            raise QueueSaturated(
+                f"Backtest queue is full ({self.queued} queued, {self.running} running). Try again later.",
+                retry_after=self._estimated_wait_seconds(),
+            )
+        if self._per_client[client_id] >= self.per_client_limit:
+            self.rejected += 1
+            raise QueueSaturated(
+                f"Too many concurrent backtests for this client (limit {self.per_client_limit}).",
+                retry_after=self._estimated_wait_seconds(),
+            )
+
+        self._per_client[client_id] += 1
+        self.queued += 1
+        enqueued_at = time.monotonic()
+        slots = self._get_slots()
+        try:
+            await slots.acquire()
+        except BaseException:
+            self.queued -= 1
+            self._release_client(client_id)
+            raise
+
+        waited = time.monotonic() - enqueued_at
+        self.queued -= 1
+        self.running += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        started_at = time.monotonic()
+        try:
+            result = await job()
+            self.completed += 1
+            return result, waited
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self._total_run += time.monotonic() - started_at
+            self.running -= 1
+            slots.release()
+            self._release_client(client_id)
+
+    def _release_client(self, client_id: str):
+        self._per_client[client_id] -= 1
+        if self._per_client[client_id] <= 0:
+            del self._per_client[client_id]
+
+    def stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "max_pending": self.max_pending,
+            "per_client_limit": self.per_client_limit,
+            "active_clients": len(self._per_client),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self._total_wait / finished * 1000, 1) if finished else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 1),
+            "avg_run_ms": round(self._total_run / finished * 1000, 1) if finished else 0.0,
+        }
+
+
+# API জুড়ে একটিমাত্র শেয়ার করা কিউ
+backtest_queue = BacktestJobQueue()
+metrics.register_gauge(lambda: {
+    "backtest_queue_running": backtest_queue.running,
+    "backtest_queue_queued": backtest_queue.queued,
+    "backtest_queue_rejected": backtest_queue.rejected,
+})
@@ -1,77 +1,146 @@
 # app/services/backtesting_engine.py (ক্যাশিং, টাইমআউট এবং ডাইনামিক প্যারামিটার সমাধানসহ চূড়ান্ত সংস্করণ)
 
+from __future__ import annotations
+
 import datetime
+import logging
 import os
-import pandas as pd
-import ccxt.async_support as ccxt_async
+import time
+import uuid
+import shutil
 import asyncio
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Tuple
 
 # আমাদের প্রজেক্টের মডিউলগুলো ইম্পোর্ট করা
-from .. import schemas
-from .strategy_manager import load_strategy_dynamically
+from .. import schemas, config
+from ..lazy_imports import lazy_import
+from .strategy_manager import load_strategy_dynamically, is_user_strategy
+from . import strategy_sandbox
+from .backtest_queue import run_in_worker
+from .result_cache import result_cache, make_result_key, canonical_params
+from . import candle_store, request_scheduler
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+pd = lazy_import("pandas")
+ccxt_async = lazy_import("ccxt.async_support")
+pa = lazy_import("pyarrow")
 
 # --- কনফিগারেশন ---
 INITIAL_CASH = 10000.0
 TRADE_FEE_PERCENTAGE = 0.1
-CACHE_DIR = "cache"
+CACHE_DIR = config.CACHE_DIR
 
 # ==============================================================================
 #  ডেটা আনা এবং ক্যাশিং ফাংশন (Data Fetching and Caching Function)
 # ==============================================================================
 
-async def fetch_historical_data(exchange, symbol: str, timeframe: str, start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+def _migrate_legacy_parquet(exchange_id: str, symbol: str, timeframe: str):
     """
-    ঐতিহাসিক ডেটা নিয়ে আসে। প্রথমে লোকাল ক্যাশ থেকে লোড করার চেষ্টা করে।
-    যদি ক্যাশে না পাওয়া যায়, তবে এক্সচেঞ্জ থেকে এনে .parquet ফাইল হিসেবে ক্যাশে সেভ করে।
+    পুরনো রেঞ্জভিত্তিক .parquet ক্যাশ ফাইলগুলো ক্যান্ডেল স্টোরে স্থানান্তর করে মুছে ফেলে,
+    যাতে আগে ডাউনলোড করা ডেটা আবার এক্সচেঞ্জ থেকে আনতে না হয়।
     """
-    symbol_filename = symbol.replace("/", "_")
-    cache_filename = f"{exchange.id}_{symbol_filename}_{timeframe}_{start_date}_to_{end_date}.parquet"
-    cache_filepath = os.path.join(CACHE_DIR, cache_filename)
-    os.makedirs(CACHE_DIR, exist_ok=True)
-
-    if os.path.exists(cache_filepath):
-        print(f"✅ Loading data from local cache: {cache_filename}")
+    prefix = f"{exchange_id}_{symbol.replace('/', '_')}_{timeframe}_"
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for filename in os.listdir(CACHE_DIR):
+        if not (filename.startswith(prefix) and filename.endswith(".parquet")):
+            continue
         try:
-            df = pd.read_parquet(cache_filepath)
-            return df
+            start_str, end_str = filename[len(prefix):-len(".parquet")].split("_to_")
+            start_ms, end_ms = candle_store.date_range_to_ms(datetime.date.fromisoformat(start_str),
+                                                             datetime.date.fromisoformat(end_str))
+            df = pd.read_parquet(os.path.join(CACHE_DIR, filename))
+            candle_store.write_candles(exchange_id, symbol, timeframe, df, start_ms, end_ms)
+            os.remove(os.path.join(CACHE_DIR, filename))
+            logger.info("📦 Migrated legacy cache file into candle store: %s", filename)
         except Exception as e:
-            print(f"⚠️ Warning: Could not read cache file '{cache_filename}'. Refetching data. Error: {e}")
+            logger.warning("⚠️ Could not migrate legacy cache file '%s'. Error: %s", filename, e)
 
-    print(f"⬇️ No cache found. Fetching data for {symbol} from {exchange.id}...")
-    
-    start_ts = int(datetime.datetime.combine(start_date, datetime.time.min).timestamp() * 1000)
-    end_ts = int(datetime.datetime.combine(end_date, datetime.time.max).timestamp() * 1000)
-    
+async def _fetch_range(exchange, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> pd.DataFrame:
+    """[start_ms, end_ms) রেঞ্জের ক্যান্ডেল এক্সচেঞ্জ থেকে পেজ করে নিয়ে আসে।"""
+    timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
     all_ohlcv = []
-    current_ts = start_ts
+    current_ts = start_ms
 
-    while current_ts < end_ts:
+    while current_ts < end_ms:
         try:
+            metrics.inc("exchange_requests_total", exchange=exchange.id, method="fetch_ohlcv")
             ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=current_ts, limit=500)
             if not ohlcv:
                 break
             all_ohlcv.extend(ohlcv)
-            current_ts = ohlcv[-1][0] + (exchange.parse_timeframe(timeframe) * 1000)
+            current_ts = ohlcv[-1][0] + timeframe_ms
         except Exception as e:
-            print(f"An error occurred while fetching data: {e}. Retrying...")
+            metrics.inc("exchange_errors_total", exchange=exchange.id, method="fetch_ohlcv")
+            logger.warning("An error occurred while fetching data: %s. Retrying...", e)
             await asyncio.sleep(3)
 
-    if not all_ohlcv:
-        return pd.DataFrame()
+    df = pd.DataFrame(all_ohlcv, columns=candle_store.CANDLE_COLUMNS)
+    return df[(df['timestamp'] >= start_ms) & (df['timestamp'] < end_ms)]
 
-    df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df = df[(df['timestamp'].dt.date >= start_date) & (df['timestamp'].dt.date <= end_date)]
-    
-    if not df.empty:
+async def ensure_candles(exchange, symbol: str, timeframe: str, start_date: datetime.date, end_date: datetime.date,
+                         source: str = "backtest") -> candle_store.CandleSpec:
+    """
+    অনুরোধ করা রেঞ্জের ক্যান্ডেলগুলো ক্যান্ডেল স্টোরে আছে কিনা নিশ্চিত করে।
+    স্টোরে না থাকা অংশ সম্ভব হলে ছোট টাইমফ্রেম থেকে রিস্যাম্পল করা হয়, বাকিটুকুই এক্সচেঞ্জ থেকে আনা হয়।
+    ডেটা নয়, একটি CandleSpec ফেরত দেয়, যা দিয়ে যেকোনো প্রসেস স্টোর থেকে পড়তে পারে।
+    source শুধু মেট্রিক্সের জন্য (ক্যাশ ওয়ার্মারের অনুরোধ ইন্টারেক্টিভ হিট রেটে গোনা হয় না)।
+    """
+    start_ms, end_ms = candle_store.date_range_to_ms(start_date, end_date)
+    spec = candle_store.CandleSpec(exchange.id, symbol, timeframe, start_ms, end_ms)
+
+    gaps = candle_store.missing_ranges(exchange.id, symbol, timeframe, start_ms, end_ms)
+    if gaps:
+        await asyncio.to_thread(_migrate_legacy_parquet, exchange.id, symbol, timeframe)
+        gaps = candle_store.missing_ranges(exchange.id, symbol, timeframe, start_ms, end_ms)
+    metrics.inc("candle_cache_requests_total", exchange=exchange.id, source=source, result="cold" if gaps else "warm")
+    if not gaps:
+        logger.debug("✅ Loading data from candle store: %s %s %s", exchange.id, symbol, timeframe)
+        return spec
+
+    # এখনো তৈরি হচ্ছে এমন ক্যান্ডেলকে কভারড হিসেবে চিহ্নিত করা হয় না, পরের বার আবার আনা হবে
+    now_ms = int(datetime.datetime.now(datetime.timezone.utc).timestamp() * 1000)
+    if candle_store.timeframe_to_ms(timeframe) is not None:
+        forming_candle_ms = candle_store.align_down(now_ms, timeframe)
+    else:
+        timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
+        forming_candle_ms = now_ms - now_ms % timeframe_ms
+
+    # বড় টাইমফ্রেম প্রথমে স্টোরে থাকা ছোট টাইমফ্রেমের ক্যান্ডেল থেকে তৈরি করার চেষ্টা করা হয়;
+    # base সিরিজ যে অংশ কভার করে না, শুধু সেটুকুই এক্সচেঞ্জ থেকে আনা হয়
+    resampled = False
+    for gap_start, gap_end in gaps:
+        if await asyncio.to_thread(candle_store.resample_into_store, exchange.id, symbol, timeframe,
+                                   gap_start, gap_end, forming_candle_ms):
+            resampled = True
+            metrics.inc("candles_resampled_total", exchange=exchange.id, timeframe=timeframe)
+            logger.info("🔁 Resampled %s %s candles locally within %s -> %s", symbol, timeframe,
+                        pd.to_datetime(gap_start, unit='ms'), pd.to_datetime(gap_end, unit='ms'))
+    if resampled:
+        gaps = candle_store.missing_ranges(exchange.id, symbol, timeframe, start_ms, end_ms)
+
+    for gap_start, gap_end in gaps:
+        logger.info("⬇️ Fetching missing candles for %s from %s: %s -> %s", symbol, exchange.id,
+                    pd.to_datetime(gap_start, unit='ms'), pd.to_datetime(gap_end, unit='ms'))
+        df = await _fetch_range(exchange, symbol, timeframe, gap_start, gap_end)
+        covered_end = min(gap_end, forming_candle_ms)
         try:
-            print(f"💾 Saving data to cache: {cache_filename}")
-            df.to_parquet(cache_filepath)
+            await asyncio.to_thread(candle_store.write_candles, exchange.id, symbol, timeframe, df,
+                                    gap_start, covered_end)
         except Exception as e:
-            print(f"⚠️ Warning: Could not save data to cache file '{cache_filename}'. Error: {e}")
+            logger.warning("⚠️ Could not save candles to the candle store. Error: %s", e)
+    return spec
 
-    return df
+async def fetch_historical_data(exchange, symbol: str, timeframe: str, start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+    """
+    ঐতিহাসিক ডেটা নিয়ে আসে। ক্যান্ডেল স্টোরে যা নেই শুধু সেটুকু এক্সচেঞ্জ থেকে এনে
+    স্টোরে যোগ করে, তারপর memory-mapped পার্টিশন থেকে ডেটাফ্রেম তৈরি করে।
+    """
+    spec = await ensure_candles(exchange, symbol, timeframe, start_date, end_date)
+    return await asyncio.to_thread(candle_store.read_candles, spec)
 
 # ==============================================================================
 #  অন্যান্য ফাংশন (Other Functions)
@@ -91,6 +160,43 @@ def calculate_max_drawdown(portfolio_values: List[float]) -> float:
             max_drawdown = drawdown
     return -max_drawdown * 100
 
+class _Portfolio:
+    """
+    সিমুলেশনের হিসাব: BUY সিগন্যালে সব ক্যাশ দিয়ে কেনা, SELL সিগন্যালে পুরো পজিশন বিক্রি,
+    দুই দিকেই TRADE_FEE_PERCENTAGE ফি। পূর্ণ এবং স্ট্রিমিং দুই মোডই একই হিসাব ব্যবহার করে।
+    """
+    __slots__ = ("cash", "asset_balance", "total_trades", "winning_trades", "last_buy_price")
+
+    def __init__(self):
+        self.cash = INITIAL_CASH
+        self.asset_balance = 0.0
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.last_buy_price = 0.0
+
+    def apply(self, signal: str, price: float):
+        """সিগন্যাল কার্যকর হলে 'BUY' বা 'SELL', না হলে None ফেরত দেয়।"""
+        if signal == 'BUY' and self.cash > 0:
+            self.asset_balance += self.cash / price * (1 - TRADE_FEE_PERCENTAGE / 100)
+            self.cash = 0.0
+            self.last_buy_price = price
+            self.total_trades += 1
+            return 'BUY'
+        if signal == 'SELL' and self.asset_balance > 0:
+            self.cash = self.asset_balance * price * (1 - TRADE_FEE_PERCENTAGE / 100)
+            self.asset_balance = 0.0
+            if self.last_buy_price > 0 and price > self.last_buy_price:
+                self.winning_trades += 1
+            return 'SELL'
+        return None
+
+    def value(self, price: float) -> float:
+        return self.cash + (self.asset_balance * price)
+
+    def win_rate(self) -> float:
+        return (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0.0
+
+
 # ==============================================================================
 #  মূল সিমুলেশন ফাংশন (Main Simulation Function - আপডেটেড)
 # ==============================================================================
@@ -99,7 +205,8 @@ async def run_simulation(exchange_name: str, strategy_name: str, symbol: str, ti
     """
     মূল ব্যাকটেস্টিং সিমুলেশন চালায় এবং কাস্টম স্ট্র্যাটেজি প্যারামিটার সমর্থন করে।
     """
-    print(f"Starting detailed backtest on '{exchange_name}' for {symbol} using '{strategy_name}' with params: {strategy_params}")
+    logger.info("Starting detailed backtest on '%s' for %s using '%s' with params: %s",
+                exchange_name, symbol, strategy_name, strategy_params)
     
     try:
         exchange_class = getattr(ccxt_async, exchange_name)
@@ -107,82 +214,365 @@ async def run_simulation(exchange_name: str, strategy_name: str, symbol: str, ti
         raise ValueError(f"The exchange '{exchange_name}' is not supported.")
     
     # আপনার দেওয়া টাইমআউট সমাধানটি অপরিবর্তিত রাখা হয়েছে
-    exchange = exchange_class({
+    exchange = request_scheduler.attach(exchange_class({
         'aiohttp_kwargs': {'timeout': 30}
-    })
+    }))
     
-    # আপনার উন্নত fetch_historical_data ফাংশনটি এখানে কল করা হচ্ছে
-    df_historical = await fetch_historical_data(exchange, symbol, timeframe, start_date, end_date)
-    await exchange.close()
-    
-    if df_historical.empty:
+    # ক্যান্ডেলগুলো স্টোরে নিশ্চিত করা হয়; ওয়ার্কারে শুধু CandleSpec যায়, ডেটাফ্রেম নয়
+    try:
+        with metrics.timer("backtest_data_fetch_seconds", exchange=exchange_name):
+            spec = await ensure_candles(exchange, symbol, timeframe, start_date, end_date)
+    finally:
+        await exchange.close()
+
+    if await asyncio.to_thread(candle_store.count_candles, spec) == 0:
         raise ValueError(f"Could not fetch historical data for {symbol} on {exchange_name}.")
     
-    # --- মূল পরিবর্তন: প্যারামিটারসহ স্ট্র্যাটেজি লোড করা ---
-    strategy = load_strategy_dynamically(strategy_name, strategy_params)
+    async def compute():
+        # ব্যবহারকারীর আপলোড করা স্ট্র্যাটেজি API প্রসেসে নয়, সীমাবদ্ধ একটি ওয়ার্কার প্রসেসে চলে
+        if is_user_strategy(strategy_name):
+            return await strategy_sandbox.run_isolated_async(
+                simulate_backtest_from_store, (spec, strategy_name, strategy_params)
+            )
+        # সিমুলেশন লুপ এবং চার্ট ডেটা তৈরি CPU-নির্ভর, তাই ওয়ার্কার প্রসেস পুলে পাঠানো হয়
+        return await run_in_worker(simulate_backtest_from_store, spec, strategy_name, strategy_params)
+
+    # একই ডেটা, একই স্ট্র্যাটেজি সোর্স এবং একই প্যারামিটারের ফলাফল ক্যাশ থেকে দেওয়া হয়।
+    # পার্টিশন ফাইলের ভার্সন ব্যবহার করা হয়, তাই ফিঙ্গারপ্রিন্টের জন্য ডেটা পড়তে হয় না।
+    data_fingerprint = await asyncio.to_thread(candle_store.data_version, spec)
+    cache_key = make_result_key(exchange_name, symbol, timeframe, start_date, end_date,
+                                data_fingerprint, strategy_name, strategy_params)
+    result = await result_cache.get_or_compute(cache_key, strategy_name, compute)
+
+    logger.info("Detailed backtest finished. Return: %.2f%%", result.total_return)
+    return result
+
+
+def simulate_backtest_from_store(spec: candle_store.CandleSpec, strategy_name: str, strategy_params: Dict[str, Any]) -> schemas.BacktestResult:
+    """
+    ওয়ার্কার প্রসেসে চলে: ক্যান্ডেল স্টোরের পার্টিশন memory-map করে পড়ে এবং সিমুলেশন চালায়।
+    সব ওয়ার্কার একই ফাইলের পেজ শেয়ার করে, তাই প্রসেস বাড়লেও ডেটার জন্য RAM বাড়ে না।
+    """
+    return simulate_backtest(candle_store.read_candles(spec), strategy_name, strategy_params)
 
-    # --- সিমুলেশন, গণনা, এবং ফলাফল তৈরির বাকি অংশ অপরিবর্তিত ---
-    cash = INITIAL_CASH
-    asset_balance = 0.0
-    total_trades = 0
-    winning_trades = 0
-    last_buy_price = 0.0
-    portfolio_history = []
-    trade_logs = []
 
+def iter_backtest_signals(df_historical: pd.DataFrame, strategy) -> Iterator[Tuple[int, str, float]]:
+    """
+    ব্যাকটেস্টারের সিগন্যাল লুপ: প্রতিটি ক্যান্ডেল i-তে শুরু থেকে i পর্যন্ত সব ক্যান্ডেল স্ট্র্যাটেজিকে দিয়ে
+    (i, সিগন্যাল, generate_signals-এ লাগা সেকেন্ড) দেয়। রিপ্লে হারনেসও লাইভ/ব্যাকটেস্ট মেলাতে এটি ব্যবহার করে।
+    """
     for i in range(len(df_historical)):
         current_data_slice = df_historical.iloc[:i+1]
+        signal_started = time.perf_counter()
         signal = strategy.generate_signals(current_data_slice)
-        
-        current_price = df_historical['close'].iloc[i]
-        current_timestamp = df_historical['timestamp'].iloc[i].to_pydatetime()
-
-        if signal == 'BUY' and cash > 0:
-            asset_to_buy = cash / current_price
-            asset_balance += asset_to_buy * (1 - TRADE_FEE_PERCENTAGE / 100)
-            cash = 0.0
-            last_buy_price = current_price
-            total_trades += 1
-            trade_logs.append(schemas.TradeLog(timestamp=current_timestamp, order_type='BUY', price=current_price))
-        elif signal == 'SELL' and asset_balance > 0:
-            cash_from_sell = asset_balance * current_price
-            cash = cash_from_sell * (1 - TRADE_FEE_PERCENTAGE / 100)
-            asset_balance = 0.0
-            if last_buy_price > 0 and current_price > last_buy_price:
-                winning_trades += 1
-            trade_logs.append(schemas.TradeLog(timestamp=current_timestamp, order_type='SELL', price=current_price))
-            
-        current_portfolio_value = cash + (asset_balance * current_price)
-        portfolio_history.append({
-            'name': df_historical['timestamp'].iloc[i].strftime('%Y-%m-%d %H:%M'),
-            'value': round(current_portfolio_value, 2)
-        })
-
-    if not portfolio_history:
-         raise ValueError("Simulation ended with no results to analyze.")
-
-    final_portfolio_value = portfolio_history[-1]['value']
+        yield i, signal, time.perf_counter() - signal_started
+
+
+def _simulate_portfolio(df_historical: pd.DataFrame, strategy) -> Tuple[List[float], List[schemas.TradeLog], _Portfolio]:
+    """
+    ব্যাকটেস্টের মূল লুপ: প্রতিটি ক্যান্ডেলে সিগন্যাল নিয়ে পোর্টফোলিও আপডেট করে।
+    (প্রতিটি ক্যান্ডেলের পোর্টফোলিও ভ্যালু, ট্রেড লগ, পোর্টফোলিও) ফেরত দেয়।
+    """
+    portfolio = _Portfolio()
+    values: List[float] = []
+    trade_logs = []
+    closes = df_historical['close']
+    timestamps = df_historical['timestamp']
+    # প্রতিটি ক্যান্ডেলে হিস্টোগ্রামে লেখা ব্যয়বহুল, তাই সময় জমা করে রান শেষে একবার রেকর্ড করা হয়
+    signal_seconds = 0.0
+    loop_started = time.perf_counter()
+
+    for i, signal, elapsed in iter_backtest_signals(df_historical, strategy):
+        signal_seconds += elapsed
+
+        current_price = closes.iloc[i]
+        executed = portfolio.apply(signal, current_price)
+        if executed:
+            trade_logs.append(schemas.TradeLog(timestamp=timestamps.iloc[i].to_pydatetime(), order_type=executed,
+                                               price=current_price))
+        values.append(round(portfolio.value(current_price), 2))
+
+    metrics.observe("strategy_signal_seconds", signal_seconds, mode="backtest")
+    metrics.observe("backtest_accounting_seconds", time.perf_counter() - loop_started - signal_seconds)
+
+    if not values:
+        raise ValueError("Simulation ended with no results to analyze.")
+    return values, trade_logs, portfolio
+
+
+def simulate_backtest(df_historical: pd.DataFrame, strategy_name: str, strategy_params: Dict[str, Any]) -> schemas.BacktestResult:
+    """
+    লোড করা ঐতিহাসিক ডেটার উপর স্ট্র্যাটেজি চালিয়ে ফলাফল তৈরি করে।
+    এটি একটি সিঙ্ক্রোনাস, pickle-যোগ্য ফাংশন, যাতে আলাদা প্রসেসেও চালানো যায়।
+    """
+    # --- মূল পরিবর্তন: প্যারামিটারসহ স্ট্র্যাটেজি লোড করা ---
+    strategy = load_strategy_dynamically(strategy_name, strategy_params)
+    portfolio_value_list, trade_logs, portfolio = _simulate_portfolio(df_historical, strategy)
+    build_started = time.perf_counter()
+
+    names = df_historical['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
+    portfolio_history = [{'name': name, 'value': value} for name, value in zip(names, portfolio_value_list)]
+
+    final_portfolio_value = portfolio_value_list[-1]
     total_return = ((final_portfolio_value - INITIAL_CASH) / INITIAL_CASH) * 100
-    win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-    portfolio_value_list = [item['value'] for item in portfolio_history]
+    win_rate = portfolio.win_rate()
     max_drawdown = calculate_max_drawdown(portfolio_value_list)
     sharpe_ratio = 1.8 # Placeholder
 
-    price_history_for_chart = [
-        schemas.CandleData(
-            timestamp=row['timestamp'].to_pydatetime(),
-            open=row['open'],
-            high=row['high'],
-            low=row['low'],
-            close=row['close']
-        ) for index, row in df_historical.iterrows()
-    ]
+    # iterrows()-এর বদলে কলামভিত্তিক রূপান্তর, যা বড় ডেটায় অনেক দ্রুত
+    price_history_for_chart = df_historical[['timestamp', 'open', 'high', 'low', 'close']].to_dict('records')
 
     result = schemas.BacktestResult(
         total_return=round(total_return, 2), win_rate=round(win_rate, 2),
         max_drawdown=round(max_drawdown, 2), sharpe_ratio=sharpe_ratio,
         history=portfolio_history, price_history=price_history_for_chart, trade_logs=trade_logs
     )
-    
-    print(f"Detailed backtest finished. Final Value: ${final_portfolio_value:.2f}, Return: {total_return:.2f}%")
-    return result
\ No newline at end of file
+    metrics.observe("backtest_result_build_seconds", time.perf_counter() - build_started)
+    return result
+
+# ==============================================================================
+#  স্ট্রিমিং ব্যাকটেস্ট (Out-of-core streaming backtest)
+#
+#  ক্যান্ডেলগুলো স্টোর থেকে খণ্ডে খণ্ডে পড়া হয়। যে স্ট্র্যাটেজি start_stream() সমর্থন করে (রিকার্সিভ
+#  ইন্ডিকেটরের সব বিল্ট-ইন স্ট্র্যাটেজি) সে ইন্ডিকেটরের অবস্থা নিজেই ক্যান্ডেল থেকে ক্যান্ডেলে এবং খণ্ড
+#  পেরিয়ে বহন করে, তাই ফলাফল পূর্ণ মোডের সমান। বাকিদের প্রতিটি সিগন্যালের জন্য শুধু warmup_bars()
+#  পরিমাণ সাম্প্রতিক ক্যান্ডেল পাঠানো হয়, এবং খণ্ডের সীমানা পেরোতে আগের খণ্ডের শেষ অংশটুকু রেখে দেওয়া
+#  হয়; সিগন্যাল যদি এর চেয়ে পুরনো ক্যান্ডেলের উপর নির্ভর করে তবে ফলাফল পূর্ণ মোড থেকে আলাদা হতে পারে। ইকুইটি কার্ভ এবং ট্রেডগুলো প্রতিটি খণ্ড শেষে ডিস্কে Arrow IPC
+#  ফাইলে লেখা হয়; মেমরিতে থাকে শুধু পোর্টফোলিওর অবস্থা এবং চার্টের জন্য একটি ছোট প্রিভিউ।
+# ==============================================================================
+
+EQUITY_FILE = "equity.arrow"
+TRADES_FILE = "trades.arrow"
+
+def backtest_runs_dir() -> Path:
+    return Path(config.CACHE_DIR) / "backtest_runs"
+
+def streaming_run_file(run_id: str, filename: str) -> Path:
+    """একটি স্ট্রিমিং রানের ফাইলের পাথ; run_id শুধুমাত্র hex হতে পারে (পাথ ট্রাভার্সাল রোধে)।"""
+    if not run_id or any(c not in "0123456789abcdef" for c in run_id):
+        raise ValueError("Invalid run id.")
+    return backtest_runs_dir() / run_id / filename
+
+def _prune_streaming_runs(keep: int):
+    runs = sorted((p for p in backtest_runs_dir().glob("*") if p.is_dir()), key=lambda p: p.stat().st_mtime)
+    for path in runs[:max(0, len(runs) - keep)]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def simulate_backtest_streaming(spec: candle_store.CandleSpec, strategy_name: str, strategy_params: Dict[str, Any],
+                                run_id: str, chunk_rows: int = None) -> schemas.StreamingBacktestResult:
+    """
+    ওয়ার্কার প্রসেসে চলে। simulate_backtest-এর মতোই হিসাব, কিন্তু মেমরির ব্যবহার রেঞ্জের
+    দৈর্ঘ্যের উপর নির্ভর করে না: chunk_rows + warmup_bars সারির বেশি কখনো মেমরিতে থাকে না।
+    """
+    strategy = load_strategy_dynamically(strategy_name, strategy_params)
+    incremental = bool(strategy.start_stream())
+    # ইনক্রিমেন্টাল স্ট্র্যাটেজি পুরনো ক্যান্ডেল চায় না; শুধু বর্তমান ক্যান্ডেলটি
+    warmup = 1 if incremental else max(1, int(strategy.warmup_bars()))
+    chunk_rows = chunk_rows or config.STREAM_CHUNK_ROWS
+
+    total_bars = candle_store.count_candles(spec)
+    if total_bars == 0:
+        raise ValueError("Simulation ended with no results to analyze.")
+    preview_stride = max(1, -(-total_bars // config.STREAM_PREVIEW_POINTS))
+
+    run_dir = streaming_run_file(run_id, EQUITY_FILE).parent
+    run_dir.mkdir(parents=True, exist_ok=True)
+    equity_schema = pa.schema([("timestamp", pa.timestamp("ms")), ("close", pa.float64()), ("value", pa.float64())])
+    trades_schema = pa.schema([("timestamp", pa.timestamp("ms")), ("order_type", pa.string()), ("price", pa.float64())])
+
+    portfolio = _Portfolio()
+    preview: List[Dict[str, Any]] = []
+    peak, max_drawdown, last_value = -float('inf'), 0.0, INITIAL_CASH
+    bar_index = 0
+    tail = None
+    signal_seconds = 0.0
+    loop_started = time.perf_counter()
+
+    with pa.OSFile(str(run_dir / EQUITY_FILE), "wb") as equity_sink, \
+         pa.OSFile(str(run_dir / TRADES_FILE), "wb") as trades_sink, \
+         pa.ipc.new_stream(equity_sink, equity_schema) as equity_writer, \
+         pa.ipc.new_stream(trades_sink, trades_schema) as trades_writer:
+
+        for chunk in candle_store.iter_candle_frames(spec, chunk_rows):
+            # আগের খণ্ডের শেষ (warmup - 1)টি ক্যান্ডেল সামনে জুড়ে দেওয়া, যাতে উইন্ডো খণ্ডের সীমানায় না কাটে
+            window_source = chunk if tail is None else pd.concat([tail, chunk], ignore_index=True)
+            first = len(window_source) - len(chunk)
+            closes = window_source['close'].to_numpy()
+            timestamps = window_source['timestamp']
+            values = []
+            trades = {"timestamp": [], "order_type": [], "price": []}
+            candles = chunk.itertuples(index=False) if incremental else None
+
+            for j in range(first, len(window_source)):
+                signal_started = time.perf_counter()
+                if incremental:
+                    signal = strategy.next_signal(next(candles))
+                else:
+                    signal = strategy.generate_signals(window_source.iloc[max(0, j - warmup + 1):j + 1])
+                signal_seconds += time.perf_counter() - signal_started
+
+                current_price = closes[j]
+                executed = portfolio.apply(signal, current_price)
+                if executed:
+                    trades["timestamp"].append(timestamps.iloc[j])
+                    trades["order_type"].append(executed)
+                    trades["price"].append(float(current_price))
+
+                # calculate_max_drawdown-এর মতোই, কিন্তু পুরো তালিকা না রেখে চলমান সর্বোচ্চ মান দিয়ে
+                value = round(portfolio.value(current_price), 2)
+                if value > peak:
+                    peak = value
+                drawdown = (peak - value) / peak if peak != 0 else 0
+                if drawdown > max_drawdown:
+                    max_drawdown = drawdown
+                values.append(value)
+                last_value = value
+
+                if bar_index % preview_stride == 0 or bar_index == total_bars - 1:
+                    preview.append({'name': timestamps.iloc[j].strftime('%Y-%m-%d %H:%M'), 'value': value})
+                bar_index += 1
+
+            equity_writer.write_batch(pa.record_batch([
+                pa.array(chunk['timestamp'], type=pa.timestamp("ms")),
+                pa.array(chunk['close'], type=pa.float64()),
+                pa.array(values, type=pa.float64()),
+            ], schema=equity_schema))
+            if trades["order_type"]:
+                trades_writer.write_batch(pa.record_batch([
+                    pa.array(trades["timestamp"], type=pa.timestamp("ms")),
+                    pa.array(trades["order_type"], type=pa.string()),
+                    pa.array(trades["price"], type=pa.float64()),
+                ], schema=trades_schema))
+
+            tail = window_source.iloc[max(0, len(window_source) - (warmup - 1)):].reset_index(drop=True) if warmup > 1 else None
+
+    metrics.observe("strategy_signal_seconds", signal_seconds, mode="streaming")
+    metrics.observe("backtest_accounting_seconds", time.perf_counter() - loop_started - signal_seconds)
+
+    return schemas.StreamingBacktestResult(
+        run_id=run_id,
+        total_return=round((last_value - INITIAL_CASH) / INITIAL_CASH * 100, 2),
+        win_rate=round(portfolio.win_rate(), 2),
+        max_drawdown=round(-max_drawdown * 100, 2),
+        sharpe_ratio=1.8,  # Placeholder, simulate_backtest-এর মতো
+        total_trades=portfolio.total_trades,
+        bars=bar_index,
+        warmup_bars=warmup,
+        incremental=incremental,
+        equity_preview=preview,
+    )
+
+
+async def run_simulation_streaming(exchange_name: str, strategy_name: str, symbol: str, timeframe: str,
+                                   start_date: datetime.date, end_date: datetime.date,
+                                   strategy_params: Dict[str, Any]) -> schemas.StreamingBacktestResult:
+    """
+    run_simulation-এর স্ট্রিমিং সংস্করণ। পূর্ণ ইকুইটি কার্ভ এবং ট্রেড ফলাফলে থাকে না,
+    run_id দিয়ে /api/backtest/stream/{run_id}/... থেকে Arrow ফাইল হিসেবে পাওয়া যায়।
+    """
+    logger.info("Starting streaming backtest on '%s' for %s %s using '%s'", exchange_name, symbol, timeframe, strategy_name)
+    exchange_class = getattr(ccxt_async, exchange_name, None)
+    if exchange_class is None:
+        raise ValueError(f"The exchange '{exchange_name}' is not supported.")
+    exchange = request_scheduler.attach(exchange_class({'aiohttp_kwargs': {'timeout': 30}}))
+    try:
+        with metrics.timer("backtest_data_fetch_seconds", exchange=exchange_name):
+            spec = await ensure_candles(exchange, symbol, timeframe, start_date, end_date)
+    finally:
+        await exchange.close()
+
+    await asyncio.to_thread(_prune_streaming_runs, config.STREAM_KEEP_RUNS - 1)
+    run_id = uuid.uuid4().hex
+    if is_user_strategy(strategy_name):
+        return await strategy_sandbox.run_isolated_async(
+            simulate_backtest_streaming, (spec, strategy_name, strategy_params, run_id)
+        )
+    return await run_in_worker(simulate_backtest_streaming, spec, strategy_name, strategy_params, run_id)
+
+# ==============================================================================
+#  একাধিক স্ট্র্যাটেজির তুলনা (Multi-strategy comparison on a shared dataset)
+#
+#  ক্যান্ডেলগুলো একবারই স্টোরে আনা হয়; স্ট্র্যাটেজিগুলো আলাদা ওয়ার্কারে সমান্তরালে চলে (একসাথে সর্বোচ্চ
+#  COMPARE_MAX_PARALLELটি) এবং একই পার্টিশন ফাইল memory-map করে পড়ে। ওয়ার্কার শুধু মেট্রিক্স, প্রতিটি ক্যান্ডেলের ইকুইটি
+#  এবং ট্রেডগুলো ফেরত দেয়; প্রাইস হিস্টোরি রেসপন্সে একবারই যায় এবং সব ইকুইটি কার্ভের টাইম ইনডেক্স।
+# ==============================================================================
+
+def simulate_equity_from_store(spec: candle_store.CandleSpec, strategy_name: str,
+                               strategy_params: Dict[str, Any]) -> Dict[str, Any]:
+    """ওয়ার্কার প্রসেসে চলে: simulate_backtest-এর মতো হিসাব, কিন্তু চার্ট পেলোড ছাড়া সংক্ষিপ্ত ফলাফল।"""
+    df = candle_store.read_candles(spec)
+    strategy = load_strategy_dynamically(strategy_name, strategy_params)
+    values, trade_logs, portfolio = _simulate_portfolio(df, strategy)
+    return {
+        "total_return": round((values[-1] - INITIAL_CASH) / INITIAL_CASH * 100, 2),
+        "win_rate": round(portfolio.win_rate(), 2),
+        "max_drawdown": round(calculate_max_drawdown(values), 2),
+        "sharpe_ratio": 1.8,  # Placeholder, simulate_backtest-এর মতো
+        "total_trades": portfolio.total_trades,
+        "final_value": values[-1],
+        "equity": values,
+        "trade_logs": [trade.model_dump() for trade in trade_logs],
+    }
+
+
+def _comparison_labels(entries: List[Dict[str, Any]]) -> List[str]:
+    """প্রতিটি সারির জন্য আলাদা লেবেল: দেওয়া label, নাহলে স্ট্র্যাটেজির নাম ও প্যারামিটার।"""
+    labels, seen = [], {}
+    for entry in entries:
+        label = entry.get("label") or f"{entry['strategy_name']} {canonical_params(entry['strategy_params'])}"
+        seen[label] = seen.get(label, 0) + 1
+        labels.append(label if seen[label] == 1 else f"{label} #{seen[label]}")
+    return labels
+
+
+async def run_comparison(exchange_name: str, symbol: str, timeframe: str, start_date: datetime.date,
+                         end_date: datetime.date, entries: List[Dict[str, Any]]) -> schemas.ComparisonResult:
+    """
+    একই ডেটাসেটে entries-এর ({strategy_name, strategy_params, label}) সব স্ট্র্যাটেজি চালিয়ে পাশাপাশি
+    মেট্রিক্স টেবিল এবং একই টাইম ইনডেক্সে ইকুইটি কার্ভ দেয়। একটি স্ট্র্যাটেজি ব্যর্থ হলে শুধু তার সারিতে
+    error থাকে, বাকিগুলোর ফলাফল আসে।
+    """
+    logger.info("Starting comparison of %d strategies on '%s' for %s %s", len(entries), exchange_name, symbol, timeframe)
+    exchange_class = getattr(ccxt_async, exchange_name, None)
+    if exchange_class is None:
+        raise ValueError(f"The exchange '{exchange_name}' is not supported.")
+    exchange = request_scheduler.attach(exchange_class({'aiohttp_kwargs': {'timeout': 30}}))
+    try:
+        with metrics.timer("backtest_data_fetch_seconds", exchange=exchange_name):
+            spec = await ensure_candles(exchange, symbol, timeframe, start_date, end_date)
+    finally:
+        await exchange.close()
+
+    df = await asyncio.to_thread(candle_store.read_candles, spec)
+    if df.empty:
+        raise ValueError(f"Could not fetch historical data for {symbol} on {exchange_name}.")
+
+    # পুরো তুলনা কিউতে একটিমাত্র জব হিসেবে ভর্তি হয়, তাই একসাথে পুলের কতগুলো প্রসেস নেবে তা সীমিত
+    parallel = asyncio.Semaphore(max(1, config.COMPARE_MAX_PARALLEL))
+
+    async def run_one(entry: Dict[str, Any]):
+        args = (spec, entry["strategy_name"], entry["strategy_params"])
+        async with parallel:
+            if is_user_strategy(entry["strategy_name"]):
+                return await strategy_sandbox.run_isolated_async(simulate_equity_from_store, args)
+            return await run_in_worker(simulate_equity_from_store, *args)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_one(entry) for entry in entries), return_exceptions=True)
+    metrics.observe("backtest_compare_seconds", time.perf_counter() - started)
+
+    rows = []
+    for label, entry, outcome in zip(_comparison_labels(entries), entries, outcomes):
+        row = {"label": label, "strategy_name": entry["strategy_name"], "strategy_params": entry["strategy_params"]}
+        if isinstance(outcome, Exception):
+            logger.warning("Comparison run '%s' failed: %s", label, outcome)
+            row["error"] = str(outcome)
+        else:
+            row.update(outcome)
+        rows.append(row)
+
+    return schemas.ComparisonResult(
+        price_history=df[['timestamp', 'open', 'high', 'low', 'close']].to_dict('records'),
+        strategies=rows,
+    )
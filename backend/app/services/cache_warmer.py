@@ -0,0 +1,280 @@
+# app/services/cache_warmer.py
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import config
+from ..lazy_imports import lazy_import
+from . import candle_store, request_scheduler
+from .backtest_queue import backtest_queue
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ccxt_async = lazy_import("ccxt.async_support")
+
+# ==============================================================================
+#  ক্যাশ ওয়ার্মার (Background cache warmer for the watchlist)
+#
+#  ওয়াচলিস্টের প্রতিটি (exchange, symbol, timeframe) সিরিজের জন্য:
+#    - top-up:   প্রতিটি টাইমফ্রেম বাউন্ডারির ঠিক পরে সদ্য বন্ধ হওয়া ক্যান্ডেলগুলো আনা হয়
+#    - backfill: কোনো top-up বাকি না থাকলে এবং ব্যাকটেস্ট কিউ খালি থাকলে একবারে একটি ছোট
+#                রেঞ্জ করে CACHE_WARMER_HISTORY_DAYS পর্যন্ত পুরনো ইতিহাস ভরা হয়
+#  সব ডাউনলোড backtesting_engine.ensure_candles দিয়ে হয়, তাই স্টোরে যা আছে তা আবার আনা হয় না।
+#  ওয়ার্মার নিজস্ব থ্রেডে নিজস্ব ইভেন্ট লুপে চলে, যাতে API-র লুপে কোনো চাপ না পড়ে।
+# ==============================================================================
+
+SeriesKey = Tuple[str, str, str]
+
+
+def parse_watchlist(raw: str) -> List[SeriesKey]:
+    """ "binance:BTC/USDT:1h,binance:ETH/USDT:4h" -> [(exchange, symbol, timeframe), ...] """
+    series = []
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        try:
+            exchange, symbol, timeframe = item.split(":")
+        except ValueError:
+            raise ValueError(f"Watchlist entry '{item}' must look like exchange:SYMBOL/QUOTE:timeframe.")
+        series.append((exchange.strip().lower(), symbol.strip(), timeframe.strip()))
+    return series
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class _SeriesState:
+    __slots__ = ("next_topup_ms", "backfilled_to", "backfill_complete", "last_topup_at", "last_error")
+
+    def __init__(self):
+        self.next_topup_ms = 0
+        self.backfilled_to: Optional[datetime.date] = None
+        self.backfill_complete = False
+        self.last_topup_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+
+class CacheWarmer:
+    """
+    ওয়াচলিস্টের সিরিজগুলো ক্যান্ডেল স্টোরে হালনাগাদ রাখে। start()/stop() trade_writer-এর মতোই
+    একটি daemon থ্রেড চালু/বন্ধ করে; ওয়াচলিস্ট রানটাইমে add()/remove() দিয়ে বদলানো যায়।
+    """
+
+    def __init__(self, watchlist: List[SeriesKey] = None, history_days: int = None, backfill_step_days: int = None,
+                 topup_delay: float = None):
+        self.history_days = history_days or config.CACHE_WARMER_HISTORY_DAYS
+        self.backfill_step_days = backfill_step_days or config.CACHE_WARMER_BACKFILL_STEP_DAYS
+        # বাউন্ডারির পর কত সেকেন্ড অপেক্ষা করা হবে, যাতে এক্সচেঞ্জ ক্যান্ডেলটি বন্ধ করার সময় পায়
+        self.topup_delay = config.CACHE_WARMER_TOPUP_DELAY if topup_delay is None else topup_delay
+        self._series: Dict[SeriesKey, _SeriesState] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        for key in (parse_watchlist(config.CACHE_WARMER_WATCHLIST) if watchlist is None else watchlist):
+            self._series[key] = _SeriesState()
+
+    # --- ওয়াচলিস্ট ---
+    def add(self, exchange: str, symbol: str, timeframe: str) -> SeriesKey:
+        key = (exchange.lower(), symbol, timeframe)
+        with self._lock:
+            self._series.setdefault(key, _SeriesState())
+        self._wake()
+        return key
+
+    def remove(self, exchange: str, symbol: str, timeframe: str) -> bool:
+        with self._lock:
+            return self._series.pop((exchange.lower(), symbol, timeframe), None) is not None
+
+    def watchlist(self) -> List[SeriesKey]:
+        with self._lock:
+            return sorted(self._series)
+
+    # --- ফ্রেশনেস রিপোর্ট ---
+    def freshness(self) -> List[Dict[str, Any]]:
+        """
+        প্রতিটি সিরিজের শেষ কভারড ক্যান্ডেল, বর্তমান সময় থেকে কতটা পিছিয়ে, এবং ব্যাকফিল কতদূর এগিয়েছে।
+        fresh মানে সর্বশেষ বন্ধ হওয়া ক্যান্ডেল পর্যন্ত স্টোরে আছে।
+        """
+        now_ms = _now_ms()
+        with self._lock:
+            items = sorted(self._series.items())
+        report = []
+        for (exchange, symbol, timeframe), state in items:
+            coverage = candle_store.get_coverage(exchange, symbol, timeframe)
+            covered_until = coverage[-1][1] if coverage else None
+            timeframe_ms = candle_store.timeframe_to_ms(timeframe)
+            last_closed_ms = candle_store.align_down(now_ms, timeframe) if timeframe_ms else None
+            report.append({
+                "exchange": exchange,
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "fresh": bool(covered_until and last_closed_ms and covered_until >= last_closed_ms),
+                "covered_until_ms": covered_until,
+                "lag_seconds": round((now_ms - covered_until) / 1000, 1) if covered_until else None,
+                "history_start_ms": coverage[-1][0] if coverage else None,
+                "backfill_complete": state.backfill_complete,
+                "last_topup_at": state.last_topup_at,
+                "next_topup_ms": state.next_topup_ms or None,
+                "last_error": state.last_error,
+            })
+        return report
+
+    def stale_count(self) -> int:
+        return sum(1 for item in self.freshness() if not item["fresh"])
+
+    # --- ডাউনলোড ---
+    def _oldest(self) -> datetime.date:
+        return datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=self.history_days)
+
+    async def _ensure(self, clients: Dict[str, Any], key: SeriesKey, start: datetime.date, end: datetime.date):
+        # ensure_candles ব্যাকটেস্টিং ইঞ্জিনের সাথে শেয়ার করা; ইম্পোর্ট এখানে যাতে স্টার্টআপে লোড না হয়
+        from .backtesting_engine import ensure_candles
+        exchange_id, symbol, timeframe = key
+        if exchange_id not in clients:
+            client = getattr(ccxt_async, exchange_id)({'aiohttp_kwargs': {'timeout': 30}})
+            clients[exchange_id] = request_scheduler.attach(client, request_scheduler.BACKFILL)
+        await ensure_candles(clients[exchange_id], symbol, timeframe, start, end, source="warmer")
+
+    async def _topup(self, clients: Dict[str, Any], key: SeriesKey, state: _SeriesState):
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        # শেষ কভারড পয়েন্ট থেকে আজ পর্যন্ত, তবে একবারে সর্বোচ্চ একটি ব্যাকফিল ধাপ; পুরনো ফাঁকগুলো ব্যাকফিল ভরে
+        start = max(self._oldest(), today - datetime.timedelta(days=self.backfill_step_days))
+        coverage = candle_store.get_coverage(*key)
+        if coverage:
+            covered_until = datetime.datetime.fromtimestamp(coverage[-1][1] / 1000, datetime.timezone.utc).date()
+            start = max(start, covered_until)
+        started = time.perf_counter()
+        try:
+            await self._ensure(clients, key, start, today)
+            state.last_topup_at = time.time()
+            state.last_error = None
+            if state.backfilled_to is None:
+                state.backfilled_to = start
+                state.backfill_complete = start <= self._oldest()
+            metrics.inc("cache_warmer_runs_total", kind="topup", outcome="ok")
+        except Exception as e:
+            state.last_error = str(e)
+            metrics.inc("cache_warmer_runs_total", kind="topup", outcome="error")
+            logger.warning("⚠️ Cache warmer could not top up %s: %s", "/".join(key), e)
+        metrics.observe("cache_warmer_seconds", time.perf_counter() - started, kind="topup")
+
+        now_ms = _now_ms()
+        if candle_store.timeframe_to_ms(key[2]):
+            state.next_topup_ms = candle_store.align_up(now_ms + 1, key[2]) + int(self.topup_delay * 1000)
+        else:
+            state.next_topup_ms = now_ms + 60_000
+
+    async def _backfill_step(self, clients: Dict[str, Any], key: SeriesKey, state: _SeriesState):
+        oldest = self._oldest()
+        end = state.backfilled_to - datetime.timedelta(days=1)
+        start = max(oldest, state.backfilled_to - datetime.timedelta(days=self.backfill_step_days))
+        started = time.perf_counter()
+        try:
+            await self._ensure(clients, key, start, end)
+            state.backfilled_to = start
+            state.backfill_complete = start <= oldest
+            metrics.inc("cache_warmer_runs_total", kind="backfill", outcome="ok")
+            if state.backfill_complete:
+                logger.info("📚 Cache warmer finished backfilling %s (%d days).", "/".join(key), self.history_days)
+        except Exception as e:
+            state.last_error = str(e)
+            metrics.inc("cache_warmer_runs_total", kind="backfill", outcome="error")
+            logger.warning("⚠️ Cache warmer could not backfill %s: %s", "/".join(key), e)
+        metrics.observe("cache_warmer_seconds", time.perf_counter() - started, kind="backfill")
+
+    # --- শিডিউলার লুপ ---
+    def _next_backfill(self) -> Optional[Tuple[SeriesKey, _SeriesState]]:
+        # ইন্টারেক্টিভ ব্যাকটেস্ট চলার সময় ব্যাকফিল থেমে থাকে, যাতে এক্সচেঞ্জের রেট লিমিট তাদের জন্য থাকে
+        if backtest_queue.running or backtest_queue.queued:
+            return None
+        with self._lock:
+            pending = [(key, state) for key, state in self._series.items()
+                       if state.backfilled_to is not None and not state.backfill_complete]
+        # সবচেয়ে কম ইতিহাস যার, তাকে আগে
+        return max(pending, key=lambda item: item[1].backfilled_to) if pending else None
+
+    async def _run_async(self):
+        self._wakeup = asyncio.Event()
+        clients: Dict[str, Any] = {}
+        try:
+            while not self._stopping:
+                self._wakeup.clear()
+                now_ms = _now_ms()
+                with self._lock:
+                    due = [(key, state) for key, state in self._series.items() if state.next_topup_ms <= now_ms]
+                for key, state in due:
+                    if self._stopping:
+                        break
+                    await self._topup(clients, key, state)
+                if due:
+                    continue
+
+                backfill = self._next_backfill()
+                if backfill:
+                    await self._backfill_step(clients, *backfill)
+                    continue
+
+                # পরের বাউন্ডারি পর্যন্ত (কিন্তু ব্যাকফিল আবার চেষ্টা করার জন্য সর্বোচ্চ ৩০ সেকেন্ড) ঘুমানো
+                with self._lock:
+                    next_due = min((state.next_topup_ms for state in self._series.values()), default=None)
+                timeout = 30.0 if next_due is None else min(30.0, max(0.0, (next_due - _now_ms()) / 1000))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for client in clients.values():
+                try:
+                    await client.close()
+                except Exception:
+                    pass
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._run_async())
+        except Exception as e:
+            metrics.inc("errors_total", component="cache_warmer")
+            logger.error("🔥 Cache warmer stopped unexpectedly: %s", e)
+        finally:
+            self._loop = None
+            loop.close()
+
+    def _wake(self):
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+        self._thread.start()
+        logger.info("🔥 Cache warmer started for %d series.", len(self._series))
+
+    def stop(self, timeout: float = 10.0):
+        if not self.is_running:
+            return
+        self._stopping = True
+        self._wake()
+        self._thread.join(timeout)
+        self._thread = None
+
+
+# API জুড়ে একটিমাত্র শেয়ার করা ওয়ার্মার
+cache_warmer = CacheWarmer()
+metrics.register_gauge(lambda: {"cache_warmer_stale_series": cache_warmer.stale_count()})
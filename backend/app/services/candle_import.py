@@ -0,0 +1,264 @@
+# app/services/candle_import.py
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import logging
+import multiprocessing
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .. import config
+from ..lazy_imports import lazy_import
+from . import candle_store
+from .backtest_queue import run_in_worker
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# ==============================================================================
+#  অফলাইন ক্যান্ডেল ইম্পোর্ট (Bulk import of candle dumps)
+#
+#  এক্সচেঞ্জের মাসিক kline আর্কাইভ (zip করা CSV), সাধারণ CSV বা parquet ফাইল পড়ে
+#  timestamp/open/high/low/close/volume স্কিমায় রূপান্তর করে ক্যান্ডেল স্টোরে লেখা হয়।
+#  ফাইল পার্স করা (unzip + CSV) প্রসেস পুলে সমান্তরালে চলে; স্টোরে লেখা মূল প্রসেসে হয়,
+#  কারণ একই মাসের পার্টিশনে একাধিক প্রসেস একসাথে লিখতে পারে না।
+#  ইম্পোর্ট করা ফাঁকহীন অংশগুলো কভারেজ ম্যানিফেস্টে যোগ হয়, তাই ব্যাকটেস্ট সেগুলো আর নেটওয়ার্ক থেকে আনে না;
+#  ফাইলের ভেতরের ফাঁক কভারেজের বাইরে থাকে। ক্যান্ডেলের ব্যবধান টাইমফ্রেমের সাথে না মিললে ফাইলটি বাদ যায়।
+# ==============================================================================
+
+SUPPORTED_SUFFIXES = (".csv", ".zip", ".parquet", ".gz")
+
+# CSV হেডারের বিভিন্ন নাম -> স্টোরের কলাম
+_COLUMN_ALIASES = {
+    "timestamp": "timestamp", "open_time": "timestamp", "opentime": "timestamp", "time": "timestamp",
+    "date": "timestamp", "datetime": "timestamp", "ts": "timestamp", "unix": "timestamp",
+    "open": "open", "o": "open",
+    "high": "high", "h": "high",
+    "low": "low", "l": "low",
+    "close": "close", "c": "close",
+    "volume": "volume", "vol": "volume", "v": "volume", "volume_base": "volume",
+}
+
+
+def discover_files(paths: Iterable[str]) -> List[Path]:
+    """ফাইল এবং ফোল্ডারের তালিকা থেকে (ফোল্ডারের ভেতরে রিকার্সিভভাবে) সমর্থিত ফাইলগুলো, নাম অনুযায়ী সাজানো।"""
+    files = set()
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.update(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES)
+        elif path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES:
+            files.add(path)
+        else:
+            raise FileNotFoundError(f"'{raw}' is not a supported file or a directory.")
+    return sorted(files)
+
+# ==============================================================================
+#  পার্সিং (Parsing; ওয়ার্কার প্রসেসে চলে)
+# ==============================================================================
+
+def _has_header(first_line: str) -> bool:
+    first_field = first_line.split(",")[0].strip().strip('"')
+    try:
+        float(first_field)
+        return False
+    except ValueError:
+        return True
+
+def _read_csv(data: bytes) -> pd.DataFrame:
+    first_line = data[:256].decode("utf-8", errors="ignore").splitlines()[0] if data else ""
+    if _has_header(first_line):
+        df = pd.read_csv(io.BytesIO(data))
+        df.columns = [_COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()) for c in df.columns]
+        return df
+    # হেডার ছাড়া ফাইল Binance kline লেআউট ধরে নেওয়া হয়: open_time, open, high, low, close, volume, ...
+    df = pd.read_csv(io.BytesIO(data), header=None)
+    return df.iloc[:, :6].set_axis(candle_store.CANDLE_COLUMNS, axis=1)
+
+def _read_raw(path: Path) -> pd.DataFrame:
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    if suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            frames = [_read_csv(archive.read(name)) for name in archive.namelist() if name.lower().endswith(".csv")]
+        if not frames:
+            raise ValueError("Archive contains no CSV files.")
+        return pd.concat(frames, ignore_index=True)
+    if suffix == ".gz":
+        return _read_csv(gzip.decompress(path.read_bytes()))
+    return _read_csv(path.read_bytes())
+
+def _to_datetime(column: pd.Series) -> pd.Series:
+    """সেকেন্ড/মিলিসেকেন্ড/মাইক্রোসেকেন্ড/ন্যানোসেকেন্ডের epoch অথবা তারিখ স্ট্রিং -> naive UTC datetime।"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        if getattr(column.dt, "tz", None) is not None:
+            column = column.dt.tz_convert("UTC").dt.tz_localize(None)
+        return column.astype("datetime64[ns]")
+    numeric = pd.to_numeric(column, errors="coerce")
+    if numeric.notna().all():
+        # Binance ২০২৫ থেকে spot আর্কাইভে মাইক্রোসেকেন্ড ব্যবহার করে, তাই মান দেখে একক ঠিক করা হয়
+        largest = numeric.abs().max()
+        unit = "ns" if largest >= 1e17 else "us" if largest >= 1e14 else "ms" if largest >= 1e11 else "s"
+        return pd.to_datetime(numeric.astype("int64"), unit=unit)
+    return pd.to_datetime(column, utc=True).dt.tz_localize(None).astype("datetime64[ns]")
+
+def parse_candle_file(path: str) -> pd.DataFrame:
+    """
+    একটি ফাইল পড়ে স্টোরের স্কিমায় (fetch_historical_data যে কলাম দেয়) রূপান্তর করে,
+    অসম্পূর্ণ সারি এবং ডুপ্লিকেট timestamp বাদ দিয়ে সময়ক্রমে সাজিয়ে ফেরত দেয়।
+    """
+    df = _read_raw(Path(path))
+    if "timestamp" not in df.columns and isinstance(df.index, pd.DatetimeIndex):
+        df = df.rename_axis("timestamp").reset_index()
+    df = df.rename(columns=lambda c: _COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    missing = [c for c in candle_store.CANDLE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = df[candle_store.CANDLE_COLUMNS].copy()
+    df['timestamp'] = _to_datetime(df['timestamp'])
+    for col in candle_store.CANDLE_COLUMNS[1:]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    df = df.dropna()
+    return df.drop_duplicates(subset='timestamp', keep='last').sort_values('timestamp').reset_index(drop=True)
+
+def _parse_safely(path: str) -> Tuple[str, Optional[pd.DataFrame], Optional[str]]:
+    try:
+        return path, parse_candle_file(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+# ==============================================================================
+#  স্টোরে লেখা (Writing into the candle store; মূল প্রসেসে)
+# ==============================================================================
+
+class _ImportSummary:
+    def __init__(self, files: int):
+        self.started = time.perf_counter()
+        self.report: Dict[str, Any] = {"files": files, "imported_files": 0, "rows": 0, "errors": [], "covered": []}
+
+    def add(self, exchange: str, symbol: str, timeframe: str, path: str, df: Optional[pd.DataFrame], error: Optional[str]):
+        if error is not None or df is None or df.empty:
+            self.report["errors"].append({"file": path, "error": error or "No candles found."})
+            logger.warning("⚠️ Skipped '%s': %s", path, error or "no candles")
+            return
+        timestamps_ms = df['timestamp'].to_numpy(dtype="datetime64[ms]").astype("int64")
+        tf_ms = candle_store.timeframe_to_ms(timeframe)
+        if tf_ms is None:
+            # মাস/বছরের মতো ক্যালেন্ডার টাইমফ্রেমে ব্যবধান স্থির নয়; পুরো ফাইলটি একটি রেঞ্জ হিসেবে কভারড
+            covered = [(int(timestamps_ms[0]), int(timestamps_ms[-1]) + 1)]
+        else:
+            spacing = int(np.median(np.diff(timestamps_ms))) if len(timestamps_ms) > 1 else tf_ms
+            if spacing != tf_ms:
+                # ভুল টাইমফ্রেমের ফাইল (যেমন 1h সিরিজে 1m ক্যান্ডেল) স্টোরে মিশে গেলে সিরিজটি নষ্ট হয়
+                error = (f"Candles are {spacing // 1000}s apart (median) but the {timeframe} timeframe needs "
+                         f"{tf_ms // 1000}s.")
+                self.report["errors"].append({"file": path, "error": error})
+                logger.warning("⚠️ Skipped '%s': %s", path, error)
+                return
+            # শুধু ফাঁকহীন অংশগুলো কভারড; ফাইলের ভেতরের ফাঁক পরে এক্সচেঞ্জ থেকে আনা হয়
+            covered = candle_store.contiguous_ranges(timestamps_ms, timeframe)
+        candle_store.write_candles(exchange, symbol, timeframe, df, covered_ranges=covered)
+        self.report["imported_files"] += 1
+        self.report["rows"] += len(df)
+        metrics.inc("candles_imported_total", len(df), exchange=exchange, timeframe=timeframe)
+
+    def finish(self, exchange: str, symbol: str, timeframe: str) -> Dict[str, Any]:
+        self.report["covered"] = candle_store.get_coverage(exchange, symbol, timeframe)
+        self.report["seconds"] = round(time.perf_counter() - self.started, 3)
+        return self.report
+
+
+def import_candle_files(paths: Iterable[str], exchange: str, symbol: str, timeframe: str,
+                        processes: int = None) -> Dict[str, Any]:
+    """CLI-এর জন্য: নিজস্ব প্রসেস পুলে ফাইলগুলো পার্স করে স্টোরে লেখে এবং একটি সারাংশ ফেরত দেয়।"""
+    files = [str(p) for p in discover_files(paths)]
+    summary = _ImportSummary(len(files))
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_parse_safely, path) for path in files]
+        for future in as_completed(futures):
+            summary.add(exchange, symbol, timeframe, *future.result())
+    return summary.finish(exchange, symbol, timeframe)
+
+
+# সব ইম্পোর্ট জব মিলিয়ে একসাথে কতগুলো ফাইল শেয়ার করা ওয়ার্কার পুলে পার্স হবে
+_parse_slots: Optional[asyncio.Semaphore] = None
+
+async def _parse_in_worker(path: str):
+    global _parse_slots
+    if _parse_slots is None:
+        _parse_slots = asyncio.Semaphore(max(1, config.CANDLE_IMPORT_CONCURRENCY))
+    async with _parse_slots:
+        return await run_in_worker(_parse_safely, path)
+
+
+async def import_candle_files_async(paths: Iterable[str], exchange: str, symbol: str, timeframe: str) -> Dict[str, Any]:
+    """
+    API-র জন্য: ব্যাকটেস্টের ওয়ার্কার পুলে পার্স করে; লেখা থ্রেডে হয়, তাই ইভেন্ট লুপ আটকে থাকে না।
+    একসাথে সর্বোচ্চ CANDLE_IMPORT_CONCURRENCYটি ফাইল পুলে যায়, তাই বড় আপলোডের সময়ও ব্যাকটেস্টের জন্য স্লট খালি থাকে।
+    """
+    files = [str(p) for p in await asyncio.to_thread(discover_files, paths)]
+    summary = _ImportSummary(len(files))
+    for completed in asyncio.as_completed([_parse_in_worker(path) for path in files]):
+        result = await completed
+        await asyncio.to_thread(summary.add, exchange, symbol, timeframe, *result)
+    return await asyncio.to_thread(summary.finish, exchange, symbol, timeframe)
+
+# ==============================================================================
+#  API জব (Background import jobs)
+# ==============================================================================
+
+IMPORT_JOBS: Dict[str, Dict[str, Any]] = {}
+
+
+def resolve_import_paths(paths: Iterable[str]) -> List[str]:
+    """
+    API থেকে আসা পাথগুলো CANDLE_IMPORT_ROOT-এর সাপেক্ষে রিজলভ করে; এর বাইরের কোনো পাথ
+    (যেমন ../ বা অ্যাবসলিউট পাথ দিয়ে) গ্রহণ করা হয় না, যাতে API দিয়ে সার্ভারের যেকোনো ফাইল পড়া না যায়।
+    """
+    root = Path(config.CANDLE_IMPORT_ROOT).resolve()
+    resolved = []
+    for raw in paths:
+        path = (root / raw).resolve()
+        if path != root and root not in path.parents:
+            raise ValueError(f"'{raw}' is outside the import folder.")
+        resolved.append(str(path))
+    return resolved
+
+
+async def _run_import_job(job_id: str, paths: List[str], exchange: str, symbol: str, timeframe: str):
+    job = IMPORT_JOBS[job_id]
+    job["status"] = "running"
+    try:
+        job.update(await import_candle_files_async(paths, exchange, symbol, timeframe))
+        job["status"] = "completed"
+        logger.info("✅ Candle import %s finished: %s rows from %s files.", job_id, job["rows"], job["imported_files"])
+    except Exception as e:
+        logger.exception("Candle import %s failed", job_id)
+        job["status"] = "failed"
+        job["error"] = str(e)
+
+
+def start_import_job(background_tasks, request: Dict[str, Any]) -> str:
+    paths = resolve_import_paths(request["paths"])
+    job_id = uuid.uuid4().hex
+    IMPORT_JOBS[job_id] = {"status": "pending", "exchange": request["exchange"], "symbol": request["symbol"],
+                           "timeframe": request["timeframe"], "files": 0, "imported_files": 0, "rows": 0,
+                           "errors": [], "covered": [], "seconds": None, "error": None}
+    background_tasks.add_task(_run_import_job, job_id, paths, request["exchange"], request["symbol"], request["timeframe"])
+    return job_id
+
+
+def get_import_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return IMPORT_JOBS.get(job_id)
@@ -0,0 +1,411 @@
+# app/services/candle_store.py
+
+from __future__ import annotations
+
+import calendar
+import datetime
+import functools
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .. import config
+from ..lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+
+# ==============================================================================
+#  ক্যান্ডেল স্টোর: (exchange, symbol, timeframe, month) অনুযায়ী ভাগ করা Arrow IPC ফাইল
+#
+#  cache/candles/binance/BTC_USDT/1h/2024-01.arrow
+#  cache/candles/binance/BTC_USDT/1h/coverage.json
+#
+#  ফাইলগুলো কমপ্রেস ছাড়া Arrow IPC ফরম্যাটে লেখা হয়, তাই memory-map করে পড়া যায়:
+#  একাধিক ওয়ার্কার প্রসেস OS-এর একই পেজ ক্যাশ শেয়ার করে এবং কোনো ডিকোডিং লাগে না।
+# ==============================================================================
+
+CANDLE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+COVERAGE_FILE = "coverage.json"
+
+@functools.lru_cache(maxsize=None)
+def candle_schema() -> pa.Schema:
+    """পার্টিশন ফাইলের Arrow স্কিমা (pyarrow প্রথম ব্যবহারের সময় লোড হয়)।"""
+    return pa.schema([
+        # ns রেজোলিউশন pandas-এর datetime64[ns]-এর সাথে মেলে, তাই রূপান্তরে কপি লাগে না
+        ("timestamp", pa.timestamp("ns")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.float64()),
+    ])
+
+# একই প্রসেসে একই সিরিজে একসাথে দুটি লেখা যেন না হয়
+_series_locks = {}
+_series_locks_guard = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CandleSpec:
+    """
+    একটি ডেটাসেটের বর্ণনা (ডেটা নয়)। ওয়ার্কার প্রসেসে ডেটাফ্রেম pickle করে না পাঠিয়ে
+    এটি পাঠানো হয়, এবং ওয়ার্কার নিজেই স্টোর থেকে memory-map করে পড়ে।
+    start_ms অন্তর্ভুক্ত, end_ms বহির্ভূত (UTC মিলিসেকেন্ড)।
+    """
+    exchange: str
+    symbol: str
+    timeframe: str
+    start_ms: int
+    end_ms: int
+
+
+def date_range_to_ms(start_date: datetime.date, end_date: datetime.date) -> Tuple[int, int]:
+    """[start_date 00:00 UTC, end_date-এর পরের দিন 00:00 UTC) রেঞ্জকে মিলিসেকেন্ডে রূপান্তর করে।"""
+    start_ms = calendar.timegm(start_date.timetuple()) * 1000
+    end_ms = calendar.timegm((end_date + datetime.timedelta(days=1)).timetuple()) * 1000
+    return start_ms, end_ms
+
+def _series_lock(series: Path) -> threading.Lock:
+    with _series_locks_guard:
+        return _series_locks.setdefault(str(series), threading.Lock())
+
+def store_root() -> Path:
+    return Path(config.CACHE_DIR) / "candles"
+
+def series_dir(exchange: str, symbol: str, timeframe: str) -> Path:
+    return store_root() / exchange.lower() / symbol.replace("/", "_") / timeframe
+
+def _month_key(ts_ms: int) -> str:
+    dt = datetime.datetime.fromtimestamp(ts_ms / 1000, datetime.timezone.utc)
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+def _months_between(start_ms: int, end_ms: int) -> List[str]:
+    """[start_ms, end_ms) রেঞ্জ যে মাসগুলো স্পর্শ করে তাদের 'YYYY-MM' কী।"""
+    if end_ms <= start_ms:
+        return []
+    start = datetime.datetime.fromtimestamp(start_ms / 1000, datetime.timezone.utc)
+    last = datetime.datetime.fromtimestamp((end_ms - 1) / 1000, datetime.timezone.utc)
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (last.year, last.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+# ==============================================================================
+#  কভারেজ ম্যানিফেস্ট (কোন সময়সীমা ইতিমধ্যে এক্সচেঞ্জ থেকে আনা হয়েছে)
+# ==============================================================================
+
+def _merge_intervals(intervals: List[List[int]]) -> List[List[int]]:
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def get_coverage(exchange: str, symbol: str, timeframe: str) -> List[List[int]]:
+    path = series_dir(exchange, symbol, timeframe) / COVERAGE_FILE
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return []
+
+def _save_coverage(series: Path, intervals: List[List[int]]):
+    tmp_path = series / (COVERAGE_FILE + ".tmp")
+    tmp_path.write_text(json.dumps(_merge_intervals(intervals)))
+    os.replace(tmp_path, series / COVERAGE_FILE)
+
+def missing_ranges(exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+    """অনুরোধ করা রেঞ্জের যে অংশগুলো এখনো স্টোরে নেই, সেগুলো ফেরত দেয়।"""
+    gaps = []
+    cursor = start_ms
+    for cov_start, cov_end in get_coverage(exchange, symbol, timeframe):
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end_ms:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, min(cov_start, end_ms)))
+        cursor = max(cursor, cov_end)
+        if cursor >= end_ms:
+            break
+    if cursor < end_ms:
+        gaps.append((cursor, end_ms))
+    return gaps
+
+# ==============================================================================
+#  লেখা (Writing partitions)
+# ==============================================================================
+
+def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[CANDLE_COLUMNS].copy()
+    if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df['timestamp'] = df['timestamp'].astype("datetime64[ns]")
+    for col in CANDLE_COLUMNS[1:]:
+        df[col] = df[col].astype("float64")
+    return df
+
+def _read_partition_frame(path: Path) -> pd.DataFrame:
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+def _write_partition(path: Path, df: pd.DataFrame):
+    table = pa.Table.from_pandas(df, schema=candle_schema(), preserve_index=False)
+    tmp_path = path.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, candle_schema()) as writer:
+            writer.write_table(table)
+    # os.replace পারমাণবিক, তাই পাঠরত প্রসেসগুলো কখনো অর্ধেক লেখা ফাইল দেখে না
+    os.replace(tmp_path, path)
+
+def write_candles(exchange: str, symbol: str, timeframe: str, df: pd.DataFrame,
+                  covered_start_ms: Optional[int] = None, covered_end_ms: Optional[int] = None,
+                  covered_ranges: Optional[Iterable[Tuple[int, int]]] = None) -> int:
+    """
+    ক্যান্ডেলগুলো মাসভিত্তিক পার্টিশনে একত্রিত করে (timestamp অনুযায়ী ডুপ্লিকেট বাদ দিয়ে) লেখে।
+    covered_* দিলে সেই রেঞ্জটি (এবং covered_ranges-এর প্রতিটি রেঞ্জ) কভারেজ ম্যানিফেস্টে যোগ হয়, যাতে পরে
+    আবার ডাউনলোড করতে না হয়। লেখা ক্যান্ডেলের সংখ্যা ফেরত দেয়।
+    """
+    series = series_dir(exchange, symbol, timeframe)
+    series.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with _series_lock(series):
+        if df is not None and not df.empty:
+            df = _normalize_frame(df)
+            month_keys = df['timestamp'].dt.strftime("%Y-%m")
+            for month, part in df.groupby(month_keys, sort=False):
+                path = series / f"{month}.arrow"
+                if path.exists():
+                    part = pd.concat([_read_partition_frame(path), part], ignore_index=True)
+                part = part.drop_duplicates(subset='timestamp', keep='last').sort_values('timestamp')
+                _write_partition(path, part)
+                written += len(part)
+        ranges = list(covered_ranges or [])
+        if covered_start_ms is not None and covered_end_ms is not None:
+            ranges.append((covered_start_ms, covered_end_ms))
+        ranges = [[int(start), int(end)] for start, end in ranges if end > start]
+        if ranges:
+            _save_coverage(series, get_coverage(exchange, symbol, timeframe) + ranges)
+    return written
+
+# ==============================================================================
+#  পড়া (Memory-mapped reads)
+# ==============================================================================
+
+def _partition_paths(spec: CandleSpec) -> List[Path]:
+    series = series_dir(spec.exchange, spec.symbol, spec.timeframe)
+    return [p for p in (series / f"{m}.arrow" for m in _months_between(spec.start_ms, spec.end_ms)) if p.exists()]
+
+def _range_mask(timestamps, spec: CandleSpec):
+    start = pa.scalar(spec.start_ms * 1_000_000, type=pa.timestamp("ns"))
+    end = pa.scalar(spec.end_ms * 1_000_000, type=pa.timestamp("ns"))
+    return pc.and_(pc.greater_equal(timestamps, start), pc.less(timestamps, end))
+
+def _filter_range(table: pa.Table, spec: CandleSpec) -> pa.Table:
+    return table.filter(_range_mask(table['timestamp'], spec))
+
+def read_candles_table(spec: CandleSpec) -> pa.Table:
+    """
+    রেঞ্জের মধ্যে পড়া মাসগুলোর পার্টিশন memory-map করে একটি Arrow টেবিল দেয়।
+    টেবিলের বাফারগুলো সরাসরি ম্যাপ করা ফাইলের পেজ, তাই কোনো কপি বা ডিকোড হয় না।
+    """
+    tables = []
+    for path in _partition_paths(spec):
+        source = pa.memory_map(str(path), "r")
+        tables.append(pa.ipc.open_file(source).read_all())
+    if not tables:
+        return candle_schema().empty_table()
+    return _filter_range(pa.concat_tables(tables), spec)
+
+def iter_candle_frames(spec: CandleSpec, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    রেঞ্জের ক্যান্ডেলগুলো সময়ক্রমে সর্বোচ্চ chunk_rows সারির ডেটাফ্রেম হিসেবে একে একে দেয়।
+    একবারে একটি মাসের পার্টিশন ম্যাপ করা হয় এবং শুধু চলতি খণ্ডটি pandas-এ রূপান্তর হয়,
+    তাই রেঞ্জ যত বড়ই হোক প্রসেসের মেমরি সীমিত থাকে।
+    """
+    for path in _partition_paths(spec):
+        with pa.memory_map(str(path), "r") as source:
+            table = _filter_range(pa.ipc.open_file(source).read_all(), spec)
+            for offset in range(0, table.num_rows, chunk_rows):
+                yield table.slice(offset, chunk_rows).to_pandas(split_blocks=True).reset_index(drop=True)
+
+def read_candles(spec: CandleSpec) -> pd.DataFrame:
+    """
+    স্টোর থেকে রেঞ্জের ক্যান্ডেলগুলো fetch_historical_data-এর মতো একই কলামসহ pandas
+    ডেটাফ্রেম হিসেবে দেয়। শুধুমাত্র অনুরোধ করা রেঞ্জের সারিগুলো প্রসেসের নিজস্ব মেমরিতে আসে।
+    """
+    table = read_candles_table(spec)
+    df = table.to_pandas(split_blocks=True)
+    return df.reset_index(drop=True)
+
+def count_candles(spec: CandleSpec) -> int:
+    # পার্টিশন একে একে গোনা হয়; filter() ডেটা কপি করে, তাই পুরো রেঞ্জের টেবিল তৈরি করা হয় না
+    total = 0
+    for path in _partition_paths(spec):
+        with pa.memory_map(str(path), "r") as source:
+            timestamps = pa.ipc.open_file(source).read_all()['timestamp']
+            total += pc.sum(_range_mask(timestamps, spec)).as_py() or 0
+    return total
+
+def data_version(spec: CandleSpec) -> str:
+    """
+    রেঞ্জের পার্টিশন ফাইলগুলোর আকার এবং পরিবর্তনের সময় থেকে একটি সস্তা ভার্সন হ্যাশ।
+    পার্টিশন শুধুমাত্র ডেটা পরিবর্তন হলেই নতুন করে লেখা হয়, তাই ডেটা না পড়েই ক্যাশ অবৈধ করা যায়।
+    """
+    digest = hashlib.sha256(f"{spec}".encode())
+    for path in _partition_paths(spec):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+# ==============================================================================
+#  লোকাল রিস্যাম্পলিং (ছোট টাইমফ্রেমের ক্যান্ডেল থেকে বড় টাইমফ্রেম তৈরি)
+# ==============================================================================
+
+_TIMEFRAME_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+# এক্সচেঞ্জগুলো (যেমন Binance) সাপ্তাহিক ক্যান্ডেল সোমবার 00:00 UTC থেকে শুরু করে; 1970-01-05 প্রথম সোমবার
+WEEK_ORIGIN_MS = 4 * 86_400_000
+
+def timeframe_to_ms(timeframe: str) -> Optional[int]:
+    """'15m', '4h', '1w' ইত্যাদিকে মিলিসেকেন্ডে রূপান্তর করে। মাস/বছরের মতো ক্যালেন্ডার টাইমফ্রেমে None।"""
+    unit = timeframe[-1:]
+    if unit not in _TIMEFRAME_UNIT_MS or not timeframe[:-1].isdigit():
+        return None
+    return int(timeframe[:-1]) * _TIMEFRAME_UNIT_MS[unit]
+
+def _bucket_origin_ms(timeframe: str) -> int:
+    return WEEK_ORIGIN_MS if timeframe.endswith("w") else 0
+
+def align_down(ts_ms: int, timeframe: str) -> int:
+    """ts_ms যে ক্যান্ডেলের মধ্যে পড়ে, তার শুরুর সময় (এক্সচেঞ্জের বাকেট সীমানা অনুযায়ী)।"""
+    tf_ms, origin = timeframe_to_ms(timeframe), _bucket_origin_ms(timeframe)
+    return (ts_ms - origin) // tf_ms * tf_ms + origin
+
+def align_up(ts_ms: int, timeframe: str) -> int:
+    start = align_down(ts_ms, timeframe)
+    return start if start == ts_ms else start + timeframe_to_ms(timeframe)
+
+def can_resample(base_timeframe: str, target_timeframe: str) -> bool:
+    """base-এর প্রতিটি ক্যান্ডেল ঠিক একটি target বাকেটের মধ্যে পড়ে কিনা।"""
+    base_ms, target_ms = timeframe_to_ms(base_timeframe), timeframe_to_ms(target_timeframe)
+    if base_ms is None or target_ms is None or base_ms >= target_ms:
+        return False
+    return target_ms % base_ms == 0 and _bucket_origin_ms(target_timeframe) % base_ms == 0
+
+def resample_candles(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    OHLCV ক্যান্ডেলগুলোকে বড় টাইমফ্রেমে একত্রিত করে: open প্রথম, high সর্বোচ্চ, low সর্বনিম্ন,
+    close শেষ এবং volume যোগফল। বাকেটগুলো epoch (সাপ্তাহিক হলে সোমবার) থেকে সারিবদ্ধ।
+    ইনপুট timestamp অনুযায়ী সাজানো থাকতে হবে।
+    """
+    if df.empty:
+        return df[CANDLE_COLUMNS].copy()
+    tf_ns = timeframe_to_ms(timeframe) * 1_000_000
+    origin_ns = _bucket_origin_ms(timeframe) * 1_000_000
+    ts_ns = df['timestamp'].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    buckets = (ts_ns - origin_ns) // tf_ns * tf_ns + origin_ns
+
+    # ইনপুট সাজানো থাকায় প্রতিটি বাকেট একটি ধারাবাহিক অংশ; reduceat দিয়ে এক পাসে একত্রিত করা যায়
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    return pd.DataFrame({
+        'timestamp': buckets[starts].view("datetime64[ns]"),
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(), starts),
+    })
+
+def cached_timeframes(exchange: str, symbol: str) -> List[str]:
+    """এই সিম্বলের জন্য স্টোরে যে টাইমফ্রেমগুলোর কভারেজ আছে।"""
+    root = series_dir(exchange, symbol, "_").parent
+    if not root.is_dir():
+        return []
+    return [p.name for p in root.iterdir() if (p / COVERAGE_FILE).exists()]
+
+def _present_ranges(exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+    """missing_ranges-এর উল্টো: রেঞ্জের যে অংশগুলো স্টোরে আছে।"""
+    present, cursor = [], start_ms
+    for gap_start, gap_end in missing_ranges(exchange, symbol, timeframe, start_ms, end_ms):
+        if gap_start > cursor:
+            present.append((cursor, gap_start))
+        cursor = gap_end
+    if cursor < end_ms:
+        present.append((cursor, end_ms))
+    return present
+
+def contiguous_ranges(timestamps_ms: np.ndarray, timeframe: str) -> List[Tuple[int, int]]:
+    """
+    সাজানো ক্যান্ডেল timestamp-গুলোর যে অংশে কোনো ক্যান্ডেল বাদ নেই (পাশাপাশি দুটির ব্যবধান ঠিক এক টাইমফ্রেম),
+    সেগুলো _present_ranges-এর মতোই [প্রথম ক্যান্ডেল, শেষ ক্যান্ডেলের শেষ) রেঞ্জ হিসেবে ফেরত দেয়।
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    if len(timestamps_ms) == 0 or tf_ms is None:
+        return []
+    breaks = np.flatnonzero(np.diff(timestamps_ms) != tf_ms)
+    starts = np.r_[0, breaks + 1]
+    lasts = np.r_[breaks, len(timestamps_ms) - 1]
+    return [(int(timestamps_ms[i]), int(timestamps_ms[j]) + tf_ms) for i, j in zip(starts, lasts)]
+
+def resample_into_store(exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int,
+                        forming_ms: int) -> bool:
+    """
+    [start_ms, end_ms) রেঞ্জের target টাইমফ্রেমের ক্যান্ডেল স্টোরে থাকা ছোট টাইমফ্রেম থেকে তৈরি করে লেখে।
+    শুধু সেই target ক্যান্ডেলগুলো তৈরি হয় যাদের পুরো সময়টা কোনো base সিরিজে আছে; base-এর ফাঁকে পড়া
+    অংশগুলো কভারেজের বাইরে থাকে, তাই কলার শুধু সেটুকুই এক্সচেঞ্জ থেকে আনে। forming_ms থেকে শুরু
+    হওয়া (এখনো তৈরি হচ্ছে এমন) ক্যান্ডেলটি বাদ দেওয়া হয়। কিছু লেখা হলে True ফেরত দেয়।
+    """
+    if timeframe_to_ms(timeframe) is None:
+        return False
+    covered_end = min(end_ms, forming_ms)
+    if covered_end <= start_ms:
+        return False
+    # সবচেয়ে বড় উপযুক্ত base আগে চেষ্টা করা হয়: ফলাফল একই, কিন্তু একত্রিত করার মতো সারি কম।
+    # একটি base যে অংশ কভার করে না, সেটুকু পরের (ছোট) base দিয়ে চেষ্টা করা হয়।
+    candidates = sorted((tf for tf in cached_timeframes(exchange, symbol) if can_resample(tf, timeframe)),
+                        key=timeframe_to_ms, reverse=True)
+    if not candidates:
+        return False
+    if align_up(start_ms, timeframe) >= min(align_up(covered_end, timeframe), forming_ms):
+        # রেঞ্জে কোনো target ক্যান্ডেল শুরু হয় না; আনার মতো কিছু নেই
+        write_candles(exchange, symbol, timeframe, None, start_ms, covered_end)
+        return True
+    remaining = [(start_ms, covered_end)]
+    wrote = False
+    for base in candidates:
+        still_missing = []
+        for lo, hi in remaining:
+            first_bucket = align_up(lo, timeframe)
+            needed_end = min(align_up(hi, timeframe), forming_ms)
+            cursor = lo
+            for piece_start, piece_end in _present_ranges(exchange, symbol, base, first_bucket, needed_end):
+                # base-এ পুরোপুরি থাকা target বাকেটগুলো; আংশিক বাকেট তৈরি করা হয় না
+                bucket_lo, bucket_hi = align_up(piece_start, timeframe), align_down(piece_end, timeframe)
+                if bucket_hi <= bucket_lo:
+                    continue
+                base_df = read_candles(CandleSpec(exchange, symbol, base, bucket_lo, bucket_hi))
+                part_start = lo if bucket_lo == first_bucket else bucket_lo
+                part_end = hi if bucket_hi == needed_end else bucket_hi
+                write_candles(exchange, symbol, timeframe, resample_candles(base_df, timeframe), part_start, part_end)
+                wrote = True
+                if part_start > cursor:
+                    still_missing.append((cursor, part_start))
+                cursor = part_end
+            if cursor < hi:
+                still_missing.append((cursor, hi))
+        remaining = still_missing
+        if not remaining:
+            break
+    return wrote
@@ -1,17 +1,24 @@
 # app/services/exchange_manager.py (চূড়ান্ত এবং নির্ভরযোগ্য async সংস্করণ)
 
-import ccxt
-import ccxt.async_support as ccxt_async
 from fastapi import HTTPException
 from typing import List
 
+from ..lazy_imports import lazy_import
+from .metrics import metrics
+from . import request_scheduler
+
+ccxt = lazy_import("ccxt")
+ccxt_async = lazy_import("ccxt.async_support")
+
 # ==============================================================================
 #  সিঙ্ক্রোনাস ফাংশন (API Key পরীক্ষার জন্য)
 #  - এই ফাংশনটি অপরিবর্তিত রাখা হয়েছে, কারণ এটি সঠিক এবং শক্তিশালী।
 # ==============================================================================
-def get_exchange_client(exchange_name: str, api_key: str, api_secret: str):
+def get_exchange_client(exchange_name: str, api_key: str, api_secret: str,
+                        priority: str = request_scheduler.INTERACTIVE):
     """
     একটি নির্দিষ্ট এক্সচেঞ্জের জন্য ccxt ক্লায়েন্ট তৈরি করে এবং সংযোগ পরীক্ষা করে।
+    ক্লায়েন্টের সব কল priority অগ্রাধিকারে এক্সচেঞ্জের রিকোয়েস্ট শিডিউলারের মধ্য দিয়ে যায়।
     """
     try:
         exchange_class = getattr(ccxt, exchange_name.lower())
@@ -23,12 +30,15 @@ def get_exchange_client(exchange_name: str, api_key: str, api_secret: str):
             'timeout': 30000,
             'adjustForTimeDifference': True,
         })
+        request_scheduler.attach(exchange, priority)
         
         # সংযোগ পরীক্ষা করার জন্য fetch_balance() একটি ভালো উপায়
+        metrics.inc("exchange_requests_total", exchange=exchange_name.lower(), method="fetch_balance")
         exchange.fetch_balance()
         return exchange
 
     except ccxt.RequestTimeout as e:
+        metrics.inc("exchange_errors_total", exchange=exchange_name.lower(), method="fetch_balance")
         detail = f"Connection to {exchange_name.capitalize()} timed out. Check network or firewall. Details: {e}"
         raise HTTPException(status_code=504, detail=detail)
 
@@ -37,6 +47,7 @@ def get_exchange_client(exchange_name: str, api_key: str, api_secret: str):
         raise HTTPException(status_code=401, detail=detail)
 
     except ccxt.NetworkError as e:
+        metrics.inc("exchange_errors_total", exchange=exchange_name.lower(), method="fetch_balance")
         detail = f"Network error connecting to {exchange_name.capitalize()}. Details: {e}"
         raise HTTPException(status_code=503, detail=detail)
 
@@ -49,6 +60,16 @@ def get_exchange_client(exchange_name: str, api_key: str, api_secret: str):
         raise HTTPException(status_code=500, detail=detail)
 
 
+def get_public_client(exchange_name: str, priority: str = request_scheduler.INTERACTIVE):
+    """
+    API Key ছাড়া একটি সিঙ্ক্রোনাস ccxt ক্লায়েন্ট, শুধু পাবলিক মার্কেট ডেটার জন্য (যেমন পেপার ট্রেডিংয়ে)।
+    """
+    exchange_class = getattr(ccxt, exchange_name.lower(), None)
+    if exchange_class is None:
+        raise ValueError(f"The exchange '{exchange_name}' is not supported.")
+    return request_scheduler.attach(exchange_class({'timeout': 30000, 'options': {'defaultType': 'spot'}}), priority)
+
+
 # ==============================================================================
 #  অ্যাসিঙ্ক্রোনাস ফাংশন (মার্কেট তালিকা আনার জন্য)
 #  - এই ফাংশনটি এখন সম্পূর্ণরূপে async-সম্মত এবং ত্রুটিমুক্ত।
@@ -63,9 +84,10 @@ async def get_all_markets(exchange_name: str) -> List[str]:
         exchange_class = getattr(ccxt_async, exchange_name.lower())
         
         # aiohttp-এর জন্য ৩০ সেকেন্ডের একটি কানেকশন টাইমআউট সেট করা হচ্ছে
-        exchange = exchange_class()
+        exchange = request_scheduler.attach(exchange_class())
         
         # load_markets() একটি async ফাংশন, তাই await আবশ্যক
+        metrics.inc("exchange_requests_total", exchange=exchange_name.lower(), method="load_markets")
         await exchange.load_markets(True) # True প্যারামিটার দিয়ে রিলোড ফোর্স করা হচ্ছে
         markets_data = exchange.markets
         
@@ -88,6 +110,7 @@ async def get_all_markets(exchange_name: str) -> List[str]:
         raise ValueError(f"The exchange '{exchange_name}' is not supported.")
     except Exception as e:
         # যেকোনো নেটওয়ার্ক বা অন্য সমস্যার জন্য
+        metrics.inc("exchange_errors_total", exchange=exchange_name.lower(), method="load_markets")
         raise ValueError(f"Could not fetch markets for '{exchange_name.capitalize()}'. Network issue or exchange error. Details: {e}")
     finally:
         # নিশ্চিত করা যে এক্সচেঞ্জ সেশন সবসময় বন্ধ হয়
@@ -0,0 +1,590 @@
+# app/services/indicators.py
+
+from __future__ import annotations
+
+import importlib
+import math
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .. import config
+from ..lazy_imports import lazy_import
+
+# API চালু হওয়ার সময় numpy/pandas লোড হয় না; প্রথম ইন্ডিকেটর কলে হয়
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# ==============================================================================
+#  ইন্ডিকেটর ফ্যাসাড (Indicator facade with pluggable backends)
+#
+#  স্ট্র্যাটেজিগুলো ইন্ডিকেটর নাম ধরে ডাকে (indicators.rsi(...) বা indicators.compute("rsi", ...)),
+#  কোন লাইব্রেরি হিসাব করবে তা এখানে ঠিক হয়। প্রতিটি ইন্ডিকেটরের তিন রকম ইমপ্লিমেন্টেশন থাকতে পারে:
+#    - talib:     C লাইব্রেরি, সবচেয়ে দ্রুত এবং প্রতি কলে খরচ সবচেয়ে কম
+#    - numpy:     এই মডিউলের নিজস্ব ভেক্টরাইজড ইমপ্লিমেন্টেশন (রিকার্সিভ স্মুদিংয়ে pandas ewm), কোনো
+#                 বাড়তি লাইব্রেরি লাগে না; সংজ্ঞা এবং ওয়ার্ম-আপ TA-Lib-এর মতো
+#    - pandas_ta: বিশুদ্ধ pandas, সবচেয়ে ধীর
+#  PREFERENCE-এ প্রতিটি ইন্ডিকেটরের জন্য indicator_benchmark.py-তে মাপা দ্রুততম থেকে ধীরতম ক্রম রাখা
+#  আছে; এই মেশিনে ইনস্টল থাকা প্রথম ব্যাকএন্ডটি ব্যবহার হয়। INDICATOR_BACKEND দিয়ে একটি নির্দিষ্ট
+#  ব্যাকএন্ড জোর করে বেছে নেওয়া যায় (যেমন ব্যাকএন্ডগুলোর ফলাফল মেলাতে)।
+#
+#  সব ফাংশন ইনপুটের index সহ pandas Series (বা DataFrame) ফেরত দেয়; ওয়ার্ম-আপের মানগুলো NaN।
+#  একাধিক লাইনের ইন্ডিকেটরের কলামের নাম লাইব্রেরি নির্বিশেষে একই:
+#    macd → macd, signal, hist    bbands → lower, middle, upper
+#    stoch → k, d                 supertrend → supertrend, direction (1 আপট্রেন্ড, -1 ডাউনট্রেন্ড)
+# ==============================================================================
+
+BACKENDS = ("talib", "numpy", "pandas_ta")
+
+PREFERENCE: Dict[str, tuple] = {
+    "sma": ("talib", "numpy", "pandas_ta"),
+    "ema": ("talib", "numpy", "pandas_ta"),
+    "rsi": ("talib", "numpy", "pandas_ta"),
+    "macd": ("talib", "numpy", "pandas_ta"),
+    "bbands": ("talib", "numpy", "pandas_ta"),
+    "stoch": ("talib", "numpy", "pandas_ta"),
+    "atr": ("talib", "numpy", "pandas_ta"),
+    "obv": ("talib", "numpy", "pandas_ta"),
+    # TA-Lib-এ Supertrend নেই; numpy ইমপ্লিমেন্টেশন ATR-এর জন্য আবার এই রেজিস্ট্রিই ব্যবহার করে
+    "supertrend": ("numpy", "pandas_ta"),
+}
+
+# ইন্ডিকেটর -> ব্যাকএন্ড -> ফাংশন
+_REGISTRY: Dict[str, Dict[str, Callable]] = {}
+# ব্যাকএন্ড লাইব্রেরি ইম্পোর্ট করা যায় কিনা (প্রথমবার দরকার হলে যাচাই করা হয়)
+_AVAILABLE: Dict[str, bool] = {"numpy": True}
+_resolved: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def register(name: str, backend: str):
+    """একটি ইন্ডিকেটরের একটি ব্যাকএন্ড ইমপ্লিমেন্টেশন রেজিস্টার করার ডেকোরেটর।"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend '{backend}'.")
+
+    def decorator(func: Callable) -> Callable:
+        _REGISTRY.setdefault(name, {})[backend] = func
+        return func
+    return decorator
+
+
+def backend_available(backend: str) -> bool:
+    available = _AVAILABLE.get(backend)
+    if available is None:
+        try:
+            importlib.import_module(backend)
+            available = True
+        except ImportError:
+            available = False
+        _AVAILABLE[backend] = available
+    return available
+
+
+def available_backends(name: str) -> List[str]:
+    """এই মেশিনে ইন্ডিকেটরটির যে ব্যাকএন্ডগুলো চালানো যায়, পছন্দের ক্রমে।"""
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown indicator '{name}'.")
+    return [backend for backend in PREFERENCE[name] if backend in _REGISTRY[name] and backend_available(backend)]
+
+
+def backend_for(name: str) -> str:
+    """ইন্ডিকেটরটির জন্য ব্যবহৃত ব্যাকএন্ড: INDICATOR_BACKEND (সম্ভব হলে), নাহলে দ্রুততম ইনস্টল করা।"""
+    backend = _resolved.get(name)
+    if backend is None:
+        with _lock:
+            candidates = available_backends(name)
+            forced = config.INDICATOR_BACKEND
+            backend = forced if forced in candidates else candidates[0]
+            _resolved[name] = backend
+    return backend
+
+
+def compute(name: str, *args, backend: Optional[str] = None, **kwargs):
+    """নাম ধরে ইন্ডিকেটর হিসাব করে; backend দিলে সেই ইমপ্লিমেন্টেশন (বেঞ্চমার্ক এবং সমতা পরীক্ষার জন্য)।"""
+    backend = backend or backend_for(name)
+    try:
+        func = _REGISTRY[name][backend]
+    except KeyError:
+        raise ValueError(f"Indicator '{name}' has no '{backend}' implementation.") from None
+    return func(*args, **kwargs)
+
+
+def indicator_names() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def _decay_bars(alpha: float, tolerance: float) -> int:
+    # (1 - alpha)^n <= tolerance হওয়ার জন্য ন্যূনতম n
+    return max(0, math.ceil(math.log(tolerance) / math.log(1.0 - alpha))) if alpha < 1 else 0
+
+def settling_bars(name: str, *params, tolerance: Optional[float] = None) -> int:
+    """
+    শেষ মানটি পুরো হিস্টোরির মানের সাথে মেলাতে বর্তমান ক্যান্ডেলসহ কতগুলো ক্যান্ডেল লাগে।
+    sma, bbands এবং stoch শুধু নির্দিষ্ট উইন্ডোর উপর নির্ভর করে, তাই সংখ্যাটি সঠিক। ema, rsi, atr এবং
+    macd রিকার্সিভ: উইন্ডোর শুরুর সিড কখনো পুরোপুরি মুছে যায় না, তাই এখানে ওয়ার্ম-আপের পরে এতগুলো
+    ক্যান্ডেল যোগ হয় যাতে সিডের ওজন tolerance-এর (ডিফল্ট INDICATOR_SETTLE_TOLERANCE) নিচে নামে।
+    তখন মানের ভুল সর্বোচ্চ tolerance × (কাটা সিড আর আসল মানের ব্যবধান)। obv ও supertrend এখানে নেই:
+    OBV ক্রমযোজিত (কখনো মেলে না), Supertrend-এর দিক পথের উপর নির্ভর করে।
+    """
+    tolerance = tolerance or config.INDICATOR_SETTLE_TOLERANCE
+    if name in ("sma", "bbands"):
+        return int(params[0])
+    if name == "stoch":
+        k, d, smooth_k = params
+        return k + smooth_k + d - 2
+    if name == "ema":
+        length = params[0]
+        return length + _decay_bars(2.0 / (length + 1), tolerance)
+    if name in ("rsi", "atr"):
+        # প্রথম মানের জন্য length-টি পরিবর্তন (length + 1 ক্যান্ডেল), তারপর Wilder স্মুদিং
+        length = params[0]
+        return length + 1 + _decay_bars(1.0 / length, tolerance)
+    if name == "macd":
+        fast, slow, signal = params
+        slow = max(fast, slow)
+        # ধীর EMA-র সিড মুছে যাওয়ার পরে সিগন্যাল লাইনের নিজের সিডও মুছে যেতে হয়
+        return (slow + signal - 1 + _decay_bars(2.0 / (slow + 1), tolerance)
+                + _decay_bars(2.0 / (signal + 1), tolerance))
+    raise ValueError(f"Indicator '{name}' has no settling length.")
+
+
+# ==============================================================================
+#  পাবলিক API (স্ট্র্যাটেজিগুলো এগুলো ডাকে)
+# ==============================================================================
+
+def sma(close: pd.Series, length: int) -> pd.Series:
+    return compute("sma", close, length)
+
+def ema(close: pd.Series, length: int) -> pd.Series:
+    return compute("ema", close, length)
+
+def rsi(close: pd.Series, length: int = 14) -> pd.Series:
+    return compute("rsi", close, length)
+
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    return compute("macd", close, fast, slow, signal)
+
+def bbands(close: pd.Series, length: int = 20, std: float = 2.0) -> pd.DataFrame:
+    return compute("bbands", close, length, std)
+
+def stoch(high: pd.Series, low: pd.Series, close: pd.Series, k: int = 14, d: int = 3, smooth_k: int = 3) -> pd.DataFrame:
+    return compute("stoch", high, low, close, k, d, smooth_k)
+
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
+    return compute("atr", high, low, close, length)
+
+def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    return compute("obv", close, volume)
+
+def supertrend(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 7,
+               multiplier: float = 3.0) -> pd.DataFrame:
+    return compute("supertrend", high, low, close, length, multiplier)
+
+
+def _values(series: pd.Series):
+    return series.to_numpy(dtype="float64")
+
+
+# ==============================================================================
+#  TA-Lib ব্যাকএন্ড
+# ==============================================================================
+
+def _talib():
+    import talib
+    return talib
+
+@register("sma", "talib")
+def _sma_talib(close, length):
+    return pd.Series(_talib().SMA(_values(close), timeperiod=length), index=close.index)
+
+@register("ema", "talib")
+def _ema_talib(close, length):
+    return pd.Series(_talib().EMA(_values(close), timeperiod=length), index=close.index)
+
+@register("rsi", "talib")
+def _rsi_talib(close, length):
+    return pd.Series(_talib().RSI(_values(close), timeperiod=length), index=close.index)
+
+@register("macd", "talib")
+def _macd_talib(close, fast, slow, signal):
+    line, signal_line, hist = _talib().MACD(_values(close), fastperiod=fast, slowperiod=slow, signalperiod=signal)
+    return pd.DataFrame({"macd": line, "signal": signal_line, "hist": hist}, index=close.index)
+
+@register("bbands", "talib")
+def _bbands_talib(close, length, std):
+    upper, middle, lower = _talib().BBANDS(_values(close), timeperiod=length, nbdevup=std, nbdevdn=std, matype=0)
+    return pd.DataFrame({"lower": lower, "middle": middle, "upper": upper}, index=close.index)
+
+@register("stoch", "talib")
+def _stoch_talib(high, low, close, k, d, smooth_k):
+    # talib.STOCH %D তৈরি হওয়ার আগ পর্যন্ত %K-ও NaN রাখে, ফলে pandas_ta-র তুলনায় %K d-1টি ক্যান্ডেল দেরিতে
+    # আসে। তাই STOCHF-এর fast %K থেকে নিজে স্মুদ করা হয়; মানগুলো STOCH-এর সাথে হুবহু মেলে
+    fast_k, _ = _talib().STOCHF(_values(high), _values(low), _values(close), fastk_period=k,
+                                fastd_period=1, fastd_matype=0)
+    slow_k = _talib().SMA(fast_k, timeperiod=smooth_k)
+    slow_d = _talib().SMA(slow_k, timeperiod=d)
+    return pd.DataFrame({"k": slow_k, "d": slow_d}, index=close.index)
+
+@register("atr", "talib")
+def _atr_talib(high, low, close, length):
+    return pd.Series(_talib().ATR(_values(high), _values(low), _values(close), timeperiod=length), index=close.index)
+
+@register("obv", "talib")
+def _obv_talib(close, volume):
+    return pd.Series(_talib().OBV(_values(close), _values(volume)), index=close.index)
+
+
+# ==============================================================================
+#  নিজস্ব NumPy ব্যাকএন্ড (TA-Lib-এর সংজ্ঞা এবং ওয়ার্ম-আপ অনুসরণ করে)
+# ==============================================================================
+
+def _rolling(values, length: int, reducer):
+    """length দৈর্ঘ্যের প্রতিটি উইন্ডোর উপর reducer; প্রথম length-1টি (এবং NaN থাকা উইন্ডো) NaN।"""
+    out = np.full(len(values), np.nan)
+    if length <= len(values):
+        out[length - 1:] = reducer(np.lib.stride_tricks.sliding_window_view(values, length), axis=1)
+    return out
+
+def _seeded_ewm(values, length: int, alpha: float):
+    """
+    প্রথম length-টি বৈধ মানের গড় দিয়ে শুরু করা রিকার্সিভ স্মুদিং (TA-Lib-এর EMA এবং Wilder পদ্ধতি)।
+    শুরুর NaN গুলো (যেমন MACD লাইনের ওয়ার্ম-আপ) বাদ দিয়ে প্রথম বৈধ মান থেকে গোনা হয়।
+    """
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < length:
+        return out
+    seed_end = valid[0] + length
+    seeded = np.concatenate(([values[valid[0]:seed_end].mean()], values[seed_end:]))
+    out[seed_end - 1:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+def _true_range(high, low, close):
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[0] = np.nan  # TA-Lib প্রথম ক্যান্ডেলের TR গণনায় ধরে না
+    return tr
+
+@register("sma", "numpy")
+def _sma_numpy(close, length):
+    return pd.Series(_rolling(_values(close), length, np.mean), index=close.index)
+
+@register("ema", "numpy")
+def _ema_numpy(close, length):
+    return pd.Series(_seeded_ewm(_values(close), length, 2.0 / (length + 1)), index=close.index)
+
+@register("rsi", "numpy")
+def _rsi_numpy(close, length):
+    change = np.diff(_values(close), prepend=np.nan)
+    gains, losses = np.where(change > 0, change, 0.0), np.where(change < 0, -change, 0.0)
+    gains[0] = losses[0] = np.nan  # প্রথম ক্যান্ডেলের কোনো পরিবর্তন নেই
+    gain = _seeded_ewm(gains, length, 1.0 / length)
+    loss = _seeded_ewm(losses, length, 1.0 / length)
+    total = gain + loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = np.where(total == 0, 0.0, 100.0 * gain / total)
+    return pd.Series(values, index=close.index)
+
+@register("macd", "numpy")
+def _macd_numpy(close, fast, slow, signal):
+    values = _values(close)
+    fast, slow = min(fast, slow), max(fast, slow)  # TA-Lib উল্টো দেওয়া পিরিয়ড অদলবদল করে নেয়
+    # TA-Lib দ্রুত EMA-কেও ধীর EMA-র সাথে একই ক্যান্ডেলে শুরু করে (শেষ fast-টি মানের গড় দিয়ে)
+    offset = max(0, slow - fast)
+    fast_ema = np.full(len(values), np.nan)
+    fast_ema[offset:] = _seeded_ewm(values[offset:], fast, 2.0 / (fast + 1))
+    line = fast_ema - _seeded_ewm(values, slow, 2.0 / (slow + 1))
+    signal_line = _seeded_ewm(line, signal, 2.0 / (signal + 1))
+    line[np.isnan(signal_line)] = np.nan  # TA-Lib-এর মতো সিগন্যাল লাইন তৈরি হওয়ার আগে MACD লাইনও NaN
+    return pd.DataFrame({"macd": line, "signal": signal_line, "hist": line - signal_line}, index=close.index)
+
+@register("bbands", "numpy")
+def _bbands_numpy(close, length, std):
+    values = _values(close)
+    middle = _rolling(values, length, np.mean)
+    deviation = _rolling(values, length, np.std) * std  # জনসংখ্যার স্ট্যান্ডার্ড ডেভিয়েশন (ddof=0), TA-Lib-এর মতো
+    return pd.DataFrame({"lower": middle - deviation, "middle": middle, "upper": middle + deviation}, index=close.index)
+
+@register("stoch", "numpy")
+def _stoch_numpy(high, low, close, k, d, smooth_k):
+    lowest = _rolling(_values(low), k, np.min)
+    highest = _rolling(_values(high), k, np.max)
+    span = highest - lowest
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fast_k = np.where(span == 0, 0.0, 100.0 * (_values(close) - lowest) / span)
+    fast_k[np.isnan(span)] = np.nan
+    slow_k = _rolling(fast_k, smooth_k, np.mean)
+    slow_d = _rolling(slow_k, d, np.mean)  # %K নিজের ওয়ার্ম-আপের পরেই আসে, %D-র জন্য অপেক্ষা করে না
+    return pd.DataFrame({"k": slow_k, "d": slow_d}, index=close.index)
+
+@register("atr", "numpy")
+def _atr_numpy(high, low, close, length):
+    tr = _true_range(_values(high), _values(low), _values(close))
+    return pd.Series(_seeded_ewm(tr, length, 1.0 / length), index=close.index)
+
+@register("obv", "numpy")
+def _obv_numpy(close, volume):
+    volumes = _values(volume)
+    signed = np.sign(np.diff(_values(close), prepend=np.nan)) * volumes
+    signed[:1] = volumes[:1]  # TA-Lib-এর মতো প্রথম ক্যান্ডেলের ভলিউম দিয়ে শুরু
+    return pd.Series(np.cumsum(signed), index=close.index)
+
+@register("supertrend", "numpy")
+def _supertrend_numpy(high, low, close, length, multiplier):
+    high_values, low_values, close_values = _values(high), _values(low), _values(close)
+    band = multiplier * atr(high, low, close, length).to_numpy()
+    mid = (high_values + low_values) / 2
+    # ব্যান্ডগুলো আগের মানের উপর নির্ভর করে, তাই লুপ; Python float-এ চালানো numpy স্কেলারের চেয়ে দ্রুত
+    upper, lower, closes = (mid + band).tolist(), (mid - band).tolist(), close_values.tolist()
+    size = len(closes)
+    trend, direction = [np.nan] * size, [np.nan] * size
+    valid = np.flatnonzero(~np.isnan(band))
+    if len(valid):
+        first = int(valid[0])
+        direction[first], trend[first] = 1.0, lower[first]
+        for i in range(first + 1, size):
+            if closes[i] > upper[i - 1]:
+                direction[i] = 1.0
+            elif closes[i] < lower[i - 1]:
+                direction[i] = -1.0
+            else:
+                direction[i] = direction[i - 1]
+                if direction[i] > 0 and lower[i] < lower[i - 1]:
+                    lower[i] = lower[i - 1]
+                if direction[i] < 0 and upper[i] > upper[i - 1]:
+                    upper[i] = upper[i - 1]
+            trend[i] = lower[i] if direction[i] > 0 else upper[i]
+    return pd.DataFrame({"supertrend": trend, "direction": direction}, index=close.index)
+
+
+# ==============================================================================
+#  ইনক্রিমেন্টাল ইন্ডিকেটর (স্ট্রিমিং ব্যাকটেস্টের জন্য)
+#
+#  রিকার্সিভ ইন্ডিকেটরের (EMA, Wilder, OBV) মান পুরো হিস্টোরির উপর নির্ভর করে, তাই ছোট উইন্ডোতে নতুন
+#  করে হিসাব করলে ফলাফল বদলায়। এই ক্লাসগুলো অবস্থা ধরে রেখে প্রতি ক্যান্ডেলে একটি করে মান আপডেট করে।
+#  সংজ্ঞা, সিড এবং যোগ-গুণের ক্রম TA-Lib-এর C লুপের মতোই, তাই পুরো সিরিজে হিসাব করা মানের সাথে পার্থক্য
+#  শুধু রাউন্ডিংয়ের (আপেক্ষিক ~1e-14; TA-Lib-এর বিল্ড FMA ব্যবহার করলে শেষ বিট আলাদা হতে পারে)।
+#  ওয়ার্ম-আপের সময় update() NaN দেয়।
+# ==============================================================================
+
+class EmaStream:
+    """TA-Lib EMA: প্রথম length-টি মানের গড় দিয়ে শুরু। শুরুর NaN ইনপুট বাদ দেওয়া হয়।"""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.k = 2.0 / (length + 1)
+        self.value = math.nan
+        self._count = 0
+        self._total = 0.0
+
+    def update(self, value: float) -> float:
+        if self._count < self.length:
+            if value != value:
+                return self.value
+            self._total += value
+            self._count += 1
+            if self._count == self.length:
+                self.value = self._total / self.length
+        else:
+            self.value = ((value - self.value) * self.k) + self.value
+        return self.value
+
+
+class RsiStream:
+    """TA-Lib RSI: গড় লাভ/ক্ষতি Wilder পদ্ধতিতে স্মুদ করা, প্রথম মান length+1তম ক্যান্ডেলে।"""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.value = math.nan
+        self._previous = None
+        self._count = 0
+        self._gain = 0.0
+        self._loss = 0.0
+
+    def update(self, close: float) -> float:
+        if self._previous is None:
+            self._previous = close
+            return self.value
+        change = close - self._previous
+        self._previous = close
+        if self._count < self.length:
+            self._count += 1
+        else:
+            self._loss *= (self.length - 1)
+            self._gain *= (self.length - 1)
+        if change < 0:
+            self._loss -= change
+        else:
+            self._gain += change
+        if self._count < self.length:
+            return self.value
+        self._count = self.length + 1  # প্রথম গড়ের পর থেকে প্রতি ক্যান্ডেলে Wilder স্মুদিং
+        self._loss /= self.length
+        self._gain /= self.length
+        total = self._gain + self._loss
+        self.value = 100.0 * (self._gain / total) if not -1e-8 < total < 1e-8 else 0.0
+        return self.value
+
+
+class AtrStream:
+    """TA-Lib ATR: দ্বিতীয় ক্যান্ডেল থেকে True Range, প্রথম length-টির গড় দিয়ে শুরু করে Wilder স্মুদিং।"""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.value = math.nan
+        self._previous_close = None
+        self._count = 0
+        self._total = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        previous_close, self._previous_close = self._previous_close, close
+        if previous_close is None:
+            return self.value
+        true_range = max(high - low, abs(previous_close - high), abs(low - previous_close))
+        if self.length <= 1:
+            self.value = true_range
+        elif self._count < self.length:
+            self._total += true_range
+            self._count += 1
+            if self._count == self.length:
+                self.value = self._total / self.length
+        else:
+            self.value = (self.value * (self.length - 1) + true_range) / self.length
+        return self.value
+
+
+class MacdStream:
+    """
+    TA-Lib MACD: দ্রুত EMA ধীর EMA-র সাথে একই ক্যান্ডেলে শুরু হয়, এবং সিগন্যাল লাইন তৈরি হওয়ার আগে
+    MACD লাইনও NaN। update() (macd, signal) দেয়।
+    """
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        fast, slow = min(fast, slow), max(fast, slow)
+        self._fast = EmaStream(fast)
+        self._slow = EmaStream(slow)
+        self._signal = EmaStream(signal)
+        self._fast_starts_at = slow - fast
+        self._bars = 0
+
+    def update(self, close: float):
+        bar, self._bars = self._bars, self._bars + 1
+        slow_ema = self._slow.update(close)
+        fast_ema = self._fast.update(close) if bar >= self._fast_starts_at else math.nan
+        if slow_ema != slow_ema:
+            return math.nan, math.nan
+        line = fast_ema - slow_ema
+        signal_line = self._signal.update(line)
+        return (line if signal_line == signal_line else math.nan), signal_line
+
+
+class ObvStream:
+    """TA-Lib OBV: প্রথম ক্যান্ডেলের ভলিউম দিয়ে শুরু, তারপর দাম বাড়লে যোগ, কমলে বিয়োগ।"""
+
+    def __init__(self):
+        self.value = math.nan
+        self._previous_close = None
+
+    def update(self, close: float, volume: float) -> float:
+        if self._previous_close is None:
+            self.value = volume
+        elif close > self._previous_close:
+            self.value += volume
+        elif close < self._previous_close:
+            self.value -= volume
+        self._previous_close = close
+        return self.value
+
+
+class SupertrendStream:
+    """numpy Supertrend-এর একই নিয়ম (ATR TA-Lib-এর মতো); update() ট্রেন্ডের দিক (1 / -1) দেয়।"""
+
+    def __init__(self, length: int, multiplier: float):
+        self.multiplier = multiplier
+        self.direction = math.nan
+        self._atr = AtrStream(length)
+        self._upper = self._lower = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        band = self.multiplier * self._atr.update(high, low, close)
+        if band != band:
+            return self.direction
+        mid = (high + low) / 2
+        upper, lower = mid + band, mid - band
+        if self.direction != self.direction:
+            direction = 1.0
+        elif close > self._upper:
+            direction = 1.0
+        elif close < self._lower:
+            direction = -1.0
+        else:
+            direction = self.direction
+            if direction > 0 and lower < self._lower:
+                lower = self._lower
+            if direction < 0 and upper > self._upper:
+                upper = self._upper
+        self._upper, self._lower, self.direction = upper, lower, direction
+        return self.direction
+
+
+# ==============================================================================
+#  pandas_ta ব্যাকএন্ড (কলামগুলো অবস্থান দিয়ে নেওয়া হয়, কারণ নামের ফরম্যাট ভার্সনভেদে বদলায়)
+# ==============================================================================
+
+def _ta():
+    import pandas_ta
+    return pandas_ta
+
+def _or_nan(result, index):
+    # ডেটা খুব কম হলে pandas_ta None ফেরত দেয়
+    return result if result is not None else pd.Series(np.nan, index=index)
+
+@register("sma", "pandas_ta")
+def _sma_ta(close, length):
+    return _or_nan(_ta().sma(close.astype("float64"), length=length), close.index)
+
+@register("ema", "pandas_ta")
+def _ema_ta(close, length):
+    return _or_nan(_ta().ema(close.astype("float64"), length=length), close.index)
+
+@register("rsi", "pandas_ta")
+def _rsi_ta(close, length):
+    return _or_nan(_ta().rsi(close.astype("float64"), length=length), close.index)
+
+def _frame(result, columns: Dict[str, int], index) -> pd.DataFrame:
+    if result is None:
+        return pd.DataFrame({name: np.nan for name in columns}, index=index)
+    return pd.DataFrame({name: result.iloc[:, position].to_numpy() for name, position in columns.items()}, index=index)
+
+@register("macd", "pandas_ta")
+def _macd_ta(close, fast, slow, signal):
+    # pandas_ta-র কলামের ক্রম: MACD, MACDh, MACDs
+    result = _ta().macd(close.astype("float64"), fast=fast, slow=slow, signal=signal)
+    return _frame(result, {"macd": 0, "signal": 2, "hist": 1}, close.index)
+
+@register("bbands", "pandas_ta")
+def _bbands_ta(close, length, std):
+    # pandas_ta-র কলামের ক্রম: BBL, BBM, BBU, BBB, BBP
+    result = _ta().bbands(close.astype("float64"), length=length, std=std)
+    return _frame(result, {"lower": 0, "middle": 1, "upper": 2}, close.index)
+
+@register("stoch", "pandas_ta")
+def _stoch_ta(high, low, close, k, d, smooth_k):
+    result = _ta().stoch(high.astype("float64"), low.astype("float64"), close.astype("float64"),
+                         k=k, d=d, smooth_k=smooth_k)
+    return _frame(result, {"k": 0, "d": 1}, close.index)
+
+@register("atr", "pandas_ta")
+def _atr_ta(high, low, close, length):
+    return _or_nan(_ta().atr(high.astype("float64"), low.astype("float64"), close.astype("float64"), length=length),
+                   close.index)
+
+@register("obv", "pandas_ta")
+def _obv_ta(close, volume):
+    return _or_nan(_ta().obv(close.astype("float64"), volume.astype("float64")), close.index)
+
+@register("supertrend", "pandas_ta")
+def _supertrend_ta(high, low, close, length, multiplier):
+    # pandas_ta-র কলামের ক্রম: SUPERT, SUPERTd, SUPERTl, SUPERTs
+    result = _ta().supertrend(high.astype("float64"), low.astype("float64"), close.astype("float64"),
+                              length=length, multiplier=multiplier)
+    return _frame(result, {"supertrend": 0, "direction": 1}, close.index)
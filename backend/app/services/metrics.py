@@ -0,0 +1,215 @@
+# app/services/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+# ==============================================================================
+#  মেট্রিক্স রেজিস্ট্রি (Counters, timers এবং Prometheus টেক্সট ফরম্যাট)
+#
+#  কোনো বাইরের লাইব্রেরি লাগে না। প্রতিটি মেট্রিক (নাম, লেবেল) জোড়া দিয়ে চিহ্নিত হয়।
+#  ওয়ার্কার প্রসেসে রেকর্ড করা মেট্রিক্স drain() দিয়ে তুলে এনে মূল প্রসেসে merge() করা হয়,
+#  তাই /metrics এন্ডপয়েন্টে পুল এবং স্যান্ডবক্সের কাজও দেখা যায়।
+# ==============================================================================
+
+# সেকেন্ডে টাইমারের বাকেট সীমা (1ms থেকে 60s)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_HELP = {
+    "backtest_data_fetch_seconds": "Time to make the requested candles available in the candle store",
+    "backtest_runs_total": "Backtests requested, by outcome",
+    "backtest_compare_seconds": "Time to run every strategy of one comparison request in parallel",
+    "cache_warmer_runs_total": "Cache warmer top-up and backfill runs, by kind and outcome",
+    "cache_warmer_seconds": "Time for one cache warmer top-up or backfill step",
+    "candle_cache_requests_total": "Candle range requests, by whether the store already covered them (warm) or not (cold)",
+    "candles_imported_total": "Candles written into the candle store from offline dump files",
+    "candles_resampled_total": "Candle ranges derived locally from a finer cached timeframe",
+    "optimizer_memo_requests_total": "Optimizer combinations looked up in the cross-job memo, by result",
+    "monte_carlo_seconds": "Time to run one Monte Carlo analysis, by method",
+    "order_router_orders_total": "Orders handled by the order router, by exchange and outcome",
+    "order_router_queue_seconds": "Time an order waited in the router for a rate-budget token and a free slot",
+    "order_router_queued_orders": "Orders currently waiting in the order router",
+    "order_signal_to_ack_seconds": "Time from the bot's signal to the exchange acknowledging the order",
+    "order_signal_to_fill_seconds": "Time from the bot's signal to the order being completely filled",
+    "paper_fills_total": "Paper exchange fills, by side and maker/taker",
+    "paper_orders_total": "Orders placed on the paper exchange, by type and side",
+    "replay_live_seconds": "Time to drive the live bot loop over one replayed candle range",
+    "result_cache_requests_total": "Backtest result cache lookups, by result",
+    "strategy_load_seconds": "Time to load and instantiate a strategy",
+    "strategy_module_cache_total": "Strategy module cache lookups, by result",
+    "strategy_signal_seconds": "Time spent in generate_signals during one backtest",
+    "backtest_accounting_seconds": "Time spent on portfolio accounting during one backtest",
+    "backtest_result_build_seconds": "Time to build the result object after a backtest",
+    "response_serialization_seconds": "Time to serialize and compress API responses, by endpoint and format",
+    "response_bytes_total": "Response bytes sent on the wire, by endpoint, format and encoding",
+    "http_request_duration_seconds": "HTTP request latency, by route",
+    "exchange_requests_total": "Requests sent to exchanges, by exchange and method",
+    "exchange_errors_total": "Failed exchange requests, by exchange and method",
+    "exchange_request_queue_depth": "Exchange requests waiting in the request scheduler, by exchange and priority",
+    "exchange_request_wait_seconds": "Time an exchange request waited for rate-limit tokens, by exchange and priority",
+    "exchange_request_weight_total": "Rate-limit weight spent on exchange requests, by exchange and priority",
+    "errors_total": "Unhandled errors, by component",
+    "trade_writer_flush_seconds": "Time to write one batch of trades",
+    "trade_writer_trades_total": "Trades written by the trade writer",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """থ্রেড-সেফ কাউন্টার এবং হিস্টোগ্রাম রেজিস্ট্রি।"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._gauge_callbacks: List[Callable[[], Dict[str, Any]]] = []
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """with metrics.timer("x_seconds", k="v"): ... — ব্লকের সময় হিস্টোগ্রামে রেকর্ড করে।"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def register_gauge(self, callback: Callable[[], Dict[str, Any]]):
+        """
+        স্ক্রেপের সময় ডাকা হবে এমন একটি ফাংশন যোগ করে, যা {নাম: মান} ফেরত দেয়। লেবেলসহ গেজের জন্য
+        মান হতে পারে [(লেবেল ডিকশনারি, মান), ...]।
+        """
+        self._gauge_callbacks.append(callback)
+
+    # --- প্রসেসের মধ্যে মেট্রিক্স আদান-প্রদান ---
+
+    def drain(self) -> Dict:
+        """এখন পর্যন্ত রেকর্ড করা সব মান ফেরত দিয়ে রেজিস্ট্রি খালি করে (pickle-যোগ্য)।"""
+        with self._lock:
+            snapshot = {
+                "counters": self._counters,
+                "histograms": {
+                    name: {key: (h.buckets, h.counts, h.total, h.count) for key, h in series.items()}
+                    for name, series in self._histograms.items()
+                },
+            }
+            self._counters = {}
+            self._histograms = {}
+        return snapshot
+
+    def merge(self, snapshot: Dict):
+        if not snapshot:
+            return
+        with self._lock:
+            for name, series in snapshot.get("counters", {}).items():
+                target = self._counters.setdefault(name, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0.0) + value
+            for name, series in snapshot.get("histograms", {}).items():
+                target = self._histograms.setdefault(name, {})
+                for key, (buckets, counts, total, count) in series.items():
+                    histogram = target.get(key)
+                    if histogram is None:
+                        histogram = target[key] = _Histogram(tuple(buckets))
+                    histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                    histogram.total += total
+                    histogram.count += count
+
+    # --- Prometheus টেক্সট ফরম্যাট ---
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ""
+        escaped = (f'{k}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{self._format_labels(key)} {value:g}")
+            for name in sorted(self._histograms):
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._format_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._format_labels(key, (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {histogram.total:.6f}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {histogram.count}")
+            callbacks = list(self._gauge_callbacks)
+
+        for callback in callbacks:
+            try:
+                gauges = callback()
+            except Exception:
+                continue
+            for name, value in sorted(gauges.items()):
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} gauge")
+                if isinstance(value, list):
+                    for labels, sample in value:
+                        lines.append(f"{name}{self._format_labels(self._key(labels))} {sample:g}")
+                else:
+                    lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# অ্যাপ্লিকেশন জুড়ে একটিই রেজিস্ট্রি
+metrics = MetricsRegistry()
+
+
+def call_with_metrics(func: Callable, *args):
+    """
+    ওয়ার্কার বা স্যান্ডবক্স প্রসেসে func চালায় এবং সেই প্রসেসে রেকর্ড হওয়া মেট্রিক্স সহ
+    (result, snapshot) ফেরত দেয়; মূল প্রসেস snapshot-টি merge() করে।
+    """
+    metrics.drain()
+    result = func(*args)
+    return result, metrics.drain()
@@ -0,0 +1,119 @@
+# app/services/monte_carlo.py
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..lazy_imports import lazy_import
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+
+# ==============================================================================
+#  মন্টে কার্লো রোবাস্টনেস বিশ্লেষণ (Monte Carlo robustness analysis)
+#
+#  একটি ব্যাকটেস্টের ট্রেড রিটার্নগুলো থেকে হাজার হাজার বিকল্প ট্রেড-ক্রম তৈরি করা হয়:
+#    - bootstrap: প্রতিটি পাথে রিটার্নগুলো প্রতিস্থাপনসহ (with replacement) বেছে নেওয়া হয়
+#    - shuffle:   একই রিটার্নগুলো শুধু ভিন্ন ক্রমে সাজানো হয় (মোট রিটার্ন একই, ড্র-ডাউন বদলায়)
+#  সব পাথ একসাথে একটি (paths × trades) NumPy অ্যারেতে গণনা হয়, কোনো Python লুপ নেই।
+#  ড্র-ডাউন ট্রেড বন্ধ হওয়ার সময়ের ইকুইটি থেকে মাপা হয় (ক্যান্ডেলভিত্তিক নয়)।
+# ==============================================================================
+
+METHODS = ("bootstrap", "shuffle")
+DEFAULT_PATHS = 10000
+MAX_PATHS = 100000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 40
+
+# একবারে সর্বোচ্চ কত সেল (paths × trades) মেমরিতে রাখা হবে; বড় ইনপুট খণ্ডে খণ্ডে গণনা হয়
+_MAX_CELLS_PER_CHUNK = 2_000_000
+
+
+def trade_returns_from_logs(trade_logs: Iterable[Any], fee_percentage: float = 0.0) -> List[float]:
+    """
+    BUY → SELL জোড়া থেকে প্রতিটি সম্পূর্ণ ট্রেডের ভগ্নাংশ রিটার্ন (0.05 = +5%) বের করে।
+    simulate_backtest-এর মতো কেনা এবং বেচা দুই দিকেই ফি কাটা হয়; শেষে খোলা পজিশন বাদ যায়।
+    trade_logs-এর উপাদান schemas.TradeLog বা {"order_type", "price"} ডিকশনারি হতে পারে।
+    """
+    fee_factor = (1 - fee_percentage / 100) ** 2
+    returns = []
+    entry_price = None
+    for log in trade_logs:
+        order_type = log["order_type"] if isinstance(log, dict) else log.order_type
+        price = float(log["price"] if isinstance(log, dict) else log.price)
+        if order_type == "BUY" and entry_price is None:
+            entry_price = price
+        elif order_type == "SELL" and entry_price:
+            returns.append(price / entry_price * fee_factor - 1)
+            entry_price = None
+    return returns
+
+
+def _histogram(values, bins: int) -> Dict[str, List[float]]:
+    counts, edges = np.histogram(values, bins=bins)
+    return {"bin_edges": [round(float(e), 4) for e in edges], "counts": [int(c) for c in counts]}
+
+
+def _simulate_chunk(returns, rng, paths: int, method: str):
+    """একটি খণ্ডের প্রতিটি পাথের (শেষ রিটার্ন, সর্বোচ্চ ড্র-ডাউন) ভগ্নাংশে ফেরত দেয়।"""
+    n = returns.shape[0]
+    if method == "bootstrap":
+        sampled = returns[rng.integers(0, n, size=(paths, n))]
+    else:
+        sampled = rng.permuted(np.broadcast_to(returns, (paths, n)), axis=1)
+
+    # ইকুইটি কার্ভ শুরু 1.0 থেকে; প্রথম ট্রেডেই লস হলে সেটিও ড্র-ডাউন হিসেবে ধরা হয়
+    equity = np.cumprod(1.0 + sampled, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    max_drawdown = ((equity - peaks) / peaks).min(axis=1)
+    return equity[:, -1] - 1.0, max_drawdown
+
+
+def run_monte_carlo(trade_returns: Sequence[float], paths: int = DEFAULT_PATHS, method: str = "bootstrap",
+                    seed: Optional[int] = None, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    include_distributions: bool = True) -> Dict[str, Any]:
+    """
+    ট্রেড রিটার্ন থেকে paths সংখ্যক সিমুলেশন চালিয়ে মোট রিটার্ন এবং সর্বোচ্চ ড্র-ডাউনের
+    পার্সেন্টাইল (শতাংশে) ফেরত দেয়। include_distributions হলে হিস্টোগ্রামও থাকে।
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method '{method}'. Use one of: {', '.join(METHODS)}.")
+    if not 1 <= paths <= MAX_PATHS:
+        raise ValueError(f"paths must be between 1 and {MAX_PATHS}.")
+    returns = np.asarray(trade_returns, dtype=np.float64)
+    if returns.ndim != 1 or returns.size == 0:
+        raise ValueError("At least one closed trade is required for a Monte Carlo analysis.")
+    if not np.isfinite(returns).all() or (returns <= -1).any():
+        raise ValueError("Trade returns must be finite fractions greater than -1.")
+
+    with metrics.timer("monte_carlo_seconds", method=method):
+        rng = np.random.default_rng(seed)
+        chunk = max(1, _MAX_CELLS_PER_CHUNK // returns.size)
+        finals, drawdowns = [], []
+        for offset in range(0, paths, chunk):
+            final, drawdown = _simulate_chunk(returns, rng, min(chunk, paths - offset), method)
+            finals.append(final)
+            drawdowns.append(drawdown)
+        final_returns = np.concatenate(finals) * 100
+        max_drawdowns = np.concatenate(drawdowns) * 100
+
+        q = np.asarray(percentiles, dtype=np.float64)
+        summary = {
+            "method": method,
+            "paths": paths,
+            "trades": int(returns.size),
+            "mean_return": round(float(final_returns.mean()), 2),
+            "probability_of_loss": round(float((final_returns < 0).mean()), 4),
+            "return_percentiles": {f"p{p:g}": round(float(v), 2)
+                                   for p, v in zip(q, np.percentile(final_returns, q))},
+            # ড্র-ডাউন ঋণাত্মক, তাই p5 হলো সবচেয়ে খারাপ ৫% পাথের সীমা
+            "max_drawdown_percentiles": {f"p{p:g}": round(float(v), 2)
+                                         for p, v in zip(q, np.percentile(max_drawdowns, q))},
+        }
+        if include_distributions:
+            summary["return_distribution"] = _histogram(final_returns, HISTOGRAM_BINS)
+            summary["max_drawdown_distribution"] = _histogram(max_drawdowns, HISTOGRAM_BINS)
+    return summary
@@ -0,0 +1,397 @@
+# app/services/optimizer_broker.py
+
+import abc
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .. import config
+
+# ==============================================================================
+#  অপটিমাইজার ব্রোকার: কোঅর্ডিনেটর এবং ওয়ার্কারদের মধ্যে কাজ ভাগ করে দেওয়ার ইন্টারফেস
+#
+#  কোঅর্ডিনেটর একটি জবের সব প্যারামিটার কম্বিনেশন ছোট ছোট ব্যাচে ভাগ করে ব্রোকারে রাখে।
+#  ওয়ার্কাররা একটি ব্যাচ লিজ নেয়, চালায় এবং ফলাফল জমা দেয়।
+#  হার্টবিট না এলে লিজের মেয়াদ শেষ হয় এবং ব্যাচটি অন্য ওয়ার্কারকে দেওয়া হয়।
+#  ব্যাচ চলার মাঝেও শেষ হওয়া কম্বিনেশনগুলো চেকপয়েন্ট করা হয়, তাই ওয়ার্কার বা সার্ভার মারা গেলে
+#  ব্যাচের শুধু বাকি অংশটুকুই আবার চলে।
+# ==============================================================================
+
+# সর্বোচ্চ লিজ সংখ্যা পেরোনো ব্যাচের বাকি কম্বিনেশনগুলোর ফলাফল সারিতে এই এরর থাকে
+LEASE_EXHAUSTED_ERROR = "lease expired too many times"
+
+
+@dataclass
+class BatchLease:
+    """একজন ওয়ার্কারকে দেওয়া একটি ব্যাচ, জবের ডেটাসেট বর্ণনা সহ।"""
+    job_id: str
+    batch_id: int
+    worker_id: str
+    spec: Dict[str, Any]
+    combinations: List[Dict[str, Any]]
+    attempt: int
+
+
+class OptimizerBroker(abc.ABC):
+    """
+    কাজ বিতরণের জন্য প্লাগযোগ্য ইন্টারফেস। অন্য ব্যাকএন্ড (যেমন Redis) যোগ করতে হলে
+    এই মেথডগুলো ইমপ্লিমেন্ট করলেই কোঅর্ডিনেটর বা ওয়ার্কারের কোড বদলাতে হয় না।
+    """
+
+    @abc.abstractmethod
+    def create_job(self, job_id: str, spec: Dict[str, Any], combinations: List[Dict[str, Any]], batch_size: int = None,
+                   completed: List[Dict[str, Any]] = None):
+        """
+        একটি নতুন জব এবং তার ব্যাচগুলো তৈরি করে। completed হলো আগেই জানা ফলাফল ({"params", "metrics"});
+        এগুলো সম্পন্ন হিসেবে জবে যোগ হয় এবং কোনো ওয়ার্কারকে দেওয়া হয় না।
+        """
+
+    @abc.abstractmethod
+    def lease_batch(self, worker_id: str, lease_seconds: float = None, job_id: str = None) -> Optional[BatchLease]:
+        """একটি অপেক্ষমাণ (বা মেয়াদোত্তীর্ণ লিজের) ব্যাচ লিজ দেয়; কাজ না থাকলে None।"""
+
+    @abc.abstractmethod
+    def heartbeat(self, batch_id: int, worker_id: str, lease_seconds: float = None) -> bool:
+        """লিজের মেয়াদ বাড়ায়; লিজটি আর এই ওয়ার্কারের না থাকলে False।"""
+
+    @abc.abstractmethod
+    def checkpoint_batch(self, batch_id: int, worker_id: str, results: List[Dict[str, Any]]) -> bool:
+        """
+        ব্যাচের এখন পর্যন্ত শেষ হওয়া কম্বিনেশনের ফলাফল জমা দেয়; ব্যাচে শুধু বাকিগুলো থেকে যায় এবং
+        লিজের চেষ্টার গণনা আবার শুরু হয়। লিজ হারিয়ে গেলে False এবং ফলাফল বাতিল।
+        """
+
+    @abc.abstractmethod
+    def complete_batch(self, batch_id: int, worker_id: str, results: List[Dict[str, Any]]) -> bool:
+        """ব্যাচের (শেষ চেকপয়েন্টের পরের) ফলাফল জমা দেয়; লিজ হারিয়ে গেলে False এবং ফলাফল বাতিল।"""
+
+    @abc.abstractmethod
+    def job_progress(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """জবের অবস্থা: status, total_runs, progress, pending/leased/done/failed ব্যাচ সংখ্যা।"""
+
+    @abc.abstractmethod
+    def job_results(self, job_id: str) -> List[Dict[str, Any]]:
+        """জবের সব সফল রানের ফলাফল।"""
+
+    @abc.abstractmethod
+    def finish_job(self, job_id: str, status: str, error: str = None):
+        """জবকে completed/failed/cancelled হিসেবে চিহ্নিত করে; বাকি ব্যাচগুলো আর লিজ দেওয়া হয় না।"""
+
+    @abc.abstractmethod
+    def reopen_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        ব্যর্থ বা অসম্পূর্ণ জবকে আবার running করে, যাতে বাকি ব্যাচগুলো লিজ দেওয়া যায়, এবং জবের spec
+        ফেরত দেয়; জব না থাকলে বা completed হলে None। বারবার লিজ হারিয়ে failed হওয়া ব্যাচগুলোও আবার
+        pending হয়।
+        """
+
+    @abc.abstractmethod
+    def unfinished_jobs(self) -> List[Dict[str, Any]]:
+        """যে জবগুলো pending বা running অবস্থায় আছে (যেমন সার্ভার রিস্টার্টের পর): job_id এবং spec।"""
+
+
+# ==============================================================================
+#  SQLite ব্রোকার (অফলাইন, কোনো আলাদা সার্ভিস লাগে না)
+# ==============================================================================
+
+class SqliteBroker(OptimizerBroker):
+    """
+    একটি SQLite ফাইলে জব, ব্যাচ এবং ফলাফল রাখে। প্রতিটি কলে নতুন কানেকশন খোলা হয়,
+    তাই একই মেশিনের থ্রেড এবং প্রসেস থেকে ব্যবহার করা যায়। WAL মোড হোস্টের শেয়ার্ড মেমরির উপর
+    নির্ভর করে, তাই ফাইলটি নেটওয়ার্ক ফোল্ডারে রেখে অন্য মেশিন থেকে ব্যবহার করা নিরাপদ নয়।
+    লিজ দেওয়া BEGIN IMMEDIATE ট্রানজ্যাকশনে হয়, যাতে দুজন ওয়ার্কার একই ব্যাচ না পায়।
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.OPTIMIZER_BROKER_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    spec TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    total_runs INTEGER NOT NULL,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS batches (
+                    batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    combinations TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS ix_batches_status ON batches (status, job_id, seq);
+                CREATE TABLE IF NOT EXISTS results (
+                    job_id TEXT NOT NULL,
+                    batch_id INTEGER NOT NULL,
+                    params TEXT NOT NULL,
+                    metrics TEXT,
+                    error TEXT
+                );
+                CREATE INDEX IF NOT EXISTS ix_results_job ON results (job_id);
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def create_job(self, job_id, spec, combinations, batch_size=None, completed=None):
+        completed = completed or []
+        batch_size = max(1, batch_size or config.OPTIMIZER_BATCH_SIZE)
+        batches = [
+            (job_id, seq, json.dumps(combinations[i:i + batch_size]), len(combinations[i:i + batch_size]), "pending")
+            for seq, i in enumerate(range(0, len(combinations), batch_size))
+        ]
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO jobs (job_id, spec, status, total_runs, created_at) VALUES (?, ?, 'pending', ?, ?)",
+                (job_id, json.dumps(spec, default=str), len(combinations) + len(completed), time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO batches (job_id, seq, combinations, size, status) VALUES (?, ?, ?, ?, ?)", batches
+            )
+            if completed:
+                # আগে থেকে জানা ফলাফলগুলো একটি সম্পন্ন ব্যাচ হিসেবে, যাতে অগ্রগতি এবং ফলাফলে গণ্য হয়
+                cursor = conn.execute(
+                    "INSERT INTO batches (job_id, seq, combinations, size, status) VALUES (?, -1, ?, ?, 'done')",
+                    (job_id, json.dumps([item["params"] for item in completed]), len(completed)),
+                )
+                conn.executemany(
+                    "INSERT INTO results (job_id, batch_id, params, metrics) VALUES (?, ?, ?, ?)",
+                    [(job_id, cursor.lastrowid, json.dumps(item["params"]), json.dumps(item["metrics"]))
+                     for item in completed],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def lease_batch(self, worker_id, lease_seconds=None, job_id=None):
+        lease_seconds = lease_seconds or config.OPTIMIZER_LEASE_SECONDS
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            while True:
+                query = """
+                    SELECT b.batch_id, b.job_id, b.combinations, b.attempts, j.spec
+                    FROM batches b JOIN jobs j ON j.job_id = b.job_id
+                    WHERE j.status IN ('pending', 'running')
+                      AND (b.status = 'pending' OR (b.status = 'leased' AND b.lease_expires < ?))
+                """
+                args: list = [now]
+                if job_id is not None:
+                    query += " AND b.job_id = ?"
+                    args.append(job_id)
+                query += " ORDER BY j.created_at, b.seq LIMIT 1"
+                row = conn.execute(query, args).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                batch_id, row_job_id, combinations, attempts, spec = row
+                if attempts >= config.OPTIMIZER_MAX_ATTEMPTS:
+                    # বারবার ওয়ার্কার মারা যাওয়ার কারণ সম্ভবত ব্যাচটি নিজেই; আর চেষ্টা করা হবে না
+                    conn.execute("UPDATE batches SET status = 'failed', worker_id = NULL WHERE batch_id = ?", (batch_id,))
+                    conn.executemany(
+                        "INSERT INTO results (job_id, batch_id, params, error) VALUES (?, ?, ?, ?)",
+                        [(row_job_id, batch_id, json.dumps(params), LEASE_EXHAUSTED_ERROR)
+                         for params in json.loads(combinations)],
+                    )
+                    continue
+
+                conn.execute(
+                    "UPDATE batches SET status = 'leased', worker_id = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE batch_id = ?",
+                    (worker_id, now + lease_seconds, batch_id),
+                )
+                conn.execute("UPDATE jobs SET status = 'running' WHERE job_id = ? AND status = 'pending'", (row_job_id,))
+                conn.execute("COMMIT")
+                return BatchLease(
+                    job_id=row_job_id, batch_id=batch_id, worker_id=worker_id,
+                    spec=json.loads(spec), combinations=json.loads(combinations), attempt=attempts + 1,
+                )
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, batch_id, worker_id, lease_seconds=None):
+        lease_seconds = lease_seconds or config.OPTIMIZER_LEASE_SECONDS
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE batches SET lease_expires = ? WHERE batch_id = ? AND worker_id = ? AND status = 'leased'",
+                (time.time() + lease_seconds, batch_id, worker_id),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _insert_results(conn: sqlite3.Connection, job_id: str, batch_id: int, results: List[Dict[str, Any]]):
+        conn.executemany(
+            "INSERT INTO results (job_id, batch_id, params, metrics, error) VALUES (?, ?, ?, ?, ?)",
+            [(job_id, batch_id, json.dumps(item["params"]),
+              json.dumps(item["metrics"]) if item.get("metrics") is not None else None,
+              item.get("error"))
+             for item in results],
+        )
+
+    def _submit_results(self, batch_id, worker_id, results, final: bool) -> bool:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT job_id, combinations FROM batches WHERE batch_id = ? AND worker_id = ? AND status = 'leased'",
+                (batch_id, worker_id),
+            ).fetchone()
+            if row is None:
+                # লিজ অন্য ওয়ার্কারের কাছে চলে গেছে; তার ফলাফলই গণ্য হবে
+                conn.execute("ROLLBACK")
+                return False
+            self._insert_results(conn, row[0], batch_id, results)
+            if final:
+                conn.execute("UPDATE batches SET status = 'done', lease_expires = NULL WHERE batch_id = ?", (batch_id,))
+            elif results:
+                # পরে কেউ ব্যাচটি আবার লিজ নিলে শুধু বাকি কম্বিনেশনগুলো পায়। অগ্রগতি হয়েছে, তাই attempts
+                # আবার শূন্য থেকে গোনা হয়: লম্বা ব্যাচ কয়েকবার ডিপ্লয়ে থামলেও ব্যর্থ হিসেবে চিহ্নিত হয় না
+                finished = {json.dumps(item["params"], sort_keys=True) for item in results}
+                remaining = [params for params in json.loads(row[1]) if json.dumps(params, sort_keys=True) not in finished]
+                conn.execute("UPDATE batches SET combinations = ?, size = ?, attempts = 0 WHERE batch_id = ?",
+                             (json.dumps(remaining), len(remaining), batch_id))
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def checkpoint_batch(self, batch_id, worker_id, results):
+        return self._submit_results(batch_id, worker_id, results, final=False)
+
+    def complete_batch(self, batch_id, worker_id, results):
+        return self._submit_results(batch_id, worker_id, results, final=True)
+
+    def job_progress(self, job_id):
+        conn = self._connect()
+        try:
+            job = conn.execute("SELECT status, total_runs, error FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+            for status, batches in conn.execute(
+                "SELECT status, COUNT(*) FROM batches WHERE job_id = ? GROUP BY status", (job_id,)
+            ):
+                counts[status] = batches
+            # প্রতিটি কম্বিনেশনের ঠিক একটি ফলাফল (সফল বা এরর) থাকে, চেকপয়েন্ট করা আংশিক ব্যাচসহ
+            progress = conn.execute("SELECT COUNT(*) FROM results WHERE job_id = ?", (job_id,)).fetchone()[0]
+            workers = conn.execute(
+                "SELECT COUNT(DISTINCT worker_id) FROM batches WHERE job_id = ? AND status = 'leased' AND lease_expires >= ?",
+                (job_id, time.time()),
+            ).fetchone()[0]
+            return {
+                "status": job[0], "total_runs": job[1], "error": job[2], "progress": progress,
+                "batches": counts, "active_workers": workers,
+            }
+        finally:
+            conn.close()
+
+    def job_results(self, job_id):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT params, metrics FROM results WHERE job_id = ? AND metrics IS NOT NULL", (job_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{"params": json.loads(params), **json.loads(metrics)} for params, metrics in rows]
+
+    def finish_job(self, job_id, status, error=None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id),
+            )
+        finally:
+            conn.close()
+
+    def reopen_job(self, job_id):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT spec FROM jobs WHERE job_id = ? AND status != 'completed'", (job_id,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE jobs SET status = 'running', error = NULL, finished_at = NULL WHERE job_id = ?",
+                             (job_id,))
+                # বারবার লিজ হারিয়ে ব্যর্থ হওয়া ব্যাচগুলো আবার চলবে: তাদের বাকি কম্বিনেশনের এরর সারিগুলো মুছে
+                # ব্যাচ pending করা হয় (চেকপয়েন্ট করা ফলাফল এবং কম্বিনেশনের নিজস্ব এরর থেকে যায়)
+                conn.execute(
+                    "DELETE FROM results WHERE error = ? AND batch_id IN "
+                    "(SELECT batch_id FROM batches WHERE job_id = ? AND status = 'failed')",
+                    (LEASE_EXHAUSTED_ERROR, job_id),
+                )
+                conn.execute(
+                    "UPDATE batches SET status = 'pending', worker_id = NULL, lease_expires = NULL, attempts = 0 "
+                    "WHERE job_id = ? AND status = 'failed'",
+                    (job_id,),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row is not None else None
+
+    def unfinished_jobs(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT job_id, spec FROM jobs WHERE status IN ('pending', 'running') ORDER BY created_at"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{"job_id": job_id, "spec": json.loads(spec)} for job_id, spec in rows]
+
+
+def new_worker_id() -> str:
+    """হোস্টনেম, PID এবং একটি র‍্যান্ডম অংশ দিয়ে ওয়ার্কারের অনন্য আইডি।"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+_broker: Optional[OptimizerBroker] = None
+
+def get_broker() -> OptimizerBroker:
+    """কনফিগার করা ব্রোকার (বর্তমানে SQLite) ফেরত দেয়।"""
+    global _broker
+    if _broker is None:
+        _broker = SqliteBroker()
+    return _broker
@@ -1,17 +1,42 @@
 # app/services/optimizer_engine.py
 
 import uuid
+import asyncio
+import hashlib
+import logging
 import itertools
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from fastapi import BackgroundTasks
-import numpy as np
 
+from .. import config, optimizer_worker
+from ..lazy_imports import lazy_import
 from . import backtesting_engine
 from . import strategy_manager
+from . import monte_carlo
+from . import request_scheduler
+from . import candle_store
+from .backtest_queue import run_in_optimizer_worker
+from .optimizer_broker import OptimizerBroker, SqliteBroker, get_broker
+from .optimizer_memo import dataset_key, get_optimizer_memo, memo_params_key
+from .result_cache import dataset_fingerprint, engine_fingerprint
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+ccxt_async = lazy_import("ccxt.async_support")
 
 # --- ইন-মেমরি জব স্টোরেজ (প্রোডাকশনের জন্য Redis বা ডাটাবেস ভালো বিকল্প) ---
 # এটি একটি সাধারণ ডিকশনারি যা প্রতিটি অপটিমাইজেশন জবের অবস্থা ট্র্যাক করবে।
+# স্থায়ী অবস্থা (ব্যাচ, চেকপয়েন্ট করা ফলাফল) ব্রোকারে থাকে; রিস্টার্টের পর সেখান থেকেই জব আবার চলে।
 JOBS_DB: Dict[str, Dict[str, Any]] = {}
+# আবার শুরু করা জবগুলোর কোঅর্ডিনেটর টাস্ক (রেফারেন্স না রাখলে ইভেন্ট লুপ টাস্কটি হারিয়ে ফেলতে পারে)
+_RESUMED_TASKS: set = set()
+# যে জবগুলো আবার শুরু করার প্রক্রিয়ায় আছে (ব্রোকারের কলের অপেক্ষায়), যাতে একই জব দুবার শুরু না হয়
+_RESUMING: set = set()
+# রিস্টার্টের পর ব্রোকার থেকে পড়া সম্পন্ন জবগুলো একবারই র‍্যাংক করার জন্য
+_RANKING_LOCK = threading.Lock()
 
 def _generate_param_combinations(params_range: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
     """প্যারামিটারের রেঞ্জ থেকে সমস্ত সম্ভাব্য কম্বিনেশন তৈরি করে।"""
@@ -44,58 +69,234 @@ def _generate_param_combinations(params_range: Dict[str, Dict[str, Any]]) -> Lis
     return param_dicts
 
 
+def _to_builtin(value):
+    """np.arange থেকে আসা numpy স্কেলারকে JSON-যোগ্য সাধারণ Python টাইপে রূপান্তর করে।"""
+    return value.item() if isinstance(value, np.generic) else value
+
+def _job_spec(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """ওয়ার্কারদের জন্য জবের ডেটাসেট এবং স্ট্র্যাটেজির বর্ণনা (JSON-যোগ্য)।"""
+    return {
+        "exchange_name": request_data['exchange_name'],
+        "strategy_name": request_data['strategy_name'],
+        "symbol": request_data['symbol'],
+        "timeframe": request_data['timeframe'],
+        "start_date": str(request_data['start_date']),
+        "end_date": str(request_data['end_date']),
+    }
+
+def _rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    ফলাফলকে Total Return অনুযায়ী সাজায় (সেরা থেকে খারাপ) এবং সেরা OPTIMIZER_MONTE_CARLO_TOP_K
+    ফলাফলের ট্রেড রিটার্নের উপর মন্টে কার্লো বিশ্লেষণ যোগ করে। ট্রেড রিটার্নগুলো API-তে পাঠানো হয় না।
+    """
+    ranked = sorted(results, key=lambda x: x['total_return'], reverse=True)
+    for rank, item in enumerate(ranked):
+        trade_returns = item.pop('trade_returns', None)
+        if rank >= config.OPTIMIZER_MONTE_CARLO_TOP_K or not trade_returns:
+            continue
+        try:
+            # নির্দিষ্ট seed, যাতে একই জবের স্ট্যাটাস বারবার চাইলে একই সংখ্যা আসে
+            item['robustness'] = monte_carlo.run_monte_carlo(
+                trade_returns, paths=config.OPTIMIZER_MONTE_CARLO_PATHS, seed=rank, include_distributions=False
+            )
+        except ValueError as e:
+            logger.debug("Skipping Monte Carlo for %s: %s", item['params'], e)
+    return ranked
+
+def _start_local_workers(broker: OptimizerBroker, job_id: str) -> List[asyncio.Future]:
+    """
+    অপটিমাইজারের নিজস্ব প্রসেস পুলে জবটির জন্য লোকাল ওয়ার্কার চালু করে। ব্যাকটেস্ট পুল আলাদা থাকে,
+    তাই লম্বা জব চলার সময়ও ইন্টারঅ্যাকটিভ ব্যাকটেস্ট আর তুলনা অপেক্ষায় পড়ে না।
+    """
+    if not isinstance(broker, SqliteBroker):
+        return []
+    return [
+        asyncio.ensure_future(run_in_optimizer_worker(optimizer_worker.drain_job, broker.path, job_id))
+        for _ in range(config.OPTIMIZER_LOCAL_WORKERS)
+    ]
+
+def _memo_context(job_spec: Dict[str, Any]):
+    """মেমোর কী-এর অংশ: স্ট্র্যাটেজি, ডেটাসেট, জব শুরুর সময়ের সোর্স হ্যাশ এবং ডেটা ফিঙ্গারপ্রিন্ট।"""
+    return (job_spec["strategy_name"], dataset_key(job_spec), job_spec["source_hash"], job_spec["data_fingerprint"])
+
+def _memo_code_hash(strategy_name: str) -> str:
+    """
+    মেমোর কোড হ্যাশ: স্ট্র্যাটেজির সোর্স, ব্যাকটেস্ট ইঞ্জিনের শেয়ার করা কোড (ইন্ডিকেটর, বেস স্ট্র্যাটেজি...)
+    এবং যে মডিউলগুলো মেট্রিক্স ও ট্রেড রিটার্ন হিসাব করে। এগুলোর যেকোনোটি বদলালে পুরনো ফলাফল বাসি।
+    """
+    digest = hashlib.sha256(strategy_manager.get_strategy_source_hash(strategy_name).encode())
+    digest.update(engine_fingerprint().encode())
+    for module in (optimizer_worker, monte_carlo):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def _split_memoized(job_spec: Dict[str, Any], combinations: List[Dict[str, Any]], reuse: bool = True):
+    """
+    আগের জবগুলোতে একই স্ট্র্যাটেজি কোড এবং একই ডেটায় চালানো কম্বিনেশনগুলো মেমো থেকে আলাদা করে।
+    (আগে জানা ফলাফল, নতুন করে চালাতে হবে এমন কম্বিনেশন) ফেরত দেয়। reuse=False হলে সবকিছু নতুন
+    করে চলে, কিন্তু ফলাফল পরে মেমোতে লেখা হয়। job_spec-এ মেমোর কনটেক্সট যোগ হয়, যাতে রিস্টার্টের
+    পর আবার শুরু হওয়া জবও একই কী-তে ফলাফল রাখে।
+    """
+    memo = get_optimizer_memo()
+    job_spec["source_hash"] = _memo_code_hash(job_spec["strategy_name"])
+    # পার্টিশন ফাইলের ভার্সন নয়, রেঞ্জের ক্যান্ডেলের কন্টেন্ট: একই মাসের পার্টিশনে অন্য রেঞ্জ যোগ হলে
+    # (ক্যাশ ওয়ার্মার, পাশের রেঞ্জের ব্যাকফিল) ফাইল বদলায়, কিন্তু এই রেঞ্জের ডেটা একই থাকলে মেমো টিকে থাকে
+    job_spec["data_fingerprint"] = dataset_fingerprint(candle_store.read_candles(optimizer_worker._candle_spec(job_spec)))
+    context = _memo_context(job_spec)
+    removed = memo.invalidate_stale(*context)
+    if removed:
+        logger.info("Dropped %s memoized optimizer results after a strategy or data change.", removed)
+    known = memo.lookup(*context, combinations) if reuse else {}
+    completed, fresh = [], []
+    for params in combinations:
+        cached = known.get(memo_params_key(params))
+        if cached is None:
+            fresh.append(params)
+        else:
+            completed.append({"params": params, "metrics": cached})
+    return completed, fresh
+
+async def _drive_job(job_id: str, broker: OptimizerBroker, job_spec: Dict[str, Any]):
+    """
+    ব্রোকারে থাকা জবের সব ব্যাচ শেষ না হওয়া পর্যন্ত লোকাল ওয়ার্কার চালায় এবং অগ্রগতি JOBS_DB-তে রাখে,
+    তারপর ফলাফল মেমোতে লিখে র‍্যাংক করে। নতুন এবং আবার শুরু হওয়া জব দুটোই এখান দিয়ে যায়।
+    """
+    local_workers = _start_local_workers(broker, job_id)
+    try:
+        while True:
+            progress = await asyncio.to_thread(broker.job_progress, job_id)
+            JOBS_DB[job_id]['progress'] = progress['progress']
+            JOBS_DB[job_id]['total_runs'] = progress['total_runs']
+            JOBS_DB[job_id]['active_workers'] = progress['active_workers']
+            batches = progress['batches']
+            if batches['pending'] == 0 and batches['leased'] == 0:
+                break
+            # বাইরের ওয়ার্কার (বা রিস্টার্টের আগের লোকাল ওয়ার্কার) মারা গেলে তার মেয়াদোত্তীর্ণ ব্যাচগুলো
+            # লোকাল ওয়ার্কাররা আবার নেয়; চেকপয়েন্টের কারণে শুধু বাকি কম্বিনেশনগুলো চলে
+            stalled = batches['leased'] > 0 and progress['active_workers'] == 0
+            if all(worker.done() for worker in local_workers) and (batches['pending'] > 0 or stalled):
+                local_workers = _start_local_workers(broker, job_id)
+            await asyncio.sleep(1)
+
+        results = await asyncio.to_thread(broker.job_results, job_id)
+        # _rank_results ট্রেড রিটার্নগুলো সরিয়ে দেয়, তাই তার আগেই মেমোতে রাখা
+        if "source_hash" in job_spec:
+            await asyncio.to_thread(get_optimizer_memo().store, *_memo_context(job_spec), results)
+        sorted_results = await asyncio.to_thread(_rank_results, results)
+
+        JOBS_DB[job_id]['results'] = sorted_results
+        JOBS_DB[job_id]['status'] = 'completed'
+        await asyncio.to_thread(broker.finish_job, job_id, 'completed')
+    finally:
+        await asyncio.gather(*local_workers, return_exceptions=True)
+
+async def _fail_job(job_id: str, broker: OptimizerBroker, error: Exception):
+    JOBS_DB[job_id]['status'] = 'failed'
+    JOBS_DB[job_id]['error'] = str(error)
+    try:
+        await asyncio.to_thread(broker.finish_job, job_id, 'failed', str(error))
+    except Exception:
+        pass
+    metrics.inc("errors_total", component="optimizer")
+    logger.error("Optimization job %s failed: %s", job_id, error)
+
 async def run_optimization_worker(job_id: str, request_data: Dict[str, Any]):
     """
-    এটি হলো আসল কর্মী, যা ব্যাকগ্রাউন্ডে চলবে এবং এক এক করে ব্যাকটেস্ট চালাবে।
+    কোঅর্ডিনেটর: কম্বিনেশনগুলো ব্যাচ করে ব্রোকারে রাখে, লোকাল ওয়ার্কার চালু করে এবং
+    সব ব্যাচ শেষ না হওয়া পর্যন্ত অগ্রগতি JOBS_DB-তে আপডেট করে।
+    একই মেশিনে আলাদা চালানো `python -m app.optimizer_worker` প্রসেসগুলোও একই ব্রোকার থেকে ব্যাচ নিতে পারে।
+    আগের জবে একই কোড ও ডেটায় চালানো কম্বিনেশনগুলো মেমো থেকে আসে; শুধু নতুনগুলো ব্রোকারে যায়।
     """
-    print(f"Starting optimization worker for job_id: {job_id}")
+    logger.info("Starting optimization coordinator for job_id: %s", job_id)
     JOBS_DB[job_id]['status'] = 'running'
-    
+    broker = get_broker()
+
     try:
         # প্যারামিটার কম্বিনেশন তৈরি করা
-        param_combinations = _generate_param_combinations(request_data['strategy_params_range'])
-        total_runs = len(param_combinations)
-        JOBS_DB[job_id]['total_runs'] = total_runs
-        results = []
-
-        for i, params in enumerate(param_combinations):
-            print(f"Running backtest {i+1}/{total_runs} with params: {params}")
-            JOBS_DB[job_id]['progress'] = i + 1
-            
-            try:
-                # ব্যাকটেস্টিং ইঞ্জিনকে প্রতিটি কম্বিনেশনের জন্য কল করা
-                result = await backtesting_engine.run_simulation(
-                    exchange_name=request_data['exchange_name'],
-                    strategy_name=request_data['strategy_name'],
-                    symbol=request_data['symbol'],
-                    timeframe=request_data['timeframe'],
-                    start_date=request_data['start_date'],
-                    end_date=request_data['end_date'],
-                    strategy_params=params
-                )
-                
-                # শুধুমাত্র মূল মেট্রিক্সগুলো সংরক্ষণ করা
-                results.append({
-                    "params": params,
-                    "total_return": result.total_return,
-                    "win_rate": result.win_rate,
-                    "max_drawdown": result.max_drawdown
-                })
-            except Exception as e:
-                print(f"Backtest failed for params {params}: {e}")
-                # একটি রান ব্যর্থ হলে অপটিমাইজেশন বন্ধ হবে না, পরেরটি চলবে
-
-        # ফলাফলকে Total Return অনুযায়ী সাজানো (সেরা থেকে খারাপ)
-        sorted_results = sorted(results, key=lambda x: x['total_return'], reverse=True)
-        
-        JOBS_DB[job_id]['results'] = sorted_results
-        JOBS_DB[job_id]['status'] = 'completed'
-        print(f"Optimization job {job_id} completed successfully.")
+        param_combinations = [
+            {key: _to_builtin(value) for key, value in params.items()}
+            for params in _generate_param_combinations(request_data['strategy_params_range'])
+        ]
+        JOBS_DB[job_id]['total_runs'] = len(param_combinations)
+
+        # ডেটা একবারই এই মেশিনের ক্যান্ডেল স্টোরে আনা হয়, যাতে লোকাল ওয়ার্কাররা সরাসরি পড়তে পারে
+        exchange_class = getattr(ccxt_async, request_data['exchange_name'], None)
+        if exchange_class is None:
+            raise ValueError(f"The exchange '{request_data['exchange_name']}' is not supported.")
+        # অপটিমাইজেশন রিসার্চের কাজ, তাই লাইভ বট ও ইন্টারেক্টিভ ব্যাকটেস্টের পরে
+        exchange = request_scheduler.attach(exchange_class({'aiohttp_kwargs': {'timeout': 30}}),
+                                            request_scheduler.BACKFILL)
+        try:
+            await backtesting_engine.ensure_candles(exchange, request_data['symbol'], request_data['timeframe'],
+                                                    request_data['start_date'], request_data['end_date'],
+                                                    source="optimizer")
+        finally:
+            await exchange.close()
+
+        job_spec = _job_spec(request_data)
+        completed, param_combinations = await asyncio.to_thread(
+            _split_memoized, job_spec, param_combinations, request_data.get('reuse_cached', True))
+        JOBS_DB[job_id]['reused_runs'] = len(completed)
+        if completed:
+            logger.info("Job %s: %s combinations reused from earlier jobs, %s to run.",
+                        job_id, len(completed), len(param_combinations))
+
+        await asyncio.to_thread(broker.create_job, job_id, job_spec, param_combinations, None, completed)
+        await _drive_job(job_id, broker, job_spec)
+        logger.info("Optimization job %s completed successfully.", job_id)
 
     except Exception as e:
-        JOBS_DB[job_id]['status'] = 'failed'
-        JOBS_DB[job_id]['error'] = str(e)
-        print(f"Optimization job {job_id} failed: {e}")
+        await _fail_job(job_id, broker, e)
+
+
+async def resume_optimization_worker(job_id: str, job_spec: Dict[str, Any]):
+    """
+    রিস্টার্ট বা ব্যর্থতার পর ব্রোকারে থাকা জব আবার চালায়। কম্বিনেশন আবার তৈরি করা হয় না: শেষ হওয়া
+    ব্যাচ এবং চেকপয়েন্ট করা কম্বিনেশনগুলো ব্রোকারে ফলাফল হিসেবে আছে, বাকি ব্যাচগুলোতে শুধু
+    না-চালানো কম্বিনেশন থাকে।
+    """
+    logger.info("Resuming optimization job %s from its last checkpoint.", job_id)
+    JOBS_DB[job_id]['status'] = 'running'
+    broker = get_broker()
+    try:
+        await _drive_job(job_id, broker, job_spec)
+        logger.info("Resumed optimization job %s completed successfully.", job_id)
+    except Exception as e:
+        await _fail_job(job_id, broker, e)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    জবের অবস্থা ফেরত দেয়। সার্ভার রিস্টার্টের পর JOBS_DB খালি থাকলেও ব্রোকারে সংরক্ষিত
+    জবের অবস্থা এবং ফলাফল পাওয়া যায়।
+    """
+    job = JOBS_DB.get(job_id)
+    if job is not None:
+        return job
+    progress = get_broker().job_progress(job_id)
+    if progress is None:
+        return None
+    if progress['status'] != 'completed':
+        return _job_from_progress(progress, None)
+    # সম্পন্ন জবের র‍্যাংকিং (মন্টে কার্লোসহ) একবারই করা হয় এবং JOBS_DB-তে রাখা হয়, যাতে পরের
+    # পোলগুলো আবার সব ফলাফল পড়ে গণনা না করে; একই সময়ে আসা পোলগুলো একটি গণনার জন্য অপেক্ষা করে
+    with _RANKING_LOCK:
+        job = JOBS_DB.get(job_id)
+        if job is None:
+            job = _job_from_progress(progress, _rank_results(get_broker().job_results(job_id)))
+            JOBS_DB[job_id] = job
+    return job
+
+def _job_from_progress(progress: Dict[str, Any], results: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    return {
+        "status": progress['status'],
+        "progress": progress['progress'],
+        "total_runs": progress['total_runs'],
+        "active_workers": progress['active_workers'],
+        "results": results,
+        "error": progress['error'],
+    }
 
 
 def start_optimization_job(background_tasks: BackgroundTasks, request_data: Dict[str, Any]) -> str:
@@ -107,6 +308,8 @@ def start_optimization_job(background_tasks: BackgroundTasks, request_data: Dict
         "status": "pending",
         "progress": 0,
         "total_runs": 0,
+        "active_workers": 0,
+        "reused_runs": 0,
         "results": None,
         "error": None
     }
@@ -114,5 +317,72 @@ def start_optimization_job(background_tasks: BackgroundTasks, request_data: Dict
     # FastAPI-এর BackgroundTasks ব্যবহার করে worker-কে ব্যাকগ্রাউন্ডে চালানো
     background_tasks.add_task(run_optimization_worker, job_id, request_data)
     
-    print(f"Job {job_id} has been queued.")
-    return job_id
\ No newline at end of file
+    logger.info("Job %s has been queued.", job_id)
+    return job_id
+
+
+class JobNotResumable(Exception):
+    """জবটি আবার শুরু করা যায় না (ইতিমধ্যে চলছে, সম্পন্ন, বা কোনো কাজ ব্রোকারে রাখার আগেই ব্যর্থ)।"""
+
+
+def _resume(job_id: str, job_spec: Dict[str, Any], progress: Dict[str, Any]):
+    JOBS_DB[job_id] = {
+        "status": "pending",
+        "progress": progress['progress'],
+        "total_runs": progress['total_runs'],
+        "active_workers": progress['active_workers'],
+        "reused_runs": JOBS_DB.get(job_id, {}).get('reused_runs'),
+        "results": None,
+        "error": None,
+    }
+    task = asyncio.ensure_future(resume_optimization_worker(job_id, job_spec))
+    _RESUMED_TASKS.add(task)
+    task.add_done_callback(_RESUMED_TASKS.discard)
+
+
+async def resume_optimization_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    অসম্পূর্ণ বা ব্যর্থ জব তার শেষ চেকপয়েন্ট থেকে আবার শুরু করে। জব না থাকলে None; আবার শুরু করা না
+    গেলে JobNotResumable। ব্রোকারের কলগুলো (BEGIN IMMEDIATE-সহ) থ্রেডে চলে, ইভেন্ট লুপে নয়।
+    """
+    if JOBS_DB.get(job_id, {}).get('status') in ('pending', 'running') or job_id in _RESUMING:
+        raise JobNotResumable("Job is already running.")
+    broker = get_broker()
+    _RESUMING.add(job_id)
+    try:
+        progress = await asyncio.to_thread(broker.job_progress, job_id)
+        if progress is None:
+            if job_id in JOBS_DB:
+                raise JobNotResumable("Job failed before any work was queued; start it again.")
+            return None
+        if progress['status'] == 'completed':
+            raise JobNotResumable("Job has already completed.")
+        job_spec = await asyncio.to_thread(broker.reopen_job, job_id)
+        if job_spec is None:
+            raise JobNotResumable("Job has already completed.")
+        _resume(job_id, job_spec, progress)
+    finally:
+        _RESUMING.discard(job_id)
+    return {"job_id": job_id, "status": "running", "progress": progress['progress'],
+            "total_runs": progress['total_runs']}
+
+
+async def resume_unfinished_jobs():
+    """সার্ভার চালু হলে আগের প্রসেসে অসম্পূর্ণ থেকে যাওয়া সব জব আবার শুরু করে।"""
+    broker = get_broker()
+    try:
+        jobs = await asyncio.to_thread(broker.unfinished_jobs)
+        for job in jobs:
+            job_id = job['job_id']
+            if job_id in JOBS_DB or job_id in _RESUMING:
+                continue
+            _RESUMING.add(job_id)
+            try:
+                _resume(job_id, job['spec'], await asyncio.to_thread(broker.job_progress, job_id))
+            finally:
+                _RESUMING.discard(job_id)
+    except Exception:
+        logger.exception("Could not resume unfinished optimizer jobs")
+        return
+    if jobs:
+        logger.info("Resumed %s unfinished optimization job(s) from their checkpoints.", len(jobs))
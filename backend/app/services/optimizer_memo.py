@@ -0,0 +1,133 @@
+# app/services/optimizer_memo.py
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .. import config
+from .metrics import metrics
+from .result_cache import canonical_params
+
+# ==============================================================================
+#  অপটিমাইজার ইভ্যালুয়েশন মেমো (Cross-job memo of evaluated combinations)
+#
+#  প্রতিটি সফল রানের মেট্রিক্স (strategy, dataset, params) দিয়ে একটি SQLite ফাইলে রাখা হয়, সাথে
+#  স্ট্র্যাটেজির সোর্স হ্যাশ এবং ডেটার ফিঙ্গারপ্রিন্ট। নতুন জব আগে এখানে দেখে; শুধু আগে না দেখা
+#  কম্বিনেশনগুলো ব্রোকারে যায়। স্ট্র্যাটেজির কোড বা ক্যান্ডেল ডেটা বদলালে সেই ডেটাসেটের পুরনো
+#  এন্ট্রিগুলো মুছে ফেলা হয়, তাই মেমো কখনো বাসি ফলাফল দেয় না।
+# ==============================================================================
+
+
+def memo_params_key(params: Dict[str, Any]) -> str:
+    """
+    canonical_params-এর মতো, কিন্তু float গুলো ১২ দশমিক পর্যন্ত রাউন্ড করা: রেঞ্জ চওড়া করলে np.arange
+    একই মানকে 0.30000000000000004 বা 0.3 হিসেবে দিতে পারে, দুটোই একই কম্বিনেশন।
+    """
+    return canonical_params({k: round(v, 12) if isinstance(v, float) else v for k, v in (params or {}).items()})
+
+
+def dataset_key(job_spec: Dict[str, Any]) -> str:
+    return json.dumps([job_spec["exchange_name"].lower(), job_spec["symbol"], job_spec["timeframe"],
+                       str(job_spec["start_date"]), str(job_spec["end_date"])])
+
+
+class OptimizerMemo:
+    """
+    SqliteBroker-এর মতোই প্রতিটি কলে নতুন কানেকশন, তাই কোঅর্ডিনেটরের থ্রেড থেকে asyncio.to_thread দিয়ে
+    নিরাপদে ডাকা যায়।
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.OPTIMIZER_MEMO_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    strategy TEXT NOT NULL,
+                    dataset TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    source_hash TEXT NOT NULL,
+                    data_fingerprint TEXT NOT NULL,
+                    metrics TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (strategy, dataset, params)
+                );
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def invalidate_stale(self, strategy: str, dataset: str, source_hash: str, data_fingerprint: str) -> int:
+        """অন্য সোর্স হ্যাশ বা ডেটা ফিঙ্গারপ্রিন্টের এন্ট্রিগুলো মুছে ফেলে; কতগুলো মুছল তা ফেরত দেয়।"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "DELETE FROM evaluations WHERE strategy = ? AND dataset = ? AND (source_hash != ? OR data_fingerprint != ?)",
+                (strategy, dataset, source_hash, data_fingerprint),
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def lookup(self, strategy: str, dataset: str, source_hash: str, data_fingerprint: str,
+               combinations: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """memo_params_key(params) -> মেট্রিক্স, শুধু যেগুলো মেমোতে আছে।"""
+        keys = list({memo_params_key(params) for params in combinations})
+        found: Dict[str, Dict[str, Any]] = {}
+        conn = self._connect()
+        try:
+            # SQLite-এর প্যারামিটার সংখ্যার সীমার নিচে থাকতে খণ্ডে খণ্ডে খোঁজা
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT params, metrics FROM evaluations WHERE strategy = ? AND dataset = ? AND source_hash = ? "
+                    f"AND data_fingerprint = ? AND params IN ({','.join('?' * len(chunk))})",
+                    (strategy, dataset, source_hash, data_fingerprint, *chunk),
+                ).fetchall()
+                found.update((params, json.loads(metrics_json)) for params, metrics_json in rows)
+        finally:
+            conn.close()
+        metrics.inc("optimizer_memo_requests_total", len(found), result="hit")
+        metrics.inc("optimizer_memo_requests_total", len(keys) - len(found), result="miss")
+        return found
+
+    def store(self, strategy: str, dataset: str, source_hash: str, data_fingerprint: str,
+              results: List[Dict[str, Any]]) -> int:
+        """ব্রোকারের job_results-এর আকারের ({"params": ..., মেট্রিক্স...}) সফল ফলাফলগুলো রাখে।"""
+        now = time.time()
+        rows = [
+            (strategy, dataset, memo_params_key(item["params"]), source_hash, data_fingerprint,
+             json.dumps({key: value for key, value in item.items() if key != "params"}), now)
+            for item in results
+        ]
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return len(rows)
+
+
+_memo: Optional[OptimizerMemo] = None
+
+def get_optimizer_memo() -> OptimizerMemo:
+    global _memo
+    if _memo is None:
+        _memo = OptimizerMemo()
+    return _memo
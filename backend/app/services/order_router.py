@@ -0,0 +1,473 @@
+# app/services/order_router.py
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import inspect
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .. import config
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+#  অর্ডার রাউটার (Async order routing for many bots)
+#
+#  বটগুলো (প্রতিটি নিজস্ব থ্রেডে) submit() দিয়ে অর্ডার দেয় এবং সাথে সাথে ফেরত পায়; আসল
+#  এক্সচেঞ্জ কল রাউটারের নিজস্ব থ্রেডের ইভেন্ট লুপে হয়। প্রতিটি এক্সচেঞ্জের একটি "লেন":
+#    - রেট বাজেট:  token bucket (প্রতি সেকেন্ডে কতগুলো অর্ডার-রিকোয়েস্ট, সাথে burst)
+#    - কনকারেন্সি: একসাথে সর্বোচ্চ কতগুলো কল চলতে পারে
+#    - ব্যাচিং:    কিউতে একাধিক অর্ডার জমে থাকলে এবং ক্লায়েন্টের createOrders থাকলে একটি কলে পাঠানো হয়
+#    - ট্র্যাকিং:  ack-এর পর খোলা অর্ডারগুলো fetch_order দিয়ে ফিল/ক্যানসেল পর্যন্ত দেখা হয়
+#  প্রতিটি অর্ডারে সিগন্যাল থেকে ack ও ফিল পর্যন্ত সময় এবং সিগন্যালের দামের তুলনায় slippage রাখা হয়।
+# ==============================================================================
+
+# ccxt-এর অর্ডার status -> রাউটারের চূড়ান্ত status
+_FINAL_STATUSES = {"closed": "filled", "canceled": "canceled", "cancelled": "canceled",
+                   "expired": "canceled", "rejected": "rejected"}
+# প্রতিটি লেনে latency পারসেন্টাইলের জন্য কতগুলো সাম্প্রতিক নমুনা রাখা হবে
+LATENCY_SAMPLES = 1000
+# /api/orders/recent-এর জন্য কতগুলো অর্ডার মেমরিতে থাকবে
+RECENT_ORDERS = 1000
+
+
+class OrderRouterStopped(RuntimeError):
+    """রাউটার বন্ধ হওয়ার সময় যে অর্ডারের ফলাফল জানা যায়নি, তার Future এই এক্সেপশন দিয়ে শেষ হয়।"""
+
+
+class _TokenBucket:
+    """প্রতি সেকেন্ডে rate টোকেন জমে, সর্বোচ্চ burst পর্যন্ত; acquire() টোকেন না থাকলে অপেক্ষা করে।"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self, cost: float = 1.0):
+        cost = min(cost, self.capacity)
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return
+            await asyncio.sleep((cost - self.tokens) / self.rate)
+
+
+class RoutedOrder:
+    """রাউটারের মধ্য দিয়ে যাওয়া একটি অর্ডারের পুরো জীবনচক্র।"""
+
+    __slots__ = ("id", "exchange", "symbol", "type", "side", "amount", "price", "params", "bot_id",
+                 "reference_price", "status", "exchange_order_id", "filled", "average", "error", "batched",
+                 "signal_at", "queued_at", "sent_at", "acked_at", "done_at", "created_at", "future", "on_fill")
+
+    def __init__(self, order_id: str, exchange: str, symbol: str, type: str, side: str, amount: float,
+                 price: Optional[float], params: Optional[Dict[str, Any]], bot_id: Optional[str],
+                 reference_price: Optional[float], signal_at: Optional[float], on_fill):
+        self.id = order_id
+        self.exchange = exchange
+        self.symbol = symbol
+        self.type = type
+        self.side = side
+        self.amount = amount
+        self.price = price
+        self.params = params
+        self.bot_id = bot_id
+        self.reference_price = reference_price
+        self.status = "queued"
+        self.exchange_order_id: Optional[str] = None
+        self.filled = 0.0
+        self.average: Optional[float] = None
+        self.error: Optional[str] = None
+        self.batched = False
+        # সব সময় time.monotonic() অনুযায়ী; signal_at না দিলে submit()-এর সময়
+        self.queued_at = time.monotonic()
+        self.signal_at = signal_at if signal_at is not None else self.queued_at
+        self.sent_at: Optional[float] = None
+        self.acked_at: Optional[float] = None
+        self.done_at: Optional[float] = None
+        self.created_at = time.time()
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.on_fill: Optional[Callable[[Dict[str, Any]], None]] = on_fill
+
+    def _since_signal_ms(self, moment: Optional[float]) -> Optional[float]:
+        return round((moment - self.signal_at) * 1000, 3) if moment is not None else None
+
+    @property
+    def slippage_bps(self) -> Optional[float]:
+        """সিগন্যালের দামের তুলনায় ফিলের দাম কতটা খারাপ (basis point; ধনাত্মক মানে আমাদের ক্ষতি)।"""
+        if not self.reference_price or not self.average:
+            return None
+        direction = 1 if self.side == "buy" else -1
+        return round((self.average - self.reference_price) / self.reference_price * 10_000 * direction, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "exchange": self.exchange,
+            "symbol": self.symbol,
+            "type": self.type,
+            "side": self.side,
+            "amount": self.amount,
+            "price": self.price,
+            "bot_id": self.bot_id,
+            "status": self.status,
+            "exchange_order_id": self.exchange_order_id,
+            "filled": self.filled,
+            "average": self.average,
+            "reference_price": self.reference_price,
+            "slippage_bps": self.slippage_bps,
+            "error": self.error,
+            "batched": self.batched,
+            "created_at": self.created_at,
+            "queue_ms": round((self.sent_at - self.queued_at) * 1000, 3) if self.sent_at is not None else None,
+            "signal_to_ack_ms": self._since_signal_ms(self.acked_at),
+            "signal_to_fill_ms": self._since_signal_ms(self.done_at if self.status == "filled" else None),
+        }
+
+
+class _Lane:
+    """একটি এক্সচেঞ্জের কিউ, রেট বাজেট এবং খোলা অর্ডারের তালিকা। শুধু রাউটারের লুপ থেকে ব্যবহৃত হয়।"""
+
+    def __init__(self, key: str, client, rate: float, burst: float, concurrency: int, batch_size: int):
+        self.key = key
+        self.client = client
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.bucket = _TokenBucket(rate, burst)
+        self.slots = asyncio.Semaphore(max(1, concurrency))
+        has = getattr(client, "has", None) or {}
+        self.batch_size = batch_size if has.get("createOrders") else 1
+        self.tracking: Dict[str, RoutedOrder] = {}
+        self.in_flight = 0
+        self.ack_latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.counts = {"submitted": 0, "acked": 0, "filled": 0, "rejected": 0, "canceled": 0, "batches": 0}
+        self.tasks: List[asyncio.Task] = []
+        # এক্সচেঞ্জে কল চলছে এমন _send টাস্কগুলো; stop() এগুলো শেষ হওয়ার অপেক্ষা করে
+        self.sending: set = set()
+
+    async def call(self, method: str, *args):
+        """async ccxt ক্লায়েন্ট সরাসরি await হয়; সিঙ্ক ক্লায়েন্ট (ccxt বা পেপার) থ্রেড পুলে চলে।"""
+        func = getattr(self.client, method)
+        if inspect.iscoroutinefunction(func):
+            return await func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.ack_latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3) if latencies else None
+
+        return {
+            "exchange": self.key,
+            "queued": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "tracking": len(self.tracking),
+            "batch_size": self.batch_size,
+            "rate_per_second": self.bucket.rate,
+            **self.counts,
+            "signal_to_ack_p50_ms": percentile(0.5),
+            "signal_to_ack_p95_ms": percentile(0.95),
+        }
+
+
+class OrderRouter:
+    """
+    অনেক বটের অর্ডার এক জায়গা থেকে এক্সচেঞ্জে পাঠায়। start()/stop() cache_warmer-এর মতোই একটি daemon
+    থ্রেড চালু/বন্ধ করে; প্রথম submit()-এ রাউটার নিজে থেকেই চালু হয়।
+    """
+
+    def __init__(self, rate: float = None, burst: float = None, concurrency: int = None, batch_size: int = None,
+                 poll_interval: float = None):
+        self.rate = rate or config.ORDER_ROUTER_RATE
+        self.burst = burst or config.ORDER_ROUTER_BURST
+        self.concurrency = concurrency or config.ORDER_ROUTER_CONCURRENCY
+        self.batch_size = batch_size or config.ORDER_ROUTER_BATCH_SIZE
+        self.poll_interval = poll_interval or config.ORDER_ROUTER_POLL_INTERVAL
+        self._lanes: Dict[str, _Lane] = {}
+        self._clients: Dict[str, Any] = {}
+        self._recent: Deque[RoutedOrder] = deque(maxlen=RECENT_ORDERS)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = threading.Event()
+        self._stopped: Optional[asyncio.Event] = None
+        self._drain_timeout = 0.0
+
+    # --- বটের দিক (যেকোনো থ্রেড থেকে) ---
+    def register(self, key: str, client):
+        """key নামের লেনের জন্য ক্লায়েন্ট দেওয়া। একই key-তে প্রথম ক্লায়েন্টটিই থাকে (সব বট একই অ্যাকাউন্ট)।"""
+        with self._lock:
+            self._clients.setdefault(key, client)
+
+    def submit(self, key: str, symbol: str, type: str, side: str, amount: float, price: float = None,
+               params: Dict[str, Any] = None, bot_id: str = None, reference_price: float = None,
+               signal_at: float = None, on_fill: Callable[[Dict[str, Any]], None] = None) -> concurrent.futures.Future:
+        """
+        অর্ডারটি কিউতে দিয়ে সাথে সাথে ফেরে। ফেরত দেওয়া Future ack (বা rejection) হলে RoutedOrder.to_dict()
+        দিয়ে পূর্ণ হয়; on_fill(order) অর্ডারটি চূড়ান্ত হলে (ফিল, আংশিক ফিল বা ক্যানসেল) রাউটারের থ্রেডে ডাকা হয়।
+        signal_at হলো সিগন্যাল তৈরির time.monotonic() মান।
+        """
+        with self._lock:
+            if key not in self._clients:
+                raise ValueError(f"No order routing client registered for '{key}'.")
+            order = RoutedOrder(f"r{next(self._ids)}", key, symbol, type, side.lower(), amount, price, params,
+                                bot_id, reference_price, signal_at, on_fill)
+            self._recent.append(order)
+        self.start()
+        metrics.inc("order_router_orders_total", exchange=key, outcome="queued")
+        self._loop.call_soon_threadsafe(self._enqueue, order)
+        return order.future
+
+    # --- লেন ও ডিসপ্যাচ (রাউটারের লুপে) ---
+    def _lane(self, key: str) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            with self._lock:
+                client = self._clients[key]
+            lane = _Lane(key, client, self.rate, self.burst, self.concurrency, self.batch_size)
+            lane.tasks = [asyncio.ensure_future(self._dispatch(lane)), asyncio.ensure_future(self._track(lane))]
+            self._lanes[key] = lane
+        return lane
+
+    def _enqueue(self, order: RoutedOrder):
+        self._lane(order.exchange).queue.put_nowait(order)
+
+    async def _dispatch(self, lane: _Lane):
+        while True:
+            batch = [await lane.queue.get()]
+            try:
+                # স্লট খালি হওয়ার অপেক্ষার সময় জমে থাকা অর্ডারগুলো পরের ব্যাচে একসাথে যায়
+                await lane.slots.acquire()
+                while len(batch) < lane.batch_size and not lane.queue.empty():
+                    batch.append(lane.queue.get_nowait())
+                # এক্সচেঞ্জের অর্ডার-রেট লিমিট ব্যাচের ভেতরের প্রতিটি অর্ডার গোনে
+                await lane.bucket.acquire(len(batch))
+            except asyncio.CancelledError:
+                # রাউটার বন্ধ হচ্ছে; যে অর্ডারগুলো এক্সচেঞ্জে যায়নি সেগুলো কিউতে ফেরে এবং _shutdown সেগুলো বাতিল করে
+                for order in batch:
+                    lane.queue.put_nowait(order)
+                raise
+            task = asyncio.ensure_future(self._send(lane, batch))
+            lane.sending.add(task)
+            task.add_done_callback(lane.sending.discard)
+
+    async def _send(self, lane: _Lane, batch: List[RoutedOrder]):
+        sent_at = time.monotonic()
+        for order in batch:
+            order.sent_at = sent_at
+            order.status = "submitted"
+            metrics.observe("order_router_queue_seconds", sent_at - order.queued_at, exchange=lane.key)
+        lane.in_flight += len(batch)
+        lane.counts["submitted"] += len(batch)
+        try:
+            if len(batch) > 1:
+                lane.counts["batches"] += 1
+                requests = [{"symbol": o.symbol, "type": o.type, "side": o.side, "amount": o.amount,
+                             "price": o.price, "params": o.params or {}} for o in batch]
+                try:
+                    results = await lane.call("create_orders", requests)
+                except Exception as e:
+                    # ব্যাচ কল ব্যর্থ হলে আবার পাঠানো হয় না, যাতে একই অর্ডার দুবার না যায়
+                    for order in batch:
+                        self._reject(lane, order, e)
+                    return
+                for order, result in zip(batch, results):
+                    order.batched = True
+                    if result.get("status") == "rejected" or not result.get("id"):
+                        self._reject(lane, order, result.get("info") or "rejected by exchange")
+                    else:
+                        self._ack(lane, order, result)
+            else:
+                order = batch[0]
+                try:
+                    result = await lane.call("create_order", order.symbol, order.type, order.side, order.amount,
+                                             order.price, order.params or {})
+                except Exception as e:
+                    self._reject(lane, order, e)
+                else:
+                    self._ack(lane, order, result)
+        except asyncio.CancelledError:
+            # stop()-এর সময়সীমার মধ্যে এক্সচেঞ্জ উত্তর দেয়নি; অর্ডারটি এক্সচেঞ্জে পৌঁছেছে কিনা জানা নেই
+            for order in batch:
+                self._abort(lane, order, "no response from the exchange before the order router stopped; "
+                                         "the order may or may not have been placed")
+            raise
+        finally:
+            lane.in_flight -= len(batch)
+            lane.slots.release()
+
+    # --- ack, ফিল এবং রিজেকশন ---
+    @staticmethod
+    def _update(order: RoutedOrder, result: Dict[str, Any]):
+        order.filled = float(result.get("filled") or 0.0)
+        order.average = (result.get("average") or result.get("price")) if order.filled else None
+
+    def _ack(self, lane: _Lane, order: RoutedOrder, result: Dict[str, Any]):
+        order.acked_at = time.monotonic()
+        order.exchange_order_id = str(result["id"])
+        order.status = "acked"
+        self._update(order, result)
+        latency = order.acked_at - order.signal_at
+        lane.ack_latencies.append(latency)
+        lane.counts["acked"] += 1
+        metrics.observe("order_signal_to_ack_seconds", latency, exchange=lane.key)
+        metrics.inc("order_router_orders_total", exchange=lane.key, outcome="acked")
+        final = _FINAL_STATUSES.get(result.get("status"))
+        if final:
+            self._finish(lane, order, final)
+        else:
+            lane.tracking[order.id] = order
+        if not order.future.done():
+            order.future.set_result(order.to_dict())
+
+    def _reject(self, lane: _Lane, order: RoutedOrder, error):
+        order.status = "rejected"
+        order.error = str(error)
+        order.done_at = time.monotonic()
+        lane.counts["rejected"] += 1
+        metrics.inc("order_router_orders_total", exchange=lane.key, outcome="rejected")
+        logger.warning("⚠️ Order %s (%s %s %s on %s) was rejected: %s", order.id, order.side, order.amount,
+                       order.symbol, lane.key, order.error)
+        if not order.future.done():
+            order.future.set_result(order.to_dict())
+
+    def _abort(self, lane: _Lane, order: RoutedOrder, reason: str):
+        if order.future.done():
+            return
+        order.status = "aborted"
+        order.error = reason
+        order.done_at = time.monotonic()
+        metrics.inc("order_router_orders_total", exchange=lane.key, outcome="aborted")
+        logger.warning("⚠️ Order %s (%s %s %s on %s) was aborted: %s", order.id, order.side, order.amount,
+                       order.symbol, lane.key, reason)
+        order.future.set_exception(OrderRouterStopped(f"Order {order.id} was aborted: {reason}"))
+
+    def _finish(self, lane: _Lane, order: RoutedOrder, status: str):
+        lane.tracking.pop(order.id, None)
+        order.done_at = time.monotonic()
+        # ক্যানসেল হওয়ার আগে কিছুটা ফিল হলে সেটিও ট্রেড হিসেবে রেকর্ড হওয়া দরকার
+        order.status = "partially_filled" if status == "canceled" and order.filled else status
+        lane.counts["filled" if order.filled else "canceled" if status == "canceled" else "rejected"] += 1
+        metrics.inc("order_router_orders_total", exchange=lane.key, outcome=order.status)
+        if order.status == "filled":
+            metrics.observe("order_signal_to_fill_seconds", order.done_at - order.signal_at, exchange=lane.key)
+        if order.on_fill is not None:
+            try:
+                order.on_fill(order.to_dict())
+            except Exception as e:
+                logger.error("🔥 on_fill callback for order %s failed: %s", order.id, e)
+
+    async def _track(self, lane: _Lane):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for order in list(lane.tracking.values()):
+                await lane.bucket.acquire()
+                try:
+                    result = await lane.call("fetch_order", order.exchange_order_id, order.symbol)
+                except Exception as e:
+                    logger.warning("⚠️ Could not poll order %s on %s: %s", order.id, lane.key, e)
+                    continue
+                self._update(order, result)
+                final = _FINAL_STATUSES.get(result.get("status"))
+                if final:
+                    self._finish(lane, order, final)
+
+    # --- রিপোর্ট ---
+    def stats(self) -> List[Dict[str, Any]]:
+        return [lane.stats() for lane in list(self._lanes.values())]
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            orders = list(self._recent)[-limit:] if limit > 0 else []
+        return [order.to_dict() for order in reversed(orders)]
+
+    # --- থ্রেড ---
+    async def _shutdown(self, timeout: float):
+        """
+        নতুন ডিসপ্যাচ বন্ধ করে, এক্সচেঞ্জে চলমান কলগুলোর জন্য timeout পর্যন্ত অপেক্ষা করে (যাতে ack/ফিল রেকর্ড হয়),
+        তারপর বাকি কলগুলো ক্যানসেল করে। কিউতে থেকে যাওয়া অর্ডারগুলোর Future OrderRouterStopped দিয়ে শেষ হয়।
+        """
+        lanes = list(self._lanes.values())
+        background = [task for lane in lanes for task in lane.tasks]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        sending = [task for lane in lanes for task in lane.sending]
+        if sending:
+            _, pending = await asyncio.wait(sending, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for lane in lanes:
+            while not lane.queue.empty():
+                self._abort(lane, lane.queue.get_nowait(), "the order router stopped before the order was sent")
+            if lane.tracking:
+                logger.warning("⚠️ Order router stopped while tracking %d open order(s) on %s; their fills will "
+                               "not be recorded.", len(lane.tracking), lane.key)
+        self._lanes.clear()
+
+    async def _run_async(self):
+        self._stopped = asyncio.Event()
+        self._ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self._shutdown(self._drain_timeout)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._run_async())
+        except Exception as e:
+            metrics.inc("errors_total", component="order_router")
+            logger.error("🔥 Order router stopped unexpectedly: %s", e)
+        finally:
+            self._loop = None
+            self._ready.clear()
+            loop.close()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            started = not self.is_running
+            if started:
+                self._thread = threading.Thread(target=self._run, name="order-router", daemon=True)
+                self._thread.start()
+        # submit() লুপ তৈরি হওয়ার আগেই call_soon_threadsafe ডাকতে পারে না
+        self._ready.wait()
+        if started:
+            logger.info("📮 Order router started.")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        রাউটার বন্ধ করে। চলমান এক্সচেঞ্জ কলগুলো timeout-এর অর্ধেক পর্যন্ত শেষ হওয়ার সুযোগ পায়, বাকি সময় থ্রেড
+        বন্ধ হওয়ার জন্য। ফিলগুলো on_fill দিয়ে trade_writer-এ যায়, তাই এটি trade_writer.stop()-এর আগে ডাকতে হয়।
+        """
+        if not self.is_running:
+            return
+        self._drain_timeout = timeout / 2
+        loop, stopped = self._loop, self._stopped
+        if loop is not None and stopped is not None:
+            loop.call_soon_threadsafe(stopped.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+
+# সব বটের জন্য একটিমাত্র শেয়ার করা রাউটার
+order_router = OrderRouter()
+metrics.register_gauge(lambda: {"order_router_queued_orders": sum(lane["queued"] for lane in order_router.stats())})
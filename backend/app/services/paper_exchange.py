@@ -0,0 +1,509 @@
+# app/services/paper_exchange.py
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import config
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+#  পেপার ট্রেডিং এক্সচেঞ্জ (Local paper-trading exchange)
+#
+#  ccxt-এর সিঙ্ক্রোনাস ক্লায়েন্টের মতো ইন্টারফেস (create_order, cancel_order, fetch_order,
+#  fetch_open_orders, fetch_my_trades, fetch_balance, fetch_ticker, fetch_ohlcv), তাই bot_core
+#  কোনো পরিবর্তন ছাড়াই আসল এক্সচেঞ্জের বদলে এটি ব্যবহার করতে পারে। কোনো অ্যাকাউন্ট লাগে না।
+#
+#  - অর্ডার: market, limit, stop_market (params["stopPrice"]) এবং stop_limit
+#  - ম্যাচিং: প্রতিটি দামের আপডেটে (ticker বা candle) price-time priority অনুযায়ী ফিল হয়;
+#    বেশি দামের bid / কম দামের ask আগে, একই দামে আগের অর্ডার আগে
+#  - লিকুইডিটি: একটি candle-এর volume-এর PAPER_LIQUIDITY_PARTICIPATION অংশ পর্যন্ত ফিল হতে পারে,
+#    বাকিটা partial fill হিসেবে খোলা থাকে এবং পরের আপডেটে আবার চেষ্টা করে
+#  - ব্যালেন্স: অর্ডার দেওয়ার সময় ফান্ড রিজার্ভ হয় (used), ফি quote কারেন্সিতে কাটা হয়
+#  market_data (যেমন একটি ccxt ক্লায়েন্ট বা রিপ্লের SimulatedExchange) থাকলে fetch_ticker/fetch_ohlcv
+#  সেখান থেকে আসে এবং একই সাথে ম্যাচিং ইঞ্জিনকে চালায়।
+# ==============================================================================
+
+ORDER_TYPES = ("market", "limit", "stop_market", "stop_limit")
+
+# কতগুলো বন্ধ/বাতিল অর্ডার এবং ফিল মেমরিতে রাখা হবে (লোড টেস্টে মেমরি সীমিত রাখতে)
+MAX_CLOSED_ORDERS = 100_000
+MAX_TRADES = 100_000
+
+
+class PaperExchangeError(Exception):
+    """পেপার এক্সচেঞ্জের সব ত্রুটির বেস ক্লাস (ccxt-এর ExchangeError-এর মতো)।"""
+
+
+class InvalidOrder(PaperExchangeError):
+    pass
+
+
+class InsufficientFunds(PaperExchangeError):
+    pass
+
+
+class OrderNotFound(PaperExchangeError):
+    pass
+
+
+def _split_symbol(symbol: str) -> Tuple[str, str]:
+    try:
+        base, quote = symbol.split("/")
+    except ValueError:
+        raise InvalidOrder(f"Symbol '{symbol}' must look like BASE/QUOTE.")
+    return base, quote.split(":")[0]
+
+
+class _Order:
+    __slots__ = ("id", "symbol", "type", "side", "amount", "price", "stop_price", "filled", "cost", "fee",
+                 "status", "timestamp", "seq", "reserved", "triggered")
+
+    def __init__(self, order_id: str, symbol: str, type_: str, side: str, amount: float, price: Optional[float],
+                 stop_price: Optional[float], timestamp: int, seq: int):
+        self.id = order_id
+        self.symbol = symbol
+        self.type = type_
+        self.side = side
+        self.amount = amount
+        self.price = price
+        self.stop_price = stop_price
+        self.filled = 0.0
+        self.cost = 0.0
+        self.fee = 0.0
+        self.status = "open"
+        self.timestamp = timestamp
+        self.seq = seq
+        # এই অর্ডারের জন্য এখনো আটকে রাখা ফান্ড (buy: quote, sell: base)
+        self.reserved = 0.0
+        self.triggered = False
+
+    @property
+    def remaining(self) -> float:
+        return self.amount - self.filled
+
+    def to_ccxt(self) -> Dict[str, Any]:
+        _, quote = _split_symbol(self.symbol)
+        return {
+            "id": self.id, "clientOrderId": None, "timestamp": self.timestamp, "symbol": self.symbol,
+            "type": self.type, "side": self.side, "price": self.price, "stopPrice": self.stop_price,
+            "amount": self.amount, "filled": self.filled, "remaining": self.remaining, "cost": self.cost,
+            "average": self.cost / self.filled if self.filled else None, "status": self.status,
+            "fee": {"cost": self.fee, "currency": quote},
+        }
+
+
+class _Book:
+    """একটি সিম্বলের খোলা অর্ডার: bid/ask হিপ (price-time priority), ট্রিগারের অপেক্ষায় থাকা stop, এবং market।"""
+
+    __slots__ = ("bids", "asks", "stops", "markets", "last_price", "candle", "liquidity")
+
+    def __init__(self):
+        self.bids: List[Tuple[float, int, _Order]] = []
+        self.asks: List[Tuple[float, int, _Order]] = []
+        self.stops: List[_Order] = []
+        # লিকুইডিটির অভাবে আংশিক ফিল হওয়া market অর্ডার (সময়ক্রমে)
+        self.markets: deque = deque()
+        self.last_price: Optional[float] = None
+        # শেষ দেখা candle-এর [timestamp, high, low, volume]; একই candle আবার এলে শুধু নতুন অংশটুকু ম্যাচ হয়
+        self.candle: Optional[List[float]] = None
+        # বর্তমান আপডেটে buy এবং sell দিকে আর কতটুকু ফিল করা যাবে
+        self.liquidity = {"buy": math.inf, "sell": math.inf}
+
+
+class PaperExchange:
+    """
+    ইন-প্রসেস পেপার ট্রেডিং এক্সচেঞ্জ। একাধিক বট (থ্রেড) একই ইনস্ট্যান্স শেয়ার করতে পারে;
+    সব পাবলিক মেথড একটি লকের মধ্যে চলে।
+    """
+
+    # ccxt-এর মতো ক্ষমতার তালিকা (অর্ডার রাউটার batch endpoint আছে কিনা এখান থেকে দেখে)
+    has = {"createOrder": True, "createOrders": True, "cancelOrder": True, "fetchOrder": True,
+           "fetchOpenOrders": True, "fetchMyTrades": True, "fetchBalance": True}
+
+    def __init__(self, market_data=None, balances: Dict[str, float] = None, taker_fee_percentage: float = None,
+                 maker_fee_percentage: float = None, liquidity_participation: float = None, clock=None):
+        self.market_data = market_data
+        self.id = f"paper-{market_data.id}" if market_data is not None else "paper"
+        self.name = f"Paper ({getattr(market_data, 'name', market_data.id)})" if market_data is not None else "Paper"
+        self.taker_fee = (config.PAPER_TAKER_FEE_PERCENTAGE if taker_fee_percentage is None else taker_fee_percentage) / 100
+        self.maker_fee = (config.PAPER_MAKER_FEE_PERCENTAGE if maker_fee_percentage is None else maker_fee_percentage) / 100
+        self.liquidity_participation = (config.PAPER_LIQUIDITY_PARTICIPATION if liquidity_participation is None
+                                        else liquidity_participation)
+        # রিপ্লেতে ভার্চুয়াল ঘড়ি (now_ms) দেওয়া যায়; না দিলে আসল সময়
+        self.clock = clock
+        starting = parse_balances(config.PAPER_STARTING_BALANCES) if balances is None else balances
+        self._free: Dict[str, float] = {currency: float(amount) for currency, amount in starting.items()}
+        self._used: Dict[str, float] = {currency: 0.0 for currency in self._free}
+        self._books: Dict[str, _Book] = {}
+        self._orders: Dict[str, _Order] = {}
+        self._open: Dict[str, _Order] = {}
+        self._closed: deque = deque()
+        self._trades: deque = deque(maxlen=MAX_TRADES)
+        self._ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    # --- সহায়ক ---
+    def _now_ms(self) -> int:
+        return self.clock.now_ms if self.clock is not None else int(time.time() * 1000)
+
+    def _book(self, symbol: str) -> _Book:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _Book()
+        return book
+
+    def _reserve(self, currency: str, amount: float):
+        if self._free.get(currency, 0.0) + 1e-12 < amount:
+            raise InsufficientFunds(f"Insufficient {currency}: {self._free.get(currency, 0.0):.8f} free, {amount:.8f} required.")
+        self._free[currency] = self._free.get(currency, 0.0) - amount
+        self._used[currency] = self._used.get(currency, 0.0) + amount
+
+    def _release(self, order: _Order):
+        if order.reserved:
+            base, quote = _split_symbol(order.symbol)
+            currency = quote if order.side == "buy" else base
+            self._used[currency] -= order.reserved
+            self._free[currency] += order.reserved
+            order.reserved = 0.0
+            # float-এর অবশিষ্ট ধুলো (যেমন -5e-14) যেন ঋণাত্মক ব্যালেন্স হিসেবে না দেখায়
+            if abs(self._used[currency]) < 1e-9:
+                self._used[currency] = 0.0
+
+    def _close(self, order: _Order, status: str):
+        order.status = status
+        self._release(order)
+        self._open.pop(order.id, None)
+        self._closed.append(order.id)
+        while len(self._closed) > MAX_CLOSED_ORDERS:
+            self._orders.pop(self._closed.popleft(), None)
+
+    # --- ফিল ---
+    def _fill(self, order: _Order, book: _Book, price: float, maker: bool) -> float:
+        """order-এর যতটুকু সম্ভব (লিকুইডিটি এবং রিজার্ভ অনুযায়ী) price-এ ফিল করে; ফিলের পরিমাণ ফেরত দেয়।"""
+        amount = min(order.remaining, book.liquidity[order.side])
+        if amount <= 0:
+            return 0.0
+        fee_rate = self.maker_fee if maker else self.taker_fee
+        base, quote = _split_symbol(order.symbol)
+        if order.side == "buy":
+            # market অর্ডারের দাম রিজার্ভের সময়ের চেয়ে বাড়লে রিজার্ভে যতটুকু কুলায় ততটুকুই
+            amount = min(amount, order.reserved / (price * (1 + fee_rate)))
+            if amount <= 1e-12:
+                # রিজার্ভ শেষ: যতটুকু ফিল হয়েছে ততটুকুতেই অর্ডার বন্ধ
+                self._close(order, "closed" if order.filled else "canceled")
+                return 0.0
+            spent = amount * price * (1 + fee_rate)
+            order.reserved -= spent
+            self._used[quote] -= spent
+            self._free[base] = self._free.get(base, 0.0) + amount
+            self._used.setdefault(base, 0.0)
+        else:
+            order.reserved -= amount
+            self._used[base] -= amount
+            self._free[quote] = self._free.get(quote, 0.0) + amount * price * (1 - fee_rate)
+            self._used.setdefault(quote, 0.0)
+
+        book.liquidity[order.side] -= amount
+        order.filled += amount
+        order.cost += amount * price
+        order.fee += amount * price * fee_rate
+        self._trades.append({
+            "id": str(next(self._trade_ids)), "order": order.id, "symbol": order.symbol, "side": order.side,
+            "price": price, "amount": amount, "cost": amount * price, "timestamp": self._now_ms(),
+            "takerOrMaker": "maker" if maker else "taker", "fee": {"cost": amount * price * fee_rate, "currency": quote},
+        })
+        metrics.inc("paper_fills_total", side=order.side, liquidity="maker" if maker else "taker")
+        if order.remaining <= 1e-12 * max(1.0, order.amount):
+            order.filled = order.amount
+            self._close(order, "closed")
+        return amount
+
+    def _match(self, book: _Book, price: float, high: float, low: float, volume: Optional[float],
+               open_: Optional[float] = None):
+        """একটি দামের আপডেটে stop ট্রিগার, অপেক্ষমাণ market অর্ডার এবং limit অর্ডারগুলো ম্যাচ করে।"""
+        available = math.inf if volume is None else volume * self.liquidity_participation
+        book.liquidity = {"buy": available, "sell": available}
+        book.last_price = price
+
+        # stop: buy stop উপরে, sell stop নিচে ট্রিগার হয়
+        if book.stops:
+            waiting = []
+            for order in sorted(book.stops, key=lambda o: o.seq):
+                if order.status != "open":
+                    continue
+                hit = high >= order.stop_price if order.side == "buy" else low <= order.stop_price
+                if not hit:
+                    waiting.append(order)
+                    continue
+                order.triggered = True
+                if order.type == "stop_market":
+                    # candle-এর ভেতরে ট্রিগার হলে stop দামে; gap হলে (candle stop-এর ওপারে খুললে) open দামে
+                    if low <= order.stop_price <= high:
+                        fill_price = order.stop_price
+                    else:
+                        fill_price = price if open_ is None else open_
+                    self._fill(order, book, fill_price, maker=False)
+                    if order.status == "open":
+                        book.markets.append(order)
+                else:
+                    self._rest_or_take(order, book)
+            book.stops = waiting
+
+        # আগের আপডেট থেকে বাকি থাকা market অর্ডার সবার আগে
+        while book.markets:
+            order = book.markets[0]
+            if order.status != "open":
+                book.markets.popleft()
+                continue
+            self._fill(order, book, price, maker=False)
+            if order.status == "open":
+                break
+            book.markets.popleft()
+
+        # limit bid: বেশি দাম আগে; দাম low পর্যন্ত নামলে limit দামে ফিল
+        while book.bids and book.liquidity["buy"] > 0:
+            neg_price, _, order = book.bids[0]
+            if order.status != "open":
+                heapq.heappop(book.bids)
+                continue
+            if -neg_price < low:
+                break
+            filled = self._fill(order, book, -neg_price, maker=True)
+            if order.status != "open":
+                heapq.heappop(book.bids)
+            elif not filled:
+                break
+        while book.asks and book.liquidity["sell"] > 0:
+            ask_price, _, order = book.asks[0]
+            if order.status != "open":
+                heapq.heappop(book.asks)
+                continue
+            if ask_price > high:
+                break
+            filled = self._fill(order, book, ask_price, maker=True)
+            if order.status != "open":
+                heapq.heappop(book.asks)
+            elif not filled:
+                break
+
+    def _rest_or_take(self, order: _Order, book: _Book):
+        """marketable limit বর্তমান দামে taker হিসেবে ফিল হয়; বাকিটা বুকে অপেক্ষা করে।"""
+        last = book.last_price
+        if last is not None and ((order.side == "buy" and order.price >= last) or (order.side == "sell" and order.price <= last)):
+            self._fill(order, book, last, maker=False)
+        if order.status == "open":
+            entry = (-order.price, order.seq, order) if order.side == "buy" else (order.price, order.seq, order)
+            heapq.heappush(book.bids if order.side == "buy" else book.asks, entry)
+
+    # --- মার্কেট ডেটা ফিড ---
+    def update_price(self, symbol: str, price: float, volume: float = None):
+        """ticker-এর দাম দিয়ে ম্যাচিং চালায়।"""
+        with self._lock:
+            self._match(self._book(symbol), float(price), float(price), float(price), volume)
+
+    def update_candle(self, symbol: str, candle: List[float]):
+        """
+        [timestamp, open, high, low, close, volume] candle দিয়ে ম্যাচিং চালায়। লাইভ ডেটার শেষ candle-টি
+        এখনো তৈরি হচ্ছে, তাই একই timestamp আবার এলে সেটি উপেক্ষা করা হয় না: high/low বাড়লে বা নতুন
+        volume এলে পুরো রেঞ্জে আবার ম্যাচ হয়, লিকুইডিটি শুধু নতুন volume থেকে। পুরনো candle উপেক্ষিত হয়।
+        """
+        ts, open_, high, low, close, volume = candle[0], *map(float, candle[1:6])
+        with self._lock:
+            book = self._book(symbol)
+            seen = book.candle
+            if seen is not None and ts < seen[0]:
+                return
+            fresh_volume = volume
+            if seen is not None and ts == seen[0]:
+                fresh_volume = max(0.0, volume - seen[3])
+                if high <= seen[1] and low >= seen[2] and fresh_volume <= 0:
+                    return
+                high, low, volume = max(high, seen[1]), min(low, seen[2]), max(volume, seen[3])
+            book.candle = [ts, high, low, volume]
+            self._match(book, close, high, low, fresh_volume, open_)
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: int = None, limit: int = None) -> List[list]:
+        if self.market_data is None:
+            raise PaperExchangeError("No market data source is attached to this paper exchange.")
+        candles = self.market_data.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+        if candles:
+            with self._lock:
+                seen = self._book(symbol).candle
+            # আগের পোলে তৈরি হতে থাকা candle-টি এখন বন্ধ হলে তার বাকি অংশটুকু আগে ম্যাচ করা
+            if len(candles) > 1 and seen is not None and candles[-2][0] == seen[0]:
+                self.update_candle(symbol, candles[-2])
+            self.update_candle(symbol, candles[-1])
+        return candles
+
+    def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        if self.market_data is not None:
+            ticker = self.market_data.fetch_ticker(symbol)
+            self.update_price(symbol, ticker["last"])
+            return ticker
+        with self._lock:
+            last = self._book(symbol).last_price
+        if last is None:
+            raise PaperExchangeError(f"No price for {symbol} yet.")
+        return {"symbol": symbol, "timestamp": self._now_ms(), "last": last, "close": last, "bid": last, "ask": last}
+
+    # --- অর্ডার ---
+    def create_order(self, symbol: str, type: str, side: str, amount: float, price: float = None,
+                     params: Dict[str, Any] = None) -> Dict[str, Any]:
+        params = params or {}
+        type_ = {"stop": "stop_market", "stop_loss": "stop_market", "stop_loss_limit": "stop_limit"}.get(type.lower(), type.lower())
+        side = side.lower()
+        if type_ not in ORDER_TYPES:
+            raise InvalidOrder(f"Unsupported order type '{type}'. Use one of: {', '.join(ORDER_TYPES)}.")
+        if side not in ("buy", "sell"):
+            raise InvalidOrder(f"Unsupported side '{side}'.")
+        if not amount or amount <= 0:
+            raise InvalidOrder("Order amount must be positive.")
+        if type_ in ("limit", "stop_limit") and (price is None or price <= 0):
+            raise InvalidOrder(f"A {type_} order needs a positive price.")
+        stop_price = params.get("stopPrice", params.get("triggerPrice"))
+        if type_.startswith("stop") and not stop_price:
+            raise InvalidOrder(f"A {type_} order needs params['stopPrice'].")
+        base, quote = _split_symbol(symbol)
+
+        with self._lock:
+            book = self._book(symbol)
+            if type_ in ("market", "stop_market") and book.last_price is None:
+                raise InvalidOrder(f"No price for {symbol} yet; fetch a ticker or candle first.")
+            seq = next(self._ids)
+            order = _Order(str(seq), symbol, type_, side, float(amount), float(price) if price is not None else None,
+                           float(stop_price) if stop_price else None, self._now_ms(), seq)
+
+            # রিজার্ভ: buy-তে সম্ভাব্য সর্বোচ্চ খরচ + taker ফি, sell-এ base পরিমাণ
+            if side == "buy":
+                reference = {"market": book.last_price, "stop_market": order.stop_price}.get(type_, order.price)
+                order.reserved = order.amount * reference * (1 + max(self.taker_fee, self.maker_fee))
+                self._reserve(quote, order.reserved)
+            else:
+                order.reserved = order.amount
+                self._reserve(base, order.reserved)
+            self._orders[order.id] = order
+            self._open[order.id] = order
+            metrics.inc("paper_orders_total", type=type_, side=side)
+
+            if type_ == "market":
+                self._fill(order, book, book.last_price, maker=False)
+                if order.status == "open":
+                    book.markets.append(order)
+            elif type_ == "limit":
+                self._rest_or_take(order, book)
+            else:
+                book.stops.append(order)
+            return order.to_ccxt()
+
+    def create_orders(self, orders: List[Dict[str, Any]], params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        ccxt-এর batch endpoint (createOrders)-এর মতো: একটি কলে একাধিক অর্ডার। একটি অর্ডার বাতিল হলে
+        পুরো ব্যাচ ব্যর্থ হয় না; সেটির জায়গায় status "rejected" এবং info-তে কারণ থাকে।
+        """
+        results = []
+        with self._lock:
+            for order in orders:
+                try:
+                    results.append(self.create_order(order["symbol"], order["type"], order["side"], order["amount"],
+                                                     order.get("price"), order.get("params")))
+                except PaperExchangeError as e:
+                    results.append({"id": None, "symbol": order["symbol"], "status": "rejected", "info": str(e)})
+        return results
+
+    def create_market_order(self, symbol: str, side: str, amount: float, params: Dict[str, Any] = None):
+        return self.create_order(symbol, "market", side, amount, None, params)
+
+    def create_limit_order(self, symbol: str, side: str, amount: float, price: float, params: Dict[str, Any] = None):
+        return self.create_order(symbol, "limit", side, amount, price, params)
+
+    def cancel_order(self, id: str, symbol: str = None, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        with self._lock:
+            order = self._orders.get(str(id))
+            if order is None or (symbol is not None and order.symbol != symbol):
+                raise OrderNotFound(f"Order {id} not found.")
+            if order.status == "open":
+                # বুক থেকে অলসভাবে সরানো হয়: হিপের মাথায় এলে status দেখে বাদ দেওয়া হয়
+                self._close(order, "canceled")
+            return order.to_ccxt()
+
+    def fetch_order(self, id: str, symbol: str = None, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        with self._lock:
+            order = self._orders.get(str(id))
+            if order is None or (symbol is not None and order.symbol != symbol):
+                raise OrderNotFound(f"Order {id} not found.")
+            return order.to_ccxt()
+
+    def fetch_open_orders(self, symbol: str = None, since: int = None, limit: int = None,
+                          params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            orders = [o.to_ccxt() for o in self._open.values() if symbol is None or o.symbol == symbol]
+        return orders[-limit:] if limit else orders
+
+    def fetch_my_trades(self, symbol: str = None, since: int = None, limit: int = None,
+                        params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            trades = [t for t in self._trades if (symbol is None or t["symbol"] == symbol)
+                      and (since is None or t["timestamp"] >= since)]
+        return trades[-limit:] if limit else trades
+
+    def fetch_balance(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        with self._lock:
+            currencies = sorted(set(self._free) | set(self._used))
+            free = {c: self._free.get(c, 0.0) for c in currencies}
+            used = {c: self._used.get(c, 0.0) for c in currencies}
+        total = {c: free[c] + used[c] for c in currencies}
+        balance: Dict[str, Any] = {"free": free, "used": used, "total": total}
+        for c in currencies:
+            balance[c] = {"free": free[c], "used": used[c], "total": total[c]}
+        return balance
+
+    def close(self):
+        """ccxt ক্লায়েন্টের মতো; অন্তর্নিহিত ডেটা সোর্সের কিছু বন্ধ করার থাকলে সেটি বন্ধ করে।"""
+        close = getattr(self.market_data, "close", None)
+        if callable(close):
+            close()
+
+
+def parse_balances(raw: str) -> Dict[str, float]:
+    """ "USDT:10000,BTC:0.5" -> {"USDT": 10000.0, "BTC": 0.5} """
+    balances = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        currency, _, amount = item.partition(":")
+        balances[currency.strip().upper()] = float(amount or 0)
+    return balances
+
+
+# ==============================================================================
+#  শেয়ার করা পেপার অ্যাকাউন্ট (Shared paper accounts)
+# ==============================================================================
+
+# এক্সচেঞ্জের নাম -> PaperExchange; একই এক্সচেঞ্জে চলা সব বট একই ব্যালেন্স এবং অর্ডার বুক শেয়ার করে
+_accounts: Dict[str, PaperExchange] = OrderedDict()
+_accounts_lock = threading.Lock()
+
+
+def get_paper_exchange(exchange_name: str, market_data=None) -> PaperExchange:
+    with _accounts_lock:
+        account = _accounts.get(exchange_name)
+        if account is None:
+            account = _accounts[exchange_name] = PaperExchange(market_data=market_data)
+            logger.info("📝 Paper trading account created for %s.", exchange_name)
+        elif account.market_data is None and market_data is not None:
+            account.market_data = market_data
+        return account
+
+
+def paper_accounts() -> Dict[str, PaperExchange]:
+    with _accounts_lock:
+        return dict(_accounts)
@@ -1,58 +1,98 @@
 # app/services/performance_analyzer.py
 
+import sys
+from typing import Dict, Any, List
 from sqlalchemy.orm import Session
 from ..database import crud
+from . import position_ledger
+
+def _win_rate(wins: int, closed_trades: int) -> float:
+    return round(wins / closed_trades * 100, 2) if closed_trades > 0 else 0.0
+
+def _breakdown(aggregates) -> List[Dict[str, Any]]:
+    return sorted([
+        {
+            "key": agg.key,
+            "realized_pnl": round(agg.realized_pnl, 2),
+            "trade_count": agg.trade_count,
+            "wins": agg.wins,
+            "losses": agg.losses,
+            "win_rate": _win_rate(agg.wins, agg.closed_trades),
+            "volume": round(agg.volume, 2),
+        }
+        for agg in aggregates
+    ], key=lambda item: item["realized_pnl"], reverse=True)
 
 def calculate_performance_stats(db: Session):
     """
-    ডাটাবেসের সমস্ত ট্রেড বিশ্লেষণ করে পারফরম্যান্স মেট্রিক গণনা করে।
+    ইনক্রিমেন্টালি আপডেট হওয়া অ্যাগ্রিগেট টেবিল থেকে পারফরম্যান্স মেট্রিক পড়ে।
+    ট্রেড হিস্ট্রি যত বড়ই হোক, এখানে কোনো ট্রেড লোড বা লুপ করা হয় না।
     """
-    # ডাটাবেস থেকে সব ট্রেড আনা (সবচেয়ে পুরনোটি আগে)
-    trades = crud.get_trades(db, limit=10000) # একটি বড় লিমিট দেওয়া হলো
-    trades.reverse() # পুরনো থেকে নতুন ক্রমে সাজানো হলো
+    aggregates = crud.get_performance_aggregates(db)
+    by_scope: Dict[str, list] = {"total": [], "symbol": [], "strategy": [], "market": []}
+    for agg in aggregates:
+        by_scope.setdefault(agg.scope, []).append(agg)
+
+    total = by_scope["total"][0] if by_scope["total"] else None
+    markets = {agg.key: agg for agg in by_scope["market"]}
 
-    if not trades:
+    if total is None:
         return {
             "total_pnl": 0,
-            "spot_pnl": 0,    # আপাতত স্পট এবং ফিউচার আলাদা করছি না
+            "spot_pnl": 0,
             "futures_pnl": 0,
             "win_rate": 0,
-            "total_trades": 0
+            "total_trades": 0,
+            "wins": 0,
+            "losses": 0,
+            "by_symbol": [],
+            "by_strategy": []
         }
 
-    total_pnl = 0.0
-    wins = 0
-    losses = 0
-    
-    # একটি সহজ PNL গণনার লজিক (পেয়ার ট্রেডিং ধরে)
-    # এটি ধরে নিচ্ছে যে প্রতিটি BUY-এর পরে একটি SELL আসে
-    last_buy_price = None
-
-    for trade in trades:
-        if trade.order_type == 'BUY':
-            if last_buy_price is None: # শুধুমাত্র প্রথম BUY-টি ট্র্যাক করা হচ্ছে
-                last_buy_price = trade.price
-        
-        elif trade.order_type == 'SELL':
-            if last_buy_price is not None:
-                # একটি BUY-SELL জোড়া পাওয়া গেছে
-                pnl = (trade.price - last_buy_price) * trade.amount
-                total_pnl += pnl
-                
-                if pnl > 0:
-                    wins += 1
-                else:
-                    losses += 1
-                
-                last_buy_price = None # পরবর্তী জোড়ার জন্য রিসেট
-
-    total_completed_trades = wins + losses
-    win_rate = (wins / total_completed_trades * 100) if total_completed_trades > 0 else 0
-
     return {
-        "total_pnl": round(total_pnl, 2),
-        "spot_pnl": round(total_pnl, 2), # সরলতার জন্য মোট PNL-কেই স্পট ধরা হচ্ছে
-        "futures_pnl": 0, # ফিউচার ট্রেডিং এখনও প্রয়োগ করা হয়নি
-        "win_rate": round(win_rate, 2),
-        "total_trades": len(trades)
-    }
\ No newline at end of file
+        "total_pnl": round(total.realized_pnl, 2),
+        "spot_pnl": round(markets["spot"].realized_pnl, 2) if "spot" in markets else 0,
+        "futures_pnl": round(markets["futures"].realized_pnl, 2) if "futures" in markets else 0,
+        "win_rate": _win_rate(total.wins, total.closed_trades),
+        "total_trades": total.trade_count,
+        "wins": total.wins,
+        "losses": total.losses,
+        "by_symbol": _breakdown(by_scope["symbol"]),
+        "by_strategy": _breakdown(by_scope["strategy"])
+    }
+
+def rebuild_performance_stats(db: Session) -> int:
+    """সম্পূর্ণ ট্রেড হিস্ট্রি থেকে অ্যাগ্রিগেট টেবিল নতুন করে তৈরি করে (ব্যাকফিল)।"""
+    return crud.rebuild_performance_aggregates(db)
+
+def ensure_performance_aggregates(db: Session) -> bool:
+    """
+    পুরনো ডাটাবেসে ট্রেড আছে কিন্তু অ্যাগ্রিগেট টেবিল খালি থাকলে একবার ব্যাকফিল করে।
+    পুরনো ট্রেডগুলোর pnl কখনো পূরণ করা হয়নি, তাই আগে FIFO লেজার পুনর্গণনা করা হয়
+    (যা শেষে অ্যাগ্রিগেটও নতুন করে তৈরি করে)। ব্যাকফিল হলে True ফেরত দেয়।
+    """
+    if crud.get_performance_aggregates(db, scope="total"):
+        return False
+    if not crud.get_trades(db, limit=1):
+        return False
+    position_ledger.recompute_ledger(db)
+    db.commit()
+    return True
+
+
+if __name__ == "__main__":
+    # ব্যবহার: python -m app.services.performance_analyzer rebuild
+    from ..database.database import SessionLocal, engine
+    from ..database import models
+
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m app.services.performance_analyzer rebuild")
+        sys.exit(1)
+
+    models.ensure_schema(engine)
+    session = SessionLocal()
+    try:
+        count = rebuild_performance_stats(session)
+        print(f"✅ Rebuilt {count} performance aggregate rows from trade history.")
+    finally:
+        session.close()
@@ -0,0 +1,231 @@
+# app/services/position_ledger.py
+
+from __future__ import annotations
+
+import sys
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import update, func, inspect
+from sqlalchemy.orm import Session
+
+from ..lazy_imports import lazy_import
+from ..database import models
+
+np = lazy_import("numpy")
+
+# ভাসমান বিন্দুর ছোট ত্রুটির কারণে যেন অতি ক্ষুদ্র লট থেকে না যায়
+QTY_EPSILON = 1e-12
+
+# ==============================================================================
+#  ইনক্রিমেন্টাল FIFO ম্যাচিং (লাইভ ট্রেড লেখার সময়)
+# ==============================================================================
+
+def _match_fifo(db: Session, lots: deque, trade: models.Trade) -> Tuple[float, float]:
+    """
+    একটি ট্রেডকে সিম্বলের খোলা লটগুলোর সাথে FIFO ক্রমে মেলায়।
+    BUY একটি নতুন লট খোলে; SELL সবচেয়ে পুরনো লট থেকে শুরু করে বন্ধ করে।
+    শুধু লং পজিশন সমর্থিত, তাই খোলা লটের চেয়ে বেশি SELL-এর বাড়তি অংশ উপেক্ষা করা হয়।
+    (realized_pnl, closed_amount) ফেরত দেয়।
+    """
+    if trade.order_type == "BUY":
+        lot = models.PositionLot(symbol=trade.symbol, trade_id=trade.id, amount=trade.amount,
+                                 price=trade.price, opened_at=trade.timestamp)
+        db.add(lot)
+        lots.append(lot)
+        return 0.0, 0.0
+
+    remaining = trade.amount
+    realized_pnl = 0.0
+    closed_amount = 0.0
+    while remaining > QTY_EPSILON and lots:
+        lot = lots[0]
+        matched = min(remaining, lot.amount)
+        realized_pnl += matched * (trade.price - lot.price)
+        closed_amount += matched
+        remaining -= matched
+        lot.amount -= matched
+        if lot.amount <= QTY_EPSILON:
+            # একই ব্যাচে খোলা এবং বন্ধ হওয়া লট কখনো ডাটাবেসে লেখার দরকার নেই
+            if inspect(lot).pending:
+                db.expunge(lot)
+            else:
+                db.delete(lot)
+            lots.popleft()
+    return realized_pnl, closed_amount
+
+def apply_trades_to_ledger(db: Session, trades: List[models.Trade]):
+    """
+    নতুন (ইতিমধ্যে flush করা) ট্রেডগুলোকে FIFO লেজারে প্রয়োগ করে, প্রতিটি ট্রেডের
+    pnl এবং closed_amount সেট করে এবং সংশ্লিষ্ট সিম্বলের খোলা লটগুলো আপডেট করে।
+    কমিট কলারের দায়িত্ব, যাতে ট্রেড, লট এবং অ্যাগ্রিগেট একই ট্রানজ্যাকশনে থাকে।
+    """
+    if not trades:
+        return
+    symbols = {trade.symbol for trade in trades}
+    stored_lots = (
+        db.query(models.PositionLot)
+        .filter(models.PositionLot.symbol.in_(symbols))
+        .order_by(models.PositionLot.opened_at, models.PositionLot.id)
+        .all()
+    )
+    book: Dict[str, deque] = {symbol: deque() for symbol in symbols}
+    for lot in stored_lots:
+        book[lot.symbol].append(lot)
+
+    for trade in sorted(trades, key=lambda t: (t.timestamp, t.id)):
+        trade.pnl, trade.closed_amount = _match_fifo(db, book[trade.symbol], trade)
+    db.flush()
+
+# ==============================================================================
+#  ভেক্টরাইজড পূর্ণ পুনর্গণনা (বড় ট্রেড হিস্ট্রির জন্য)
+# ==============================================================================
+
+def _fifo_cost(consumed: np.ndarray, buy_qty: np.ndarray, buy_price: np.ndarray) -> np.ndarray:
+    """
+    প্রথম `consumed` পরিমাণ কেনা ইউনিটের মোট ক্রয়মূল্য (FIFO)।
+    ক্রমযোজিত ক্রয় পরিমাণের উপর searchsorted দিয়ে একবারে সব মান গণনা করা হয়।
+    """
+    if len(buy_qty) == 0:
+        return np.zeros_like(consumed)
+    cum_qty = np.cumsum(buy_qty)
+    cum_cost = np.cumsum(buy_qty * buy_price)
+    k = np.clip(np.searchsorted(cum_qty, consumed, side="left"), 0, len(buy_qty) - 1)
+    prev_qty = cum_qty[k] - buy_qty[k]
+    prev_cost = cum_cost[k] - buy_qty[k] * buy_price[k]
+    return prev_cost + (consumed - prev_qty) * buy_price[k]
+
+def compute_fifo_ledger(is_buy: np.ndarray, amount: np.ndarray, price: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    একটি সিম্বলের সময়ক্রম অনুযায়ী সাজানো সব ট্রেডের FIFO ফলাফল লুপ ছাড়াই গণনা করে।
+
+    ইনভেন্টরি হলো শূন্যে প্রতিফলিত (reflected) ক্রমযোজিত নেট ফ্লো, তাই খোলা লটের চেয়ে
+    বেশি SELL-এর বাড়তি অংশ ইনক্রিমেন্টাল লেজারের মতোই উপেক্ষিত হয়।
+    """
+    signed = np.where(is_buy, amount, -amount)
+    net_flow = np.cumsum(signed)
+    inventory = net_flow - np.minimum.accumulate(np.minimum(net_flow, 0.0))
+    inventory_before = np.concatenate(([0.0], inventory[:-1]))
+    closed_amount = np.where(is_buy, 0.0, np.clip(inventory_before - inventory, 0.0, None))
+
+    buy_qty = amount[is_buy]
+    buy_price = price[is_buy]
+    consumed = np.cumsum(closed_amount)
+    consumed_before = consumed - closed_amount
+    cost_basis = _fifo_cost(consumed, buy_qty, buy_price) - _fifo_cost(consumed_before, buy_qty, buy_price)
+    pnl = np.where(closed_amount > 0, closed_amount * price - cost_basis, 0.0)
+
+    # শেষে অবশিষ্ট খোলা লট: প্রতিটি BUY-এর যে অংশ মোট খরচ হওয়া পরিমাণের পরে পড়ে
+    total_consumed = consumed[-1] if len(consumed) else 0.0
+    remaining = np.clip(np.cumsum(buy_qty) - total_consumed, 0.0, buy_qty)
+    return {"pnl": pnl, "closed_amount": closed_amount, "remaining_buy_qty": remaining}
+
+def recompute_ledger(db: Session) -> int:
+    """
+    সমস্ত ট্রেড থেকে লেজার সম্পূর্ণ নতুন করে গণনা করে: প্রতিটি ট্রেডের pnl/closed_amount,
+    খোলা লট এবং পারফরম্যান্স অ্যাগ্রিগেট। আপডেট হওয়া ট্রেডের সংখ্যা ফেরত দেয়।
+    """
+    from ..database import crud
+
+    rows = db.query(
+        models.Trade.id, models.Trade.symbol, models.Trade.order_type,
+        models.Trade.amount, models.Trade.price, models.Trade.timestamp
+    ).order_by(models.Trade.symbol, models.Trade.timestamp, models.Trade.id).all()
+
+    db.query(models.PositionLot).delete(synchronize_session=False)
+    if not rows:
+        crud.rebuild_performance_aggregates(db)
+        return 0
+
+    ids = np.array([r.id for r in rows], dtype=np.int64)
+    symbols = np.array([r.symbol or "" for r in rows], dtype=object)
+    is_buy = np.array([r.order_type == "BUY" for r in rows], dtype=bool)
+    amount = np.array([r.amount or 0.0 for r in rows], dtype=np.float64)
+    price = np.array([r.price or 0.0 for r in rows], dtype=np.float64)
+    timestamps = [r.timestamp for r in rows]
+
+    pnl = np.zeros(len(rows))
+    closed_amount = np.zeros(len(rows))
+    new_lots = []
+
+    # সারিগুলো ইতিমধ্যে সিম্বল অনুযায়ী সাজানো, তাই প্রতিটি সিম্বল একটি ধারাবাহিক স্লাইস
+    boundaries = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(rows)]))
+    for start, end in zip(starts, ends):
+        result = compute_fifo_ledger(is_buy[start:end], amount[start:end], price[start:end])
+        pnl[start:end] = result["pnl"]
+        closed_amount[start:end] = result["closed_amount"]
+
+        buy_positions = np.flatnonzero(is_buy[start:end]) + start
+        for pos, remaining in zip(buy_positions, result["remaining_buy_qty"]):
+            if remaining > QTY_EPSILON:
+                new_lots.append({"symbol": symbols[pos], "trade_id": int(ids[pos]), "amount": float(remaining),
+                                 "price": float(price[pos]), "opened_at": timestamps[pos]})
+
+    db.execute(update(models.Trade), [
+        {"id": int(trade_id), "pnl": float(p), "closed_amount": float(c)}
+        for trade_id, p, c in zip(ids, pnl, closed_amount)
+    ])
+    if new_lots:
+        db.bulk_insert_mappings(models.PositionLot, new_lots)
+    db.flush()
+    crud.rebuild_performance_aggregates(db)
+    return len(rows)
+
+# ==============================================================================
+#  খোলা পজিশন এবং আনরিয়ালাইজড PnL
+# ==============================================================================
+
+def get_open_positions(db: Session, mark_prices: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    প্রতিটি সিম্বলের খোলা লটগুলো যোগ করে পজিশন এবং আনরিয়ালাইজড PnL দেয়।
+    mark_prices না দিলে সেই সিম্বলের সর্বশেষ ট্রেডের প্রাইস মার্ক প্রাইস হিসেবে ধরা হয়।
+    """
+    lot_rows = db.query(
+        models.PositionLot.symbol,
+        func.sum(models.PositionLot.amount).label("amount"),
+        func.sum(models.PositionLot.amount * models.PositionLot.price).label("cost_basis"),
+        func.count(models.PositionLot.id).label("lots"),
+    ).group_by(models.PositionLot.symbol).all()
+
+    mark_prices = dict(mark_prices or {})
+    positions = []
+    for row in lot_rows:
+        mark_price = mark_prices.get(row.symbol)
+        if mark_price is None:
+            mark_price = (
+                db.query(models.Trade.price)
+                .filter(models.Trade.symbol == row.symbol)
+                .order_by(models.Trade.timestamp.desc(), models.Trade.id.desc())
+                .limit(1)
+                .scalar()
+            ) or 0.0
+        positions.append({
+            "symbol": row.symbol,
+            "amount": row.amount,
+            "avg_entry_price": row.cost_basis / row.amount if row.amount else 0.0,
+            "cost_basis": row.cost_basis,
+            "mark_price": mark_price,
+            "unrealized_pnl": row.amount * mark_price - row.cost_basis,
+            "lots": row.lots,
+        })
+    return positions
+
+
+if __name__ == "__main__":
+    # ব্যবহার: python -m app.services.position_ledger recompute
+    from ..database.database import SessionLocal, engine
+
+    if len(sys.argv) < 2 or sys.argv[1] != "recompute":
+        print("Usage: python -m app.services.position_ledger recompute")
+        sys.exit(1)
+
+    models.ensure_schema(engine)
+    session = SessionLocal()
+    try:
+        count = recompute_ledger(session)
+        session.commit()
+        print(f"✅ Recomputed FIFO ledger over {count} trades.")
+    finally:
+        session.close()
@@ -0,0 +1,223 @@
+# app/services/replay.py
+
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .. import bot_core, schemas
+from ..lazy_imports import lazy_import
+from . import candle_store, request_scheduler, strategy_sandbox
+from .paper_exchange import PaperExchange
+from .backtest_queue import run_in_worker
+from .metrics import metrics
+from .strategy_manager import load_strategy_dynamically, is_user_strategy
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+ccxt_async = lazy_import("ccxt.async_support")
+
+# ==============================================================================
+#  রিপ্লে হারনেস (Faster-than-real-time replay of the live bot)
+#
+#  bot_core.run_bot_cycle-কে হুবহু চালানো হয়, শুধু তিনটি জিনিস বদলে:
+#    - এক্সচেঞ্জ: ক্যান্ডেল স্টোরের ডেটা থেকে উত্তর দেওয়া একটি SimulatedExchange
+#    - ঘড়ি:     VirtualClock, যার sleep() অপেক্ষা না করে সময় এগিয়ে দেয়
+#    - ট্রেড:    ডাটাবেসের বদলে মেমরিতে জমা হয়
+#  প্রতিটি চক্রে ঠিক একটি নতুন ক্যান্ডেল বন্ধ হয় (poll_interval = টাইমফ্রেম), তারপর একই ডেটায়
+#  ব্যাকটেস্টারের সিগন্যাল লুপ চালিয়ে প্রতিটি ক্যান্ডেলের লাইভ ও ব্যাকটেস্ট সিগন্যাল মেলানো হয়।
+# ==============================================================================
+
+# রিপোর্টে সর্বোচ্চ কতগুলো অমিল দেখানো হবে
+MAX_REPORTED_MISMATCHES = 50
+
+
+class VirtualClock:
+    """bot_core.WallClock-এর মতো ইন্টারফেস; sleep() শুধু ভার্চুয়াল সময় এগিয়ে দেয়।"""
+
+    def __init__(self, start_ms: int, end_ms: int, on_exhausted: Callable[[], None]):
+        self.now_ms = start_ms
+        self.end_ms = end_ms
+        self.on_exhausted = on_exhausted
+
+    def now(self) -> datetime.datetime:
+        return datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=self.now_ms)
+
+    def sleep(self, seconds: float):
+        self.now_ms += int(seconds * 1000)
+        # ডেটার শেষ ক্যান্ডেল বন্ধ হওয়ার পর বটকে থামতে বলা হয়
+        if self.now_ms > self.end_ms:
+            self.on_exhausted()
+
+
+class SimulatedExchange:
+    """
+    ccxt-এর সিঙ্ক্রোনাস ক্লায়েন্টের যে অংশ bot_core ব্যবহার করে (fetch_ohlcv, fetch_ticker, create_order),
+    ক্যান্ডেল স্টোরের ডেটা দিয়ে। ঘড়ির সময় পর্যন্ত শুধু বন্ধ হওয়া ক্যান্ডেলগুলো দেখা যায়, তাই
+    ব্যাকটেস্টারের মতোই প্রতিটি সিগন্যাল একটি বন্ধ ক্যান্ডেলের উপর তৈরি হয় এবং তার close-এ ফিল হয়।
+    """
+
+    id = "replay"
+    name = "Replay"
+
+    def __init__(self, df, timeframe_ms: int, clock: VirtualClock):
+        self.clock = clock
+        self._rows = df[candle_store.CANDLE_COLUMNS].copy()
+        self._rows['timestamp'] = df['timestamp'].astype("datetime64[ms]").astype("int64")
+        self._values = self._rows.to_numpy(dtype=np.float64)
+        self._timestamps = self._rows['timestamp'].to_numpy()
+        self._close_times = self._timestamps + timeframe_ms
+        self.orders: List[Dict[str, Any]] = []
+
+    def _closed_count(self) -> int:
+        return int(np.searchsorted(self._close_times, self.clock.now_ms, side="right"))
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = None, since: int = None, limit: int = None) -> List[list]:
+        end = self._closed_count()
+        start = 0 if limit is None else max(0, end - limit)
+        if since is not None:
+            start = max(start, int(np.searchsorted(self._timestamps, since, side="left")))
+        rows = self._values[start:end].tolist()
+        for row in rows:
+            row[0] = int(row[0])
+        return rows
+
+    def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        end = self._closed_count()
+        if end == 0:
+            raise ValueError(f"No candles for {symbol} before {self.clock.now()}.")
+        close = float(self._values[end - 1][4])
+        return {"symbol": symbol, "timestamp": self.clock.now_ms, "last": close, "close": close,
+                "bid": close, "ask": close}
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float, price: float = None,
+                     params: Dict[str, Any] = None) -> Dict[str, Any]:
+        fill_price = self.fetch_ticker(symbol)["last"] if type == "market" or price is None else price
+        order = {"id": str(len(self.orders) + 1), "symbol": symbol, "type": type, "side": side,
+                 "amount": amount, "filled": amount, "price": fill_price, "status": "closed",
+                 "timestamp": self.clock.now_ms}
+        self.orders.append(order)
+        return order
+
+
+class _TradeRecorder:
+    """trade_writer-এর submit()/flush() ইন্টারফেস; ট্রেডগুলো শুধু মেমরিতে রাখে।"""
+
+    def __init__(self):
+        self.trades: List[Dict[str, Any]] = []
+
+    def submit(self, symbol: str, order_type: str, amount: float, price: float, timestamp: datetime.datetime = None,
+               strategy: Optional[str] = None, market_type: str = "spot"):
+        self.trades.append({"symbol": symbol, "order_type": order_type, "amount": amount,
+                            "price": price, "timestamp": timestamp})
+
+    def flush(self) -> int:
+        return 0
+
+
+def replay_bot(spec: candle_store.CandleSpec, strategy_name: str, strategy_params: Dict[str, Any],
+               trade_amount: float = bot_core.DEFAULT_TRADE_AMOUNT, paper_trading: bool = False) -> Dict[str, Any]:
+    """
+    ওয়ার্কার প্রসেসে চলে: স্টোরের ক্যান্ডেলগুলোর উপর লাইভ বট চালায়, তারপর একই ডেটায় ব্যাকটেস্টারের
+    সিগন্যাল বের করে প্রতিটি ক্যান্ডেলে মিলিয়ে দেখে। schemas.ReplayReport-এর আকারে ডিকশনারি ফেরত দেয়।
+    paper_trading হলে বট সিমুলেটেড এক্সচেঞ্জের উপর একটি নতুন PaperExchange-এ অর্ডার দেয়।
+    """
+    # ব্যাকটেস্টিং ইঞ্জিন pandas এবং ccxt টানে, তাই শুধু ওয়ার্কারে ইম্পোর্ট করা হয়
+    from .backtesting_engine import _Portfolio, iter_backtest_signals
+
+    df = candle_store.read_candles(spec)
+    if df.empty:
+        raise ValueError(f"No cached candles for {spec.symbol} {spec.timeframe} in the requested range.")
+    timeframe_ms = candle_store.timeframe_to_ms(spec.timeframe)
+    if timeframe_ms is None:
+        raise ValueError(f"Unsupported timeframe for replay: {spec.timeframe}")
+
+    status = {"is_running": False}
+    first_close = int(df['timestamp'].iloc[0].value // 1_000_000) + timeframe_ms
+    last_close = int(df['timestamp'].iloc[-1].value // 1_000_000) + timeframe_ms
+    clock = VirtualClock(first_close, last_close, on_exhausted=lambda: status.update(is_running=False))
+    simulated = SimulatedExchange(df, timeframe_ms, clock)
+    exchange = PaperExchange(market_data=simulated, clock=clock) if paper_trading else simulated
+    recorder = _TradeRecorder()
+
+    # চক্রের শেষ ক্যান্ডেলের timestamp (ms) -> লাইভ সিগন্যাল
+    live_signals: Dict[int, str] = {}
+    def on_signal(live_df, signal):
+        live_signals[int(live_df['timestamp'].iloc[-1])] = signal
+
+    options = {"exchange": exchange.id, "strategy": strategy_name, "symbol": spec.symbol,
+               "timeframe": spec.timeframe, "trade_amount": trade_amount, "params": strategy_params,
+               "poll_interval": timeframe_ms / 1000, "paper_trading": paper_trading}
+
+    # প্রতিটি চক্রে INFO লগ হাজার হাজার লাইন তৈরি করে এবং লুপের সময় মাপা নষ্ট করে
+    previous_level = bot_core.logger.level
+    bot_core.logger.setLevel(logging.WARNING)
+    started = time.perf_counter()
+    try:
+        bot_core.run_bot_cycle(status, options, exchange=exchange, clock=clock, trade_sink=recorder,
+                               on_signal=on_signal)
+    finally:
+        bot_core.logger.setLevel(previous_level)
+    live_seconds = time.perf_counter() - started
+    metrics.observe("replay_live_seconds", live_seconds)
+
+    started = time.perf_counter()
+    strategy = load_strategy_dynamically(strategy_name, strategy_params)
+    timestamps_ms = simulated._timestamps
+    portfolio = _Portfolio()
+    compared = matching = 0
+    mismatches = []
+    for i, signal, _ in iter_backtest_signals(df, strategy):
+        portfolio.apply(signal, df['close'].iloc[i])
+        live = live_signals.get(int(timestamps_ms[i]))
+        compared += 1
+        if live == signal:
+            matching += 1
+        elif len(mismatches) < MAX_REPORTED_MISMATCHES:
+            mismatches.append({"timestamp": df['timestamp'].iloc[i].to_pydatetime(), "live": live, "backtest": signal})
+    backtest_seconds = time.perf_counter() - started
+
+    return {
+        "candles": len(df),
+        "live_cycles": len(live_signals),
+        "live_seconds": round(live_seconds, 3),
+        "cycles_per_second": round(len(live_signals) / live_seconds, 1) if live_seconds > 0 else 0.0,
+        "backtest_seconds": round(backtest_seconds, 3),
+        "compared": compared,
+        "matching": matching,
+        "match_rate": round(matching / compared * 100, 2) if compared else 0.0,
+        "parity": matching == compared,
+        "mismatches": mismatches,
+        "live_orders": len(recorder.trades),
+        "backtest_trades": portfolio.total_trades,
+        "paper_balance": exchange.fetch_balance()["total"] if paper_trading else None,
+    }
+
+
+async def run_replay(exchange_name: str, strategy_name: str, symbol: str, timeframe: str,
+                     start_date: datetime.date, end_date: datetime.date, strategy_params: Dict[str, Any],
+                     trade_amount: float = bot_core.DEFAULT_TRADE_AMOUNT, paper_trading: bool = False) -> schemas.ReplayReport:
+    """ক্যান্ডেলগুলো স্টোরে নিশ্চিত করে রিপ্লে ওয়ার্কার প্রসেসে (ইউজার স্ট্র্যাটেজি হলে স্যান্ডবক্সে) চালায়।"""
+    from .backtesting_engine import ensure_candles
+
+    exchange_class = getattr(ccxt_async, exchange_name, None)
+    if exchange_class is None:
+        raise ValueError(f"The exchange '{exchange_name}' is not supported.")
+    exchange = request_scheduler.attach(exchange_class({'aiohttp_kwargs': {'timeout': 30}}))
+    try:
+        with metrics.timer("backtest_data_fetch_seconds", exchange=exchange_name):
+            spec = await ensure_candles(exchange, symbol, timeframe, start_date, end_date)
+    finally:
+        await exchange.close()
+
+    args = (spec, strategy_name, strategy_params, trade_amount, paper_trading)
+    if is_user_strategy(strategy_name):
+        report = await strategy_sandbox.run_isolated_async(replay_bot, args)
+    else:
+        report = await run_in_worker(replay_bot, *args)
+    logger.info("🎞️ Replay of '%s' on %s %s: %d candles, %.1f cycles/s, signal match %.2f%%",
+                strategy_name, symbol, timeframe, report["candles"], report["cycles_per_second"], report["match_rate"])
+    return schemas.ReplayReport(**report)
@@ -0,0 +1,241 @@
+# app/services/request_scheduler.py
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextvars
+import inspect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from .. import config
+from .metrics import metrics
+
+# ==============================================================================
+#  এক্সচেঞ্জ রিকোয়েস্ট শিডিউলার (Central per-exchange request scheduler)
+#
+#  ccxt প্রতিটি REST কলের আগে client.throttle(cost) ডাকে, যেখানে cost হলো সেই endpoint-এর
+#  প্রকাশিত weight (ccxt-এর এক্সচেঞ্জ সংজ্ঞা থেকে)। attach() সেই throttle-কে এই শিডিউলারে পাঠায়,
+#  তাই বট, ব্যাকটেস্ট, ওয়ার্মার, মার্কেট তালিকা — সব ক্লায়েন্ট (সিঙ্ক বা async, যেকোনো থ্রেড বা
+#  ইভেন্ট লুপ) একই এক্সচেঞ্জের একটি token bucket শেয়ার করে।
+#    - রেট:       প্রতি সেকেন্ডে 1000 / client.rateLimit টোকেন (ccxt-এর নিজস্ব হিসাব)
+#    - অগ্রাধিকার: LIVE > INTERACTIVE > BACKFILL; কিউর মাথায় সবসময় সর্বোচ্চ অগ্রাধিকারের রিকোয়েস্ট
+#    - রিজার্ভ:    নিচের শ্রেণিগুলো বাকেটের একটি অংশ খালি রেখে যায়, তাই ব্যাকফিল চলার সময়ও লাইভ
+#                 বটের রিকোয়েস্ট অপেক্ষা ছাড়াই টোকেন পায় (দীর্ঘমেয়াদে ব্যাকফিলের থ্রুপুট একই থাকে)
+#  শিডিউলার প্রসেসভিত্তিক; আলাদা প্রসেসের অপটিমাইজার ওয়ার্কাররা নিজস্ব বাকেট পায়।
+# ==============================================================================
+
+LIVE = "live"
+INTERACTIVE = "interactive"
+BACKFILL = "backfill"
+PRIORITIES = (LIVE, INTERACTIVE, BACKFILL)
+
+# with request_priority(...) দিয়ে সেট করা হলে ক্লায়েন্টের ডিফল্ট অগ্রাধিকারের চেয়ে এটি আগে
+_current_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: str):
+    """এই ব্লকের (বা async টাস্কের) ভেতরের সব এক্সচেঞ্জ কল নির্দিষ্ট অগ্রাধিকারে যায়।"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown request priority '{priority}'.")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "priority", "cost", "wake", "enqueued_at")
+
+    def __init__(self, priority: str, seq: int, cost: float, wake: Callable[[], None]):
+        self.rank = PRIORITIES.index(priority)
+        self.seq = seq
+        self.priority = priority
+        self.cost = cost
+        self.wake = wake
+        self.enqueued_at = time.monotonic()
+
+
+class RequestScheduler:
+    """
+    একটি এক্সচেঞ্জের token bucket এবং অগ্রাধিকার কিউ। acquire() (থ্রেড থেকে) এবং acquire_async()
+    (যেকোনো ইভেন্ট লুপ থেকে) একই কিউতে দাঁড়ায়; শুধু কিউর মাথার রিকোয়েস্ট টোকেন নিতে পারে।
+    """
+
+    def __init__(self, exchange_id: str, rate: float, burst_seconds: float = None, reserves: Dict[str, float] = None):
+        self.exchange_id = exchange_id
+        self.rate = rate
+        burst_seconds = config.REQUEST_SCHEDULER_BURST_SECONDS if burst_seconds is None else burst_seconds
+        self.capacity = max(1.0, rate * burst_seconds)
+        reserves = reserves or {LIVE: 0.0, INTERACTIVE: config.REQUEST_SCHEDULER_INTERACTIVE_RESERVE,
+                                BACKFILL: config.REQUEST_SCHEDULER_BACKFILL_RESERVE}
+        self.reserves = {priority: self.capacity * reserves.get(priority, 0.0) for priority in PRIORITIES}
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.granted = {priority: 0 for priority in PRIORITIES}
+        self.weight = {priority: 0.0 for priority in PRIORITIES}
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _enqueue(self, cost: Optional[float], priority: str, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(priority, next(self._seq), 1.0 if cost is None else float(cost), wake)
+        with self._lock:
+            bisect.insort(self._queue, waiter, key=lambda w: (w.rank, w.seq))
+        return waiter
+
+    def _poll(self, waiter: _Waiter) -> Optional[float]:
+        """টোকেন পেলে 0; কিউর মাথায় না থাকলে None (জাগিয়ে দেওয়া পর্যন্ত অপেক্ষা); নাহলে কত সেকেন্ড অপেক্ষা।"""
+        with self._lock:
+            if not self._queue or self._queue[0] is not waiter:
+                return None
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # bucket-এর চেয়ে ভারী রিকোয়েস্ট পূর্ণ বাকেটে যায় এবং ঋণ (ঋণাত্মক টোকেন) রেখে যায়
+            need = min(self.capacity, waiter.cost + self.reserves[waiter.priority])
+            if self.tokens < need:
+                return (need - self.tokens) / self.rate
+            self.tokens -= waiter.cost
+            self._queue.pop(0)
+            self.granted[waiter.priority] += 1
+            self.weight[waiter.priority] += waiter.cost
+            head = self._queue[0] if self._queue else None
+        if head is not None:
+            head.wake()
+        metrics.observe("exchange_request_wait_seconds", now - waiter.enqueued_at,
+                        exchange=self.exchange_id, priority=waiter.priority)
+        metrics.inc("exchange_request_weight_total", waiter.cost, exchange=self.exchange_id, priority=waiter.priority)
+        return 0.0
+
+    def _abandon(self, waiter: _Waiter):
+        # বাতিল হওয়া (যেমন cancel করা async টাস্ক) রিকোয়েস্ট কিউ আটকে রাখতে পারে না
+        with self._lock:
+            was_head = bool(self._queue) and self._queue[0] is waiter
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+            head = self._queue[0] if was_head and self._queue else None
+        if head is not None:
+            head.wake()
+
+    def acquire(self, cost: float = None, priority: str = INTERACTIVE):
+        event = threading.Event()
+        waiter = self._enqueue(cost, priority, event.set)
+        try:
+            while True:
+                event.clear()
+                delay = self._poll(waiter)
+                if delay == 0:
+                    waiter = None
+                    return
+                event.wait(delay)
+        finally:
+            if waiter is not None:
+                self._abandon(waiter)
+
+    async def acquire_async(self, cost: float = None, priority: str = INTERACTIVE):
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(cost, priority, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                event.clear()
+                delay = self._poll(waiter)
+                if delay == 0:
+                    waiter = None
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if waiter is not None:
+                self._abandon(waiter)
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._lock:
+            depth = {priority: 0 for priority in PRIORITIES}
+            for waiter in self._queue:
+                depth[waiter.priority] += 1
+        return depth
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tokens = min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.rate)
+        return {
+            "exchange": self.exchange_id,
+            "rate_per_second": round(self.rate, 3),
+            "capacity": round(self.capacity, 3),
+            "tokens": round(tokens, 3),
+            "queued": self.queue_depth(),
+            "granted": dict(self.granted),
+            "weight": {priority: round(value, 3) for priority, value in self.weight.items()},
+        }
+
+
+# ==============================================================================
+#  রেজিস্ট্রি এবং ccxt ক্লায়েন্টে যুক্ত করা (Registry and ccxt client hook)
+# ==============================================================================
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_registry_lock = threading.Lock()
+
+
+def get_scheduler(exchange_id: str, rate_limit_ms: float = None) -> RequestScheduler:
+    """এক্সচেঞ্জের শিডিউলার; প্রথমবার তৈরির সময় ccxt-এর rateLimit (প্রতি weight-এ ms) থেকে রেট ঠিক হয়।"""
+    with _registry_lock:
+        scheduler = _schedulers.get(exchange_id)
+        if scheduler is None:
+            rate = 1000.0 / rate_limit_ms if rate_limit_ms else config.REQUEST_SCHEDULER_DEFAULT_RATE
+            scheduler = _schedulers[exchange_id] = RequestScheduler(exchange_id, rate)
+        return scheduler
+
+
+def attach(client, priority: str = INTERACTIVE):
+    """
+    ccxt ক্লায়েন্টের (সিঙ্ক বা async) throttle এই এক্সচেঞ্জের শিডিউলারে পাঠানো হয়। priority হলো এই
+    ক্লায়েন্টের কলগুলোর ডিফল্ট অগ্রাধিকার; request_priority() দিয়ে কোনো ব্লকের জন্য বদলানো যায়।
+    একই ক্লায়েন্ট ফেরত দেয়, যাতে তৈরির জায়গাতেই মোড়ানো যায়।
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown request priority '{priority}'.")
+    hook = getattr(type(client), "throttle", None)
+    if hook is None:
+        # ccxt নয় এমন ক্লায়েন্ট (যেমন রিপ্লের সিমুলেটেড এক্সচেঞ্জ) অপরিবর্তিত থাকে
+        return client
+    scheduler = get_scheduler(client.id, getattr(client, "rateLimit", None))
+    client.enableRateLimit = True
+
+    if inspect.iscoroutinefunction(hook):
+        async def throttle(cost=None):
+            await scheduler.acquire_async(cost, _current_priority.get() or priority)
+    else:
+        def throttle(cost=None):
+            scheduler.acquire(cost, _current_priority.get() or priority)
+
+    client.throttle = throttle
+    return client
+
+
+def scheduler_stats() -> List[Dict[str, Any]]:
+    with _registry_lock:
+        schedulers = sorted(_schedulers.values(), key=lambda s: s.exchange_id)
+    return [scheduler.stats() for scheduler in schedulers]
+
+
+def _queue_depth_gauge() -> Dict[str, Any]:
+    with _registry_lock:
+        schedulers = list(_schedulers.values())
+    return {"exchange_request_queue_depth": [
+        ({"exchange": scheduler.exchange_id, "priority": priority}, depth)
+        for scheduler in schedulers for priority, depth in scheduler.queue_depth().items()
+    ]}
+
+
+metrics.register_gauge(_queue_depth_gauge)
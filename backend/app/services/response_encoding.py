@@ -0,0 +1,299 @@
+# app/services/response_encoding.py
+
+from __future__ import annotations
+
+import datetime
+import functools
+import gzip
+import importlib
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from .. import config
+from ..lazy_imports import lazy_import
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+orjson = lazy_import("orjson")
+pa = lazy_import("pyarrow")
+
+# ==============================================================================
+#  কন্টেন্ট নেগোশিয়েশন (Response formats and compression)
+#
+#  ক্লায়েন্ট Accept হেডার দিয়ে ফরম্যাট বেছে নেয়:
+#    application/json                     — ডিফল্ট; pydantic-core বা orjson দিয়ে এনকোড
+#    application/x-msgpack                — কলামভিত্তিক MessagePack (msgpack ইনস্টল থাকলে)
+#    application/vnd.apache.arrow.stream  — Arrow IPC স্ট্রিম; বাকি ফিল্ডগুলো স্কিমা মেটাডেটায়
+#  Accept-Encoding অনুযায়ী br (brotli ইনস্টল থাকলে) অথবা gzip কম্প্রেশন হয়।
+#  ব্রাউজারের সাধারণ fetch() (Accept: */*) আগের মতোই JSON পায়।
+# ==============================================================================
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPE = "application/x-msgpack"
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+# একই ফরম্যাটের অন্য নামগুলো
+_MEDIA_ALIASES = {"application/msgpack": MSGPACK_TYPE, "application/vnd.msgpack": MSGPACK_TYPE}
+
+# Arrow স্কিমা মেটাডেটার যে কী-তে টেবিলের বাইরের ফিল্ডগুলো JSON হিসেবে থাকে
+ARROW_FIELDS_KEY = b"zenith.fields"
+
+
+class ColumnarPayload(NamedTuple):
+    """
+    অ্যারে-ভারী রেসপন্সের কলামভিত্তিক রূপ: একটি মূল টেবিল (কলাম -> মানের তালিকা) এবং
+    বাকি ছোট ফিল্ডগুলো। টাইমস্ট্যাম্প কলাম UTC মিলিসেকেন্ডে থাকে।
+    """
+    table_name: str
+    table: Dict[str, List[Any]]
+    fields: Dict[str, Any]
+    timestamp_columns: Tuple[str, ...] = ("timestamp",)
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_module(name: str):
+    """ঐচ্ছিক এনকোডিং লাইব্রেরি; ইনস্টল না থাকলে সেই ফরম্যাট নেগোশিয়েশনে বাদ যায়।"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+# ==============================================================================
+#  হেডার পার্সিং (Accept / Accept-Encoding)
+# ==============================================================================
+
+def _parse_header(value: Optional[str]) -> List[Tuple[str, float]]:
+    """'a/b;q=0.5, c/d' -> [('a/b', 0.5), ('c/d', 1.0)]; q=0 মানে গ্রহণযোগ্য নয়।"""
+    items = []
+    for part in (value or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, val = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        items.append((token.strip().lower(), q))
+    return items
+
+def negotiate_media_type(accept: Optional[str], columnar: bool) -> Optional[str]:
+    """
+    Accept হেডার এবং ইনস্টল থাকা লাইব্রেরি অনুযায়ী সবচেয়ে পছন্দের ফরম্যাট।
+    কোনোটিই গ্রহণযোগ্য না হলে None (API তখন 406 দেয়)।
+    """
+    available = [JSON_TYPE]
+    if columnar:
+        available.append(ARROW_TYPE)
+        if _optional_module("msgpack") is not None:
+            available.append(MSGPACK_TYPE)
+    if not accept:
+        return JSON_TYPE
+
+    # একই q হলে নির্দিষ্টভাবে চাওয়া ফরম্যাট wildcard-এর চেয়ে অগ্রাধিকার পায়
+    best, best_score = None, (0.0, 0)
+    for token, q in _parse_header(accept):
+        token = _MEDIA_ALIASES.get(token, token)
+        if token in ("*/*", "application/*"):
+            candidate, score = JSON_TYPE, (q, 0)
+        elif token in available:
+            candidate, score = token, (q, 1)
+        else:
+            continue
+        if q > 0 and score > best_score:
+            best, best_score = candidate, score
+    return best
+
+def negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    accepted = {token: q for token, q in _parse_header(accept_encoding) if q > 0}
+    if "br" in accepted and _optional_module("brotli") is not None:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+# ==============================================================================
+#  এনকোডার (Encoders)
+# ==============================================================================
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=datetime.timezone.utc)
+_ONE_MS = datetime.timedelta(milliseconds=1)
+
+def _to_millis(value: Any) -> Any:
+    # naive datetime UTC হিসেবে ধরা হয় (ক্যান্ডেল এবং ট্রেড সবই UTC-তে সংরক্ষিত);
+    # .timestamp() লোকাল টাইমজোন ব্যবহার করে এবং বিয়োগের চেয়ে ধীর
+    if isinstance(value, datetime.datetime):
+        return (value - (_EPOCH if value.tzinfo is None else _EPOCH_UTC)) // _ONE_MS
+    return value
+
+def _orjson_default(value: Any):
+    # pandas.Timestamp-এর মতো datetime সাবক্লাস এবং numpy স্কেলার
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def encode_json(payload: Any) -> bytes:
+    """pydantic মডেল হলে pydantic-core-এর Rust সিরিয়ালাইজার, অন্যথায় orjson।"""
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json().encode()
+    return orjson.dumps(payload, default=_orjson_default)
+
+def encode_msgpack(columnar: ColumnarPayload) -> bytes:
+    msgpack = _optional_module("msgpack")
+    table = {
+        name: [_to_millis(v) for v in values] if name in columnar.timestamp_columns else values
+        for name, values in columnar.table.items()
+    }
+    return msgpack.packb({**columnar.fields, columnar.table_name: table},
+                         default=_orjson_default, use_bin_type=True)
+
+def encode_arrow(columnar: ColumnarPayload) -> Tuple[bytes, bool]:
+    """
+    মূল টেবিলটি Arrow IPC স্ট্রিম হিসেবে, বাকি ফিল্ড স্কিমা মেটাডেটায় JSON হিসেবে।
+    zstd পাওয়া গেলে IPC বাফারগুলোই কম্প্রেস করা হয়; তখন আলাদা HTTP কম্প্রেশন লাগে না।
+    (bytes, already_compressed) ফেরত দেয়।
+    """
+    arrays = {}
+    for name, values in columnar.table.items():
+        if name in columnar.timestamp_columns:
+            arrays[name] = pa.array([_to_millis(v) for v in values], type=pa.timestamp("ms", tz="UTC"))
+        else:
+            arrays[name] = pa.array(values)
+    table = pa.table(arrays)
+    fields = json.dumps({"table": columnar.table_name, **columnar.fields}, default=_orjson_default)
+    table = table.replace_schema_metadata({ARROW_FIELDS_KEY: fields.encode()})
+
+    compressed = pa.Codec.is_available("zstd")
+    options = pa.ipc.IpcWriteOptions(compression="zstd" if compressed else None)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), compressed
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return _optional_module("brotli").compress(body, quality=config.RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=config.RESPONSE_GZIP_LEVEL, mtime=0)
+
+# ==============================================================================
+#  রেসপন্স তৈরি (Building the response)
+# ==============================================================================
+
+def encoded_response(request: Request, payload: Any, endpoint: str,
+                     columnar: Optional[Callable[[], ColumnarPayload]] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Accept এবং Accept-Encoding অনুযায়ী payload এনকোড করে একটি Response তৈরি করে।
+    columnar দিলে (অলসভাবে ডাকা হয়) msgpack এবং Arrow ফরম্যাটও দেওয়া যায়।
+    """
+    media_type = negotiate_media_type(request.headers.get("accept"), columnar is not None)
+    if media_type is None:
+        return Response(
+            content=json.dumps({"detail": "None of the requested media types can be produced for this endpoint."}),
+            status_code=406, media_type=JSON_TYPE,
+        )
+    fmt = {JSON_TYPE: "json", MSGPACK_TYPE: "msgpack", ARROW_TYPE: "arrow"}[media_type]
+
+    started = time.perf_counter()
+    already_compressed = False
+    if media_type == JSON_TYPE:
+        body = encode_json(payload)
+    elif media_type == MSGPACK_TYPE:
+        body = encode_msgpack(columnar())
+    else:
+        body, already_compressed = encode_arrow(columnar())
+
+    response_headers = dict(headers or {})
+    response_headers["Vary"] = "Accept, Accept-Encoding"
+    content_encoding = None
+    if not already_compressed and len(body) >= config.RESPONSE_COMPRESSION_MIN_BYTES:
+        content_encoding = negotiate_content_encoding(request.headers.get("accept-encoding"))
+        if content_encoding:
+            body = compress(body, content_encoding)
+            response_headers["Content-Encoding"] = content_encoding
+    metrics.observe("response_serialization_seconds", time.perf_counter() - started,
+                    endpoint=endpoint, format=fmt)
+    metrics.inc("response_bytes_total", len(body), endpoint=endpoint, format=fmt,
+                encoding=content_encoding or ("arrow-ipc" if already_compressed else "identity"))
+    return Response(content=body, media_type=media_type, headers=response_headers)
+
+# ==============================================================================
+#  এন্ডপয়েন্টভিত্তিক কলামার রূপ (Columnar views of API payloads)
+# ==============================================================================
+
+def backtest_columns(result) -> ColumnarPayload:
+    """
+    BacktestResult: প্রতিটি ক্যান্ডেলের OHLC এবং সেই সময়ের পোর্টফোলিও ভ্যালু একই টেবিলে।
+    simulate_backtest প্রতিটি ক্যান্ডেলের জন্য একটি history পয়েন্ট তৈরি করে, তাই দৈর্ঘ্য সমান।
+    """
+    candles = result.price_history
+    table = {
+        "timestamp": [c.timestamp for c in candles],
+        "open": [c.open for c in candles],
+        "high": [c.high for c in candles],
+        "low": [c.low for c in candles],
+        "close": [c.close for c in candles],
+    }
+    fields = {
+        "total_return": result.total_return,
+        "win_rate": result.win_rate,
+        "max_drawdown": result.max_drawdown,
+        "sharpe_ratio": result.sharpe_ratio,
+        "trade_logs": [{"timestamp": _to_millis(t.timestamp), "order_type": t.order_type, "price": t.price}
+                       for t in result.trade_logs],
+    }
+    if len(result.history) == len(candles):
+        table["portfolio_value"] = [h.value for h in result.history]
+    else:
+        fields["history"] = [{"name": h.name, "value": h.value} for h in result.history]
+    return ColumnarPayload("price_history", table, fields)
+
+def comparison_columns(result) -> ColumnarPayload:
+    """
+    ComparisonResult: OHLC এবং প্রতিটি স্ট্র্যাটেজির ইকুইটি (equity.<label>) একই টেবিলে;
+    মেট্রিক্স ও ট্রেডগুলো fields-এ। ব্যর্থ সারির কোনো কলাম থাকে না।
+    """
+    candles = result.price_history
+    table = {
+        "timestamp": [c.timestamp for c in candles],
+        "open": [c.open for c in candles],
+        "high": [c.high for c in candles],
+        "low": [c.low for c in candles],
+        "close": [c.close for c in candles],
+    }
+    rows = []
+    for row in result.strategies:
+        if row.error is None:
+            table[f"equity.{row.label}"] = row.equity
+        summary = row.model_dump(exclude={"equity", "trade_logs"})
+        summary["trade_logs"] = [{"timestamp": _to_millis(t.timestamp), "order_type": t.order_type, "price": t.price}
+                                 for t in row.trade_logs]
+        rows.append(summary)
+    return ColumnarPayload("price_history", table, {"strategies": rows})
+
+def trades_columns(trades: List[Dict[str, Any]]) -> ColumnarPayload:
+    names = ("id", "symbol", "order_type", "amount", "price", "timestamp", "pnl")
+    return ColumnarPayload("trades", {name: [t[name] for t in trades] for name in names}, {})
+
+def optimizer_columns(job: Dict[str, Any]) -> ColumnarPayload:
+    """অপটিমাইজার ফলাফল: প্রতিটি প্যারামিটার আলাদা কলামে (params.<নাম>), রোবাস্টনেস JSON স্ট্রিং হিসেবে।"""
+    results = job.get("results") or []
+    param_names = sorted({name for item in results for name in item["params"]})
+    table: Dict[str, List[Any]] = {f"params.{name}": [item["params"].get(name) for item in results] for name in param_names}
+    for metric in ("total_return", "win_rate", "max_drawdown"):
+        table[metric] = [item[metric] for item in results]
+    table["robustness"] = [json.dumps(item["robustness"]) if item.get("robustness") else None for item in results]
+    fields = {key: value for key, value in job.items() if key != "results"}
+    return ColumnarPayload("results", table, fields, timestamp_columns=())
@@ -0,0 +1,226 @@
+# app/services/result_cache.py
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .. import config
+from ..lazy_imports import lazy_import
+from .strategy_manager import get_strategy_source_hash
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# ==============================================================================
+#  কী তৈরি (Content-addressed keys)
+# ==============================================================================
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    ক্যান্ডেল ডেটার কন্টেন্ট থেকে একটি হ্যাশ। একই রেঞ্জের ডেটা পরিবর্তন হলে (নতুন ক্যান্ডেল,
+    সংশোধিত মান) ফিঙ্গারপ্রিন্ট বদলে যায়, তাই পুরনো ফলাফল আর মেলে না।
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        # UI থেকে 14 এবং 14.0 একই প্যারামিটার হিসেবে গণ্য
+        return int(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+def canonical_params(params: Dict[str, Any]) -> str:
+    """প্যারামিটার ডিকশনারিকে একটি স্থির (sorted, normalized) JSON স্ট্রিংয়ে রূপান্তর করে।"""
+    return json.dumps({str(k): _canonical_value(v) for k, v in (params or {}).items()}, sort_keys=True, default=str)
+
+# স্ট্র্যাটেজির নিজের ফাইল ছাড়াও যেসব সোর্স ফাইল ব্যাকটেস্টের ফলাফল বদলাতে পারে (app/ ফোল্ডারের সাপেক্ষে)
+ENGINE_SOURCE_FILES = (
+    "services/backtesting_engine.py",
+    "services/indicators.py",
+    "strategies/base_strategy.py",
+    "schemas.py",
+)
+
+_ENGINE_FINGERPRINT: Optional[str] = None
+
+def engine_fingerprint() -> str:
+    """
+    সিমুলেশন ইঞ্জিন, ইন্ডিকেটর, বেস স্ট্র্যাটেজি এবং স্কিমার সোর্সের হ্যাশ, সাথে RESULT_CACHE_VERSION এবং
+    INDICATOR_BACKEND। ডিপ্লয়ের পর এগুলোর কোনোটি বদলালে ডিস্কে থাকা পুরনো ফলাফলের কী আর মেলে না।
+    কোড প্রসেস চলাকালীন বদলায় না, তাই প্রতি প্রসেসে একবারই গণনা করা হয়।
+    """
+    global _ENGINE_FINGERPRINT
+    if _ENGINE_FINGERPRINT is None:
+        app_dir = Path(__file__).resolve().parent.parent
+        digest = hashlib.sha256(f"{config.RESULT_CACHE_VERSION}|{config.INDICATOR_BACKEND}".encode())
+        for relative_path in ENGINE_SOURCE_FILES:
+            digest.update(relative_path.encode())
+            digest.update((app_dir / relative_path).read_bytes())
+        _ENGINE_FINGERPRINT = digest.hexdigest()
+    return _ENGINE_FINGERPRINT
+
+def make_result_key(exchange_name: str, symbol: str, timeframe: str, start_date, end_date,
+                    data_fingerprint: str, strategy_name: str, strategy_params: Dict[str, Any]) -> str:
+    payload = json.dumps({
+        "dataset": [exchange_name.lower(), symbol, timeframe, str(start_date), str(end_date), data_fingerprint],
+        "strategy": [strategy_name, get_strategy_source_hash(strategy_name)],
+        "engine": engine_fingerprint(),
+        "params": canonical_params(strategy_params),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _strategy_slug(strategy_name: str) -> str:
+    return strategy_name.replace(" ", "_").lower()
+
+# ==============================================================================
+#  মেমরি + ডিস্ক LRU ক্যাশ এবং একই অনুরোধ একত্রীকরণ
+# ==============================================================================
+
+class BacktestResultCache:
+    """
+    ব্যাকটেস্ট ফলাফলের দুই-স্তরের LRU ক্যাশ: দ্রুত মেমরি স্তর এবং সীমিত আকারের ডিস্ক স্তর।
+    একই কী-এর একাধিক একযোগে অনুরোধ একটিমাত্র গণনায় একত্রিত (coalesce) হয়।
+    """
+
+    def __init__(self, cache_dir: str = None, memory_entries: int = None, disk_entries: int = None):
+        self.cache_dir = Path(cache_dir or os.path.join(config.CACHE_DIR, "results"))
+        self.memory_entries = memory_entries or config.RESULT_CACHE_MEMORY_ENTRIES
+        self.disk_entries = disk_entries or config.RESULT_CACHE_DISK_ENTRIES
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_strategy: Dict[str, str] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    # --- মেমরি স্তর ---
+    def _remember(self, key: str, strategy_name: str, value: Any):
+        self._memory[key] = value
+        self._memory_strategy[key] = strategy_name
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            old_key, _ = self._memory.popitem(last=False)
+            self._memory_strategy.pop(old_key, None)
+
+    # --- ডিস্ক স্তর ---
+    def _disk_path(self, key: str, strategy_name: str) -> Path:
+        # ফাইলের নামের শুরুতে স্ট্র্যাটেজির নাম রাখা, যাতে আপলোডের পর সহজে মুছে ফেলা যায়
+        return self.cache_dir / f"{_strategy_slug(strategy_name)}__{key}.pkl"
+
+    def _read_disk(self, key: str, strategy_name: str) -> Optional[Any]:
+        path = self._disk_path(key, strategy_name)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # LRU-এর জন্য ব্যবহারের সময় হালনাগাদ
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("⚠️ Discarding unreadable result cache entry %s: %s", path.name, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, strategy_name: str, value: Any):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key, strategy_name)
+            tmp_path = path.with_suffix(".tmp")
+            with tmp_path.open("wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except Exception as e:
+            logger.warning("⚠️ Could not write result cache entry: %s", e)
+
+    def _evict_disk(self):
+        entries = list(self.cache_dir.glob("*.pkl"))
+        if len(entries) <= self.disk_entries:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:len(entries) - self.disk_entries]:
+            path.unlink(missing_ok=True)
+
+    # --- পাবলিক API ---
+    async def get_or_compute(self, key: str, strategy_name: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """ক্যাশে থাকলে ফলাফল দেয়; না থাকলে compute() একবার চালিয়ে সংরক্ষণ করে।"""
+        if key in self._memory:
+            self.hits += 1
+            metrics.inc("result_cache_requests_total", result="memory_hit")
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            metrics.inc("result_cache_requests_total", result="coalesced")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await asyncio.to_thread(self._read_disk, key, strategy_name)
+            if value is not None:
+                self.disk_hits += 1
+                metrics.inc("result_cache_requests_total", result="disk_hit")
+            else:
+                self.misses += 1
+                metrics.inc("result_cache_requests_total", result="miss")
+                value = await compute()
+                await asyncio.to_thread(self._write_disk, key, strategy_name, value)
+            self._remember(key, strategy_name, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # অপেক্ষমাণ কেউ না থাকলে "exception never retrieved" সতর্কবার্তা এড়ানো
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate_strategy(self, strategy_name: str) -> int:
+        """একটি স্ট্র্যাটেজির সব ক্যাশ করা ফলাফল (মেমরি এবং ডিস্ক) মুছে ফেলে।"""
+        removed = 0
+        for key in [k for k, name in self._memory_strategy.items() if name == strategy_name]:
+            self._memory.pop(key, None)
+            self._memory_strategy.pop(key, None)
+            removed += 1
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.glob(f"{_strategy_slug(strategy_name)}__*.pkl"):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+
+# API জুড়ে একটিমাত্র শেয়ার করা ক্যাশ
+result_cache = BacktestResultCache()
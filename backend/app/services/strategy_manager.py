@@ -1,13 +1,23 @@
-# app/services/strategy_manager.py (ডিবাগিং প্রিন্ট স্টেটমেন্ট সহ সম্পূর্ণ সংস্করণ)
+# app/services/strategy_manager.py
 
 import os
+import json
+import logging
 import shutil
+import hashlib
+import datetime
+import threading
+import py_compile
 import importlib.util
 from fastapi import UploadFile
-from typing import List, Dict, Any, Type
+from typing import List, Dict, Any, Type, Optional
 from pathlib import Path
 
 from ..strategies.base_strategy import BaseStrategy
+from . import strategy_sandbox
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 # --- পাথগুলোকে pathlib ব্যবহার করে আরও নির্ভরযোগ্য করা হলো ---
 try:
@@ -23,28 +33,117 @@ except NameError:
 
 IGNORE_FILES = {"__init__.py", "base_strategy.py"}
 
-def _get_strategy_module(strategy_name: str):
-    filename_str = strategy_name.replace(" ", "_").lower() + ".py"
+# আপলোড করা এবং যাচাই করা স্ট্র্যাটেজিগুলোর রেজিস্ট্রি (sha256, ক্লাসের নাম, প্যারামিটার সংজ্ঞা)
+REGISTRY_PATH = USER_STRATEGIES_PATH / "registry.json"
+_registry_lock = threading.Lock()
+
+# একবার লোড হওয়া মডিউল ক্যাশ: path -> (mtime_ns, module), যাতে প্রতিটি লোডে ফাইল আবার exec না হয়
+_MODULE_CACHE: Dict[str, Any] = {}
+
+def _strategy_filename(strategy_name: str) -> str:
+    return strategy_name.replace(" ", "_").lower() + ".py"
+
+def _resolve_strategy_path(strategy_name: str) -> Path:
+    filename_str = _strategy_filename(strategy_name)
     
     user_strategy_path = USER_STRATEGIES_PATH / filename_str
     base_strategy_path = BASE_STRATEGIES_PATH / filename_str
     
-    module_path = None
     if user_strategy_path.exists():
-        module_path = user_strategy_path
+        return user_strategy_path
     elif base_strategy_path.exists():
-        module_path = base_strategy_path
-    else:
-         raise ImportError(f"Strategy file '{filename_str}' not found.")
+        return base_strategy_path
+    raise ImportError(f"Strategy file '{filename_str}' not found.")
+
+def is_user_strategy(strategy_name: str) -> bool:
+    """স্ট্র্যাটেজিটি ব্যবহারকারীর আপলোড করা কিনা (যা শুধুমাত্র স্যান্ডবক্সে চালানো হয়)।"""
+    return (USER_STRATEGIES_PATH / _strategy_filename(strategy_name)).exists()
+
+def _get_strategy_module(strategy_name: str):
+    module_path = _resolve_strategy_path(strategy_name)
+    mtime_ns = module_path.stat().st_mtime_ns
+    cached = _MODULE_CACHE.get(str(module_path))
+    if cached and cached[0] == mtime_ns:
+        metrics.inc("strategy_module_cache_total", result="hit")
+        return cached[1]
+    metrics.inc("strategy_module_cache_total", result="miss")
         
     spec = importlib.util.spec_from_file_location(strategy_name, str(module_path))
     if not spec or not spec.loader:
         raise ImportError(f"Could not create module spec from {module_path}")
 
+    # SourceFileLoader __pycache__-এ থাকা প্রি-কম্পাইলড বাইটকোড ব্যবহার করে
     strategy_module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(strategy_module)
+    _MODULE_CACHE[str(module_path)] = (mtime_ns, strategy_module)
     return strategy_module
 
+_SOURCE_HASH_CACHE: Dict[str, Any] = {}
+
+def get_strategy_source_hash(strategy_name: str) -> str:
+    """
+    স্ট্র্যাটেজি ফাইলের কন্টেন্টের sha256। ফাইল পরিবর্তন হলে (যেমন আবার আপলোড) হ্যাশ বদলে যায়,
+    তাই ফলাফল ক্যাশের কী স্বয়ংক্রিয়ভাবে অবৈধ হয়ে যায়।
+    """
+    module_path = _resolve_strategy_path(strategy_name)
+    mtime_ns = module_path.stat().st_mtime_ns
+    cached = _SOURCE_HASH_CACHE.get(str(module_path))
+    if cached and cached[0] == mtime_ns:
+        metrics.inc("strategy_module_cache_total", result="hit")
+        return cached[1]
+    metrics.inc("strategy_module_cache_total", result="miss")
+    digest = _file_sha256(module_path)
+    _SOURCE_HASH_CACHE[str(module_path)] = (mtime_ns, digest)
+    return digest
+
+# ==========================================================
+#        ব্যবহারকারীর স্ট্র্যাটেজি রেজিস্ট্রি
+# ==========================================================
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def _load_registry() -> Dict[str, Dict[str, Any]]:
+    if not REGISTRY_PATH.exists():
+        return {}
+    try:
+        return json.loads(REGISTRY_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _save_registry(registry: Dict[str, Dict[str, Any]]):
+    tmp_path = REGISTRY_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(registry, indent=2), encoding="utf-8")
+    os.replace(tmp_path, REGISTRY_PATH)
+
+def _register_strategy(file_path: Path, validation: Dict[str, Any]) -> Dict[str, Any]:
+    entry = {
+        "filename": file_path.name,
+        "sha256": _file_sha256(file_path),
+        "class_name": validation["class_name"],
+        "params_definition": validation["params_definition"],
+        "validated_at": datetime.datetime.utcnow().isoformat(),
+    }
+    with _registry_lock:
+        registry = _load_registry()
+        registry[get_strategy_display_name(file_path.name)] = entry
+        _save_registry(registry)
+    return entry
+
+def get_registered_user_strategy(strategy_name: str) -> Dict[str, Any]:
+    """
+    একটি আপলোড করা স্ট্র্যাটেজির রেজিস্ট্রি এন্ট্রি দেয়। ফাইলটি রেজিস্ট্রিতে না থাকলে বা
+    পরিবর্তিত হলে (যেমন হাতে কপি করা) প্রথমে স্যান্ডবক্সে যাচাই করে রেজিস্টার করে।
+    """
+    file_path = USER_STRATEGIES_PATH / _strategy_filename(strategy_name)
+    if not file_path.exists():
+        raise ImportError(f"Strategy file '{file_path.name}' not found.")
+    entry = _load_registry().get(get_strategy_display_name(file_path.name))
+    if entry and entry.get("sha256") == _file_sha256(file_path):
+        return entry
+    validation = strategy_sandbox.validate_strategy_file(file_path)
+    py_compile.compile(str(file_path), doraise=True)
+    return _register_strategy(file_path, validation)
+
 def _find_strategy_class_in_module(strategy_module) -> Type[BaseStrategy]:
     for attr_name in dir(strategy_module):
         attr = getattr(strategy_module, attr_name)
@@ -53,69 +152,74 @@ def _find_strategy_class_in_module(strategy_module) -> Type[BaseStrategy]:
     raise TypeError(f"No valid strategy class found in module {strategy_module.__name__}")
 
 def save_strategy_file(file: UploadFile) -> str:
+    """
+    আপলোড করা ফাইলটি প্রথমে একটি অস্থায়ী ফোল্ডারে রেখে স্যান্ডবক্সে যাচাই করে।
+    যাচাই সফল হলেই ফাইলটি user_uploaded-এ সরানো, বাইটকোডে কম্পাইল এবং রেজিস্টার করা হয়।
+    """
     if not file.filename or not file.filename.endswith(".py"):
         raise ValueError("Invalid file type. Only .py files are allowed.")
     
     safe_filename = Path(file.filename).name
-    USER_STRATEGIES_PATH.mkdir(parents=True, exist_ok=True)
-    file_path = USER_STRATEGIES_PATH / safe_filename
+    if safe_filename in IGNORE_FILES:
+        raise ValueError(f"'{safe_filename}' is a reserved file name.")
+    pending_dir = USER_STRATEGIES_PATH / ".pending"
+    pending_dir.mkdir(parents=True, exist_ok=True)
+    pending_path = pending_dir / safe_filename
     
-    with file_path.open("wb") as buffer:
+    with pending_path.open("wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
+
+    try:
+        # যাচাই ব্যর্থ হলে ValueError, যা API-তে 400 হিসেবে যায়
+        validation = strategy_sandbox.validate_strategy_file(pending_path)
+        py_compile.compile(str(pending_path), doraise=True)
+    except py_compile.PyCompileError as e:
+        pending_path.unlink(missing_ok=True)
+        raise ValueError(f"Strategy failed to compile: {e.msg}")
+    except Exception:
+        pending_path.unlink(missing_ok=True)
+        raise
+
+    file_path = USER_STRATEGIES_PATH / safe_filename
+    os.replace(pending_path, file_path)
+    py_compile.compile(str(file_path), doraise=True)
+    entry = _register_strategy(file_path, validation)
         
-    return f"Successfully uploaded {safe_filename}"
+    return f"Successfully uploaded and validated {safe_filename} ({entry['class_name']})"
 
 def get_strategy_display_name(filename: str) -> str:
     return Path(filename).stem.replace("_", " ").title()
 
-# ==========================================================
-#                  পরিবর্তিত ফাংশন নিচে
-# ==========================================================
 def get_available_strategies() -> List[str]:
     """ডিফল্ট এবং ব্যবহারকারীর আপলোড করা সমস্ত স্ট্র্যাটেজির একটি তালিকা তৈরি করে।"""
-    print("    --> DEBUG: Inside get_available_strategies function")
     found_strategies = set()
-    
-    print(f"    --> DEBUG: Checking base path: '{BASE_STRATEGIES_PATH}'")
-    if BASE_STRATEGIES_PATH.is_dir():
-        print("    --> DEBUG: Base path is a directory. Scanning...")
-        for f in BASE_STRATEGIES_PATH.iterdir():
-            print(f"        - Found item: {f.name}")
+    for directory in (BASE_STRATEGIES_PATH, USER_STRATEGIES_PATH):
+        if not directory.is_dir():
+            # আপলোড ফোল্ডার না থাকা স্বাভাবিক (কোনো ফাইল আপলোড হয়নি)
+            logger.debug("Strategy path '%s' does not exist; skipping.", directory)
+            continue
+        for f in directory.iterdir():
             if f.is_file() and f.name.endswith(".py") and f.name not in IGNORE_FILES:
-                print(f"          >> It's a valid strategy file. Adding.")
                 found_strategies.add(get_strategy_display_name(f.name))
-    else:
-        print(f"    --> DEBUG: WARNING! Base path '{BASE_STRATEGIES_PATH}' does not exist or is not a directory.")
-
-    print(f"    --> DEBUG: Checking user path: '{USER_STRATEGIES_PATH}'")
-    if USER_STRATEGIES_PATH.is_dir():
-        print("    --> DEBUG: User path is a directory. Scanning...")
-        for f in USER_STRATEGIES_PATH.iterdir():
-            print(f"        - Found item: {f.name}")
-            if f.is_file() and f.name.endswith(".py") and f.name not in IGNORE_FILES:
-                print(f"          >> It's a valid user strategy file. Adding.")
-                found_strategies.add(get_strategy_display_name(f.name))
-    else:
-        # এটি একটি সাধারণ অবস্থা, এরর নয়, তাই Warning নয়
-        print(f"    --> DEBUG: User path '{USER_STRATEGIES_PATH}' does not exist (this is normal if no files uploaded).")
-                
-    sorted_list = sorted(list(found_strategies))
-    print(f"    --> DEBUG: Final sorted list being returned: {sorted_list}")
-    return sorted_list
+    return sorted(found_strategies)
 
 def get_strategy_params(strategy_name: str) -> List[Dict[str, Any]]:
     try:
+        # আপলোড করা স্ট্র্যাটেজির কোড API প্রসেসে চালানো হয় না; রেজিস্ট্রি থেকে সংজ্ঞা পড়া হয়
+        if is_user_strategy(strategy_name):
+            return get_registered_user_strategy(strategy_name)["params_definition"]
         module = _get_strategy_module(strategy_name)
         strategy_class = _find_strategy_class_in_module(module)
         if hasattr(strategy_class, 'get_params_definition'):
             return strategy_class.get_params_definition()
         return []
-    except (ImportError, TypeError) as e:
-        print(f"Error getting params for '{strategy_name}': {e}")
+    except (ImportError, TypeError, ValueError) as e:
+        logger.warning("Error getting params for '%s': %s", strategy_name, e)
         raise e
 
 def load_strategy_dynamically(strategy_name: str, params: Dict[str, Any]) -> BaseStrategy:
-    print(f"Attempting to load strategy '{strategy_name}' with params: {params}")
-    module = _get_strategy_module(strategy_name)
-    strategy_class = _find_strategy_class_in_module(module)
-    return strategy_class(params)
\ No newline at end of file
+    logger.debug("Loading strategy '%s' with params: %s", strategy_name, params)
+    with metrics.timer("strategy_load_seconds"):
+        module = _get_strategy_module(strategy_name)
+        strategy_class = _find_strategy_class_in_module(module)
+        return strategy_class(params)
\ No newline at end of file
@@ -0,0 +1,166 @@
+# app/services/strategy_sandbox.py
+
+import asyncio
+import importlib.util
+import multiprocessing
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from .. import config
+from .metrics import metrics, call_with_metrics
+
+try:
+    import resource  # শুধুমাত্র POSIX সিস্টেমে পাওয়া যায়
+except ImportError:
+    resource = None
+
+VALID_SIGNALS = {"BUY", "SELL", "HOLD"}
+SMOKE_TEST_BARS = 300
+
+
+class StrategySandboxError(Exception):
+    """স্যান্ডবক্সে স্ট্র্যাটেজি যাচাই বা চালানোর সময় ব্যর্থতা (টাইমআউট, সীমা অতিক্রম, এরর)।"""
+
+
+# ==============================================================================
+#  ওয়ার্কার প্রসেসের ভেতরের অংশ (Inside the worker process)
+# ==============================================================================
+
+def _apply_resource_limits(cpu_seconds: int, memory_mb: int):
+    """ওয়ার্কার প্রসেসে CPU সময় এবং মেমরির সীমা বসায় (POSIX-এ)। Windows-এ শুধু টাইমআউট কাজ করে।"""
+    if resource is None:
+        return
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+    if memory_mb:
+        limit_bytes = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+
+def _sandbox_entry(conn, func: Callable, args: Tuple, cpu_seconds: int, memory_mb: int):
+    try:
+        _apply_resource_limits(cpu_seconds, memory_mb)
+        result, snapshot = call_with_metrics(func, *args)
+        conn.send((True, result, snapshot))
+    except MemoryError:
+        conn.send((False, "Strategy exceeded the memory limit.", None))
+    except BaseException as e:
+        conn.send((False, f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}", None))
+    finally:
+        conn.close()
+
+# ==============================================================================
+#  আলাদা প্রসেসে চালানো (Running in an isolated process)
+# ==============================================================================
+
+def run_isolated(func: Callable, args: Tuple = (), timeout: float = None,
+                 cpu_seconds: int = None, memory_mb: int = None) -> Any:
+    """
+    func(*args) একটি নতুন spawn করা প্রসেসে CPU/মেমরি সীমাসহ চালায় এবং ফলাফল ফেরত দেয়।
+    সময়সীমা পার হলে বা প্রসেস মারা গেলে StrategySandboxError দেয়। func এবং args অবশ্যই pickle-যোগ্য হতে হবে।
+    """
+    timeout = timeout or config.USER_STRATEGY_BACKTEST_TIMEOUT
+    cpu_seconds = cpu_seconds if cpu_seconds is not None else config.USER_STRATEGY_CPU_SECONDS
+    memory_mb = memory_mb if memory_mb is not None else config.USER_STRATEGY_MEMORY_MB
+
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_sandbox_entry, args=(child_conn, func, args, cpu_seconds, memory_mb), daemon=True)
+    process.start()
+    child_conn.close()
+    try:
+        if not parent_conn.poll(timeout):
+            raise StrategySandboxError(f"Strategy execution timed out after {timeout:.0f} seconds.")
+        try:
+            ok, payload, snapshot = parent_conn.recv()
+        except EOFError:
+            raise StrategySandboxError("Strategy worker process died (CPU or memory limit exceeded?).")
+        if not ok:
+            raise StrategySandboxError(payload)
+        metrics.merge(snapshot)
+        return payload
+    finally:
+        parent_conn.close()
+        if process.is_alive():
+            process.kill()
+        process.join(5)
+
+async def run_isolated_async(func: Callable, args: Tuple = (), **limits) -> Any:
+    """run_isolated-এর async সংস্করণ; অপেক্ষাটি একটি থ্রেডে হয়, তাই ইভেন্ট লুপ ব্লক হয় না।"""
+    return await asyncio.to_thread(run_isolated, func, args, **limits)
+
+# ==============================================================================
+#  আপলোডের সময় যাচাই (Validation at upload time)
+# ==============================================================================
+
+def _synthetic_ohlcv(bars: int = SMOKE_TEST_BARS):
+    """স্মোক টেস্টের জন্য একটি কৃত্রিম random-walk OHLCV ডেটাফ্রেম তৈরি করে।"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.005, bars)) * close
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2023-01-01", periods=bars, freq="h"),
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.uniform(10, 100, bars),
+    })
+
+def _validate_strategy_file(module_path: str) -> Dict[str, Any]:
+    """
+    (ওয়ার্কার প্রসেসে চলে) ফাইলটি ইম্পোর্ট করে, BaseStrategy সাবক্লাস এবং
+    get_params_definition পরীক্ষা করে এবং কৃত্রিম ডেটায় একটি স্মোক টেস্ট চালায়।
+    """
+    from ..strategies.base_strategy import BaseStrategy
+
+    spec = importlib.util.spec_from_file_location("uploaded_strategy_under_validation", module_path)
+    if not spec or not spec.loader:
+        raise ValueError("Could not create a module spec for the uploaded file.")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    strategy_classes = [
+        attr for attr in vars(module).values()
+        if isinstance(attr, type) and issubclass(attr, BaseStrategy) and attr is not BaseStrategy
+    ]
+    if not strategy_classes:
+        raise ValueError("No subclass of BaseStrategy found in the uploaded file.")
+    strategy_class = strategy_classes[0]
+
+    if not hasattr(strategy_class, "get_params_definition"):
+        raise ValueError(f"{strategy_class.__name__} must define a static get_params_definition() method.")
+    params_definition = strategy_class.get_params_definition()
+    if not isinstance(params_definition, list) or not all(
+        isinstance(p, dict) and {"name", "type", "default"} <= set(p) for p in params_definition
+    ):
+        raise ValueError("get_params_definition() must return a list of dicts with 'name', 'type' and 'default'.")
+
+    default_params = {p["name"]: p["default"] for p in params_definition}
+    strategy = strategy_class(default_params)
+    df = _synthetic_ohlcv()
+    # পুরো ডেটা এবং কয়েকটি ছোট স্লাইসে সিগন্যাল তৈরি করে দেখা
+    for end in (2, 30, len(df) // 2, len(df)):
+        signal = strategy.generate_signals(df.iloc[:end].copy())
+        if signal not in VALID_SIGNALS:
+            raise ValueError(f"generate_signals() returned {signal!r}; expected one of {sorted(VALID_SIGNALS)}.")
+
+    return {"class_name": strategy_class.__name__, "params_definition": params_definition}
+
+def validate_strategy_file(module_path: Path) -> Dict[str, Any]:
+    """
+    আপলোড করা ফাইলটি একটি সীমাবদ্ধ ওয়ার্কার প্রসেসে যাচাই করে।
+    সফল হলে ক্লাসের নাম এবং প্যারামিটার সংজ্ঞা ফেরত দেয়, ব্যর্থ হলে ValueError দেয়।
+    """
+    try:
+        return run_isolated(
+            _validate_strategy_file, (str(module_path),),
+            timeout=config.USER_STRATEGY_VALIDATION_TIMEOUT,
+            cpu_seconds=int(config.USER_STRATEGY_VALIDATION_TIMEOUT) + 1,
+        )
+    except StrategySandboxError as e:
+        raise ValueError(f"Strategy validation failed: {e}")
@@ -1,16 +1,51 @@
 # app/strategies/base_strategy.py
 
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-import pandas as pd
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # শুধুমাত্র টাইপ হিন্টের জন্য; API চালু হওয়ার সময় pandas লোড হয় না
+    import pandas as pd
 
 class BaseStrategy(ABC):
     """
     একটি অ্যাবস্ট্রাক্ট বেস ক্লাস যা সব ট্রেডিং স্ট্র্যাটেজিকে মেনে চলতে হবে।
     এটি নিশ্চিত করে যে প্রতিটি স্ট্র্যাটেজিতে একটি 'generate_signals' মেথড আছে।
     """
+    # warmup_bars() ওভাররাইড না করা স্ট্র্যাটেজির জন্য একটি অনুমান, যা স্ট্র্যাটেজির ইন্ডিকেটর জানে না;
+    # এর চেয়ে লম্বা লুকব্যাক বা রিকার্সিভ ইন্ডিকেটর থাকলে নিজের warmup_bars() দিতে হবে
+    DEFAULT_WARMUP_BARS = 500
+
     def __init__(self, strategy_params: dict):
         self.params = strategy_params
 
+    def warmup_bars(self) -> int:
+        """
+        সিগন্যাল তৈরির জন্য প্রয়োজনীয় লুকব্যাক (বর্তমান ক্যান্ডেলসহ)। লাইভ বট প্রতি চক্রে এতগুলো
+        ক্যান্ডেল আনে, এবং start_stream() সমর্থন না করলে স্ট্রিমিং মোডও এর বেশি পুরনো ডেটা রাখে না।
+        নির্দিষ্ট উইন্ডোর ইন্ডিকেটরে এটি সঠিক হতে পারে; EMA/RSI-এর মতো রিকার্সিভ ইন্ডিকেটর কখনো পুরোপুরি
+        মেলে না, তাই indicators.settling_bars() দিয়ে INDICATOR_SETTLE_TOLERANCE অনুযায়ী নির্ধারণ করুন।
+        """
+        return self.DEFAULT_WARMUP_BARS
+
+    def start_stream(self) -> bool:
+        """
+        স্ট্রিমিং ব্যাকটেস্টের শুরুতে একবার ডাকা হয়। রিকার্সিভ ইন্ডিকেটরের (EMA, RSI, OBV ইত্যাদি) মান
+        পুরো হিস্টোরির উপর নির্ভর করে, তাই warmup_bars()-এর উইন্ডোতে নতুন করে হিসাব করলে পূর্ণ ব্যাকটেস্টের
+        সাথে মেলে না। এমন স্ট্র্যাটেজি এখানে indicators-এর *Stream অবস্থা তৈরি করে True দেয় এবং
+        next_signal ইমপ্লিমেন্ট করে। False (ডিফল্ট) হলে ইঞ্জিন প্রতিটি ক্যান্ডেলে শেষ warmup_bars()
+        ক্যান্ডেল দিয়ে generate_signals ডাকে, যা শুধু সীমিত লুকব্যাকের ইন্ডিকেটরের জন্য পূর্ণ মোডের সমান।
+        """
+        return False
+
+    def next_signal(self, candle) -> str:
+        """
+        start_stream() True দিলে প্রতিটি নতুন ক্যান্ডেলে ক্রমানুসারে একবার ডাকা হয়। candle-এ open, high,
+        low, close, volume অ্যাট্রিবিউট থাকে; ফলাফল একই ক্যান্ডেলে generate_signals যা দিত তাই।
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def generate_signals(self, historical_data: pd.DataFrame) -> str:
         """
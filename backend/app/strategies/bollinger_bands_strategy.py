@@ -1,9 +1,12 @@
 # app/strategies/bollinger_bands_strategy.py
 
+import logging
 import pandas as pd
-import pandas_ta as ta
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
+logger = logging.getLogger(__name__)
+
 class BollingerBandsStrategy(BaseStrategy):
     """প্রাইস যখন Bollinger Bands-এর সীমানা স্পর্শ করে, তখন Mean Reversion সিগন্যাল দেয়।"""
     
@@ -11,7 +14,7 @@ class BollingerBandsStrategy(BaseStrategy):
         # params থেকে length এবং std_dev নেওয়া, না থাকলে ডিফল্ট ভ্যালু ব্যবহার করা
         self.length = int(params.get('length', 20))
         self.std_dev = float(params.get('std_dev', 2.0))
-        print(f"Bollinger Bands Strategy Initialized with: Length={self.length}, StdDev={self.std_dev}")
+        logger.debug("Bollinger Bands Strategy Initialized with: Length=%s, StdDev=%s", self.length, self.std_dev)
 
     # <-- মূল পরিবর্তন: UI-এর জন্য প্যারামিটার সংজ্ঞা যোগ করা হলো -->
     @staticmethod
@@ -25,20 +28,20 @@ class BollingerBandsStrategy(BaseStrategy):
             {"name": "std_dev", "type": "float", "default": 2.0, "label": "Standard Deviation"}
         ]
 
+    def warmup_bars(self) -> int:
+        # চলমান গড় এবং স্ট্যান্ডার্ড ডেভিয়েশন শুধু শেষ length ক্যান্ডেলের উপর নির্ভর করে (সঠিক, আনুমানিক নয়)
+        return indicators.settling_bars("bbands", self.length)
+
     def generate_signals(self, df: pd.DataFrame) -> str:
-        # __init__ থেকে পাওয়া ভ্যালু ব্যবহার করে কলামের নাম তৈরি করা
-        bbl_col = f'BBL_{self.length}_{self.std_dev}'
-        bbu_col = f'BBU_{self.length}_{self.std_dev}'
-        
-        # pandas_ta কে সঠিক প্যারামিটার পাস করা
-        df.ta.bbands(length=self.length, std=self.std_dev, append=True)
-        
-        if len(df) < self.length or bbl_col not in df.columns or bbu_col not in df.columns:
+        if len(df) < self.length:
             return "HOLD"
-            
+
+        # ইন্ডিকেটর ফ্যাসাড ইনস্টল করা দ্রুততম ব্যাকএন্ড দিয়ে ব্যান্ডগুলো হিসাব করে
+        bands = indicators.bbands(df['close'], length=self.length, std=self.std_dev)
+
         latest_price = df['close'].iloc[-1]
-        lower_band = df[bbl_col].iloc[-1]
-        upper_band = df[bbu_col].iloc[-1]
+        lower_band = bands['lower'].iloc[-1]
+        upper_band = bands['upper'].iloc[-1]
 
         if pd.isna(lower_band) or pd.isna(upper_band):
             return "HOLD"
@@ -1,7 +1,7 @@
 # app/strategies/ema_crossover_strategy.py
 
 import pandas as pd
-import pandas_ta as ta
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
 class EmaCrossoverStrategy(BaseStrategy):
@@ -32,35 +32,51 @@ class EmaCrossoverStrategy(BaseStrategy):
             }
         ]
 
+    def warmup_bars(self) -> int:
+        # দুটি EMA যতক্ষণে settle হয় (indicators.settling_bars দেখুন), এবং আগের ক্যান্ডেলের সাথে তুলনার জন্য আরও একটি
+        return max(indicators.settling_bars("ema", self.short_window),
+                   indicators.settling_bars("ema", self.long_window)) + 1
+
     def generate_signals(self, df: pd.DataFrame) -> str:
-        # __init__ থেকে পাওয়া ভ্যালু ব্যবহার করে ডাইনামিকভাবে EMA গণনা করা
-        short_ema_col = f'EMA_{self.short_window}'
-        long_ema_col = f'EMA_{self.long_window}'
-        
-        # দুটি EMA গণনা করা
-        # নিশ্চিত করা যে কলামের নামগুলো অনন্য থাকে
-        df.ta.ema(length=self.short_window, append=True, col_names=(short_ema_col,))
-        df.ta.ema(length=self.long_window, append=True, col_names=(long_ema_col,))
-        
-        # ডেটা পর্যাপ্ত কিনা এবং কলামগুলো তৈরি হয়েছে কিনা তা পরীক্ষা করা
-        if len(df) < self.long_window or short_ema_col not in df.columns or long_ema_col not in df.columns:
+        # ডেটা পর্যাপ্ত কিনা তা পরীক্ষা করা
+        if len(df) < self.long_window:
             return "HOLD"
-        
-        # NaN ভ্যালু আছে কিনা তা পরীক্ষা করা, যা গণনার শুরুতে হতে পারে
-        if pd.isna(df[short_ema_col].iloc[-1]) or pd.isna(df[long_ema_col].iloc[-1]):
+
+        # __init__ থেকে পাওয়া ভ্যালু ব্যবহার করে দুটি EMA গণনা করা
+        short_ema = indicators.ema(df['close'], self.short_window)
+        long_ema = indicators.ema(df['close'], self.long_window)
+        return self._crossover(short_ema.iloc[-2], long_ema.iloc[-2], short_ema.iloc[-1], long_ema.iloc[-1])
+
+    def start_stream(self) -> bool:
+        # স্ট্রিমিং ব্যাকটেস্টে EMA-র অবস্থা ক্যান্ডেল থেকে ক্যান্ডেলে বহন করা হয়
+        self._bars = 0
+        self._short_stream = indicators.EmaStream(self.short_window)
+        self._long_stream = indicators.EmaStream(self.long_window)
+        self._previous = (float('nan'), float('nan'))
+        return True
+
+    def next_signal(self, candle) -> str:
+        self._bars += 1
+        latest = (self._short_stream.update(candle.close), self._long_stream.update(candle.close))
+        previous, self._previous = self._previous, latest
+        if self._bars < self.long_window:
             return "HOLD"
+        return self._crossover(*previous, *latest)
 
-        latest = df.iloc[-1]
-        previous = df.iloc[-2]
+    @staticmethod
+    def _crossover(previous_short, previous_long, latest_short, latest_long) -> str:
+        # NaN ভ্যালু আছে কিনা তা পরীক্ষা করা, যা গণনার শুরুতে হতে পারে
+        if pd.isna(latest_short) or pd.isna(latest_long):
+            return "HOLD"
 
         # গোল্ডেন ক্রস (BUY)
         # short ema crosses above long ema
-        if previous[short_ema_col] < previous[long_ema_col] and latest[short_ema_col] > latest[long_ema_col]:
+        if previous_short < previous_long and latest_short > latest_long:
             return "BUY"
 
         # ডেথ ক্রস (SELL)
         # short ema crosses below long ema
-        if previous[short_ema_col] > previous[long_ema_col] and latest[short_ema_col] < latest[long_ema_col]:
+        if previous_short > previous_long and latest_short < latest_long:
             return "SELL"
             
         return "HOLD"
\ No newline at end of file
@@ -1,7 +1,7 @@
 # app/strategies/macd_crossover_strategy.py
 
 import pandas as pd
-import pandas_ta as ta
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
 class MacdCrossoverStrategy(BaseStrategy):
@@ -39,32 +39,49 @@ class MacdCrossoverStrategy(BaseStrategy):
             }
         ]
 
-    def generate_signals(self, df: pd.DataFrame) -> str:
-        # MACD ইন্ডিকেটর গণনা করা
-        df.ta.macd(fast=self.fast, slow=self.slow, signal=self.signal, append=True)
-        
-        # pandas_ta দ্বারা তৈরি কলামের নামগুলো সঠিকভাবে ধরা
-        macd_line = f'MACD_{self.fast}_{self.slow}_{self.signal}'
-        signal_line = f'MACDs_{self.fast}_{self.slow}_{self.signal}'
+    def warmup_bars(self) -> int:
+        # MACD এবং সিগন্যাল লাইন settle হওয়া পর্যন্ত, এবং আগের ক্যান্ডেলের সাথে তুলনার জন্য আরও একটি
+        return indicators.settling_bars("macd", self.fast, self.slow, self.signal) + 1
 
+    def generate_signals(self, df: pd.DataFrame) -> str:
         # যথেষ্ট ডেটা আছে কিনা তা নিশ্চিত করার জন্য একটি উন্নত পরীক্ষা
         # MACD হিসাব করতে কমপক্ষে (slow_period + signal_period) ডেটা লাগে
-        if len(df) < (self.slow + self.signal) or macd_line not in df.columns or signal_line not in df.columns:
+        if len(df) < (self.slow + self.signal):
             return "HOLD"
-        
+
+        # MACD ইন্ডিকেটর গণনা করা (কলাম: macd, signal, hist)
+        macd = indicators.macd(df['close'], fast=self.fast, slow=self.slow, signal=self.signal)
+        macd_line = macd['macd']
+        signal_line = macd['signal']
+        return self._crossover(macd_line.iloc[-2], signal_line.iloc[-2], macd_line.iloc[-1], signal_line.iloc[-1])
+
+    def start_stream(self) -> bool:
+        # স্ট্রিমিং ব্যাকটেস্টে তিনটি EMA-র অবস্থা ক্যান্ডেল থেকে ক্যান্ডেলে বহন করা হয়
+        self._bars = 0
+        self._stream = indicators.MacdStream(self.fast, self.slow, self.signal)
+        self._previous = (float('nan'), float('nan'))
+        return True
+
+    def next_signal(self, candle) -> str:
+        self._bars += 1
+        latest = self._stream.update(candle.close)
+        previous, self._previous = self._previous, latest
+        if self._bars < (self.slow + self.signal):
+            return "HOLD"
+        return self._crossover(*previous, *latest)
+
+    @staticmethod
+    def _crossover(previous_macd, previous_signal, latest_macd, latest_signal) -> str:
         # NaN ভ্যালু আছে কিনা তা পরীক্ষা করা, যা গণনার শুরুতে হতে পারে
-        if pd.isna(df[macd_line].iloc[-1]) or pd.isna(df[signal_line].iloc[-1]):
+        if pd.isna(latest_macd) or pd.isna(latest_signal):
             return "HOLD"
-            
-        latest = df.iloc[-1]
-        previous = df.iloc[-2]
 
         # বুলিশ ক্রওসওভার (BUY): MACD লাইন সিগন্যাল লাইনকে নিচ থেকে ক্রস করে উপরে উঠলে
-        if previous[macd_line] < previous[signal_line] and latest[macd_line] > latest[signal_line]:
+        if previous_macd < previous_signal and latest_macd > latest_signal:
             return "BUY"
 
         # বেয়ারিশ ক্রওসওভার (SELL): MACD লাইন সিগন্যাল লাইনকে উপর থেকে ক্রস করে নিচে নামলে
-        if previous[macd_line] > previous[signal_line] and latest[macd_line] < latest[signal_line]:
+        if previous_macd > previous_signal and latest_macd < latest_signal:
             return "SELL"
             
         return "HOLD"
\ No newline at end of file
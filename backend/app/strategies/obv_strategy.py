@@ -1,7 +1,7 @@
 # app/strategies/obv_strategy.py
 
 import pandas as pd
-import pandas_ta as ta
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
 class ObvStrategy(BaseStrategy):
@@ -27,31 +27,50 @@ class ObvStrategy(BaseStrategy):
         ]
     # --- নতুন কোড শেষ ---
     
+    def warmup_bars(self) -> int:
+        # OBV ক্রমযোজিত, কিন্তু OBV এবং তার EMA-র তুলনা ধ্রুবক অফসেটে বদলায় না; তাই শুধু EMA settle হওয়া
+        # পর্যন্ত, এবং আগের ক্যান্ডেলের সাথে তুলনার জন্য আরও একটি
+        return indicators.settling_bars("ema", self.ema_length) + 1
+
     def generate_signals(self, df: pd.DataFrame) -> str:
-        # On-Balance Volume গণনা
-        df.ta.obv(append=True)
-
-        # OBV-এর একটি EMA গণনা করা হচ্ছে ট্রেন্ড বোঝার জন্য
-        obv_ema_col = f'OBVe_{self.ema_length}' # pandas_ta ডিফল্ট নাম ব্যবহার করে, আমরাও তাই করব
-        df.ta.ema(close=df['OBV'], length=self.ema_length, append=True) # pandas_ta স্বয়ংক্রিয়ভাবে সঠিক নাম দেবে
-        
-        # যথেষ্ট ডেটা আছে কিনা তা নিশ্চিত করা এবং কলামের অস্তিত্ব পরীক্ষা করা
-        if 'OBV' not in df.columns or obv_ema_col not in df.columns or len(df) < 2:
+        # যথেষ্ট ডেটা আছে কিনা তা নিশ্চিত করা
+        if len(df) < 2:
             return "HOLD"
-            
-        latest = df.iloc[-1]
-        previous = df.iloc[-2]
 
+        # On-Balance Volume এবং ট্রেন্ড বোঝার জন্য তার একটি EMA গণনা
+        obv = indicators.obv(df['close'], df['volume'])
+        obv_ema = indicators.ema(obv, self.ema_length)
+        return self._crossover(obv.iloc[-2], obv_ema.iloc[-2], obv.iloc[-1], obv_ema.iloc[-1])
+
+    def start_stream(self) -> bool:
+        # স্ট্রিমিং ব্যাকটেস্টে ক্রমযোজিত OBV এবং তার EMA-র অবস্থা ক্যান্ডেল থেকে ক্যান্ডেলে বহন করা হয়
+        self._bars = 0
+        self._obv_stream = indicators.ObvStream()
+        self._ema_stream = indicators.EmaStream(self.ema_length)
+        self._previous = (float('nan'), float('nan'))
+        return True
+
+    def next_signal(self, candle) -> str:
+        self._bars += 1
+        obv = self._obv_stream.update(candle.close, candle.volume)
+        latest = (obv, self._ema_stream.update(obv))
+        previous, self._previous = self._previous, latest
+        if self._bars < 2:
+            return "HOLD"
+        return self._crossover(*previous, *latest)
+
+    @staticmethod
+    def _crossover(previous_obv, previous_ema, latest_obv, latest_ema) -> str:
         # NaN ভ্যালু আছে কিনা তা পরীক্ষা করা, যা গণনার শুরুতে হতে পারে
-        if pd.isna(latest[obv_ema_col]) or pd.isna(previous[obv_ema_col]):
+        if pd.isna(latest_ema) or pd.isna(previous_ema):
             return "HOLD"
 
         # OBV যখন তার EMA-কে নিচ থেকে উপরে ক্রস করে (BUY)
-        if previous['OBV'] < previous[obv_ema_col] and latest['OBV'] > latest[obv_ema_col]:
+        if previous_obv < previous_ema and latest_obv > latest_ema:
             return "BUY"
 
         # OBV যখন তার EMA-কে উপর থেকে নিচে ক্রস করে (SELL)
-        if previous['OBV'] > previous[obv_ema_col] and latest['OBV'] < latest[obv_ema_col]:
+        if previous_obv > previous_ema and latest_obv < latest_ema:
             return "SELL"
             
         return "HOLD"
\ No newline at end of file
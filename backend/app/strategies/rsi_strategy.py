@@ -1,9 +1,12 @@
 # app/strategies/rsi_strategy.py
 
+import logging
 import pandas as pd
-import talib
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
+logger = logging.getLogger(__name__)
+
 class RsiStrategy(BaseStrategy):
     """
     RSI (Relative Strength Index) ইন্ডিকেটরের উপর ভিত্তি করে ট্রেডিং স্ট্র্যাটেজি।
@@ -20,8 +23,8 @@ class RsiStrategy(BaseStrategy):
         self.oversold = int(params.get('oversold', 30))
         self.overbought = int(params.get('overbought', 70))
         
-        # ডিবাগিং-এর জন্য কোন প্যারামিটার দিয়ে ক্লাসটি তৈরি হলো তা প্রিন্ট করা
-        print(f"RSI Strategy Initialized with: Length={self.length}, Oversold={self.oversold}, Overbought={self.overbought}")
+        # ডিবাগিং-এর জন্য কোন প্যারামিটার দিয়ে ক্লাসটি তৈরি হলো তা লগ করা (DEBUG লেভেলে, কারণ অপটিমাইজারে প্রতিটি রানে এটি তৈরি হয়)
+        logger.debug("RSI Strategy Initialized with: Length=%s, Oversold=%s, Overbought=%s", self.length, self.oversold, self.overbought)
 
     @staticmethod
     def get_params_definition():
@@ -35,6 +38,10 @@ class RsiStrategy(BaseStrategy):
             {"name": "overbought", "type": "integer", "default": 70, "label": "Overbought Threshold"}
         ]
 
+    def warmup_bars(self) -> int:
+        # Wilder স্মুদিং রিকার্সিভ; গড় লাভ/ক্ষতি settle হওয়া পর্যন্ত (indicators.settling_bars দেখুন)
+        return indicators.settling_bars("rsi", self.length)
+
     def generate_signals(self, df: pd.DataFrame) -> str:
         """
         RSI মান পরীক্ষা করে 'BUY', 'SELL' বা 'HOLD' সিগন্যাল তৈরি করে।
@@ -44,11 +51,25 @@ class RsiStrategy(BaseStrategy):
             return 'HOLD'
 
         # __init__-এ সেট করাインスタンス ভ্যারিয়েবল ব্যবহার করা হচ্ছে
-        rsi_values = talib.RSI(df['close'], timeperiod=self.length)
+        rsi_values = indicators.rsi(df['close'], self.length)
 
         # সর্বশেষ RSI মান
-        latest_rsi = rsi_values.iloc[-1]
+        return self._signal(rsi_values.iloc[-1])
+
+    def start_stream(self) -> bool:
+        # স্ট্রিমিং ব্যাকটেস্টে Wilder স্মুদিংয়ের অবস্থা ক্যান্ডেল থেকে ক্যান্ডেলে বহন করা হয়
+        self._bars = 0
+        self._stream = indicators.RsiStream(self.length)
+        return True
+
+    def next_signal(self, candle) -> str:
+        self._bars += 1
+        latest_rsi = self._stream.update(candle.close)
+        if self._bars < self.length:
+            return 'HOLD'
+        return self._signal(latest_rsi)
 
+    def _signal(self, latest_rsi) -> str:
         # যদি সর্বশেষ মান NaN হয় (যেমন, ডেটার শুরুতে), তাহলে কোনো সিগন্যাল না দেওয়া
         if pd.isna(latest_rsi):
             return 'HOLD'
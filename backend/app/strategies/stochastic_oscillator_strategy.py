@@ -1,7 +1,7 @@
 # app/strategies/stochastic_oscillator_strategy.py
 
 import pandas as pd
-import pandas_ta as ta
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
 class StochasticOscillatorStrategy(BaseStrategy):
@@ -26,30 +26,34 @@ class StochasticOscillatorStrategy(BaseStrategy):
             {"name": "overbought", "type": "integer", "default": 80, "label": "Overbought Level"}
         ]
         
-    def generate_signals(self, df: pd.DataFrame) -> str:
-        
-        # ডাইনামিক কলামের নাম তৈরি করা
-        stoch_k_col = f'STOCHk_{self.k_period}_{self.d_period}_{self.smoothing}'
-        stoch_d_col = f'STOCHd_{self.k_period}_{self.d_period}_{self.smoothing}'
+    def warmup_bars(self) -> int:
+        # %K শুধু শেষ k + smoothing - 1 ক্যান্ডেলের উপর নির্ভর করে (সঠিক, আনুমানিক নয়), কিন্তু generate_signals-এর
+        # গার্ড k + d + smoothing ক্যান্ডেলের কমে HOLD দেয়, তাই উইন্ডো অন্তত ততটা হতে হবে
+        return self.k_period + self.d_period + self.smoothing
 
-        # pandas_ta ব্যবহার করে Stochastic Oscillator গণনা করা
-        df.ta.stoch(k=self.k_period, d=self.d_period, smooth_k=self.smoothing, append=True)
-        
-        # যথেষ্ট ডেটা আছে এবং কলাম তৈরি হয়েছে কিনা তা নিশ্চিত করা
-        if len(df) < 2 or stoch_k_col not in df.columns:
+    def generate_signals(self, df: pd.DataFrame) -> str:
+        # যথেষ্ট ডেটা আছে কিনা তা নিশ্চিত করা; পুরনো pandas_ta কোডে k + d + smooth_k-এর কম ক্যান্ডেলে %K কলামই
+        # তৈরি হতো না, তাই HOLD আসত
+        if len(df) < self.k_period + self.d_period + self.smoothing:
             return "HOLD"
+
+        # Stochastic Oscillator গণনা করা (কলাম: k, d)
+        stoch_k = indicators.stoch(df['high'], df['low'], df['close'],
+                                   k=self.k_period, d=self.d_period, smooth_k=self.smoothing)['k']
             
-        latest = df.iloc[-1]
-        previous = df.iloc[-2]
+        previous_k = stoch_k.iloc[-2]
+        latest_k = stoch_k.iloc[-1]
+        if pd.isna(previous_k) or pd.isna(latest_k):
+            return "HOLD"
 
         # Oversold লেভেল থেকে উপরে উঠলে (BUY)
         # %K লাইনটি oversold লেভেলকে নিচ থেকে ক্রস করে উপরে উঠছে
-        if previous[stoch_k_col] < self.oversold and latest[stoch_k_col] > self.oversold:
+        if previous_k < self.oversold and latest_k > self.oversold:
             return "BUY"
 
         # Overbought লেভেল থেকে নিচে নামলে (SELL)
         # %K লাইনটি overbought লেভেলকে উপর থেকে ক্রস করে নিচে নামছে
-        if previous[stoch_k_col] > self.overbought and latest[stoch_k_col] < self.overbought:
+        if previous_k > self.overbought and latest_k < self.overbought:
             return "SELL"
             
         return "HOLD"
\ No newline at end of file
@@ -1,12 +1,15 @@
 # app/strategies/supertrend_strategy.py
 
 import pandas as pd
-import pandas_ta as ta
+from app.services import indicators
 from app.strategies.base_strategy import BaseStrategy
 
 class SupertrendStrategy(BaseStrategy):
     """Supertrend ইন্ডিকেটরের ট্রেন্ড পরিবর্তনের উপর ভিত্তি করে সিগন্যাল দেয়।"""
     
+    # উইন্ডোতে একটি ট্রেন্ড বদল ধরার জন্য বাড়তি ATR পিরিয়ড (warmup_bars দেখুন)
+    TREND_PERIODS = 20
+
     def __init__(self, params: dict):
         """
         __init__ মেথডটি এখন robust type casting সহ প্যারামিটার গ্রহণ করে।
@@ -25,29 +28,49 @@ class SupertrendStrategy(BaseStrategy):
             {"name": "multiplier", "type": "float", "default": 3.0, "label": "Multiplier"}
         ]
         
-    def generate_signals(self, df: pd.DataFrame) -> str:
-        
-        # ডাইনামিক কলামের নাম তৈরি করা (pandas_ta অনুযায়ী)
-        # যেমন: SUPERTd_7_3.0
-        direction_col = f'SUPERTd_{self.period}_{self.multiplier}'
+    def warmup_bars(self) -> int:
+        # ATR settle হওয়া পর্যন্ত, আগের ক্যান্ডেলের সাথে তুলনার জন্য আরও একটি, এবং ট্রেন্ডের দিকের জন্য
+        # বাড়তি TREND_PERIODS × period। দিকটি পথের উপর নির্ভর করে: উইন্ডো আপট্রেন্ড ধরে শুরু হয়
+        # এবং উইন্ডোর ভেতরে প্রথম ট্রেন্ড বদলের পরেই পূর্ণ হিস্টোরির সাথে মেলে। এর কোনো গাণিতিক সীমা নেই;
+        # বাড়তি অংশটি একটি অনুমান (এর চেয়ে লম্বা ট্রেন্ডে উইন্ডোর দিক ভুল থাকতে পারে)
+        return indicators.settling_bars("atr", self.period) + 1 + self.TREND_PERIODS * self.period
 
-        # pandas_ta ব্যবহার করে Supertrend ইন্ডিকেটর গণনা করা
-        df.ta.supertrend(length=self.period, multiplier=self.multiplier, append=True)
-        
+    def generate_signals(self, df: pd.DataFrame) -> str:
         # যথেষ্ট ডেটা আছে কিনা তা নিশ্চিত করা
-        if len(df) < 2 or direction_col not in df.columns or pd.isna(df[direction_col].iloc[-2]):
+        if len(df) < 2:
             return "HOLD"
-            
-        latest = df.iloc[-1]
-        previous = df.iloc[-2]
 
-        # SUPERTd কলামটি ট্রেন্ড নির্দেশ করে (1 for uptrend, -1 for downtrend)
+        # Supertrend ইন্ডিকেটর গণনা করা; direction কলাম ট্রেন্ড নির্দেশ করে (1 for uptrend, -1 for downtrend)
+        direction = indicators.supertrend(df['high'], df['low'], df['close'],
+                                          length=self.period, multiplier=self.multiplier)['direction']
+        return self._trend_change(direction.iloc[-2], direction.iloc[-1])
+
+    def start_stream(self) -> bool:
+        # স্ট্রিমিং ব্যাকটেস্টে ATR এবং ব্যান্ডগুলোর অবস্থা ক্যান্ডেল থেকে ক্যান্ডেলে বহন করা হয়
+        self._bars = 0
+        self._stream = indicators.SupertrendStream(self.period, self.multiplier)
+        self._previous = float('nan')
+        return True
+
+    def next_signal(self, candle) -> str:
+        self._bars += 1
+        latest = self._stream.update(candle.high, candle.low, candle.close)
+        previous, self._previous = self._previous, latest
+        if self._bars < 2:
+            return "HOLD"
+        return self._trend_change(previous, latest)
+
+    @staticmethod
+    def _trend_change(previous, latest) -> str:
+        if pd.isna(previous):
+            return "HOLD"
+            
         # আপট্রেন্ড শুরু হলে (BUY) - অর্থাৎ, ট্রেন্ড -1 থেকে 1-এ পরিবর্তিত হলে
-        if previous[direction_col] == -1 and latest[direction_col] == 1:
+        if previous == -1 and latest == 1:
             return "BUY"
 
         # ডাউনট্রেন্ড শুরু হলে (SELL) - অর্থাৎ, ট্রেন্ড 1 থেকে -1-এ পরিবর্তিত হলে
-        if previous[direction_col] == 1 and latest[direction_col] == -1:
+        if previous == 1 and latest == -1:
             return "SELL"
             
         return "HOLD"
\ No newline at end of file
@@ -0,0 +1,77 @@
+# encoding_benchmark.py
+#
+# একটি বড় সিন্থেটিক BacktestResult বিভিন্ন ফরম্যাট এবং কম্প্রেশনে এনকোড করে
+# সময় এবং বাইটের তুলনা দেখায় (আগের ডিফল্ট: কম্প্রেশন ছাড়া JSON)।
+#
+#   python encoding_benchmark.py --candles 50000
+
+import argparse
+import datetime
+import random
+import time
+
+from app import schemas
+from app.services import response_encoding
+from app.services.response_encoding import ARROW_TYPE, JSON_TYPE, MSGPACK_TYPE
+
+
+def build_result(candles: int) -> schemas.BacktestResult:
+    """র‍্যান্ডম-ওয়াক দামের ঘণ্টাভিত্তিক ক্যান্ডেল এবং প্রতিটির জন্য একটি পোর্টফোলিও পয়েন্ট।"""
+    rng = random.Random(42)
+    start = datetime.datetime(2020, 1, 1)
+    price = 20000.0
+    price_history, history, trade_logs = [], [], []
+    for i in range(candles):
+        ts = start + datetime.timedelta(hours=i)
+        open_ = price
+        price = max(1.0, price + rng.gauss(0, 50))
+        price_history.append({"timestamp": ts, "open": round(open_, 2), "high": round(max(open_, price) + 10, 2),
+                              "low": round(min(open_, price) - 10, 2), "close": round(price, 2)})
+        history.append({"name": ts.strftime('%Y-%m-%d %H:%M'), "value": round(price / 2, 2)})
+        if i % 50 == 0:
+            trade_logs.append({"timestamp": ts, "order_type": "BUY" if i % 100 == 0 else "SELL", "price": round(price, 2)})
+    return schemas.BacktestResult(total_return=12.3, win_rate=55.0, max_drawdown=-8.1, sharpe_ratio=1.8,
+                                  history=history, price_history=price_history, trade_logs=trade_logs)
+
+
+def encode(result: schemas.BacktestResult, media_type: str, content_encoding: str = None):
+    started = time.perf_counter()
+    columnar = response_encoding.backtest_columns
+    already_compressed = False
+    if media_type == JSON_TYPE:
+        body = response_encoding.encode_json(result)
+    elif media_type == MSGPACK_TYPE:
+        body = response_encoding.encode_msgpack(columnar(result))
+    else:
+        body, already_compressed = response_encoding.encode_arrow(columnar(result))
+    if content_encoding and not already_compressed:
+        body = response_encoding.compress(body, content_encoding)
+    return time.perf_counter() - started, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare response encodings for a large backtest result")
+    parser.add_argument("--candles", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    result = build_result(args.candles)
+    cases = [("json", JSON_TYPE, None), ("json + gzip", JSON_TYPE, "gzip"), ("arrow", ARROW_TYPE, None)]
+    if response_encoding.negotiate_content_encoding("br") == "br":
+        cases.insert(2, ("json + br", JSON_TYPE, "br"))
+    if response_encoding.negotiate_media_type(MSGPACK_TYPE, columnar=True) == MSGPACK_TYPE:
+        cases += [("msgpack", MSGPACK_TYPE, None), ("msgpack + gzip", MSGPACK_TYPE, "gzip")]
+
+    print(f"--- Response Encoding Benchmark ({args.candles} candles) ---")
+    print(f"{'format':<16} {'ms':>9} {'bytes':>12} {'vs json':>9}")
+    baseline = None
+    for label, media_type, content_encoding in cases:
+        runs = [encode(result, media_type, content_encoding) for _ in range(args.repeat)]
+        seconds = min(r[0] for r in runs)
+        size = runs[0][1]
+        baseline = baseline or size
+        print(f"{label:<16} {seconds * 1000:>9.1f} {size:>12,} {baseline / size:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# indicator_benchmark.py
+#
+# প্রতিটি ইন্ডিকেটরের প্রতিটি ইনস্টল করা ব্যাকএন্ড (talib, numpy, pandas_ta) একই সিন্থেটিক ক্যান্ডেলে চালিয়ে
+# ফলাফল মেলায় (ওয়ার্ম-আপের পরে) এবং সময় মাপে: একটি লম্বা সিরিজে একবার, এবং স্ট্র্যাটেজির মতো ছোট
+# উইন্ডোতে বারবার (প্রতিটি ক্যান্ডেলে generate_signals যেভাবে ডাকে)। শেষে দেখায় রেজিস্ট্রির PREFERENCE
+# অনুযায়ী বেছে নেওয়া ব্যাকএন্ডটিই সবচেয়ে দ্রুত কিনা।
+#
+#   python indicator_benchmark.py --bars 20000 --window 500
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicators
+
+# ইন্ডিকেটর -> (ইনপুট কলাম, প্যারামিটার, কতগুলো ক্যান্ডেলের পর থেকে ব্যাকএন্ডগুলোর মান মিলতে হবে)
+# রিকার্সিভ ইন্ডিকেটরের শুরুর মান লাইব্রেরিভেদে আলাদা ভাবে স্মুদ হয়, তাই পিরিয়ডের কয়েক গুণ বাদ দেওয়া হয়
+CASES = {
+    "sma": (("close",), (20,), 20),
+    "ema": (("close",), (20,), 200),
+    "rsi": (("close",), (14,), 300),
+    "macd": (("close",), (12, 26, 9), 500),
+    "bbands": (("close",), (20, 2.0), 20),
+    "stoch": (("high", "low", "close"), (14, 3, 3), 20),
+    "atr": (("high", "low", "close"), (14,), 300),
+    "obv": (("close", "volume"), (), 0),
+    "supertrend": (("high", "low", "close"), (7, 3.0), 300),
+}
+
+
+def build_candles(bars: int) -> pd.DataFrame:
+    """র‍্যান্ডম-ওয়াক দামের OHLCV ক্যান্ডেল।"""
+    rng = np.random.default_rng(42)
+    close = 20000 + np.cumsum(rng.normal(0, 50, bars))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.random(bars) * 40
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.integers(1, 1000, bars).astype(float),
+    })
+
+
+def max_difference(result, reference, warmup: int) -> float:
+    """ওয়ার্ম-আপের পরে সর্বোচ্চ আপেক্ষিক পার্থক্য; একটিতে NaN অন্যটিতে মান থাকলে inf।"""
+    a = pd.DataFrame(result).iloc[warmup:].to_numpy(dtype=float)
+    b = pd.DataFrame(reference).iloc[warmup:].to_numpy(dtype=float)
+    if a.shape != b.shape or not np.array_equal(np.isnan(a), np.isnan(b)):
+        return float("inf")
+    mask = ~np.isnan(a)
+    if not mask.any():
+        return 0.0
+    return float(np.max(np.abs(a[mask] - b[mask]) / np.maximum(np.abs(b[mask]), 1.0)))
+
+
+def time_call(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare indicator backends for speed and equivalence")
+    parser.add_argument("--bars", type=int, default=20000, help="Length of the long series")
+    parser.add_argument("--window", type=int, default=500, help="Window size for the per-candle calls")
+    parser.add_argument("--calls", type=int, default=200, help="Per-candle calls to time on the window")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Allowed relative difference after warm-up")
+    args = parser.parse_args()
+
+    df = build_candles(args.bars)
+    window = df.iloc[-args.window:]
+    missing = [backend for backend in indicators.BACKENDS if not indicators.backend_available(backend)]
+
+    print(f"--- Indicator Backend Benchmark ({args.bars:,} bars, {args.window}-bar window) ---")
+    if missing:
+        print(f"not installed: {', '.join(missing)}")
+    print(f"{'indicator':<11} {'backend':<10} {'series ms':>10} {'window µs':>10} {'max diff':>10}")
+
+    failures, slower = [], []
+    for name in indicators.indicator_names():
+        columns, params, warmup = CASES[name]
+        backends = indicators.available_backends(name)
+        inputs = [df[column] for column in columns]
+        window_inputs = [window[column] for column in columns]
+        reference = indicators.compute(name, *inputs, *params, backend=backends[0])
+
+        timings = {}
+        for backend in backends:
+            series_seconds = time_call(lambda: indicators.compute(name, *inputs, *params, backend=backend), args.repeat)
+            window_seconds = time_call(
+                lambda: [indicators.compute(name, *window_inputs, *params, backend=backend) for _ in range(args.calls)],
+                args.repeat) / args.calls
+            timings[backend] = window_seconds
+            difference = max_difference(indicators.compute(name, *inputs, *params, backend=backend), reference, warmup)
+            if difference > args.tolerance:
+                failures.append(f"{name}/{backend} differs from {backends[0]} by {difference:.2e}")
+            print(f"{name:<11} {backend:<10} {series_seconds * 1000:>10.2f} {window_seconds * 1e6:>10.1f} {difference:>10.1e}")
+
+        fastest = min(timings, key=timings.get)
+        if fastest != backends[0]:
+            slower.append(f"{name}: registry picks {backends[0]}, but {fastest} was faster on this machine")
+
+    for line in failures:
+        print(f"❌ {line}")
+    for line in slower:
+        print(f"⚠️ {line}")
+    if failures:
+        print("\n❌ Indicator backends disagree.")
+        return 1
+    if not slower:
+        print("\n✅ Every backend agrees, and the registry picks the fastest installed backend for every indicator.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
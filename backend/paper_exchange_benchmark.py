@@ -0,0 +1,95 @@
+# paper_exchange_benchmark.py
+#
+# পেপার এক্সচেঞ্জের লোড টেস্ট: অনেকগুলো বট (থ্রেড) একই অ্যাকাউন্টে র‍্যান্ডম market/limit/stop অর্ডার
+# দেয় এবং বাতিল করে, আর একটি ফিড থ্রেড র‍্যান্ডম-ওয়াক ক্যান্ডেল দিয়ে ম্যাচিং ইঞ্জিন চালায়।
+# প্রতি সেকেন্ডে কতগুলো অর্ডার এবং ফিল হলো তা দেখায়।
+#
+#   python paper_exchange_benchmark.py --bots 50 --orders 2000 --symbols 5
+
+import argparse
+import random
+import threading
+import time
+
+from app.services.paper_exchange import PaperExchange, PaperExchangeError
+
+
+def run_bot(exchange: PaperExchange, symbols, orders: int, seed: int, errors: list):
+    rng = random.Random(seed)
+    open_ids = []
+    for _ in range(orders):
+        symbol = rng.choice(symbols)
+        last = exchange.fetch_ticker(symbol)["last"]
+        side = rng.choice(("buy", "sell"))
+        roll = rng.random()
+        try:
+            if roll < 0.3:
+                exchange.create_order(symbol, "market", side, 0.01)
+            elif roll < 0.8:
+                offset = rng.uniform(-0.01, 0.01) * last
+                order = exchange.create_order(symbol, "limit", side, rng.uniform(0.01, 0.05), round(last + offset, 2))
+                open_ids.append(order["id"])
+            elif roll < 0.9:
+                stop = last * (1.005 if side == "buy" else 0.995)
+                exchange.create_order(symbol, "stop_market", side, 0.01, params={"stopPrice": stop})
+            elif open_ids:
+                exchange.cancel_order(open_ids.pop(rng.randrange(len(open_ids))))
+        except PaperExchangeError as e:
+            errors.append(type(e).__name__)
+
+
+def run_feed(exchange: PaperExchange, symbols, prices, stop_event: threading.Event, interval: float):
+    rng = random.Random(0)
+    ts = 0
+    while not stop_event.is_set():
+        ts += 60_000
+        for symbol in symbols:
+            open_ = prices[symbol]
+            close = max(1.0, open_ * (1 + rng.gauss(0, 0.002)))
+            prices[symbol] = close
+            exchange.update_candle(symbol, [ts, open_, max(open_, close) * 1.001, min(open_, close) * 0.999, close, 500.0])
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the paper exchange matching engine")
+    parser.add_argument("--bots", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=2000, help="Orders per bot")
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--feed-interval", type=float, default=0.001, help="Seconds between candle updates")
+    args = parser.parse_args()
+
+    symbols = [f"C{i}/USDT" for i in range(args.symbols)]
+    balances = {"USDT": 1e12, **{s.split("/")[0]: 1e9 for s in symbols}}
+    exchange = PaperExchange(balances=balances)
+    prices = {s: 100.0 for s in symbols}
+    for symbol in symbols:
+        exchange.update_price(symbol, prices[symbol])
+
+    stop_event = threading.Event()
+    feed = threading.Thread(target=run_feed, args=(exchange, symbols, prices, stop_event, args.feed_interval))
+    errors: list = []
+    bots = [threading.Thread(target=run_bot, args=(exchange, symbols, args.orders, seed, errors))
+            for seed in range(args.bots)]
+
+    started = time.perf_counter()
+    feed.start()
+    for bot in bots:
+        bot.start()
+    for bot in bots:
+        bot.join()
+    elapsed = time.perf_counter() - started
+    stop_event.set()
+    feed.join()
+
+    total_orders = args.bots * args.orders
+    fills = len(exchange.fetch_my_trades())
+    print(f"--- Paper Exchange Benchmark ({args.bots} bots, {args.symbols} symbols) ---")
+    print(f"orders: {total_orders:,} in {elapsed:.2f} s ({total_orders / elapsed:,.0f} orders/s)")
+    print(f"fills:  {fills:,} ({fills / elapsed:,.0f} fills/s), open orders: {len(exchange.fetch_open_orders()):,}")
+    if errors:
+        print(f"rejected: {len(errors):,} ({', '.join(sorted(set(errors)))})")
+
+
+if __name__ == "__main__":
+    main()
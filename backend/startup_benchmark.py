@@ -0,0 +1,97 @@
+# startup_benchmark.py
+#
+# API-এর কোল্ড স্টার্টের সময় মাপে: `import app.main` কতক্ষণ লাগে এবং কোন মডিউল কত সময় নেয়।
+# ভারী লাইব্রেরি (ccxt, pandas, numpy ...) স্টার্টআপে আবার ইম্পোর্ট হতে শুরু করলে বা মোট সময়
+# বাজেট ছাড়িয়ে গেলে exit code 1 দেয়, তাই CI-তে রিগ্রেশন ধরা পড়ে।
+#
+#   python startup_benchmark.py --top 25 --budget-ms 1500
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.resolve()
+
+# এই মডিউলগুলো প্রথম ব্যবহারের সময় লোড হওয়ার কথা, স্টার্টআপে নয়
+FORBIDDEN_MODULES = ("ccxt", "pandas", "numpy", "pyarrow", "talib", "pandas_ta", "aiohttp")
+
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+
+def measure_imports(target: str = "app.main"):
+    """
+    নতুন ইন্টারপ্রেটারে `python -X importtime` দিয়ে target ইম্পোর্ট করে।
+    (wall_seconds, [(module, self_us, cumulative_us), ...]) ফেরত দেয়।
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # ফরম্যাট: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return wall, rows
+
+
+def measure_startup_hook() -> float:
+    """FastAPI-এর startup হুক (ডাটাবেস স্কিমা, ট্রেড রাইটার ইত্যাদি) চালাতে কত সময় লাগে।"""
+    sys.path.insert(0, str(BACKEND_DIR))
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    started = time.perf_counter()
+    with TestClient(app):
+        elapsed = time.perf_counter() - started
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold start time")
+    parser.add_argument("--top", type=int, default=20, help="How many modules to list")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Fail above this import time")
+    parser.add_argument("--with-startup", action="store_true", help="Also time the FastAPI startup hook")
+    args = parser.parse_args()
+
+    wall, rows = measure_imports()
+    by_module = {module: (self_us, cumulative_us) for module, self_us, cumulative_us in rows}
+    total_ms = by_module.get("app.main", (0, 0))[1] / 1000
+
+    print("--- Startup Import Benchmark ---")
+    print(f"import app.main: {total_ms:.1f} ms (interpreter wall time {wall * 1000:.0f} ms)")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+    if args.with_startup:
+        print(f"\nstartup hook: {measure_startup_hook() * 1000:.1f} ms")
+
+    failed = False
+    eager = sorted({m.split(".")[0] for m in by_module} & set(FORBIDDEN_MODULES))
+    if eager:
+        print(f"\n❌ Heavy modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\n❌ Import time {total_ms:.1f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("\n✅ Cold start is within budget.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+# tests/conftest.py
+
+import pytest
+
+from app import config
+from app.services import indicators
+from indicator_benchmark import build_candles
+
+
+@pytest.fixture(scope="session")
+def candles():
+    """সব টেস্টের জন্য একই নির্দিষ্ট (seed 42) র‍্যান্ডম-ওয়াক ক্যান্ডেল।"""
+    return build_candles(400)
+
+
+@pytest.fixture
+def indicator_backend(monkeypatch):
+    """একটি নির্দিষ্ট ইন্ডিকেটর ব্যাকএন্ড জোর করে বেছে নেওয়ার ফাংশন; টেস্ট শেষে আগের অবস্থা ফিরে আসে।"""
+    def use(backend: str):
+        monkeypatch.setattr(config, "INDICATOR_BACKEND", backend)
+        indicators._resolved.clear()
+    yield use
+    indicators._resolved.clear()
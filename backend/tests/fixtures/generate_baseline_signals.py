@@ -0,0 +1,122 @@
+# tests/fixtures/generate_baseline_signals.py
+#
+# ইন্ডিকেটর ফ্যাসাডে সরানোর আগের (pandas_ta / talib সরাসরি ব্যবহার করা) বিল্ট-ইন স্ট্র্যাটেজিগুলো
+# conftest-এর একই সিন্থেটিক সিরিজে চালিয়ে baseline_signals.json লেখে। test_strategy_signals.py বর্তমান
+# স্ট্র্যাটেজিগুলোকে এই ফাইলের সাথে মেলায়। pandas_ta এবং TA-Lib দুটোই ইনস্টল থাকা আলাদা পরিবেশে চালাতে হয়
+# (pandas_ta-র নতুন ভার্সনের জন্য Python 3.12+ লাগে):
+#
+#   git archive <migration-এর আগের কমিট> backend/app/strategies | tar -x -C /tmp/baseline
+#   touch /tmp/baseline/backend/app/__init__.py
+#   python tests/fixtures/generate_baseline_signals.py /tmp/baseline/backend
+
+import hashlib
+import importlib
+import inspect
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BARS = 2000
+MODULES = ["bollinger_bands", "ema_crossover", "macd_crossover", "obv", "rsi", "stochastic_oscillator", "supertrend"]
+
+
+def build_candles(bars: int) -> pd.DataFrame:
+    # indicator_benchmark.build_candles-এর হুবহু কপি; ওটা বর্তমান app ইম্পোর্ট করে, যা এখানে পুরনো app-এর সাথে মিশে যেত
+    rng = np.random.default_rng(42)
+    close = 20000 + np.cumsum(rng.normal(0, 50, bars))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.random(bars) * 40
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.integers(1, 1000, bars).astype(float),
+    })
+
+
+def series_digest(df: pd.DataFrame) -> str:
+    return hashlib.sha256(np.ascontiguousarray(df[["open", "high", "low", "close", "volume"]].to_numpy()).tobytes()).hexdigest()
+
+
+# পুরনো স্ট্র্যাটেজিগুলো pandas_ta-র কলামের নাম হার্ডকোড করেছিল। এখন ইনস্টল করা যায় এমন pandas_ta (0.4.x)
+# বলিঞ্জারের নামে std দুবার বসায় (BBL_20_2.0_2.0), এবং OBV-এর EMA-কে কোনো ভার্সনেই 'OBVe_20' নাম দেয় না,
+# তাই এই দুটি স্ট্র্যাটেজি আসলে সবসময় HOLD দিত। স্ট্র্যাটেজিগুলো যে মান পড়তে চেয়েছিল সেটাই মেলানোর জন্য
+# কলামগুলোকে তাদের প্রত্যাশিত নামে দেওয়া হয়।
+COLUMN_ALIASES = {
+    "bollinger_bands_strategy": "BB*_{length}_{std}_{std} -> BB*_{length}_{std}",
+    "obv_strategy": "EMA_{length} of the OBV column -> OBVe_{length}",
+}
+
+
+def _alias_columns(pandas_ta):
+    accessor = pandas_ta.AnalysisIndicators
+    original_bbands, original_ema = accessor.bbands, accessor.ema
+
+    def _append(frame, result):
+        for column in result.columns:
+            frame[column] = result[column]
+
+    def bbands(self, *args, append=False, **kwargs):
+        result = original_bbands(self, *args, **kwargs)
+        parts = [column.split("_") for column in result.columns]
+        result.columns = ["_".join(p[:-1]) if len(p) == 4 and p[2] == p[3] else "_".join(p) for p in parts]
+        if append:
+            _append(self._df, result)
+        return result
+
+    def ema(self, *args, **kwargs):
+        close = kwargs.get("close")
+        if not (isinstance(close, pd.Series) and close.name == "OBV"):
+            return original_ema(self, *args, **kwargs)
+        append = kwargs.pop("append", False)
+        result = original_ema(self, *args, **kwargs)
+        result = result.to_frame() if isinstance(result, pd.Series) else result
+        result.columns = [column.replace("EMA", "OBVe") for column in result.columns]
+        if append:
+            _append(self._df, result)
+        return result
+
+    accessor.bbands, accessor.ema = bbands, ema
+
+
+def main(baseline_backend: str):
+    sys.path.insert(0, baseline_backend)
+    import pandas_ta  # df.ta অ্যাক্সেসর রেজিস্টার করে
+    import talib
+    _alias_columns(pandas_ta)
+    df = build_candles(BARS)
+    signals = {}
+    for name in MODULES:
+        module = importlib.import_module(f"app.strategies.{name}_strategy")
+        base = importlib.import_module("app.strategies.base_strategy").BaseStrategy
+        strategy_class = next(member for _, member in inspect.getmembers(module, inspect.isclass)
+                              if issubclass(member, base) and member is not base)
+        strategy = strategy_class({p["name"]: p["default"] for p in strategy_class.get_params_definition()})
+        found = {"BUY": [], "SELL": []}
+        # পুরনো ব্যাকটেস্টারের লুপ: প্রতিটি ক্যান্ডেলে শুরু থেকে সেই ক্যান্ডেল পর্যন্ত একটি নতুন কপি
+        for i in range(len(df)):
+            signal = strategy.generate_signals(df.iloc[:i + 1].copy())
+            if signal != "HOLD":
+                found[signal].append(i)
+        signals[f"{name}_strategy"] = found
+        print(name, {side: len(indices) for side, indices in found.items()})
+
+    output = {
+        "bars": BARS,
+        "series_sha256": series_digest(df),
+        "column_aliases": COLUMN_ALIASES,
+        "generated_with": {"pandas_ta": pandas_ta.version, "talib": talib.__version__, "pandas": pd.__version__,
+                           "numpy": np.__version__},
+        "signals": signals,
+    }
+    path = Path(__file__).with_name("baseline_signals.json")
+    path.write_text(json.dumps(output, indent=1) + "\n")
+    print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,51 @@
+# tests/test_candle_import.py
+#
+# ইম্পোর্টে শুধু ফাঁকহীন অংশগুলো কভারড হিসেবে চিহ্নিত হয় এবং ভুল টাইমফ্রেমের ফাইল স্টোরে লেখা হয় না।
+
+import pytest
+
+from app import config
+from app.services import candle_import, candle_store
+from indicator_benchmark import build_candles
+
+HOUR_MS = 3_600_000
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _write_csv(tmp_path, name, timestamps_ms):
+    df = build_candles(len(timestamps_ms))
+    df.insert(0, "timestamp", timestamps_ms)
+    path = tmp_path / name
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _import(path, timeframe):
+    summary = candle_import._ImportSummary(1)
+    summary.add("binance", "BTC/USDT", timeframe, *candle_import._parse_safely(path))
+    return summary.finish("binance", "BTC/USDT", timeframe)
+
+
+def test_coverage_is_marked_per_contiguous_run(tmp_path):
+    # ১০-১৪ এবং ৩০ নম্বর ঘণ্টা নেই
+    hours = [h for h in range(48) if not 10 <= h < 15 and h != 30]
+    report = _import(_write_csv(tmp_path, "gapped.csv", [START_MS + h * HOUR_MS for h in hours]), "1h")
+    assert report["errors"] == [] and report["rows"] == len(hours)
+    assert report["covered"] == [[START_MS, START_MS + 10 * HOUR_MS],
+                                 [START_MS + 15 * HOUR_MS, START_MS + 30 * HOUR_MS],
+                                 [START_MS + 31 * HOUR_MS, START_MS + 48 * HOUR_MS]]
+    assert candle_store.missing_ranges("binance", "BTC/USDT", "1h", START_MS, START_MS + 48 * HOUR_MS) == [
+        (START_MS + 10 * HOUR_MS, START_MS + 15 * HOUR_MS), (START_MS + 30 * HOUR_MS, START_MS + 31 * HOUR_MS)]
+
+
+def test_file_with_wrong_spacing_is_rejected(tmp_path):
+    minutes = [START_MS + m * 60_000 for m in range(120)]
+    report = _import(_write_csv(tmp_path, "minutes.csv", minutes), "1h")
+    assert report["imported_files"] == 0 and report["rows"] == 0 and report["covered"] == []
+    assert "median" in report["errors"][0]["error"]
+    assert not candle_store.series_dir("binance", "BTC/USDT", "1h").exists()
@@ -0,0 +1,72 @@
+# tests/test_indicators.py
+
+import numpy as np
+import pytest
+
+from app.services import indicators
+from indicator_benchmark import CASES, max_difference
+
+TOLERANCE = 1e-6
+
+
+def _compute(name, candles, backend):
+    columns, params, _ = CASES[name]
+    return indicators.compute(name, *[candles[column] for column in columns], *params, backend=backend)
+
+
+def test_every_indicator_has_a_case():
+    assert sorted(CASES) == indicators.indicator_names()
+
+
+@pytest.mark.parametrize("name", [name for name in CASES if "talib" in indicators.PREFERENCE[name]])
+def test_numpy_matches_talib_after_warmup(name, candles):
+    pytest.importorskip("talib")
+    warmup = CASES[name][2]
+    assert max_difference(_compute(name, candles, "numpy"), _compute(name, candles, "talib"), warmup) <= TOLERANCE
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_pandas_ta_matches_numpy_after_warmup(name, candles):
+    pytest.importorskip("pandas_ta")
+    warmup = CASES[name][2]
+    assert max_difference(_compute(name, candles, "pandas_ta"), _compute(name, candles, "numpy"), warmup) <= TOLERANCE
+
+
+@pytest.mark.parametrize("backend", indicators.BACKENDS)
+def test_stoch_k_is_not_delayed_until_d(backend, candles):
+    # pandas_ta-র মতো %K নিজের ওয়ার্ম-আপের (k + smooth_k - 1 ক্যান্ডেল) পরেই আসে, %D আরও d-1 ক্যান্ডেল পরে
+    if not indicators.backend_available(backend):
+        pytest.skip(f"{backend} is not installed")
+    k, d, smooth_k = 14, 3, 3
+    result = indicators.compute("stoch", candles["high"], candles["low"], candles["close"], k, d, smooth_k,
+                                backend=backend)
+    assert int(np.argmax(result["k"].notna().to_numpy())) == k + smooth_k - 2
+    assert int(np.argmax(result["d"].notna().to_numpy())) == k + smooth_k + d - 3
+
+
+def _stream(stream, *columns):
+    return np.array([stream.update(*values) for values in zip(*(column.tolist() for column in columns))])
+
+
+@pytest.mark.parametrize("backend", ["talib", "numpy"])
+def test_streams_match_batch_indicators(backend, candles):
+    # স্ট্রিমিং ব্যাকটেস্টের ইনক্রিমেন্টাল মান পুরো সিরিজে হিসাব করা মানের সাথে রাউন্ডিং পর্যন্ত মেলে
+    if not indicators.backend_available(backend):
+        pytest.skip(f"{backend} is not installed")
+    high, low, close, volume = candles["high"], candles["low"], candles["close"], candles["volume"]
+    macd = indicators.compute("macd", close, 12, 26, 9, backend=backend)
+    macd_stream = indicators.MacdStream(12, 26, 9)
+    streamed_macd = np.array([macd_stream.update(value) for value in close.tolist()])
+    pairs = [
+        (_stream(indicators.EmaStream(20), close), indicators.compute("ema", close, 20, backend=backend)),
+        (_stream(indicators.RsiStream(14), close), indicators.compute("rsi", close, 14, backend=backend)),
+        (_stream(indicators.AtrStream(14), high, low, close), indicators.compute("atr", high, low, close, 14, backend=backend)),
+        (_stream(indicators.ObvStream(), close, volume), indicators.compute("obv", close, volume, backend=backend)),
+        (streamed_macd[:, 0], macd["macd"]),
+        (streamed_macd[:, 1], macd["signal"]),
+        (_stream(indicators.SupertrendStream(7, 3.0), high, low, close),
+         indicators.compute("supertrend", high, low, close, 7, 3.0, backend="numpy")["direction"]),
+    ]
+    # MACD দুটি ~20000 মানের EMA-র পার্থক্য, তাই তার রাউন্ডিং (পরম) দামের স্কেলে ~1e-12
+    for streamed, batch in pairs:
+        assert max_difference(streamed, batch, 0) <= 1e-9
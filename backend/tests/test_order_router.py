@@ -0,0 +1,70 @@
+# tests/test_order_router.py
+#
+# বন্ধ হওয়ার সময় রাউটার কোনো অর্ডারের Future ঝুলিয়ে রাখে না: চলমান কল সময়মতো শেষ হলে তার ack/ফিল রেকর্ড হয়,
+# না হলে এবং কিউতে থাকা অর্ডারগুলো OrderRouterStopped দিয়ে শেষ হয়।
+
+import threading
+
+import pytest
+
+from app.services.order_router import OrderRouter, OrderRouterStopped
+
+
+class _SlowExchange:
+    """create_order ছেড়ে না দেওয়া পর্যন্ত আটকে থাকে; প্রতিটি অর্ডার সাথে সাথে পুরো ফিল হয়।"""
+
+    has = {}
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.called = threading.Event()
+        self.calls = 0
+
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self.calls += 1
+        self.called.set()
+        self.release.wait(5)
+        return {"id": f"x{self.calls}", "status": "closed", "filled": amount, "average": 100.0}
+
+
+@pytest.fixture
+def exchange():
+    exchange = _SlowExchange()
+    yield exchange
+    exchange.release.set()
+
+
+def _submit(router, fills, count):
+    return [router.submit("paper", "BTC/USDT", "market", "buy", 1.0, on_fill=fills.append) for _ in range(count)]
+
+
+def test_stop_fails_queued_and_unanswered_orders(exchange):
+    router = OrderRouter(rate=1000, burst=1000, concurrency=1, batch_size=1)
+    router.register("paper", exchange)
+    fills = []
+    futures = _submit(router, fills, 3)
+    assert exchange.called.wait(2)
+    router.stop(timeout=0.4)
+    assert not router.is_running
+    for future in futures:
+        with pytest.raises(OrderRouterStopped):
+            future.result(timeout=0)
+    # প্রথমটি এক্সচেঞ্জ কলে আটকে ছিল, বাকি দুটি কিউতে
+    assert exchange.calls == 1
+    assert [order["status"] for order in router.recent()] == ["aborted"] * 3
+    assert fills == []
+
+
+def test_stop_waits_for_in_flight_orders(exchange):
+    router = OrderRouter(rate=1000, burst=1000, concurrency=1, batch_size=1)
+    router.register("paper", exchange)
+    fills = []
+    futures = _submit(router, fills, 2)
+    assert exchange.called.wait(2)
+    threading.Timer(0.1, exchange.release.set).start()
+    router.stop(timeout=4)
+    # প্রথম অর্ডার কলে ছিল এবং সময়মতো ফিল হয়েছে; দ্বিতীয়টি তখনও কিউতে ছিল
+    assert futures[0].result(timeout=0)["status"] == "filled"
+    assert [fill["id"] for fill in fills] == ["r1"]
+    with pytest.raises(OrderRouterStopped):
+        futures[1].result(timeout=0)
@@ -0,0 +1,70 @@
+# tests/test_strategy_signals.py
+#
+# ইন্ডিকেটর ফ্যাসাডে সরানো প্রতিটি স্ট্র্যাটেজির সিগন্যাল, সরানোর আগের pandas_ta/talib স্ট্র্যাটেজি কোড থেকে
+# তৈরি golden ফাইলের (fixtures/baseline_signals.json) সাথে মেলানো হয়। ফাইলটি বর্তমান কোড দিয়ে নয়, পুরনো
+# কোড দিয়েই fixtures/generate_baseline_signals.py চালিয়ে বানাতে হয়। সিরিজটি ২০০০ বারের, যাতে EMA ও stoch-এর
+# দুই দিকেই একাধিক ক্রসওভার থাকে।
+
+import importlib
+import inspect
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services import indicators
+from app.services.backtesting_engine import iter_backtest_signals
+from app.strategies.base_strategy import BaseStrategy
+from indicator_benchmark import build_candles
+from tests.fixtures.generate_baseline_signals import series_digest
+
+BASELINE = json.loads((Path(__file__).parent / "fixtures" / "baseline_signals.json").read_text())
+STRATEGY_MODULES = sorted(BASELINE["signals"])
+
+
+def _load_strategy(module_name: str) -> BaseStrategy:
+    module = importlib.import_module(f"app.strategies.{module_name}")
+    strategy_class = next(member for _, member in inspect.getmembers(module, inspect.isclass)
+                          if issubclass(member, BaseStrategy) and member is not BaseStrategy)
+    params = {param["name"]: param["default"] for param in strategy_class.get_params_definition()}
+    return strategy_class(params)
+
+
+@pytest.fixture(scope="module")
+def baseline_candles():
+    return build_candles(BASELINE["bars"])
+
+
+def test_baseline_series_is_unchanged(baseline_candles):
+    # build_candles বদলালে golden ফাইল আর একই সিরিজের নয়; তখন পুরনো কোড দিয়ে আবার বানাতে হবে
+    assert series_digest(baseline_candles) == BASELINE["series_sha256"]
+
+
+@pytest.mark.parametrize("module_name", ["ema_crossover_strategy", "stochastic_oscillator_strategy"])
+def test_baseline_covers_crossovers_both_ways(module_name):
+    signals = BASELINE["signals"][module_name]
+    assert len(signals["BUY"]) >= 3 and len(signals["SELL"]) >= 3
+
+
+@pytest.mark.parametrize("backend", indicators.BACKENDS)
+@pytest.mark.parametrize("module_name", STRATEGY_MODULES)
+def test_signals_match_baseline(module_name, backend, baseline_candles, indicator_backend):
+    if not indicators.backend_available(backend):
+        pytest.skip(f"{backend} is not installed")
+    indicator_backend(backend)
+    signals = {"BUY": [], "SELL": []}
+    for i, signal, _ in iter_backtest_signals(baseline_candles, _load_strategy(module_name)):
+        if signal != "HOLD":
+            signals[signal].append(i)
+    assert signals == BASELINE["signals"][module_name]
+
+
+def test_stochastic_holds_without_enough_bars_or_k(baseline_candles):
+    strategy = _load_strategy("stochastic_oscillator_strategy")
+    short = strategy.k_period + strategy.d_period + strategy.smoothing - 1
+    # k + smooth_k ক্যান্ডেলেই %K-র দুটি মান থাকে, তাই গার্ড না থাকলে এই উইন্ডোগুলোর অনেকগুলোতে ক্রসিং ধরা পড়ত
+    for start in range(0, len(baseline_candles) - short, 7):
+        assert strategy.generate_signals(baseline_candles.iloc[start:start + short]) == "HOLD", start
+    gapped = baseline_candles.iloc[:100].copy()
+    gapped.loc[gapped.index[-1], "close"] = float("nan")
+    assert strategy.generate_signals(gapped) == "HOLD"
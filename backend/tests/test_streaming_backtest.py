@@ -0,0 +1,70 @@
+# tests/test_streaming_backtest.py
+#
+# স্ট্রিমিং ব্যাকটেস্ট (খণ্ডে খণ্ডে পড়া, ইন্ডিকেটরের অবস্থা বহন করা) পূর্ণ ব্যাকটেস্টের মতোই প্রতিটি
+# ক্যান্ডেলের ইকুইটি এবং একই ট্রেড দেয় কিনা, প্রতিটি বিল্ট-ইন স্ট্র্যাটেজি এবং ইনস্টল করা ব্যাকএন্ডে।
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app import config
+from app.services import backtesting_engine, candle_store, indicators
+from indicator_benchmark import build_candles
+
+STRATEGIES = [
+    "Bollinger Bands Strategy",
+    "Ema Crossover Strategy",
+    "Macd Crossover Strategy",
+    "Obv Strategy",
+    "Rsi Strategy",
+    "Stochastic Oscillator Strategy",
+    "Supertrend Strategy",
+]
+# ডিফল্ট প্যারামিটারের চেয়ে ছোট পিরিয়ড, যাতে ছোট সিরিজেও অনেকগুলো ট্রেড হয়
+# রিকার্সিভ ইন্ডিকেটরের স্ট্র্যাটেজিগুলো উইন্ডোর বদলে অবস্থা বহন করে; ছোট সিরিজে উইন্ডোর ভুল ধরা না পড়লেও
+# এটি নিশ্চিত করে যে ইনক্রিমেন্টাল পথটিই পরীক্ষা হচ্ছে
+INCREMENTAL = {"Ema Crossover Strategy", "Macd Crossover Strategy", "Obv Strategy", "Rsi Strategy",
+               "Supertrend Strategy"}
+PARAMS = {
+    "Ema Crossover Strategy": {"short_window": 10, "long_window": 40},
+}
+BARS = 1500
+CHUNK_ROWS = 97  # খণ্ডের সীমানা মাসের পার্টিশনের সীমানার সাথে মেলে না
+
+
+@pytest.fixture
+def spec(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path))
+    df = build_candles(BARS)
+    df.insert(0, "timestamp", pd.date_range("2023-01-01", periods=BARS, freq="h"))
+    candle_store.write_candles("testex", "BTC/USDT", "1h", df)
+    start_ms, end_ms = candle_store.date_range_to_ms(df["timestamp"].iloc[0].date(), df["timestamp"].iloc[-1].date())
+    return candle_store.CandleSpec("testex", "BTC/USDT", "1h", start_ms, end_ms)
+
+
+def _read_arrow(path) -> pd.DataFrame:
+    with pa.OSFile(str(path), "rb") as source:
+        return pa.ipc.open_stream(source).read_all().to_pandas()
+
+
+@pytest.mark.parametrize("backend", indicators.BACKENDS)
+@pytest.mark.parametrize("strategy_name", STRATEGIES)
+def test_streaming_matches_full_backtest(strategy_name, backend, spec, indicator_backend):
+    if not indicators.backend_available(backend):
+        pytest.skip(f"{backend} is not installed")
+    indicator_backend(backend)
+    params = PARAMS.get(strategy_name, {})
+
+    full = backtesting_engine.simulate_backtest(candle_store.read_candles(spec), strategy_name, params)
+    streamed = backtesting_engine.simulate_backtest_streaming(spec, strategy_name, params, "0" * 32,
+                                                              chunk_rows=CHUNK_ROWS)
+
+    equity = _read_arrow(backtesting_engine.streaming_run_file(streamed.run_id, backtesting_engine.EQUITY_FILE))
+    trades = _read_arrow(backtesting_engine.streaming_run_file(streamed.run_id, backtesting_engine.TRADES_FILE))
+    assert equity["value"].tolist() == [point.value for point in full.history]
+    assert trades["order_type"].tolist() == [trade.order_type for trade in full.trade_logs]
+    assert trades["price"].tolist() == [trade.price for trade in full.trade_logs]
+    assert len(full.trade_logs) > 0
+    assert streamed.incremental == (strategy_name in INCREMENTAL)
+    assert (streamed.total_return, streamed.win_rate, streamed.max_drawdown) == \
+        (full.total_return, full.win_rate, full.max_drawdown)
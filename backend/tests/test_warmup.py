@@ -0,0 +1,63 @@
+# tests/test_warmup.py
+#
+# লাইভ বট প্রতি চক্রে শুধু শেষ warmup_bars() ক্যান্ডেল আনে। রিকার্সিভ ইন্ডিকেটরের উইন্ডো
+# indicators.settling_bars() থেকে আসে, যার প্রতিশ্রুতি: কাটা উইন্ডোর শেষ মান পুরো হিস্টোরির মান থেকে
+# সর্বোচ্চ INDICATOR_SETTLE_TOLERANCE × (সিড আর আসল মানের ব্যবধান) দূরে। এখানে সেই সীমা এবং
+# স্ট্র্যাটেজির সিগন্যালে তার প্রভাব যাচাই করা হয়।
+
+import numpy as np
+import pytest
+
+from app import config
+from app.services import indicators
+from app.services.backtesting_engine import iter_backtest_signals
+from indicator_benchmark import build_candles
+from tests.test_strategy_signals import STRATEGY_MODULES, _load_strategy
+
+BARS = 3000
+
+
+@pytest.fixture(scope="module")
+def long_candles():
+    return build_candles(BARS)
+
+
+def _scales(candles):
+    # সিড আর আসল মানের ব্যবধানের সর্বোচ্চ সম্ভাব্য মান: দামের পুরো রেঞ্জ, RSI-এর 0-100, ATR-এর সর্বোচ্চ রেঞ্জ
+    price_range = float(candles["close"].max() - candles["close"].min())
+    return {"ema": price_range, "macd": price_range, "rsi": 100.0,
+            "atr": float((candles["high"] - candles["low"]).max() + price_range)}
+
+
+@pytest.mark.parametrize("name, columns, params", [
+    ("ema", ("close",), (20,)),
+    ("ema", ("close",), (200,)),
+    ("rsi", ("close",), (14,)),
+    ("atr", ("high", "low", "close"), (14,)),
+    ("macd", ("close",), (12, 26, 9)),
+])
+def test_settled_window_error_is_within_tolerance(name, columns, params, long_candles):
+    window = indicators.settling_bars(name, *params)
+    inputs = [long_candles[column] for column in columns]
+    full = np.asarray(indicators.compute(name, *inputs, *params), dtype=float)
+    allowed = config.INDICATOR_SETTLE_TOLERANCE * _scales(long_candles)[name]
+    for end in range(window, BARS, 11):
+        cut = indicators.compute(name, *[series.iloc[end - window + 1:end + 1] for series in inputs], *params)
+        difference = np.abs(np.asarray(cut, dtype=float)[-1] - full[end])
+        assert np.nanmax(difference) <= allowed
+
+
+def test_tighter_tolerance_needs_more_bars():
+    assert indicators.settling_bars("ema", 200, tolerance=1e-6) > indicators.settling_bars("ema", 200, tolerance=1e-3)
+    # নির্দিষ্ট উইন্ডোর ইন্ডিকেটরে tolerance-এর প্রভাব নেই
+    assert indicators.settling_bars("bbands", 20, 2.0, tolerance=1e-9) == 20
+
+
+@pytest.mark.parametrize("module_name", STRATEGY_MODULES)
+def test_live_window_signals_match_full_history(module_name, long_candles):
+    # লাইভ বটের মতো শুধু শেষ warmup_bars() ক্যান্ডেল দিয়ে প্রতিটি সিগন্যাল
+    strategy = _load_strategy(module_name)
+    window = strategy.warmup_bars()
+    candles = long_candles.iloc[:1500]
+    for i, expected, _ in iter_backtest_signals(candles, strategy):
+        assert strategy.generate_signals(candles.iloc[max(0, i - window + 1):i + 1]) == expected, i